@@ -2,7 +2,10 @@
 Registro en el admin de Django
 """
 from django.contrib import admin
-from .models import Facultad, Asignatura, Carrera, PlanCarreraAsignatura, ProfesorAsignatura, PeriodoAcademico
+from .models import (
+    Facultad, Asignatura, Carrera, PlanCarreraAsignatura, ProfesorAsignatura, PeriodoAcademico,
+    ImportacionAsignaturas,
+)
 
 # Registrar PeriodoAcademico en el admin
 @admin.register(PeriodoAcademico)
@@ -57,3 +60,14 @@ class ProfesorAsignaturaAdmin(admin.ModelAdmin):
     list_display = ('profesor', 'asignatura', 'fecha_asignacion')
     search_fields = ('profesor__username', 'asignatura__codigo')
     list_filter = ('fecha_asignacion',)
+
+
+@admin.register(ImportacionAsignaturas)
+class ImportacionAsignaturasAdmin(admin.ModelAdmin):
+    list_display = ('nombre_archivo', 'periodo', 'usuario', 'dry_run', 'estado', 'total_filas', 'creadas', 'fecha_creacion')
+    list_filter = ('estado', 'dry_run', 'periodo')
+    search_fields = ('nombre_archivo', 'sha256', 'usuario__username')
+    readonly_fields = (
+        'id', 'sha256', 'estado', 'error', 'total_filas', 'filas_procesadas', 'validas', 'invalidas',
+        'creadas', 'fecha_creacion', 'fecha_inicio', 'fecha_fin',
+    )
@@ -9,6 +9,7 @@ from .views import (
 	PlanCarreraAsignaturaViewSet,
 	ProfesorAsignaturaViewSet,
 	PeriodoAcademicoViewSet,
+	ImportacionAsignaturasViewSet,
 )
 
 router = DefaultRouter()
@@ -18,5 +19,6 @@ router.register(r'asignaturas', AsignaturaViewSet, basename='asignatura')
 router.register(r'carreras', CarreraViewSet, basename='carrera')
 router.register(r'planes-carrera-asignaturas', PlanCarreraAsignaturaViewSet, basename='plan-carrera-asignatura')
 router.register(r'profesor-asignaturas', ProfesorAsignaturaViewSet, basename='profesor-asignatura')
+router.register(r'importaciones-asignaturas', ImportacionAsignaturasViewSet, basename='importacion-asignaturas')
 
 urlpatterns = router.urls
@@ -3,7 +3,8 @@ Serializers para modelos académicos
 """
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Prefetch
 from applications.academico.models import (
     Facultad,
     Asignatura,
@@ -11,6 +12,8 @@ from applications.academico.models import (
     PlanCarreraAsignatura,
     ProfesorAsignatura,
     PeriodoAcademico,
+    ImportacionAsignaturas,
+    FilaImportacion,
 )
 
 Usuario = get_user_model()
@@ -80,9 +83,49 @@ class AsignaturaSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'fecha_creacion']
     
 
+    @staticmethod
+    def preparar_queryset(queryset, prefijo=''):
+        """
+        Aplica select_related/prefetch_related con todo lo que lee este serializer.
+        `prefijo` permite usarlo desde otro modelo (p. ej. 'asignatura__' para Matricula).
+        """
+        return queryset.select_related(f'{prefijo}periodo_academico').prefetch_related(
+            f'{prefijo}carreras',
+            Prefetch(
+                f'{prefijo}planes_carrera',
+                queryset=PlanCarreraAsignatura.objects.select_related('carrera__facultad'),
+            ),
+            Prefetch(
+                f'{prefijo}profesores_asignados',
+                queryset=ProfesorAsignatura.objects.select_related('profesor'),
+            ),
+            f'{prefijo}prerrequisitos',
+        )
+
+    @staticmethod
+    def _prefetched(obj, relacion):
+        """Objetos precargados con prefetch_related para `relacion`, o None si no se precargó."""
+        cache = getattr(obj, '_prefetched_objects_cache', {})
+        return list(cache[relacion]) if relacion in cache else None
+
+    def _plan_principal(self, obj):
+        """
+        Primer PlanCarreraAsignatura (orden del modelo). Se resuelve una sola vez por
+        asignatura y usa `planes_carrera` precargado si está disponible.
+        """
+        if not hasattr(obj, '_plan_principal_cache'):
+            planes = self._prefetched(obj, 'planes_carrera')
+            if planes is not None:
+                obj._plan_principal_cache = planes[0] if planes else None
+            else:
+                obj._plan_principal_cache = obj.planes_carrera.select_related('carrera__facultad').first()
+        return obj._plan_principal_cache
+
     def get_profesores_info(self, obj):
         """Retorna la lista de profesores asociados a la asignatura mediante ProfesorAsignatura"""
-        profesores = ProfesorAsignatura.objects.filter(asignatura=obj)
+        profesores = self._prefetched(obj, 'profesores_asignados')
+        if profesores is None:
+            profesores = ProfesorAsignatura.objects.filter(asignatura=obj).select_related('profesor')
         return [
             {
                 'id': pa.profesor.id,
@@ -94,38 +137,39 @@ class AsignaturaSerializer(serializers.ModelSerializer):
         ]
 
     def create(self, validated_data):
+        from applications.academico.services.profesores import sincronizar_profesores
+
         profesores_ids = validated_data.pop('profesores', [])
-        asignatura = super().create(validated_data)
-        # Limpiar relaciones previas (por si acaso)
-        ProfesorAsignatura.objects.filter(asignatura=asignatura).delete()
-        for profesor_id in profesores_ids:
-            ProfesorAsignatura.objects.create(asignatura=asignatura, profesor_id=profesor_id)
+        with transaction.atomic():
+            asignatura = super().create(validated_data)
+            sincronizar_profesores(asignatura, profesores_ids)
         return asignatura
 
     def update(self, instance, validated_data):
+        from applications.academico.services.profesores import sincronizar_profesores
+
         profesores_ids = validated_data.pop('profesores', None)
-        asignatura = super().update(instance, validated_data)
-        if profesores_ids is not None:
-            # Si la lista está vacía, elimina todas las relaciones
-            ProfesorAsignatura.objects.filter(asignatura=asignatura).delete()
-            for profesor_id in profesores_ids:
-                ProfesorAsignatura.objects.create(asignatura=asignatura, profesor_id=profesor_id)
+        with transaction.atomic():
+            asignatura = super().update(instance, validated_data)
+            if profesores_ids is not None:
+                # Solo cambian (y se notifican) los profesores agregados o quitados
+                sincronizar_profesores(asignatura, profesores_ids)
         return asignatura
     
     def get_carrera_nombre(self, obj):
         """Retorna el nombre de la primera carrera asociada"""
-        plan = obj.planes_carrera.select_related('carrera').first()
+        plan = self._plan_principal(obj)
         return plan.carrera.nombre if plan else None
     
     def get_carrera_facultad(self, obj):
         """Retorna el nombre de la facultad de la primera carrera asociada"""
-        plan = obj.planes_carrera.select_related('carrera__facultad').first()
+        plan = self._plan_principal(obj)
         return plan.carrera.facultad.nombre if plan and plan.carrera.facultad else None
     
     def get_carrera_id(self, obj):
         """Retorna el ID de la primera carrera asociada"""
-        plan = obj.planes_carrera.select_related('carrera').first()
-        return plan.carrera.id if plan else None
+        plan = self._plan_principal(obj)
+        return plan.carrera_id if plan else None
     
     def get_prerrequisitos_nombres(self, obj):
         """Retorna nombres y códigos de los prerrequisitos"""
@@ -136,9 +180,27 @@ class AsignaturaSerializer(serializers.ModelSerializer):
     
     def get_semestre(self, obj):
         """Retorna el semestre de la primera carrera asociada"""
-        plan = obj.planes_carrera.first()
+        plan = self._plan_principal(obj)
         return plan.semestre if plan else None
     
+    def validate_prerrequisitos(self, value):
+        """Rechaza prerrequisitos que cerrarían un ciclo (con el grafo en caché del periodo)"""
+        if self.instance is None or not value:
+            # Una asignatura nueva todavía no es prerrequisito de nadie
+            return value
+        from applications.academico.services.prerrequisitos import grafo_periodo
+
+        grafo = grafo_periodo(self.instance.periodo_academico_id)
+        ciclo = grafo.crearia_ciclo(self.instance.id, [p.id for p in value])
+        if ciclo == [self.instance.id]:
+            raise serializers.ValidationError("Una asignatura no puede ser prerrequisito de sí misma.")
+        if ciclo:
+            codigos = ', '.join(grafo.nodos[i][0] or str(i) for i in ciclo)
+            raise serializers.ValidationError(
+                f"Crearía un ciclo de prerrequisitos: {codigos} ya requiere(n) esta asignatura."
+            )
+        return value
+
     def validate_codigo(self, value):
         """Validar que el código sea único"""
         # Si estamos editando, excluir la asignatura actual
@@ -195,3 +257,37 @@ class PlanCarreraAsignaturaSerializer(serializers.ModelSerializer):
             'semestre', 'es_obligatoria', 'creditos_override', 'fecha_creacion'
         ]
         read_only_fields = ['id', 'fecha_creacion']
+
+
+class ImportacionAsignaturasSerializer(serializers.ModelSerializer):
+    periodo_nombre = serializers.CharField(source='periodo.nombre', read_only=True)
+    usuario_username = serializers.CharField(source='usuario.username', read_only=True, default=None)
+    progreso = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ImportacionAsignaturas
+        fields = [
+            'id', 'usuario', 'usuario_username', 'periodo', 'periodo_nombre', 'nombre_archivo', 'sha256',
+            'dry_run', 'estado', 'error', 'total_filas', 'filas_procesadas', 'validas', 'invalidas',
+            'creadas', 'progreso', 'fecha_creacion', 'fecha_inicio', 'fecha_fin'
+        ]
+        read_only_fields = fields
+
+    def get_progreso(self, obj):
+        """Porcentaje: validación de filas y, si no es dry_run, creación de las válidas."""
+        if obj.estado == 'completada':
+            return 100
+        if not obj.total_filas:
+            return 0
+        validacion = obj.filas_procesadas / obj.total_filas
+        if obj.dry_run:
+            return min(99, int(100 * validacion))
+        creacion = obj.creadas / obj.validas if obj.validas else 0
+        return min(99, int(50 * validacion + 50 * creacion))
+
+
+class FilaImportacionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = FilaImportacion
+        fields = ['id', 'fila', 'codigo', 'datos', 'errores', 'advertencias', 'valida', 'creada']
+        read_only_fields = fields
@@ -1,16 +1,18 @@
 """
 ViewSets para modelos académicos
 """
-from rest_framework import viewsets, filters, status
+import json
+
+from rest_framework import mixins, viewsets, filters, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db import transaction
+from django.db import IntegrityError
 from django.db.models import Q
-import pandas as pd
-import io
+from django.http import StreamingHttpResponse
+from rest_framework.pagination import PageNumberPagination
 from applications.academico.models import (
     Facultad,
     Asignatura,
@@ -18,7 +20,10 @@ from applications.academico.models import (
     PlanCarreraAsignatura,
     ProfesorAsignatura,
     PeriodoAcademico,
+    ImportacionAsignaturas,
 )
+from applications.academico.services.facultades import asignaturas_de_facultad
+from applications.academico.services.periodos import activar_periodo, desactivar_periodo, obtener_periodo, periodos
 from applications.usuarios.tasks import send_asignatura_assignment_email, send_asignatura_desactivacion_email
 from applications.usuarios.api.permissions import TienePermiso
 from .serializers import (
@@ -28,6 +33,8 @@ from .serializers import (
     PlanCarreraAsignaturaSerializer,
     ProfesorAsignaturaSerializer,
     PeriodoAcademicoSerializer,
+    ImportacionAsignaturasSerializer,
+    FilaImportacionSerializer,
 )
 from .permissions import (
     FacultadPermission,
@@ -97,6 +104,14 @@ class PeriodoAcademicoViewSet(viewsets.ModelViewSet):
     search_fields = ['nombre', 'descripcion']
     ordering = ['-fecha_inicio']
 
+    def list(self, request, *args, **kwargs):
+        # Sin búsqueda ni orden explícito la lista sale del catálogo en caché
+        if request.query_params.keys() - {'page'}:
+            return super().list(request, *args, **kwargs)
+        page = self.paginate_queryset(periodos())
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
     @action(detail=True, methods=['post'], url_path='activar')
     def activar(self, request, pk=None):
         """
@@ -108,10 +123,7 @@ class PeriodoAcademicoViewSet(viewsets.ModelViewSet):
         if not (user.is_superuser or 'super_admin' in roles or 'admin' in roles or 'coordinador' in roles):
             return Response({'detail': 'No tiene permisos para activar periodos.'}, status=status.HTTP_403_FORBIDDEN)
 
-        PeriodoAcademico.objects.update(activo=False)
-        periodo = self.get_object()
-        periodo.activo = True
-        periodo.save()
+        periodo = activar_periodo(self.get_object())
         return Response({'detail': f'Periodo {periodo.nombre} activado.'})
 
     @action(detail=True, methods=['post'], url_path='desactivar')
@@ -124,9 +136,7 @@ class PeriodoAcademicoViewSet(viewsets.ModelViewSet):
         if not (user.is_superuser or 'super_admin' in roles or 'admin' in roles or 'coordinador' in roles):
             return Response({'detail': 'No tiene permisos para desactivar periodos.'}, status=status.HTTP_403_FORBIDDEN)
 
-        periodo = self.get_object()
-        periodo.activo = False
-        periodo.save()
+        periodo = desactivar_periodo(self.get_object())
         return Response({'detail': f'Periodo {periodo.nombre} desactivado.'})
 
 
@@ -147,16 +157,15 @@ class AsignaturaViewSet(viewsets.ModelViewSet):
         'list': 'ver_asignaturas',
         'retrieve': 'ver_asignaturas',
         'importar': 'crear_asignatura',
+        'grafo': 'ver_asignaturas',
     }
     
     def get_queryset(self):
         """
-        Optimiza queries con select_related para evitar N+1 queries
+        Precarga todo lo que lee AsignaturaSerializer (consultas constantes por página).
         Filtra asignaturas según el rol del usuario. Para estudiantes, solo muestra asignaturas activas de su carrera.
         """
-        queryset = Asignatura.objects.select_related(
-            'periodo_academico'
-        ).prefetch_related('carreras__facultad')
+        queryset = AsignaturaSerializer.preparar_queryset(Asignatura.objects.all())
 
         user = self.request.user
 
@@ -177,13 +186,13 @@ class AsignaturaViewSet(viewsets.ModelViewSet):
         # Coordinador solo ve asignaturas de carreras de su facultad
         if 'coordinador' in user_roles:
             if user.facultad:
-                return queryset.filter(carreras__facultad=user.facultad).distinct()
+                return queryset.filter(id__in=asignaturas_de_facultad(user.facultad))
             return Asignatura.objects.none()
 
         # Admin ve asignaturas de su facultad
         if 'admin' in user_roles:
             if user.facultad:
-                return queryset.filter(carreras__facultad=user.facultad).distinct()
+                return queryset.filter(id__in=asignaturas_de_facultad(user.facultad))
             return Asignatura.objects.none()
 
         # Profesor/Docente solo ve SUS asignaturas (por tabla intermedia)
@@ -202,15 +211,80 @@ class AsignaturaViewSet(viewsets.ModelViewSet):
     
 
     # Métodos de email eliminados porque la asignación de profesores ahora es solo por ProfesorAsignatura
+
+    @action(detail=False, methods=['get'])
+    def grafo(self, request):
+        """
+        Grafo de prerrequisitos del periodo (en caché) limitado a las asignaturas visibles.
+        Parámetros:
+        - periodo_id: ID del periodo académico (opcional, usa el activo si no se especifica)
+        - carrera_id: agrega el orden curricular (topológico) del plan de esa carrera
+        - asignatura_id: agrega sus prerrequisitos y dependientes transitivos
+        """
+        from applications.academico.services.prerrequisitos import grafo_periodo
+
+        periodo_id = request.query_params.get('periodo_id')
+        periodo = obtener_periodo(periodo_id)
+        if not periodo:
+            return Response(
+                {'error': 'Periodo académico no encontrado. Especifique periodo_id'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        grafo = grafo_periodo(periodo.id)
+        visibles = set(self.get_queryset().filter(periodo_academico_id=periodo.id).values_list('id', flat=True))
+        aristas = [
+            [origen, destino]
+            for origen, destinos in grafo.prerrequisitos.items() if origen in visibles
+            for destino in destinos
+        ]
+        ids = visibles | {destino for _, destino in aristas}
+
+        def codigos(asignatura_ids):
+            return [grafo.nodos[i][0] for i in sorted(asignatura_ids, key=lambda i: grafo.nodos[i][0] or '')]
+
+        data = {
+            'periodo': {'id': periodo.id, 'nombre': periodo.nombre},
+            'nodos': [
+                {'id': i, 'codigo': grafo.nodos[i][0], 'nombre': grafo.nodos[i][1]}
+                for i in sorted(ids, key=lambda i: grafo.nodos[i][0] or '')
+            ],
+            'aristas': aristas,
+            'ciclos': [codigos(c) for c in grafo.ciclos() if visibles.intersection(c)],
+        }
+
+        asignatura_id = request.query_params.get('asignatura_id')
+        if asignatura_id:
+            if not asignatura_id.isdigit() or int(asignatura_id) not in visibles:
+                return Response({'error': 'Asignatura no encontrada en el periodo'}, status=status.HTTP_404_NOT_FOUND)
+            asignatura_id = int(asignatura_id)
+            data['asignatura'] = {
+                'id': asignatura_id,
+                'codigo': grafo.nodos[asignatura_id][0],
+                'prerrequisitos_transitivos': codigos(grafo.prerrequisitos_transitivos(asignatura_id)),
+                'dependientes_transitivos': codigos(grafo.dependientes_transitivos(asignatura_id) & visibles),
+            }
+
+        carrera_id = request.query_params.get('carrera_id')
+        if carrera_id:
+            if not carrera_id.isdigit():
+                return Response({'error': 'carrera_id inválido'}, status=status.HTTP_400_BAD_REQUEST)
+            data['orden_curricular'] = [
+                a for a in grafo.orden_curricular(int(carrera_id)) if a['id'] in visibles
+            ]
+
+        return Response(data)
     
     @action(detail=False, methods=['post'], parser_classes=[MultiPartParser, FormParser])
     def importar(self, request):
         """
-        Importa asignaturas desde archivo CSV/XLSX
+        Importa asignaturas desde archivo CSV/XLSX/XLS
         Parámetros:
-        - archivo: archivo CSV o XLSX
+        - archivo: archivo CSV, XLSX o XLS
         - dry_run: boolean (default True) - si es True solo valida, si es False crea las asignaturas
         - periodo_id: ID del periodo académico (opcional, usa el activo si no se especifica)
+        - asincrono: boolean (default False) - si es True responde 202 con una importación
+          que se procesa en segundo plano (ver /api/importaciones-asignaturas/{id}/)
         
         Columnas esperadas del archivo:
         - Carrera: nombre exacto de la carrera
@@ -222,6 +296,7 @@ class AsignaturaViewSet(viewsets.ModelViewSet):
         """
         archivo = request.FILES.get('archivo')
         dry_run = request.data.get('dry_run', 'true').lower() == 'true'
+        asincrono = request.data.get('asincrono', 'false').lower() == 'true'
         periodo_id = request.data.get('periodo_id')
         
         if not archivo:
@@ -231,283 +306,53 @@ class AsignaturaViewSet(viewsets.ModelViewSet):
             )
         
         # Determinar periodo académico
+        periodo = obtener_periodo(periodo_id)
         if periodo_id:
-            try:
-                periodo = PeriodoAcademico.objects.get(id=periodo_id)
-            except PeriodoAcademico.DoesNotExist:
+            if not periodo:
                 return Response(
                     {'error': f'Periodo académico con ID {periodo_id} no existe'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
         else:
             # Usar el periodo activo
-            periodo = PeriodoAcademico.objects.filter(activo=True).first()
             if not periodo:
                 return Response(
                     {'error': 'No hay periodo académico activo. Especifique periodo_id'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
-        
-        # Leer archivo
+        # El catálogo devuelve valores inmutables; las asignaturas e importaciones necesitan la instancia
+        periodo = PeriodoAcademico.objects.get(pk=periodo.id)
+
+        if asincrono:
+            from applications.academico.services.trabajos_importacion import crear_importacion
+
+            importacion, creada = crear_importacion(
+                archivo=archivo, periodo=periodo, usuario=request.user, dry_run=dry_run
+            )
+            data = ImportacionAsignaturasSerializer(importacion).data
+            data['url'] = request.build_absolute_uri(f'/api/importaciones-asignaturas/{importacion.pk}/')
+            data['duplicada'] = not creada
+            return Response(data, status=status.HTTP_202_ACCEPTED if creada else status.HTTP_200_OK)
+
+        from applications.academico.services.importacion import (
+            ArchivoInvalido,
+            importar_asignaturas,
+            leer_archivo,
+            mapear_columnas,
+        )
+
         try:
-            file_ext = archivo.name.split('.')[-1].lower()
-            if file_ext == 'csv':
-                df = pd.read_csv(io.BytesIO(archivo.read()))
-            elif file_ext in ['xlsx', 'xls']:
-                df = pd.read_excel(io.BytesIO(archivo.read()))
-            else:
-                return Response(
-                    {'error': 'Formato de archivo no soportado. Use CSV o XLSX'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-        except Exception as e:
+            with leer_archivo(archivo.name, archivo) as tabla:
+                columnas_mapa = mapear_columnas(tabla.columnas)
+                resultados = importar_asignaturas(tabla, columnas_mapa, periodo, dry_run=dry_run)
+        except ArchivoInvalido as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
             return Response(
-                {'error': f'Error al leer archivo: {str(e)}'},
-                status=status.HTTP_400_BAD_REQUEST
+                {'error': 'Otro proceso creó asignaturas con los mismos códigos durante la importación; vuelva a intentarlo'},
+                status=status.HTTP_409_CONFLICT
             )
-        
-        # Normalizar nombres de columnas (remover tildes, espacios, convertir a minúsculas)
-        import unicodedata
-        def normalizar(texto):
-            texto = str(texto).strip().lower()
-            texto = unicodedata.normalize('NFD', texto)
-            texto = ''.join(c for c in texto if unicodedata.category(c) != 'Mn')
-            return texto.replace(' ', '_')
-        
-        # Crear mapeo de columnas normalizadas
-        columnas_originales = list(df.columns)
-        columnas_normalizadas = {normalizar(col): col for col in columnas_originales}
-        
-        # Validar columnas requeridas (buscar variantes)
-        columnas_requeridas = {
-            'carrera': ['Carrera', 'carrera', 'CARRERA'],
-            'semestre': ['Semestre', 'semestre', 'SEMESTRE', 'Sem', 'sem'],
-            'materia': ['Materia', 'materia', 'MATERIA', 'Nombre', 'nombre'],
-            'creditos': ['Créditos', 'Creditos', 'creditos', 'CREDITOS', 'Créd'],
-            'codigo': ['Código', 'Codigo', 'codigo', 'CODIGO', 'Código Materia', 'Codigo Materia']
-        }
-        
-        # Mapeo final de columnas encontradas
-        columnas_mapa = {}
-        errores_columnas = []
-        
-        for clave, variantes in columnas_requeridas.items():
-            encontrada = None
-            for variante in variantes:
-                if variante in df.columns:
-                    encontrada = variante
-                    break
-            if encontrada:
-                columnas_mapa[clave] = encontrada
-            else:
-                errores_columnas.append(clave)
-        
-        if errores_columnas:
-            return Response(
-                {'error': f'Columnas faltantes: {", ".join(errores_columnas)}. Columnas disponibles: {", ".join(df.columns)}'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Verificación adicional: asegurar que todas las claves requeridas están en el mapeo
-        claves_requeridas = ['carrera', 'semestre', 'materia', 'creditos', 'codigo']
-        for clave in claves_requeridas:
-            if clave not in columnas_mapa:
-                return Response(
-                    {'error': f'Error interno: columna {clave} no mapeada correctamente'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-        
-        # Procesar filas
-        resultados = {
-            'total': len(df),
-            'validas': 0,
-            'invalidas': 0,
-            'creadas': 0,
-            'filas': []
-        }
-        
-        # Guardar índices originales para reportes de error
-        df['_fila_original'] = df.index + 2  # +2 porque Excel empieza en 1 y tiene header
-        
-        # Ordenar por semestre para que prerrequisitos se creen en orden correcto
-        try:
-            df = df.sort_values(by=columnas_mapa['semestre'], ascending=True)
-        except Exception:
-            pass  # Si no puede ordenar, continúa sin ordenar
-        
-        # Sin cache - búsqueda flexible en cada fila
-        for idx, row in df.iterrows():
-            # Limpiar NaN values de pandas para que sean JSON serializable
-            row_dict = row.to_dict()
-            row_dict_limpio = {k: (None if pd.isna(v) else v) for k, v in row_dict.items()}
-            
-            fila_resultado = {
-                'fila': int(row['_fila_original']),  # Usar fila original del Excel
-                'datos': row_dict_limpio,
-                'errores': [],
-                'advertencias': [],
-                'creada': False
-            }
-            
-            # Inicializar variables
-            carrera = None
-            codigo_asignatura = None
-            semestre = None
-            creditos = None
-            
-            # Validar carrera (búsqueda flexible: case-insensitive)
-            try:
-                nombre_carrera = str(row[columnas_mapa['carrera']]).strip()
-            except (KeyError, IndexError, TypeError):
-                fila_resultado['errores'].append('Error al leer columna Carrera')
-                nombre_carrera = ''
-            
-            if not nombre_carrera or nombre_carrera == 'nan':
-                fila_resultado['errores'].append('Carrera no puede estar vacía')
-            else:
-                carrera = Carrera.objects.filter(nombre__iexact=nombre_carrera).first()
-                if not carrera:
-                    fila_resultado['errores'].append(f'Carrera "{nombre_carrera}" no existe')
-            
-            # Validar código (requerido y debe ser único)
-            try:
-                codigo_asignatura = str(row[columnas_mapa['codigo']]).strip()
-            except (KeyError, IndexError):
-                fila_resultado['errores'].append('Error al leer columna Código')
-                codigo_asignatura = None
-            
-            if codigo_asignatura and codigo_asignatura != 'nan':
-                if Asignatura.objects.filter(codigo=codigo_asignatura).exists():
-                    fila_resultado['errores'].append(f'Código "{codigo_asignatura}" ya existe')
-            else:
-                fila_resultado['errores'].append('Código no puede estar vacío')
-            
-            # Validar semestre
-            semestre = None
-            try:
-                val_semestre = str(row[columnas_mapa['semestre']]).strip()
-                if val_semestre and val_semestre != 'nan':
-                    semestre = int(float(val_semestre))
-                    if semestre < 1 or semestre > 12:
-                        fila_resultado['errores'].append('Semestre debe estar entre 1 y 12')
-                        semestre = None
-                else:
-                    fila_resultado['errores'].append('Semestre no puede estar vacío')
-            except (ValueError, TypeError, KeyError, IndexError) as e:
-                fila_resultado['errores'].append(f'Semestre debe ser un número entero')
-                semestre = None
-            
-            # Validar créditos
-            creditos = None
-            try:
-                val_creditos = str(row[columnas_mapa['creditos']]).strip()
-                if val_creditos and val_creditos != 'nan':
-                    creditos = int(float(val_creditos))
-                    if creditos < 1:
-                        fila_resultado['errores'].append('Créditos debe ser mayor a 0')
-                        creditos = None
-                else:
-                    fila_resultado['errores'].append('Créditos no puede estar vacío')
-            except (ValueError, TypeError, KeyError, IndexError) as e:
-                fila_resultado['errores'].append(f'Créditos debe ser un número entero')
-                creditos = None
-            
-            # Nombre de asignatura
-            nombre_materia = None
-            try:
-                nombre_materia = str(row[columnas_mapa['materia']]).strip()
-            except (KeyError, IndexError, TypeError):
-                fila_resultado['errores'].append('Error al leer columna Materia')
-                nombre_materia = None
-            
-            if not nombre_materia or nombre_materia == 'nan':
-                fila_resultado['errores'].append('Materia no puede estar vacía')
-            
-            # Descripción (opcional) - buscar en cualquier variante de nombre
-            descripcion = ''
-            for col_name in df.columns:
-                if col_name.lower() in ['descripción', 'descripcion', 'descripció']:
-                    descripcion = str(row[col_name]).strip()
-                    break
-            if descripcion == 'nan':
-                descripcion = ''
-            
-            # Prerrequisitos (opcional) - solo advertencia, no bloquea creación
-            # buscar en cualquier variante de nombre
-            prerrequisitos_str = ''
-            for col_name in df.columns:
-                if col_name.lower() in ['prerrequisitos', 'prerrequisito', 'prerequisitos', 'prerequisito']:
-                    prerrequisitos_str = str(row[col_name]).strip()
-                    break
-            prerrequisitos = []
-            advertencias = []
-            # Ignorar valores vacíos, nan, guiones (-, —, –), etc.
-            if prerrequisitos_str and prerrequisitos_str not in ['nan', '', '-', '—', '–', 'N/A', 'n/a']:
-                codigos_prereq = [c.strip() for c in prerrequisitos_str.split(',') if c.strip() and c.strip() not in ['-', '—', '–']]
-                if codigos_prereq:  # Solo validar si hay códigos reales
-                    prereq_existentes = Asignatura.objects.filter(codigo__in=codigos_prereq)
-                    codigos_encontrados = set(prereq_existentes.values_list('codigo', flat=True))
-                    codigos_no_encontrados = [c for c in codigos_prereq if c not in codigos_encontrados]
-                    if codigos_no_encontrados:
-                        # Solo advertencia, no error
-                        advertencias.append(
-                            f'Prerrequisitos no encontrados (se omitirán): {", ".join(codigos_no_encontrados)}'
-                        )
-                    prerrequisitos = list(prereq_existentes)
-            
-            # Agregar advertencias al resultado pero no como errores bloqueantes
-            if advertencias:
-                fila_resultado['advertencias'] = advertencias
-            
-            # El código viene del Excel, NO se genera
-            # (validación de unicidad ya hecha arriba)
-            
-            # Si hay errores, marcar como inválida
-            if fila_resultado['errores']:
-                resultados['invalidas'] += 1
-            else:
-                # Validar que todos los datos necesarios estén presentes
-                if not carrera or not semestre or not creditos or not nombre_materia or not codigo_asignatura:
-                    fila_resultado['errores'].append('Faltan datos requeridos (carrera, semestre, créditos, código o nombre)')
-                    resultados['invalidas'] += 1
-                else:
-                    resultados['validas'] += 1
-                    fila_resultado['codigo_usado'] = codigo_asignatura
-                    
-                    # Si no es dry_run, crear la asignatura
-                    if not dry_run:
-                        try:
-                            with transaction.atomic():
-                                asignatura = Asignatura.objects.create(
-                                    nombre=nombre_materia,
-                                    codigo=codigo_asignatura,
-                                    descripcion=descripcion,
-                                    creditos=creditos,
-                                    estado=True,
-                                    periodo_academico=periodo
-                                )
-                                
-                                # Crear relación con carrera en PlanCarreraAsignatura
-                                PlanCarreraAsignatura.objects.create(
-                                    carrera=carrera,
-                                    asignatura=asignatura,
-                                    semestre=semestre,
-                                    es_obligatoria=True
-                                )
-                                
-                                # Enlazar prerrequisitos si existen
-                                if prerrequisitos:
-                                    asignatura.prerrequisitos.set(prerrequisitos)
-                                
-                                fila_resultado['creada'] = True
-                                resultados['creadas'] += 1
-                        except Exception as e:
-                            fila_resultado['errores'].append(f'Error al crear: {str(e)}')
-                            resultados['invalidas'] += 1
-                            resultados['validas'] -= 1
-            
-            resultados['filas'].append(fila_resultado)
-        
+
         resultados['modo'] = 'validación' if dry_run else 'creación'
         resultados['periodo'] = {
             'id': periodo.id,
@@ -517,6 +362,67 @@ class AsignaturaViewSet(viewsets.ModelViewSet):
         return Response(resultados, status=status.HTTP_200_OK)
 
 
+class FilaImportacionPagination(PageNumberPagination):
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class ImportacionAsignaturasViewSet(mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Importaciones asíncronas de asignaturas.
+
+    - GET /api/importaciones-asignaturas/{id}/          estado y progreso (para sondeo)
+    - GET /api/importaciones-asignaturas/{id}/filas/    resultado por fila, paginado (?con_errores=true)
+    - GET /api/importaciones-asignaturas/{id}/errores/  filas con errores o advertencias en NDJSON
+    """
+    serializer_class = ImportacionAsignaturasSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        user_roles = []
+        if hasattr(user, 'roles') and user.roles.exists():
+            user_roles = [r.tipo for r in user.roles.all()]
+        elif hasattr(user, 'rol'):
+            user_roles = [user.rol]
+
+        if getattr(user, 'is_superuser', False) and 'super_admin' not in user_roles:
+            user_roles.append('super_admin')
+
+        queryset = ImportacionAsignaturas.objects.select_related('periodo', 'usuario')
+        if 'super_admin' in user_roles:
+            return queryset
+        return queryset.filter(usuario=user)
+
+    def retrieve(self, request, *args, **kwargs):
+        importacion = self.get_object()
+        headers = {'Retry-After': '2'} if importacion.estado in ('pendiente', 'procesando') else {}
+        return Response(self.get_serializer(importacion).data, headers=headers)
+
+    @action(detail=True, methods=['get'], pagination_class=FilaImportacionPagination)
+    def filas(self, request, pk=None):
+        filas = self.get_object().filas.order_by('id')
+        if request.query_params.get('con_errores', 'false').lower() == 'true':
+            filas = filas.filter(valida=False)
+        page = self.paginate_queryset(filas)
+        return self.get_paginated_response(FilaImportacionSerializer(page, many=True).data)
+
+    @action(detail=True, methods=['get'])
+    def errores(self, request, pk=None):
+        """Una línea JSON por fila con errores o advertencias, sin cargar el reporte completo en memoria."""
+        importacion = self.get_object()
+        filas = (
+            importacion.filas.filter(Q(valida=False) | ~Q(advertencias=[]))
+            .order_by('id')
+            .values('fila', 'codigo', 'errores', 'advertencias')
+        )
+        lineas = (json.dumps(f, ensure_ascii=False) + '\n' for f in filas.iterator(chunk_size=2000))
+        response = StreamingHttpResponse(lineas, content_type='application/x-ndjson')
+        response['Content-Disposition'] = f'attachment; filename="importacion_{importacion.pk}_errores.ndjson"'
+        return response
+
+
 class ProfesorAsignaturaViewSet(viewsets.ModelViewSet):
     """ViewSet para gestionar relación Profesor-Asignatura"""
     queryset = ProfesorAsignatura.objects.all()
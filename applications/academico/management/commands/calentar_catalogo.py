@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from applications.academico.services import catalogo
+
+
+class Command(BaseCommand):
+    help = (
+        'Precarga en la caché compartida el catálogo académico (facultades, carreras y planes de '
+        'carrera) para que los workers no consulten la base de datos tras un despliegue o una '
+        'limpieza de caché. Con --estadisticas muestra además los aciertos de lectura.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--estadisticas', action='store_true', help='Leer el catálogo y mostrar la tasa de aciertos')
+
+    def handle(self, *args, **options):
+        inicio = time.perf_counter()
+        cargado = catalogo.calentar()
+        segundos = time.perf_counter() - inicio
+        self.stdout.write(self.style.SUCCESS(
+            f"Catálogo v{catalogo.version_catalogo()} precargado en {segundos * 1000:.0f} ms: "
+            f"{cargado['facultades']} facultades, {cargado['carreras']} carreras, "
+            f"{cargado['planes']} filas de plan ({cargado['claves']} claves)."
+        ))
+
+        if options['estadisticas']:
+            # Una pasada de lectura como la de las peticiones: debe resolverse sin consultas
+            catalogo.reiniciar_estadisticas()
+            for carrera in catalogo.carreras().values():
+                catalogo.facultad(carrera.facultad_id)
+                catalogo.plan_carrera(carrera.id)
+            for clave, valor in catalogo.estadisticas().items():
+                self.stdout.write(f'  {clave:<22} {valor}')
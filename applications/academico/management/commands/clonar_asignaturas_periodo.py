@@ -1,15 +1,27 @@
 from django.core.management.base import BaseCommand, CommandError
-from applications.academico.models import Asignatura, PeriodoAcademico, PlanCarreraAsignatura
-from django.db import transaction
+
+from applications.academico.models import PeriodoAcademico
+from applications.academico.services.clonacion import TAMANO_LOTE, clonar_periodo
+
 
 class Command(BaseCommand):
-    help = 'Clona todas las asignaturas y relaciones de un periodo académico origen a uno destino.'
+    help = (
+        'Clona las asignaturas de un periodo académico origen a uno destino, con sus planes de '
+        'carrera y prerrequisitos (remapeados a las copias) y, opcionalmente, profesores asignados '
+        'y tareas como plantilla. Los códigos clonados llevan un sufijo porque son únicos.'
+    )
 
     def add_arguments(self, parser):
         parser.add_argument('origen', type=str, help='Nombre del periodo académico origen (ej: 2025-I)')
         parser.add_argument('destino', type=str, help='Nombre del periodo académico destino (ej: 2026-I)')
+        parser.add_argument('--sufijo', type=str, help='Sufijo de los códigos clonados (por defecto "-<destino>")')
+        parser.add_argument('--profesores', action='store_true', help='Copiar profesores asignados (sin correos)')
+        parser.add_argument('--tareas', action='store_true', help='Copiar tareas como borrador con fechas corridas')
+        parser.add_argument('--solo-activas', action='store_true', help='Solo asignaturas activas del origen')
+        parser.add_argument('--dry-run', action='store_true', help='Mostrar lo que se copiaría sin escribir')
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help='Filas por INSERT')
+        parser.add_argument('--detalle', action='store_true', help='Listar los códigos nuevos y reutilizados')
 
-    @transaction.atomic
     def handle(self, *args, **options):
         nombre_origen = options['origen']
         nombre_destino = options['destino']
@@ -19,34 +31,37 @@ class Command(BaseCommand):
         except PeriodoAcademico.DoesNotExist:
             raise CommandError('Uno de los periodos no existe.')
 
-        asignaturas_origen = Asignatura.objects.filter(periodo_academico=periodo_origen)
-        if not asignaturas_origen.exists():
-            self.stdout.write(self.style.WARNING('No hay asignaturas en el periodo origen.'))
-            return
-
-        # Clonar asignaturas y relaciones
-        for asignatura in asignaturas_origen:
-            # Buscar si ya existe una asignatura con el mismo código y periodo destino
-            nueva, created = Asignatura.objects.get_or_create(
-                codigo=asignatura.codigo,
-                periodo_academico=periodo_destino,
-                defaults={
-                    'nombre': asignatura.nombre,
-                    'descripcion': asignatura.descripcion,
-                    'creditos': asignatura.creditos,
-                    'estado': asignatura.estado,
-                }
+        sufijo = options['sufijo'] or '-' + ''.join(nombre_destino.split())
+        try:
+            resultado = clonar_periodo(
+                periodo_origen, periodo_destino, sufijo=sufijo,
+                profesores=options['profesores'], tareas=options['tareas'],
+                solo_activas=options['solo_activas'], dry_run=options['dry_run'],
+                tamano_lote=options['lote'],
             )
-            # Clonar relaciones con carreras (PlanCarreraAsignatura)
-            planes = PlanCarreraAsignatura.objects.filter(asignatura=asignatura)
-            for plan in planes:
-                PlanCarreraAsignatura.objects.get_or_create(
-                    carrera=plan.carrera,
-                    asignatura=nueva,
-                    defaults={
-                        'semestre': plan.semestre,
-                        'es_obligatoria': plan.es_obligatoria,
-                        'creditos_override': plan.creditos_override,
-                    }
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run: no se escribió nada.'))
+        verbo = 'por copiar' if options['dry_run'] else 'copiadas'
+        self.stdout.write(f'Filas {verbo}:')
+        for tabla in ('asignaturas', 'planes', 'prerrequisitos', 'profesores', 'tareas'):
+            if tabla in resultado.segundos:
+                self.stdout.write(
+                    f'  {tabla:<16} {getattr(resultado, tabla):>7}  ({resultado.segundos[tabla] * 1000:.0f} ms)'
                 )
-        self.stdout.write(self.style.SUCCESS('Asignaturas y relaciones clonadas correctamente de %s a %s.' % (nombre_origen, nombre_destino)))
+        self.stdout.write(
+            f'Asignaturas ya clonadas en {nombre_destino}: {len(resultado.existentes)} '
+            f'(se completan sus planes y prerrequisitos)'
+        )
+        if options['detalle']:
+            for codigo in resultado.nuevas:
+                self.stdout.write(f'  + {codigo}')
+            for codigo in resultado.existentes:
+                self.stdout.write(f'  = {codigo}')
+        for conflicto in resultado.conflictos:
+            self.stdout.write(self.style.WARNING(f'  omitida {conflicto}'))
+        self.stdout.write(self.style.SUCCESS(
+            f'Clonación de {nombre_origen} a {nombre_destino} en {resultado.segundos["total"]:.2f} s.'
+        ))
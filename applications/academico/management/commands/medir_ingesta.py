@@ -0,0 +1,102 @@
+import csv
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from openpyxl import Workbook
+
+from applications.academico.services.importacion import leer_archivo, mapear_columnas, validar_asignaturas
+from applications.reportes.services.ingesta import abrir_tabla
+
+
+ENCABEZADOS = ['Carrera', 'Semestre', 'Materia', 'Créditos', 'Código', 'Descripción', 'Prerrequisitos']
+
+
+def _filas(n):
+    for i in range(n):
+        yield [
+            'Sistemas', 1 + i % 10, f'Materia de prueba {i}', 3, f'BM{i}',
+            f'Descripción de la materia {i}', f'BM{i - 7}' if i >= 7 else '',
+        ]
+
+
+def _generar(formato, n, directorio):
+    ruta = os.path.join(directorio, f'asignaturas.{formato}')
+    if formato == 'csv':
+        with open(ruta, 'w', newline='', encoding='utf-8') as f:
+            escritor = csv.writer(f)
+            escritor.writerow(ENCABEZADOS)
+            escritor.writerows(_filas(n))
+    else:
+        libro = Workbook(write_only=True)
+        hoja = libro.create_sheet()
+        hoja.append(ENCABEZADOS)
+        for fila in _filas(n):
+            hoja.append(fila)
+        libro.save(ruta)
+    return ruta
+
+
+def _medir(funcion):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        resultado = funcion()
+    finally:
+        segundos = time.perf_counter() - inicio
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return resultado, pico / (1024 * 1024), segundos
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide memoria pico (tracemalloc) y tiempo de lectura de un archivo de asignaturas '
+        'generado: carga completa con pandas frente a la ingesta en streaming y la validación '
+        'de la importación (solo lectura, no crea asignaturas).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--filas', type=int, default=100_000)
+        parser.add_argument('--formato', choices=['csv', 'xlsx', 'ambos'], default='ambos')
+
+    def handle(self, *args, **options):
+        formatos = ['csv', 'xlsx'] if options['formato'] == 'ambos' else [options['formato']]
+        with tempfile.TemporaryDirectory() as directorio:
+            for formato in formatos:
+                ruta = _generar(formato, options['filas'], directorio)
+                tamano = os.path.getsize(ruta) / (1024 * 1024)
+                self.stdout.write(f"\n{formato.upper()}: {options['filas']} filas, {tamano:.1f} MB")
+                for nombre, funcion in self._casos(formato, ruta):
+                    filas, pico, segundos = _medir(funcion)
+                    self.stdout.write(f'  {nombre:<34} {filas:>8} filas  pico {pico:8.1f} MB  {segundos:6.2f} s')
+
+    def _casos(self, formato, ruta):
+        def pandas_completo():
+            # Lo que hacía el endpoint: bytes en memoria + DataFrame + dicts por fila
+            import pandas as pd
+
+            with open(ruta, 'rb') as f:
+                contenido = io.BytesIO(f.read())
+            df = pd.read_csv(contenido) if formato == 'csv' else pd.read_excel(contenido)
+            return len(df.astype(object).where(df.notna(), None).to_dict('records'))
+
+        def streaming():
+            with open(ruta, 'rb') as f, abrir_tabla(ruta, f) as tabla:
+                return sum(1 for _ in tabla)
+
+        def validacion():
+            with open(ruta, 'rb') as f, leer_archivo(ruta, f) as tabla:
+                return validar_asignaturas(tabla, mapear_columnas(tabla.columnas)).total
+
+        try:
+            import pandas  # noqa: F401
+        except ImportError:
+            self.stdout.write(self.style.WARNING('  pandas no está instalado: se omite la referencia'))
+        else:
+            yield 'pandas (archivo completo)', pandas_completo
+        yield 'ingesta en streaming', streaming
+        yield 'validación de la importación', validacion
@@ -0,0 +1,130 @@
+import random
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from applications.academico.models import Asignatura, Carrera, Facultad, PeriodoAcademico, PlanCarreraAsignatura
+from applications.academico.services.prerrequisitos import GrafoPrerrequisitos, grafo_periodo, invalidar_grafo
+
+
+class _Deshacer(Exception):
+    pass
+
+
+def _medir(funcion):
+    consultas = 0
+
+    def contar(execute, sql, params, many, context):
+        nonlocal consultas
+        consultas += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(contar):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        segundos = time.perf_counter() - inicio
+    return resultado, segundos, consultas
+
+
+class Command(BaseCommand):
+    help = (
+        'Mide el grafo de prerrequisitos sobre un plan generado (por defecto 5000 asignaturas): '
+        'carga, caché, cierre transitivo, ciclos y orden curricular frente a recorrer el M2M '
+        'consulta por consulta. Los datos se crean en una transacción que se revierte al final.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--asignaturas', type=int, default=5000)
+        parser.add_argument('--prerrequisitos', type=int, default=3, help='Máximo de prerrequisitos por asignatura')
+        parser.add_argument('--muestra', type=int, default=20, help='Asignaturas para el recorrido consulta por consulta')
+        parser.add_argument('--semilla', type=int, default=1)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._medir_todo(options)
+                raise _Deshacer
+        except _Deshacer:
+            pass
+
+    def _crear_datos(self, n, max_prereqs, semilla):
+        azar = random.Random(semilla)
+        periodo = PeriodoAcademico.objects.create(
+            nombre='Benchmark prerrequisitos', fecha_inicio=date(2000, 1, 1), fecha_fin=date(2000, 6, 30)
+        )
+        facultad = Facultad.objects.create(nombre='Benchmark', codigo='BENCH-PRQ')
+        carrera = Carrera.objects.create(
+            nombre='Benchmark', codigo='BENCH-PRQ', facultad=facultad, nivel='pregrado', modalidad='presencial'
+        )
+        asignaturas = Asignatura.objects.bulk_create(
+            [Asignatura(nombre=f'Asignatura {i}', codigo=f'BPRQ{i:06d}', periodo_academico=periodo, creditos=3)
+             for i in range(n)],
+            batch_size=1000,
+        )
+        if any(a.id is None for a in asignaturas):
+            asignaturas = list(Asignatura.objects.filter(periodo_academico=periodo).order_by('codigo'))
+        ids = [a.id for a in asignaturas]
+        PlanCarreraAsignatura.objects.bulk_create(
+            [PlanCarreraAsignatura(carrera=carrera, asignatura_id=a_id, semestre=1 + i * 10 // n)
+             for i, a_id in enumerate(ids)],
+            batch_size=1000,
+        )
+        # DAG: cada asignatura requiere hasta `max_prereqs` de las anteriores cercanas
+        Prerrequisito = Asignatura.prerrequisitos.through
+        aristas = [
+            Prerrequisito(from_asignatura_id=ids[i], to_asignatura_id=ids[j])
+            for i in range(1, n)
+            for j in azar.sample(range(max(0, i - 200), i), min(i, azar.randint(0, max_prereqs), 200))
+        ]
+        Prerrequisito.objects.bulk_create(aristas, batch_size=1000)
+        return periodo, carrera, ids, len(aristas)
+
+    def _fila(self, nombre, segundos, consultas, detalle=''):
+        self.stdout.write(f'  {nombre:<44} {segundos * 1000:10.1f} ms  {consultas:>6} consultas  {detalle}')
+
+    def _medir_todo(self, options):
+        n = options['asignaturas']
+        periodo, carrera, ids, total_aristas = self._crear_datos(n, options['prerrequisitos'], options['semilla'])
+        self.stdout.write(f'{n} asignaturas, {total_aristas} prerrequisitos\n')
+
+        muestra = ids[-options['muestra']:]
+
+        def recorrido_m2m():
+            total = 0
+            for a_id in muestra:
+                vistos, pila = set(), [a_id]
+                while pila:
+                    for p in Asignatura.objects.get(pk=pila.pop()).prerrequisitos.values_list('id', flat=True):
+                        if p not in vistos:
+                            vistos.add(p)
+                            pila.append(p)
+                total += len(vistos)
+            return total
+
+        total_m2m, segundos, consultas = _medir(recorrido_m2m)
+        self._fila(f'cierre M2M consulta a consulta ({len(muestra)})', segundos, consultas, f'{total_m2m} alcanzables')
+
+        grafo, segundos, consultas = _medir(lambda: GrafoPrerrequisitos.cargar(periodo.id))
+        self._fila('carga del grafo (sin caché)', segundos, consultas)
+
+        invalidar_grafo()
+        _, segundos, consultas = _medir(lambda: grafo_periodo(periodo.id))
+        self._fila('grafo_periodo (llena la caché)', segundos, consultas)
+        grafo, segundos, consultas = _medir(lambda: grafo_periodo(periodo.id))
+        self._fila('grafo_periodo (desde caché)', segundos, consultas)
+
+        total_grafo, segundos, consultas = _medir(
+            lambda: sum(len(grafo.prerrequisitos_transitivos(a)) for a in muestra)
+        )
+        self._fila(f'cierre con el grafo ({len(muestra)})', segundos, consultas, f'{total_grafo} alcanzables')
+        _, segundos, consultas = _medir(lambda: sum(len(grafo.prerrequisitos_transitivos(a)) for a in ids))
+        self._fila(f'cierre con el grafo (todas, {n})', segundos, consultas)
+
+        ciclos, segundos, consultas = _medir(grafo.ciclos)
+        self._fila('detección de ciclos (Tarjan)', segundos, consultas, f'{len(ciclos)} ciclos')
+        _, segundos, consultas = _medir(lambda: [grafo.crearia_ciclo(ids[0], [a]) for a in muestra])
+        self._fila(f'validación de escritura ({len(muestra)})', segundos, consultas)
+        orden, segundos, consultas = _medir(lambda: grafo.orden_curricular(carrera.id))
+        self._fila('orden curricular de la carrera', segundos, consultas, f'{len(orden)} asignaturas')
@@ -1,15 +1,29 @@
 from django.core.management.base import BaseCommand, CommandError
-from applications.academico.models import Asignatura, PeriodoAcademico
-from django.db import transaction
+
+from applications.academico.models import Carrera, Facultad, PeriodoAcademico
+from applications.academico.services.movimiento import TAMANO_LOTE, mover_periodo
+
 
 class Command(BaseCommand):
-    help = 'Mueve todas las asignaturas activas de un periodo origen a un periodo destino (actualiza el campo periodo_academico)'
+    help = (
+        'Mueve las asignaturas activas de un periodo origen a un periodo destino (actualiza el campo '
+        'periodo_academico) con UPDATE por lotes, junto con sus matrículas y solicitudes pendientes '
+        'y, opcionalmente, las fechas de sus tareas y recordatorios.'
+    )
 
     def add_arguments(self, parser):
         parser.add_argument('origen', type=str, help='Nombre del periodo académico origen (ej: 2025-I)')
         parser.add_argument('destino', type=str, help='Nombre del periodo académico destino (ej: 2026-I)')
+        parser.add_argument('--carrera', type=str, help='Código de carrera: solo sus asignaturas')
+        parser.add_argument('--facultad', type=str, help='Código de facultad: solo asignaturas de sus carreras')
+        parser.add_argument('--incluir-inactivas', action='store_true', help='Mover también las asignaturas inactivas')
+        parser.add_argument(
+            '--desplazar-fechas', action='store_true',
+            help='Correr tareas y recordatorios pendientes la diferencia entre los inicios de periodo',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Contar las filas afectadas sin escribir')
+        parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help='Asignaturas por transacción')
 
-    @transaction.atomic
     def handle(self, *args, **options):
         nombre_origen = options['origen']
         nombre_destino = options['destino']
@@ -19,14 +33,44 @@ class Command(BaseCommand):
         except PeriodoAcademico.DoesNotExist:
             raise CommandError('Uno de los periodos no existe.')
 
-        asignaturas = Asignatura.objects.filter(periodo_academico=periodo_origen, estado=True)
-        if not asignaturas.exists():
+        filtros = {}
+        try:
+            if options['carrera']:
+                filtros['carrera'] = Carrera.objects.get(codigo=options['carrera'])
+            if options['facultad']:
+                filtros['facultad'] = Facultad.objects.get(codigo=options['facultad'])
+        except (Carrera.DoesNotExist, Facultad.DoesNotExist):
+            raise CommandError('La carrera o facultad indicada no existe.')
+
+        try:
+            resultado = mover_periodo(
+                periodo_origen, periodo_destino, **filtros,
+                incluir_inactivas=options['incluir_inactivas'],
+                desplazar_fechas=options['desplazar_fechas'],
+                dry_run=options['dry_run'], tamano_lote=options['lote'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if not resultado.asignaturas:
             self.stdout.write(self.style.WARNING('No hay asignaturas activas en el periodo origen.'))
             return
 
-        count = 0
-        for asignatura in asignaturas:
-            asignatura.periodo_academico = periodo_destino
-            asignatura.save()
-            count += 1
-        self.stdout.write(self.style.SUCCESS(f'{count} asignaturas movidas de {nombre_origen} a {nombre_destino}.'))
\ No newline at end of file
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run: no se escribió nada.'))
+        self.stdout.write(f'{resultado.lotes} lotes (selección {resultado.segundos["seleccion"] * 1000:.0f} ms)')
+        for fase in ('asignaturas', 'matriculas', 'solicitudes', 'tareas', 'recordatorios'):
+            if fase in resultado.segundos:
+                self.stdout.write(
+                    f'  {fase:<14} {getattr(resultado, fase):>7} filas  ({resultado.segundos[fase] * 1000:.0f} ms)'
+                )
+        if resultado.matriculas_omitidas:
+            self.stdout.write(self.style.WARNING(
+                f'  {resultado.matriculas_omitidas} matrículas quedan en {nombre_origen}: '
+                f'el estudiante ya tiene la asignatura matriculada en {nombre_destino}'
+            ))
+        verbo = 'se moverían' if options['dry_run'] else 'movidas'
+        self.stdout.write(self.style.SUCCESS(
+            f'{resultado.asignaturas} asignaturas {verbo} de {nombre_origen} a {nombre_destino} '
+            f'en {resultado.segundos["total"]:.2f} s.'
+        ))
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def poblar_facultades(apps, schema_editor):
+    PlanCarreraAsignatura = apps.get_model('academico', 'PlanCarreraAsignatura')
+    AsignaturaFacultad = apps.get_model('academico', 'AsignaturaFacultad')
+    pares = PlanCarreraAsignatura.objects.values_list('asignatura_id', 'carrera__facultad_id').distinct()
+    AsignaturaFacultad.objects.bulk_create(
+        [AsignaturaFacultad(asignatura_id=a, facultad_id=f) for a, f in pares],
+        batch_size=2000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0009_asignatura_prerrequisitos'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AsignaturaFacultad',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('asignatura', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facultades_alcance', to='academico.asignatura')),
+                ('facultad', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='asignaturas_alcance', to='academico.facultad')),
+            ],
+            options={
+                'verbose_name': 'Asignatura-Facultad',
+                'verbose_name_plural': 'Asignaturas-Facultades',
+                'constraints': [models.UniqueConstraint(fields=('facultad', 'asignatura'), name='uniq_facultad_asignatura')],
+            },
+        ),
+        migrations.RunPython(poblar_facultades, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:28
+
+import django.core.serializers.json
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0010_asignatura_facultad'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportacionAsignaturas',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('archivo', models.FileField(upload_to='importaciones/asignaturas/')),
+                ('nombre_archivo', models.CharField(max_length=255)),
+                ('sha256', models.CharField(help_text='Hash del contenido (deduplica reimportaciones)', max_length=64)),
+                ('dry_run', models.BooleanField(default=True)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('completada', 'Completada'), ('fallida', 'Fallida')], default='pendiente', max_length=20)),
+                ('error', models.TextField(blank=True, default='')),
+                ('total_filas', models.PositiveIntegerField(default=0)),
+                ('filas_procesadas', models.PositiveIntegerField(default=0)),
+                ('validas', models.PositiveIntegerField(default=0)),
+                ('invalidas', models.PositiveIntegerField(default=0)),
+                ('creadas', models.PositiveIntegerField(default=0)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_inicio', models.DateTimeField(blank=True, null=True)),
+                ('fecha_fin', models.DateTimeField(blank=True, null=True)),
+                ('periodo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='importaciones_asignaturas', to='academico.periodoacademico')),
+                ('usuario', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='importaciones_asignaturas', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Importación de asignaturas',
+                'verbose_name_plural': 'Importaciones de asignaturas',
+                'ordering': ['-fecha_creacion'],
+            },
+        ),
+        migrations.CreateModel(
+            name='FilaImportacion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('fila', models.PositiveIntegerField(help_text='Número de fila en el archivo (1 = encabezado)')),
+                ('codigo', models.CharField(blank=True, default='', max_length=20)),
+                ('datos', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('errores', models.JSONField(default=list)),
+                ('advertencias', models.JSONField(default=list)),
+                ('valida', models.BooleanField(default=False)),
+                ('creada', models.BooleanField(default=False)),
+                ('importacion', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='filas', to='academico.importacionasignaturas')),
+            ],
+            options={
+                'verbose_name': 'Fila de importación',
+                'verbose_name_plural': 'Filas de importación',
+                'ordering': ['importacion', 'id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importacionasignaturas',
+            constraint=models.UniqueConstraint(condition=models.Q(('estado', 'fallida'), _negated=True), fields=('sha256', 'periodo', 'dry_run'), name='uniq_importacion_asignaturas_contenido'),
+        ),
+        migrations.AddIndex(
+            model_name='filaimportacion',
+            index=models.Index(fields=['importacion', 'valida', 'id'], name='fila_importacion_valida_idx'),
+        ),
+    ]
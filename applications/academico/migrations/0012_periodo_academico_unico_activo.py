@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+def dejar_un_periodo_activo(apps, schema_editor):
+    # Si hay varios activos se conserva el más reciente (el que ya devolvía `.first()`)
+    PeriodoAcademico = apps.get_model('academico', 'PeriodoAcademico')
+    activo = PeriodoAcademico.objects.filter(activo=True).order_by('-fecha_inicio').first()
+    if activo:
+        PeriodoAcademico.objects.filter(activo=True).exclude(pk=activo.pk).update(activo=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0011_importacion_asignaturas'),
+    ]
+
+    operations = [
+        migrations.RunPython(dejar_un_periodo_activo, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='periodoacademico',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(('activo', True)),
+                fields=('activo',),
+                name='periodo_academico_unico_activo',
+            ),
+        ),
+    ]
@@ -1,7 +1,10 @@
 """
 Modelos académicos
 """
-from django.db import models
+import uuid
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 from django.conf import settings
 
 
@@ -16,15 +19,32 @@ class PeriodoAcademico(models.Model):
     fecha_fin = models.DateField()
     activo = models.BooleanField(default=False)
     fecha_creacion = models.DateTimeField(auto_now_add=True)
-    
+
     class Meta:
         verbose_name = 'Período Académico'
         verbose_name_plural = 'Períodos Académicos'
         ordering = ['-fecha_inicio']
-    
+        constraints = [
+            models.UniqueConstraint(
+                fields=['activo'],
+                condition=models.Q(activo=True),
+                name='periodo_academico_unico_activo',
+            ),
+        ]
+
     def __str__(self):
         return self.nombre
 
+    def save(self, *args, **kwargs):
+        if not self.activo:
+            return super().save(*args, **kwargs)
+        # Un solo periodo activo: se bloquean los periodos (son pocas filas) para que dos
+        # activaciones concurrentes no choquen con la restricción única
+        with transaction.atomic():
+            list(PeriodoAcademico.objects.select_for_update().order_by('pk').values_list('pk', flat=True))
+            PeriodoAcademico.objects.filter(activo=True).exclude(pk=self.pk).update(activo=False)
+            super().save(*args, **kwargs)
+
 
 class Facultad(models.Model):
     nombre = models.CharField(max_length=150)
@@ -154,6 +174,36 @@ class PlanCarreraAsignatura(models.Model):
         return f"{self.carrera.codigo} → {self.asignatura.codigo} (sem {self.semestre or '-'} )"
 
 
+class AsignaturaFacultad(models.Model):
+    """
+    Facultades de una asignatura (las de las carreras en cuyo plan está), desnormalizado para
+    que los filtros por alcance de coordinadores/admins sean un solo predicado indexado en vez
+    del join asignatura → PlanCarreraAsignatura → Carrera con `.distinct()`.
+    Lo mantienen las señales de academico y el comando `reconstruir_facultades`.
+    """
+    asignatura = models.ForeignKey(
+        Asignatura,
+        on_delete=models.CASCADE,
+        related_name='facultades_alcance'
+    )
+    facultad = models.ForeignKey(
+        Facultad,
+        on_delete=models.CASCADE,
+        related_name='asignaturas_alcance'
+    )
+
+    class Meta:
+        verbose_name = 'Asignatura-Facultad'
+        verbose_name_plural = 'Asignaturas-Facultades'
+        constraints = [
+            # (facultad, asignatura): el índice único resuelve "asignaturas de la facultad X" sin leer la tabla
+            models.UniqueConstraint(fields=['facultad', 'asignatura'], name='uniq_facultad_asignatura'),
+        ]
+
+    def __str__(self):
+        return f"{self.facultad_id} → {self.asignatura_id}"
+
+
 class ProfesorAsignatura(models.Model):
     """Tabla intermedia para relación N-to-N entre Profesor y Asignatura"""
     profesor = models.ForeignKey(
@@ -176,3 +226,79 @@ class ProfesorAsignatura(models.Model):
     
     def __str__(self):
         return f"{self.profesor.username} → {self.asignatura.codigo}"
+
+
+class ImportacionAsignaturas(models.Model):
+    """
+    Importación asíncrona de un archivo de asignaturas (POST /api/asignaturas/importar/ con
+    asincrono=true). Un worker Celery valida el archivo, guarda el resultado de cada fila
+    (FilaImportacion) y crea las asignaturas por bloques, actualizando los contadores.
+    """
+    ESTADO_CHOICES = (
+        ('pendiente', 'Pendiente'),
+        ('procesando', 'Procesando'),
+        ('completada', 'Completada'),
+        ('fallida', 'Fallida'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    usuario = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='importaciones_asignaturas'
+    )
+    periodo = models.ForeignKey(PeriodoAcademico, on_delete=models.CASCADE, related_name='importaciones_asignaturas')
+    archivo = models.FileField(upload_to='importaciones/asignaturas/')
+    nombre_archivo = models.CharField(max_length=255)
+    sha256 = models.CharField(max_length=64, help_text='Hash del contenido (deduplica reimportaciones)')
+    dry_run = models.BooleanField(default=True)
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='pendiente')
+    error = models.TextField(blank=True, default='')
+    total_filas = models.PositiveIntegerField(default=0)
+    filas_procesadas = models.PositiveIntegerField(default=0)
+    validas = models.PositiveIntegerField(default=0)
+    invalidas = models.PositiveIntegerField(default=0)
+    creadas = models.PositiveIntegerField(default=0)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_inicio = models.DateTimeField(null=True, blank=True)
+    fecha_fin = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Importación de asignaturas'
+        verbose_name_plural = 'Importaciones de asignaturas'
+        ordering = ['-fecha_creacion']
+        constraints = [
+            # El mismo archivo para el mismo periodo y modo se procesa una sola vez (salvo si falló)
+            models.UniqueConstraint(
+                fields=['sha256', 'periodo', 'dry_run'],
+                condition=~models.Q(estado='fallida'),
+                name='uniq_importacion_asignaturas_contenido',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.nombre_archivo} ({self.estado})"
+
+
+class FilaImportacion(models.Model):
+    """Resultado de una fila de una ImportacionAsignaturas (para el listado paginado y el reporte)."""
+    importacion = models.ForeignKey(ImportacionAsignaturas, on_delete=models.CASCADE, related_name='filas')
+    fila = models.PositiveIntegerField(help_text='Número de fila en el archivo (1 = encabezado)')
+    codigo = models.CharField(max_length=20, blank=True, default='')
+    datos = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    errores = models.JSONField(default=list)
+    advertencias = models.JSONField(default=list)
+    valida = models.BooleanField(default=False)
+    creada = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name = 'Fila de importación'
+        verbose_name_plural = 'Filas de importación'
+        ordering = ['importacion', 'id']
+        indexes = [
+            models.Index(fields=['importacion', 'valida', 'id'], name='fila_importacion_valida_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.importacion_id} fila {self.fila}"
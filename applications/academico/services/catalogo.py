@@ -0,0 +1,272 @@
+"""
+Catálogo académico en caché: facultades, carreras y planes de carrera.
+
+Cambian unas pocas veces por ciclo pero se leen en casi cada petición (nombres en
+serializers, filtros por carrera/facultad, importaciones). Se sirven desde dos niveles:
+
+1. un LRU en memoria del proceso (sin red ni SQL), con caducidad por entrada de `LRU_TTL`;
+2. la caché compartida de settings.CACHES (Redis, común a la web y a los workers Celery),
+   de la que se llena el LRU;
+
+y solo ante un fallo en ambos se consulta la base de datos. Las claves llevan el número de
+versión del catálogo; las señales de academico lo incrementan en la caché compartida al
+escribir cualquiera de estos modelos. Cada proceso relee la versión como mucho cada
+`VERSION_LOCAL_TTL` segundos (el que escribe la ve de inmediato), así que una carrera nueva
+aparece en `carreras_por_nombre()` de los demás workers en ese plazo. `LRU_TTL` acota lo
+que puede durar una copia local si la versión no avanza (p. ej. si la caché compartida se
+vació y el contador volvió a empezar en una versión que el LRU ya tenía).
+
+Los valores son dataclasses inmutables con los campos que usan los lectores, no instancias
+de modelo.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+from applications.academico.models import Carrera, Facultad, PlanCarreraAsignatura
+
+
+CACHE_TTL = 6 * 60 * 60
+CLAVE_VERSION = 'academico:catalogo:version'
+LRU_MAX = 512
+LRU_TTL = 60.0
+VERSION_LOCAL_TTL = 1.0
+
+_FALTA = object()
+
+
+@dataclass(frozen=True)
+class FacultadCatalogo:
+    id: int
+    nombre: str
+    codigo: str | None
+    estado: bool
+    coordinador_id: int | None
+
+
+@dataclass(frozen=True)
+class CarreraCatalogo:
+    id: int
+    nombre: str
+    codigo: str
+    facultad_id: int
+    nivel: str
+    modalidad: str
+    estado: bool
+
+
+@dataclass(frozen=True)
+class PlanCatalogo:
+    asignatura_id: int
+    semestre: int | None
+    es_obligatoria: bool
+    creditos_override: int | None
+
+
+class _LRU:
+    def __init__(self, maximo: int, ttl: float):
+        self.maximo = maximo
+        self.ttl = ttl
+        self._datos: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clave):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                return _FALTA
+            if time.monotonic() >= entrada[0]:
+                del self._datos[clave]
+                return _FALTA
+            self._datos.move_to_end(clave)
+            return entrada[1]
+
+    def set(self, clave, valor) -> None:
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + self.ttl, valor)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maximo:
+                self._datos.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._datos.clear()
+
+    def __len__(self):
+        return len(self._datos)
+
+
+_lru = _LRU(LRU_MAX, LRU_TTL)
+_version_local: dict = {}
+_contadores: Counter = Counter()
+
+
+def version_catalogo() -> int:
+    ahora = time.monotonic()
+    if _version_local and ahora - _version_local['leida'] < VERSION_LOCAL_TTL:
+        return _version_local['version']
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        cache.add(CLAVE_VERSION, 1, None)
+        version = cache.get(CLAVE_VERSION, 1)
+    _version_local.update(version=version, leida=ahora)
+    return version
+
+
+def invalidar_catalogo() -> None:
+    _lru.clear()
+    _version_local.clear()
+    try:
+        cache.incr(CLAVE_VERSION)
+    except ValueError:
+        cache.add(CLAVE_VERSION, 1, None)
+
+
+def _clave(nombre: str, version: int) -> str:
+    return f'academico:catalogo:v{version}:{nombre}'
+
+
+def _obtener(nombre: str, cargar):
+    clave = _clave(nombre, version_catalogo())
+    valor = _lru.get(clave)
+    if valor is not _FALTA:
+        _contadores['local'] += 1
+        return valor
+    valor = cache.get(clave, _FALTA)
+    if valor is _FALTA:
+        _contadores['bd'] += 1
+        valor = cargar()
+        cache.set(clave, valor, CACHE_TTL)
+    else:
+        _contadores['compartida'] += 1
+    _lru.set(clave, valor)
+    return valor
+
+
+def _id(valor) -> int | None:
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+# --- Cargas desde la base de datos ---
+
+def _cargar_facultades() -> dict[int, FacultadCatalogo]:
+    return {
+        f['id']: FacultadCatalogo(**f)
+        for f in Facultad.objects.order_by('nombre', 'id').values('id', 'nombre', 'codigo', 'estado', 'coordinador_id')
+    }
+
+
+def _cargar_carreras() -> dict[int, CarreraCatalogo]:
+    return {
+        c['id']: CarreraCatalogo(**c)
+        for c in Carrera.objects.order_by('nombre', 'id').values(
+            'id', 'nombre', 'codigo', 'facultad_id', 'nivel', 'modalidad', 'estado'
+        )
+    }
+
+
+def _planes(filtro) -> dict[int, list[PlanCatalogo]]:
+    por_carrera: dict[int, list[PlanCatalogo]] = {}
+    for carrera_id, asignatura_id, semestre, obligatoria, override in (
+        PlanCarreraAsignatura.objects.filter(**filtro).order_by('carrera_id', 'semestre', 'asignatura_id')
+        .values_list('carrera_id', 'asignatura_id', 'semestre', 'es_obligatoria', 'creditos_override')
+    ):
+        por_carrera.setdefault(carrera_id, []).append(PlanCatalogo(asignatura_id, semestre, obligatoria, override))
+    return por_carrera
+
+
+# --- Lecturas ---
+
+def facultades() -> dict[int, FacultadCatalogo]:
+    """Todas las facultades por id (en orden de nombre)."""
+    return _obtener('facultades', _cargar_facultades)
+
+
+def carreras() -> dict[int, CarreraCatalogo]:
+    """Todas las carreras por id (en orden de nombre)."""
+    return _obtener('carreras', _cargar_carreras)
+
+
+def facultad(facultad_id) -> FacultadCatalogo | None:
+    return facultades().get(_id(facultad_id))
+
+
+def carrera(carrera_id) -> CarreraCatalogo | None:
+    return carreras().get(_id(carrera_id))
+
+
+def _indice_nombres(por_id: dict[int, CarreraCatalogo]) -> dict[str, CarreraCatalogo]:
+    indice: dict[str, CarreraCatalogo] = {}
+    for c in por_id.values():
+        indice.setdefault(c.nombre.strip().casefold(), c)
+    return indice
+
+
+def carreras_por_nombre() -> dict[str, CarreraCatalogo]:
+    """Nombre normalizado (strip + casefold) -> carrera; ante nombres repetidos, la primera por nombre e id."""
+    return _obtener('carreras_por_nombre', lambda: _indice_nombres(carreras()))
+
+
+def plan_carrera(carrera_id) -> tuple[PlanCatalogo, ...]:
+    """Asignaturas del plan de la carrera (todos los periodos), por semestre."""
+    carrera_id = _id(carrera_id)
+    if carrera_id is None:
+        return ()
+    return _obtener(
+        f'plan:{carrera_id}',
+        lambda: tuple(_planes({'carrera_id': carrera_id}).get(carrera_id, ())),
+    )
+
+
+def calentar() -> dict[str, int]:
+    """
+    Carga el catálogo completo en la caché compartida y en el LRU de este proceso
+    (los planes de todas las carreras con una sola consulta).
+    """
+    version = version_catalogo()
+    datos = {
+        'facultades': _cargar_facultades(),
+        'carreras': _cargar_carreras(),
+    }
+    datos['carreras_por_nombre'] = _indice_nombres(datos['carreras'])
+    planes = _planes({})
+    for carrera_id in datos['carreras']:
+        datos[f'plan:{carrera_id}'] = tuple(planes.get(carrera_id, ()))
+
+    cache.set_many({_clave(nombre, version): valor for nombre, valor in datos.items()}, CACHE_TTL)
+    for nombre, valor in datos.items():
+        _lru.set(_clave(nombre, version), valor)
+    return {
+        'facultades': len(datos['facultades']),
+        'carreras': len(datos['carreras']),
+        'planes': sum(len(p) for p in planes.values()),
+        'claves': len(datos),
+    }
+
+
+def estadisticas() -> dict:
+    """Aciertos y fallos de este proceso desde que arrancó (o desde `reiniciar_estadisticas`)."""
+    local, compartida, bd = _contadores['local'], _contadores['compartida'], _contadores['bd']
+    total = local + compartida + bd
+    return {
+        'lecturas': total,
+        'aciertos_local': local,
+        'aciertos_compartida': compartida,
+        'fallos': bd,
+        'tasa_aciertos': round((local + compartida) / total, 4) if total else None,
+        'tasa_aciertos_local': round(local / total, 4) if total else None,
+        'entradas_lru': len(_lru),
+        'version': version_catalogo(),
+    }
+
+
+def reiniciar_estadisticas() -> None:
+    _contadores.clear()
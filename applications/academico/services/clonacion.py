@@ -0,0 +1,268 @@
+"""
+Clonación masiva de un periodo académico (asignaturas, planes, prerrequisitos y,
+opcionalmente, asignaciones de profesores y tareas como plantilla).
+
+Cada tabla se lee con una consulta y se escribe con `bulk_create` por lotes; los ids
+nuevos se resuelven con tablas de remapeo origen -> destino, así las aristas de
+prerrequisitos apuntan a las copias del periodo destino. Es idempotente: lo que ya existe
+en el destino (mismo código clonado, mismo plan, misma arista...) se reutiliza, por lo que
+una segunda ejecución solo completa lo que falte. Con dry_run se calcula el mismo diff sin
+escribir (las asignaturas por crear reciben ids provisionales negativos).
+
+`Asignatura.codigo` es único en toda la tabla, así que la copia usa `codigo + sufijo`.
+"""
+from __future__ import annotations
+
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Lower
+
+from applications.academico.models import Asignatura, PlanCarreraAsignatura, ProfesorAsignatura
+from applications.academico.services.facultades import sincronizar_facultades_asignaturas
+from applications.academico.signals import asignaturas_modificadas
+
+
+TAMANO_LOTE = 1000
+LARGO_CODIGO = Asignatura._meta.get_field('codigo').max_length
+
+
+@dataclass
+class ResultadoClonacion:
+    """Filas copiadas (o por copiar en dry_run) por tabla y diferencias encontradas."""
+    dry_run: bool
+    asignaturas: int = 0
+    planes: int = 0
+    prerrequisitos: int = 0
+    profesores: int = 0
+    tareas: int = 0
+    nuevas: list[str] = field(default_factory=list)
+    existentes: list[str] = field(default_factory=list)
+    conflictos: list[str] = field(default_factory=list)
+    segundos: dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def codigo_clonado(codigo: str, sufijo: str) -> str | None:
+    """Código de la copia, o None si no cabe en el campo."""
+    nuevo = f'{codigo}{sufijo}'
+    return nuevo if len(nuevo) <= LARGO_CODIGO else None
+
+
+class _Clonador:
+    def __init__(self, origen, destino, *, sufijo, solo_activas, dry_run, tamano_lote):
+        self.origen, self.destino = origen, destino
+        self.sufijo = sufijo
+        self.solo_activas = solo_activas
+        self.dry_run = dry_run
+        self.tamano_lote = tamano_lote
+        self.resultado = ResultadoClonacion(dry_run=dry_run)
+        self.mapa: dict[int, int] = {}      # asignatura origen -> asignatura destino
+        self.creadas: list[int] = []
+
+    def _fase(self, nombre, funcion):
+        inicio = time.perf_counter()
+        funcion()
+        self.resultado.segundos[nombre] = round(time.perf_counter() - inicio, 3)
+
+    def _insertar(self, modelo, objetos, **kwargs):
+        if objetos and not self.dry_run:
+            return modelo.objects.bulk_create(objetos, batch_size=self.tamano_lote, **kwargs)
+        return objetos
+
+    def asignaturas(self):
+        origen = Asignatura.objects.filter(periodo_academico=self.origen)
+        if self.solo_activas:
+            origen = origen.filter(estado=True)
+        filas = list(origen.order_by('codigo').values('id', 'codigo', 'nombre', 'descripcion', 'creditos', 'estado'))
+
+        codigos = {f['id']: codigo_clonado(f['codigo'] or '', self.sufijo) for f in filas}
+        ocupados = {
+            codigo: (a_id, periodo_id)
+            for codigo, a_id, periodo_id in Asignatura.objects.filter(
+                codigo__in=[c for c in codigos.values() if c]
+            ).values_list('codigo', 'id', 'periodo_academico_id')
+        }
+
+        por_crear = []
+        for f in filas:
+            nuevo = codigos[f['id']]
+            if nuevo is None:
+                self.resultado.conflictos.append(f"{f['codigo']}: el código con sufijo supera {LARGO_CODIGO} caracteres")
+            elif nuevo in ocupados and ocupados[nuevo][1] != self.destino.id:
+                self.resultado.conflictos.append(f"{f['codigo']}: {nuevo} ya existe en otro periodo")
+            elif nuevo in ocupados:
+                self.mapa[f['id']] = ocupados[nuevo][0]
+                self.resultado.existentes.append(nuevo)
+            else:
+                por_crear.append((f, nuevo))
+
+        nuevas = self._insertar(Asignatura, [
+            Asignatura(
+                codigo=nuevo, nombre=f['nombre'], descripcion=f['descripcion'], creditos=f['creditos'],
+                estado=f['estado'], periodo_academico=self.destino,
+            )
+            for f, nuevo in por_crear
+        ])
+        if self.dry_run:
+            ids = {nuevo: -(i + 1) for i, (_, nuevo) in enumerate(por_crear)}
+        else:
+            ids = {a.codigo: a.id for a in nuevas}
+            if any(i is None for i in ids.values()):
+                # Backends sin RETURNING en bulk_create
+                ids = dict(Asignatura.objects.filter(codigo__in=ids.keys()).values_list('codigo', 'id'))
+        for f, nuevo in por_crear:
+            self.mapa[f['id']] = ids[nuevo]
+        self.creadas = list(ids.values())
+        self.resultado.nuevas = [nuevo for _, nuevo in por_crear]
+        self.resultado.asignaturas = len(por_crear)
+
+    def planes(self):
+        existentes = set(
+            PlanCarreraAsignatura.objects.filter(asignatura_id__in=self.mapa.values())
+            .values_list('carrera_id', 'asignatura_id')
+        )
+        nuevos = [
+            PlanCarreraAsignatura(
+                carrera_id=p['carrera_id'], asignatura_id=self.mapa[p['asignatura_id']], semestre=p['semestre'],
+                es_obligatoria=p['es_obligatoria'], creditos_override=p['creditos_override'],
+            )
+            for p in PlanCarreraAsignatura.objects.filter(asignatura_id__in=self.mapa.keys()).values(
+                'carrera_id', 'asignatura_id', 'semestre', 'es_obligatoria', 'creditos_override'
+            )
+            if (p['carrera_id'], self.mapa[p['asignatura_id']]) not in existentes
+        ]
+        self._insertar(PlanCarreraAsignatura, nuevos, ignore_conflicts=True)
+        self.resultado.planes = len(nuevos)
+
+    def prerrequisitos(self):
+        Prerrequisito = Asignatura.prerrequisitos.through
+        existentes = set(
+            Prerrequisito.objects.filter(from_asignatura_id__in=self.mapa.values())
+            .values_list('from_asignatura_id', 'to_asignatura_id')
+        )
+        aristas = set()
+        for desde, hacia in Prerrequisito.objects.filter(from_asignatura_id__in=self.mapa.keys()).values_list(
+            'from_asignatura_id', 'to_asignatura_id'
+        ):
+            # Prerrequisitos del mismo periodo apuntan a su copia; los de otros periodos se conservan
+            arista = (self.mapa[desde], self.mapa.get(hacia, hacia))
+            if arista not in existentes:
+                aristas.add(arista)
+        self._insertar(
+            Prerrequisito,
+            [Prerrequisito(from_asignatura_id=d, to_asignatura_id=h) for d, h in sorted(aristas)],
+            ignore_conflicts=True,
+        )
+        self.resultado.prerrequisitos = len(aristas)
+
+    def profesores(self):
+        existentes = set(
+            ProfesorAsignatura.objects.filter(asignatura_id__in=self.mapa.values())
+            .values_list('profesor_id', 'asignatura_id')
+        )
+        nuevos = [
+            ProfesorAsignatura(profesor_id=profesor_id, asignatura_id=self.mapa[asignatura_id])
+            for profesor_id, asignatura_id in ProfesorAsignatura.objects.filter(
+                asignatura_id__in=self.mapa.keys()
+            ).values_list('profesor_id', 'asignatura_id')
+            if (profesor_id, self.mapa[asignatura_id]) not in existentes
+        ]
+        self._insertar(ProfesorAsignatura, nuevos, ignore_conflicts=True)
+        self.resultado.profesores = len(nuevos)
+
+    def tareas(self):
+        """Tareas como plantilla: en borrador, con fechas corridas al inicio del periodo destino."""
+        from applications.evaluaciones.models import ContenidoArchivo, Tarea
+        from applications.evaluaciones.storage import AlmacenamientoDeduplicado
+
+        desfase = self.destino.fecha_inicio - self.origen.fecha_inicio
+        existentes = set(
+            Tarea.objects.filter(asignatura_id__in=self.mapa.values())
+            .values_list('asignatura_id', Lower('titulo'))
+        )
+        campos = (
+            'asignatura_id', 'titulo', 'descripcion', 'tipo_tarea', 'peso_porcentual',
+            'fecha_publicacion', 'fecha_vencimiento', 'permite_entrega_tardia', 'archivo_adjunto',
+        )
+        nuevas = []
+        for t in Tarea.objects.filter(asignatura_id__in=self.mapa.keys()).order_by('id').values(*campos):
+            asignatura_id = self.mapa[t['asignatura_id']]
+            clave = (asignatura_id, t['titulo'].lower())
+            if clave in existentes:
+                continue
+            existentes.add(clave)
+            nuevas.append(Tarea(**{
+                **t,
+                'asignatura_id': asignatura_id,
+                'fecha_publicacion': t['fecha_publicacion'] + desfase,
+                'fecha_vencimiento': t['fecha_vencimiento'] + desfase,
+                'estado': 'borrador',
+            }))
+        self._insertar(Tarea, nuevas)
+        self.resultado.tareas = len(nuevas)
+
+        # Los adjuntos deduplicados se comparten: cada copia suma una referencia al blob.
+        # Los adjuntos anteriores al almacenamiento deduplicado nunca se borran del storage,
+        # así que la copia puede apuntar al mismo archivo.
+        blobs = Counter(t.archivo_adjunto.name for t in nuevas if AlmacenamientoDeduplicado.es_blob(t.archivo_adjunto.name))
+        if not self.dry_run:
+            for veces, rutas in _agrupar_por_valor(blobs).items():
+                ContenidoArchivo.objects.filter(ruta__in=rutas).update(referencias=F('referencias') + veces)
+
+    def ejecutar(self, *, profesores: bool, tareas: bool) -> ResultadoClonacion:
+        inicio = time.perf_counter()
+        with transaction.atomic():
+            self._fase('asignaturas', self.asignaturas)
+            self._fase('planes', self.planes)
+            self._fase('prerrequisitos', self.prerrequisitos)
+            if profesores:
+                self._fase('profesores', self.profesores)
+            if tareas:
+                self._fase('tareas', self.tareas)
+            if not self.dry_run and self.creadas:
+                # bulk_create no dispara señales: alcance por facultad y cachés
+                creadas = list(self.creadas)
+                sincronizar_facultades_asignaturas(creadas)
+                transaction.on_commit(
+                    lambda: asignaturas_modificadas.send(sender=Asignatura, asignatura_ids=creadas)
+                )
+        self.resultado.segundos['total'] = round(time.perf_counter() - inicio, 3)
+        return self.resultado
+
+
+def _agrupar_por_valor(conteo: Counter) -> dict[int, list]:
+    grupos: dict[int, list] = {}
+    for clave, veces in conteo.items():
+        grupos.setdefault(veces, []).append(clave)
+    return grupos
+
+
+def clonar_periodo(
+    origen,
+    destino,
+    *,
+    sufijo: str,
+    profesores: bool = False,
+    tareas: bool = False,
+    solo_activas: bool = False,
+    dry_run: bool = False,
+    tamano_lote: int = TAMANO_LOTE,
+) -> ResultadoClonacion:
+    """
+    Copia las asignaturas de `origen` a `destino` con sus planes y prerrequisitos (y, si se
+    pide, profesores asignados y tareas). No envía correos de asignación.
+    """
+    if origen.pk == destino.pk:
+        raise ValueError('El periodo origen y el destino deben ser distintos.')
+    if not sufijo:
+        raise ValueError('El sufijo no puede estar vacío: los códigos de asignatura son únicos.')
+    clonador = _Clonador(
+        origen, destino, sufijo=sufijo, solo_activas=solo_activas, dry_run=dry_run, tamano_lote=tamano_lote,
+    )
+    return clonador.ejecutar(profesores=profesores, tareas=tareas)
@@ -0,0 +1,49 @@
+"""
+Alcance por facultad de las asignaturas (tabla AsignaturaFacultad).
+
+Una asignatura pertenece a las facultades de las carreras en cuyo plan está. En lugar de
+filtrar con `carreras__facultad=...` (join por PlanCarreraAsignatura y Carrera, con
+duplicados que obligan a `.distinct()`), los filtros usan `asignaturas_de_facultad`:
+un `IN (subconsulta)` sobre el índice único (facultad, asignatura).
+"""
+from __future__ import annotations
+
+from django.db import transaction
+
+from applications.academico.models import AsignaturaFacultad, PlanCarreraAsignatura
+
+
+LOTE = 2000
+
+
+def asignaturas_de_facultad(facultad):
+    """Subconsulta con los ids de asignaturas de la facultad (para `asignatura_id__in=`)."""
+    return AsignaturaFacultad.objects.filter(facultad=facultad).values('asignatura_id')
+
+
+def sincronizar_facultades_asignaturas(asignatura_ids=None) -> dict:
+    """
+    Recalcula AsignaturaFacultad desde los planes (todas las asignaturas o solo las dadas)
+    aplicando solo la diferencia: inserta los pares que faltan y borra los que sobran.
+    """
+    planes = PlanCarreraAsignatura.objects.all()
+    actuales = AsignaturaFacultad.objects.all()
+    if asignatura_ids is not None:
+        asignatura_ids = list(asignatura_ids)
+        planes = planes.filter(asignatura_id__in=asignatura_ids)
+        actuales = actuales.filter(asignatura_id__in=asignatura_ids)
+
+    esperados = set(planes.values_list('asignatura_id', 'carrera__facultad_id').distinct())
+    existentes = {(a, f): pk for pk, a, f in actuales.values_list('pk', 'asignatura_id', 'facultad_id')}
+
+    faltantes = esperados - existentes.keys()
+    sobrantes = [pk for par, pk in existentes.items() if par not in esperados]
+    with transaction.atomic():
+        AsignaturaFacultad.objects.bulk_create(
+            [AsignaturaFacultad(asignatura_id=a, facultad_id=f) for a, f in faltantes],
+            batch_size=LOTE,
+            ignore_conflicts=True,
+        )
+        for i in range(0, len(sobrantes), LOTE):
+            AsignaturaFacultad.objects.filter(pk__in=sobrantes[i:i + LOTE]).delete()
+    return {'agregadas': len(faltantes), 'eliminadas': len(sobrantes)}
@@ -0,0 +1,180 @@
+"""
+Traslado masivo de asignaturas de un periodo académico a otro.
+
+En lugar de `asignatura.save()` por fila, cada lote de ids se mueve con un único UPDATE y
+en la misma transacción corta se actualizan las filas que dependen del periodo:
+
+- matrículas y solicitudes pendientes del periodo origen pasan al destino (se omiten las
+  que chocarían con una matrícula/solicitud ya existente en el destino);
+- opcionalmente, las fechas de las tareas se corren la diferencia entre los inicios de
+  periodo y los recordatorios pendientes se reprograman con el mismo desfase.
+
+Los lotes se confirman por separado para no bloquear el catálogo completo. Como `update()`
+no dispara señales, al confirmar cada lote se invalidan las cachés afectadas.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass, field
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from applications.academico.models import Asignatura
+from applications.academico.signals import asignaturas_modificadas
+
+
+TAMANO_LOTE = 500
+
+
+@dataclass
+class ResultadoMovimiento:
+    """Filas actualizadas (o por actualizar en dry_run) por tabla y tiempo por fase."""
+    dry_run: bool
+    lotes: int = 0
+    asignaturas: int = 0
+    matriculas: int = 0
+    matriculas_omitidas: int = 0
+    solicitudes: int = 0
+    tareas: int = 0
+    recordatorios: int = 0
+    segundos: dict[str, float] = field(default_factory=dict)
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+def asignaturas_a_mover(origen, *, carrera=None, facultad=None, incluir_inactivas=False):
+    qs = Asignatura.objects.filter(periodo_academico=origen)
+    if not incluir_inactivas:
+        qs = qs.filter(estado=True)
+    if carrera is not None:
+        qs = qs.filter(carreras=carrera)
+    if facultad is not None:
+        qs = qs.filter(carreras__facultad=facultad)
+    return qs.distinct()
+
+
+class _Movimiento:
+    def __init__(self, origen, destino, *, desplazar_fechas, dry_run):
+        self.origen, self.destino = origen, destino
+        self.desfase = destino.fecha_inicio - origen.fecha_inicio if desplazar_fechas else None
+        self.dry_run = dry_run
+        self.resultado = ResultadoMovimiento(dry_run=dry_run)
+
+    def _fase(self, nombre, funcion, *args):
+        inicio = time.perf_counter()
+        filas = funcion(*args)
+        segundos = self.resultado.segundos
+        segundos[nombre] = round(segundos.get(nombre, 0) + time.perf_counter() - inicio, 3)
+        setattr(self.resultado, nombre, getattr(self.resultado, nombre) + filas)
+
+    def _aplicar(self, qs, **cambios) -> int:
+        return qs.count() if self.dry_run else qs.update(**cambios)
+
+    def asignaturas(self, ids) -> int:
+        return self._aplicar(
+            Asignatura.objects.filter(id__in=ids, periodo_academico=self.origen),
+            periodo_academico=self.destino,
+        )
+
+    def matriculas(self, ids) -> int:
+        from applications.matriculas.models import Matricula
+
+        origen = Matricula.objects.filter(asignatura_id__in=ids, periodo=self.origen)
+        ya_en_destino = Matricula.objects.filter(
+            estudiante_id=OuterRef('estudiante_id'), asignatura_id=OuterRef('asignatura_id'), periodo=self.destino,
+        )
+        conflicto = origen.filter(Exists(ya_en_destino))
+        self.resultado.matriculas_omitidas += conflicto.count()
+        return self._aplicar(
+            origen.exclude(Exists(ya_en_destino)), periodo=self.destino, fecha_actualizacion=timezone.now(),
+        )
+
+    def solicitudes(self, ids) -> int:
+        from applications.matriculas.models import SolicitudMatricula
+
+        pendiente_en_destino = SolicitudMatricula.objects.filter(
+            estudiante_id=OuterRef('estudiante_id'), asignatura_id=OuterRef('asignatura_id'),
+            periodo=self.destino, estado='pendiente',
+        )
+        return self._aplicar(
+            SolicitudMatricula.objects.filter(asignatura_id__in=ids, periodo=self.origen, estado='pendiente')
+            .exclude(Exists(pendiente_en_destino)),
+            periodo=self.destino,
+        )
+
+    def tareas(self, ids) -> int:
+        from applications.evaluaciones.models import Tarea
+
+        qs = Tarea.objects.filter(asignatura_id__in=ids)
+        if not self.dry_run:
+            # El vencimiento define qué entregas son tardías: las estadísticas cacheadas caducan
+            from applications.evaluaciones.services.estadisticas import invalidar_estadisticas
+
+            tareas_ids = list(qs.values_list('id', flat=True))
+            transaction.on_commit(lambda: [invalidar_estadisticas(t) for t in tareas_ids])
+        return self._aplicar(
+            qs,
+            fecha_publicacion=F('fecha_publicacion') + self.desfase,
+            fecha_vencimiento=F('fecha_vencimiento') + self.desfase,
+            fecha_actualizacion=timezone.now(),
+        )
+
+    def recordatorios(self, ids) -> int:
+        from applications.notificaciones.models import RecordatorioVencimiento
+
+        # Los ya enviados no se tocan, igual que al reprogramar desde la señal de Tarea
+        return self._aplicar(
+            RecordatorioVencimiento.objects.filter(tarea__asignatura_id__in=ids, sent_at__isnull=True),
+            scheduled_for=F('scheduled_for') + self.desfase,
+            updated_at=timezone.now(),
+        )
+
+    def mover_lote(self, ids):
+        with transaction.atomic():
+            self._fase('asignaturas', self.asignaturas, ids)
+            self._fase('matriculas', self.matriculas, ids)
+            self._fase('solicitudes', self.solicitudes, ids)
+            if self.desfase:
+                self._fase('tareas', self.tareas, ids)
+                self._fase('recordatorios', self.recordatorios, ids)
+            if not self.dry_run:
+                transaction.on_commit(
+                    lambda: asignaturas_modificadas.send(sender=Asignatura, asignatura_ids=list(ids))
+                )
+        self.resultado.lotes += 1
+
+
+def mover_periodo(
+    origen,
+    destino,
+    *,
+    carrera=None,
+    facultad=None,
+    incluir_inactivas: bool = False,
+    desplazar_fechas: bool = False,
+    dry_run: bool = False,
+    tamano_lote: int = TAMANO_LOTE,
+) -> ResultadoMovimiento:
+    """
+    Mueve al periodo `destino` las asignaturas (activas, salvo `incluir_inactivas`) de
+    `origen`, opcionalmente solo las de una carrera o facultad, en lotes de `tamano_lote`.
+    """
+    if origen.pk == destino.pk:
+        raise ValueError('El periodo origen y el destino deben ser distintos.')
+    if tamano_lote < 1:
+        raise ValueError('El tamaño de lote debe ser positivo.')
+
+    inicio = time.perf_counter()
+    ids = list(
+        asignaturas_a_mover(origen, carrera=carrera, facultad=facultad, incluir_inactivas=incluir_inactivas)
+        .order_by('id').values_list('id', flat=True)
+    )
+    movimiento = _Movimiento(origen, destino, desplazar_fechas=desplazar_fechas, dry_run=dry_run)
+    movimiento.resultado.segundos['seleccion'] = round(time.perf_counter() - inicio, 3)
+    for i in range(0, len(ids), tamano_lote):
+        movimiento.mover_lote(ids[i:i + tamano_lote])
+    movimiento.resultado.segundos['total'] = round(time.perf_counter() - inicio, 3)
+    return movimiento.resultado
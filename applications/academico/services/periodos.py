@@ -0,0 +1,110 @@
+"""
+Catálogo de periodos académicos en caché (lista completa y periodo activo).
+
+Son pocas filas que cambian un par de veces por ciclo, pero casi cada endpoint de matrícula,
+calificaciones e importación busca el periodo activo. La lista se guarda en la caché
+compartida (settings.CACHES, común a todos los workers) bajo una clave versionada, como el
+catálogo de matrículas y el grafo de prerrequisitos. Cada proceso conserva además su copia
+para esa versión, así que una lectura cuesta un GET de la versión y ninguna consulta SQL, y
+una activación se ve en todos los workers en la siguiente lectura.
+
+Se devuelven dataclasses inmutables (`PeriodoCatalogo`), no instancias de modelo: se comparten
+entre peticiones del mismo proceso. Para filtrar se usa `periodo.id`; para escribir (FK de
+objetos nuevos, activar/desactivar) se carga la instancia con `PeriodoAcademico.objects.get`.
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+
+from django.core.cache import cache
+
+from applications.academico.models import PeriodoAcademico
+
+
+CACHE_TTL = 5 * 60
+CLAVE_VERSION = 'academico:periodos:version'
+# La copia local también caduca por tiempo, por si la caché compartida se vacía y la versión reinicia
+LOCAL_TTL = 5
+
+_local: dict = {}
+
+
+@dataclass(frozen=True)
+class PeriodoCatalogo:
+    id: int
+    nombre: str
+    descripcion: str | None
+    fecha_inicio: date
+    fecha_fin: date
+    activo: bool
+    fecha_creacion: datetime
+
+    def __str__(self):
+        return self.nombre
+
+
+def version_periodos() -> int:
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        cache.add(CLAVE_VERSION, 1, None)
+        version = cache.get(CLAVE_VERSION, 1)
+    return version
+
+
+def invalidar_periodos() -> None:
+    _local.clear()
+    try:
+        cache.incr(CLAVE_VERSION)
+    except ValueError:
+        cache.add(CLAVE_VERSION, 1, None)
+
+
+def periodos() -> tuple[PeriodoCatalogo, ...]:
+    """Todos los periodos, del más reciente al más antiguo."""
+    version = version_periodos()
+    local = _local.get('lista')
+    if local and local[0] == version and time.monotonic() - local[1] < LOCAL_TTL:
+        return local[2]
+
+    clave = f'academico:periodos:v{version}'
+    lista = cache.get(clave)
+    if lista is None:
+        lista = tuple(
+            PeriodoCatalogo(**p)
+            for p in PeriodoAcademico.objects.order_by('-fecha_inicio', '-id').values(
+                'id', 'nombre', 'descripcion', 'fecha_inicio', 'fecha_fin', 'activo', 'fecha_creacion'
+            )
+        )
+        cache.set(clave, lista, CACHE_TTL)
+    _local['lista'] = (version, time.monotonic(), lista)
+    return lista
+
+
+def periodo_activo() -> PeriodoCatalogo | None:
+    return next((p for p in periodos() if p.activo), None)
+
+
+def obtener_periodo(periodo_id=None) -> PeriodoCatalogo | None:
+    """El periodo `periodo_id` (None si no existe o no es un id válido) o, sin id, el activo."""
+    if not periodo_id:
+        return periodo_activo()
+    try:
+        periodo_id = int(periodo_id)
+    except (TypeError, ValueError):
+        return None
+    return next((p for p in periodos() if p.id == periodo_id), None)
+
+
+def activar_periodo(periodo: PeriodoAcademico) -> PeriodoAcademico:
+    """Deja `periodo` como único activo (ver `PeriodoAcademico.save`)."""
+    periodo.activo = True
+    periodo.save(update_fields=['activo'])
+    return periodo
+
+
+def desactivar_periodo(periodo: PeriodoAcademico) -> PeriodoAcademico:
+    periodo.activo = False
+    periodo.save(update_fields=['activo'])
+    return periodo
@@ -0,0 +1,244 @@
+"""
+Grafo de prerrequisitos de un periodo académico.
+
+`Asignatura.prerrequisitos` es un M2M recursivo: recorrerlo con `.prerrequisitos.all()`
+cuesta una consulta por nodo. Aquí la lista de aristas del periodo se carga con una sola
+consulta (más una para los nodos) en listas de adyacencia y se guarda en caché; la clave
+incluye un número de versión que `signals` incrementa ante cualquier cambio de
+prerrequisitos o asignaturas, igual que el catálogo de matrículas.
+
+Con el grafo en memoria se resuelven el cierre transitivo, la detección de ciclos
+(Tarjan), el orden curricular por carrera y la validación de nuevas aristas.
+"""
+from __future__ import annotations
+
+import heapq
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+from applications.academico.models import Asignatura
+from applications.academico.services.catalogo import plan_carrera
+
+
+CACHE_TTL = 60 * 60
+CLAVE_VERSION = 'academico:prerrequisitos:version'
+
+
+def orden_topologico(codigos: dict, dependencias: dict) -> tuple[list, set]:
+    """
+    Ordena `codigos` de modo que cada elemento quede después de sus dependencias
+    (Kahn; a igualdad de nivel, por la clave de orden de `codigos`). Solo se consideran
+    las dependencias que también están en `codigos`.
+    Devuelve (orden, en_ciclo); los que están en un ciclo van al final del orden.
+    """
+    pendientes = {c: 0 for c in codigos}
+    dependientes: dict = {}
+    for codigo, prereqs in dependencias.items():
+        if codigo not in pendientes:
+            continue
+        for p in prereqs:
+            if p in pendientes:
+                pendientes[codigo] += 1
+                dependientes.setdefault(p, []).append(codigo)
+
+    listos = [(codigos[c], c) for c, n in pendientes.items() if n == 0]
+    heapq.heapify(listos)
+    orden = []
+    while listos:
+        _, codigo = heapq.heappop(listos)
+        orden.append(codigo)
+        for d in dependientes.get(codigo, ()):
+            pendientes[d] -= 1
+            if pendientes[d] == 0:
+                heapq.heappush(listos, (codigos[d], d))
+
+    en_ciclo = {c for c, n in pendientes.items() if n > 0}
+    orden.extend(sorted(en_ciclo, key=lambda c: codigos[c]))
+    return orden, en_ciclo
+
+
+def version_grafo() -> int:
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        cache.add(CLAVE_VERSION, 1, None)
+        version = cache.get(CLAVE_VERSION, 1)
+    return version
+
+
+def invalidar_grafo() -> None:
+    try:
+        cache.incr(CLAVE_VERSION)
+    except ValueError:
+        cache.add(CLAVE_VERSION, 1, None)
+
+
+@dataclass
+class GrafoPrerrequisitos:
+    """
+    `nodos`: id -> (codigo, nombre) de las asignaturas del periodo y de los prerrequisitos
+    que apuntan fuera de él. `prerrequisitos`: id -> ids que requiere (solo los que tienen).
+    """
+    periodo_id: int
+    nodos: dict[int, tuple[str, str]]
+    prerrequisitos: dict[int, list[int]]
+
+    @classmethod
+    def cargar(cls, periodo_id: int) -> 'GrafoPrerrequisitos':
+        Prerrequisito = Asignatura.prerrequisitos.through
+        aristas = Prerrequisito.objects.filter(
+            from_asignatura__periodo_academico_id=periodo_id
+        ).values_list('from_asignatura_id', 'to_asignatura_id')
+        prerrequisitos: dict[int, list[int]] = {}
+        for origen, destino in aristas:
+            prerrequisitos.setdefault(origen, []).append(destino)
+
+        externos = {p for ps in prerrequisitos.values() for p in ps}
+        nodos = {
+            a_id: (codigo, nombre)
+            for a_id, codigo, nombre in Asignatura.objects.filter(periodo_academico_id=periodo_id)
+            .values_list('id', 'codigo', 'nombre')
+        }
+        externos -= nodos.keys()
+        if externos:
+            nodos.update(
+                (a_id, (codigo, nombre))
+                for a_id, codigo, nombre in Asignatura.objects.filter(id__in=externos).values_list('id', 'codigo', 'nombre')
+            )
+        return cls(periodo_id=periodo_id, nodos=nodos, prerrequisitos=prerrequisitos)
+
+    @property
+    def dependientes(self) -> dict[int, list[int]]:
+        """Adyacencia inversa (id -> asignaturas que lo requieren), calculada una vez."""
+        if not hasattr(self, '_dependientes'):
+            inversa: dict[int, list[int]] = {}
+            for origen, destinos in self.prerrequisitos.items():
+                for d in destinos:
+                    inversa.setdefault(d, []).append(origen)
+            self._dependientes = inversa
+        return self._dependientes
+
+    def __getstate__(self):
+        # La adyacencia inversa no se guarda en caché
+        estado = self.__dict__.copy()
+        estado.pop('_dependientes', None)
+        return estado
+
+    @staticmethod
+    def _alcanzables(adyacencia: dict[int, list[int]], origenes) -> set[int]:
+        vistos: set[int] = set()
+        pila = [d for o in origenes for d in adyacencia.get(o, ())]
+        while pila:
+            nodo = pila.pop()
+            if nodo not in vistos:
+                vistos.add(nodo)
+                pila.extend(adyacencia.get(nodo, ()))
+        return vistos
+
+    def prerrequisitos_transitivos(self, asignatura_id: int) -> set[int]:
+        """Todo lo que hay que aprobar antes de `asignatura_id` (sin incluirla, salvo ciclo)."""
+        return self._alcanzables(self.prerrequisitos, [asignatura_id])
+
+    def dependientes_transitivos(self, asignatura_id: int) -> set[int]:
+        """Asignaturas que requieren `asignatura_id` directa o indirectamente."""
+        return self._alcanzables(self.dependientes, [asignatura_id])
+
+    def crearia_ciclo(self, asignatura_id: int, prerrequisito_ids) -> list[int]:
+        """
+        Prerrequisitos de `prerrequisito_ids` que, asignados a `asignatura_id`, cerrarían un
+        ciclo: la propia asignatura o alguna que ya la requiere directa o indirectamente.
+        """
+        candidatos = set(prerrequisito_ids)
+        if not candidatos:
+            return []
+        if asignatura_id in candidatos:
+            return [asignatura_id]
+        dependientes = self.dependientes_transitivos(asignatura_id)
+        return sorted(candidatos & dependientes)
+
+    def ciclos(self) -> list[list[int]]:
+        """Componentes fuertemente conexas con ciclo (Tarjan iterativo), cada una ordenada por id."""
+        indice: dict[int, int] = {}
+        bajo: dict[int, int] = {}
+        en_pila: set[int] = set()
+        pila: list[int] = []
+        resultado = []
+        contador = 0
+
+        for raiz in self.prerrequisitos:
+            if raiz in indice:
+                continue
+            trabajo = [(raiz, iter(self.prerrequisitos.get(raiz, ())))]
+            indice[raiz] = bajo[raiz] = contador
+            contador += 1
+            pila.append(raiz)
+            en_pila.add(raiz)
+            while trabajo:
+                nodo, hijos = trabajo[-1]
+                avanzo = False
+                for hijo in hijos:
+                    if hijo not in indice:
+                        indice[hijo] = bajo[hijo] = contador
+                        contador += 1
+                        pila.append(hijo)
+                        en_pila.add(hijo)
+                        trabajo.append((hijo, iter(self.prerrequisitos.get(hijo, ()))))
+                        avanzo = True
+                        break
+                    if hijo in en_pila:
+                        bajo[nodo] = min(bajo[nodo], indice[hijo])
+                if avanzo:
+                    continue
+                trabajo.pop()
+                if trabajo:
+                    padre = trabajo[-1][0]
+                    bajo[padre] = min(bajo[padre], bajo[nodo])
+                if bajo[nodo] == indice[nodo]:
+                    componente = []
+                    while True:
+                        miembro = pila.pop()
+                        en_pila.discard(miembro)
+                        componente.append(miembro)
+                        if miembro == nodo:
+                            break
+                    if len(componente) > 1 or nodo in self.prerrequisitos.get(nodo, ()):
+                        resultado.append(sorted(componente))
+        return sorted(resultado)
+
+    def orden_curricular(self, carrera_id: int) -> list[dict]:
+        """
+        Asignaturas del plan de la carrera en orden topológico (a igualdad, por semestre y
+        código). `nivel` es la longitud de la cadena de prerrequisitos dentro del plan y
+        `advertencia` marca ciclos o prerrequisitos ubicados en un semestre igual o posterior.
+        """
+        semestres = {p.asignatura_id: p.semestre for p in plan_carrera(carrera_id) if p.asignatura_id in self.nodos}
+        orden, en_ciclo = orden_topologico(
+            {a: (semestres[a], self.nodos[a][0] or '') for a in semestres}, self.prerrequisitos
+        )
+
+        niveles: dict[int, int] = {}
+        resultado = []
+        for a in orden:
+            previos = [p for p in self.prerrequisitos.get(a, ()) if p in semestres]
+            niveles[a] = 1 + max((niveles.get(p, 0) for p in previos if p not in en_ciclo), default=0)
+            advertencia = None
+            if a in en_ciclo:
+                advertencia = 'ciclo de prerrequisitos'
+            elif any(semestres[p] >= semestres[a] for p in previos):
+                advertencia = 'prerrequisito en un semestre igual o posterior'
+            codigo, nombre = self.nodos[a]
+            resultado.append({
+                'id': a, 'codigo': codigo, 'nombre': nombre, 'semestre': semestres[a],
+                'nivel': niveles[a], 'prerrequisitos': previos, 'advertencia': advertencia,
+            })
+        return resultado
+
+
+def grafo_periodo(periodo_id: int) -> GrafoPrerrequisitos:
+    """Grafo del periodo desde caché (se reconstruye con dos consultas si cambió la versión)."""
+    clave = f'academico:prerrequisitos:v{version_grafo()}:{periodo_id}'
+    grafo = cache.get(clave)
+    if grafo is None:
+        grafo = GrafoPrerrequisitos.cargar(periodo_id)
+        cache.set(clave, grafo, CACHE_TTL)
+    return grafo
@@ -0,0 +1,50 @@
+"""Asignación de profesores a una asignatura (ProfesorAsignatura) por diferencias."""
+from __future__ import annotations
+
+from django.db import transaction
+
+from applications.academico.models import Asignatura, ProfesorAsignatura
+from applications.academico.signals import (
+    asignaturas_modificadas,
+    notificar_cambios_profesores,
+    sin_notificaciones_por_fila,
+)
+
+
+def sincronizar_profesores(asignatura, profesores_ids) -> dict:
+    """
+    Deja a `profesores_ids` como únicos profesores de la asignatura tocando solo las
+    diferencias: un DELETE para los quitados y un bulk_create para los nuevos. Al confirmar
+    la transacción se encola un único lote de correos (uno por asignación que cambió).
+
+    La fila de la asignatura se bloquea antes de leer los profesores actuales, así dos
+    sincronizaciones concurrentes de la misma asignatura no calculan (ni notifican) las
+    mismas diferencias.
+    """
+    deseados = {int(p) for p in profesores_ids}
+
+    with transaction.atomic():
+        list(Asignatura.objects.select_for_update().filter(pk=asignatura.pk).values_list('pk', flat=True))
+        actuales = set(
+            ProfesorAsignatura.objects.filter(asignatura=asignatura).values_list('profesor_id', flat=True)
+        )
+        agregados, quitados = deseados - actuales, actuales - deseados
+        if not agregados and not quitados:
+            return {'agregados': [], 'quitados': []}
+
+        if quitados:
+            # Los correos de los quitados salen en el lote de abajo, no uno por fila
+            with sin_notificaciones_por_fila():
+                ProfesorAsignatura.objects.filter(asignatura=asignatura, profesor_id__in=quitados).delete()
+        ProfesorAsignatura.objects.bulk_create(
+            [ProfesorAsignatura(asignatura=asignatura, profesor_id=p) for p in agregados],
+            ignore_conflicts=True,
+        )
+
+        asignatura_id = asignatura.pk
+        transaction.on_commit(lambda: notificar_cambios_profesores(asignatura_id, agregados, quitados))
+        transaction.on_commit(
+            lambda: asignaturas_modificadas.send(sender=Asignatura, asignatura_ids=[asignatura_id])
+        )
+
+    return {'agregados': sorted(agregados), 'quitados': sorted(quitados)}
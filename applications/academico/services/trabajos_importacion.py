@@ -0,0 +1,164 @@
+"""
+Importaciones de asignaturas en segundo plano.
+
+POST /api/asignaturas/importar/ con `asincrono=true` solo guarda el archivo y crea una
+ImportacionAsignaturas; la tarea Celery la procesa por fases:
+
+1. Recorre el archivo y lo valida por bloques (`validar_asignaturas`); cada bloque se
+   guarda como FilaImportacion al validarse, actualizando `filas_procesadas`.
+2. Si no es dry_run, crea las asignaturas siguiendo el orden topológico en bloques de
+   `TAMANO_BLOQUE`, una transacción por bloque, actualizando `creadas`.
+
+El contenido se identifica por su SHA-256: reenviar el mismo archivo para el mismo periodo
+y modo devuelve la importación existente en vez de procesarlo otra vez (salvo si falló).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+
+from django.core.files.base import ContentFile
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from applications.academico.models import FilaImportacion, ImportacionAsignaturas
+from applications.academico.services.importacion import (
+    ArchivoInvalido,
+    crear_asignaturas,
+    leer_archivo,
+    mapear_columnas,
+    validar_asignaturas,
+)
+
+
+logger = logging.getLogger(__name__)
+
+TAMANO_BLOQUE = 500
+
+
+def hash_archivo(archivo) -> str:
+    sha = hashlib.sha256()
+    for bloque in archivo.chunks():
+        sha.update(bloque)
+    archivo.seek(0)
+    return sha.hexdigest()
+
+
+def _vigente(sha256: str, periodo, dry_run: bool):
+    return (
+        ImportacionAsignaturas.objects
+        .filter(sha256=sha256, periodo=periodo, dry_run=dry_run)
+        .exclude(estado='fallida')
+        .first()
+    )
+
+
+def crear_importacion(*, archivo, periodo, usuario, dry_run: bool) -> tuple[ImportacionAsignaturas, bool]:
+    """
+    Registra la importación y programa su procesamiento al confirmar la transacción.
+    Devuelve (importacion, creada); si el mismo contenido ya se importó devuelve esa con creada=False.
+    """
+    from applications.academico.tasks import procesar_importacion_asignaturas
+
+    sha256 = hash_archivo(archivo)
+    existente = _vigente(sha256, periodo, dry_run)
+    if existente:
+        return existente, False
+
+    importacion = ImportacionAsignaturas(
+        usuario=usuario, periodo=periodo, nombre_archivo=archivo.name, sha256=sha256, dry_run=dry_run,
+    )
+    try:
+        with transaction.atomic():
+            importacion.archivo.save(archivo.name, ContentFile(archivo.read()), save=False)
+            importacion.save()
+    except IntegrityError:
+        # Otra petición con el mismo archivo ganó la carrera
+        importacion.archivo.delete(save=False)
+        return _vigente(sha256, periodo, dry_run), False
+
+    transaction.on_commit(lambda: procesar_importacion_asignaturas.delay(str(importacion.pk)))
+    return importacion, True
+
+
+class _GuardarFilas:
+    """Guarda cada bloque validado como FilaImportacion y actualiza los contadores."""
+
+    def __init__(self, importacion: ImportacionAsignaturas, columna_codigo: str):
+        self.importacion = importacion
+        self.columna_codigo = columna_codigo
+        self.procesadas = self.validas = 0
+
+    def __call__(self, filas: list[dict]) -> None:
+        FilaImportacion.objects.bulk_create([
+            FilaImportacion(
+                importacion=self.importacion,
+                fila=f['fila'],
+                codigo=str(f.get('codigo_usado') or f['datos'].get(self.columna_codigo) or '')[:20],
+                datos=f['datos'],
+                errores=f['errores'],
+                advertencias=f['advertencias'],
+                valida=not f['errores'],
+            )
+            for f in filas
+        ])
+        self.procesadas += len(filas)
+        self.validas += sum(1 for f in filas if not f['errores'])
+        ImportacionAsignaturas.objects.filter(pk=self.importacion.pk).update(
+            filas_procesadas=self.procesadas, validas=self.validas, invalidas=self.procesadas - self.validas,
+        )
+
+
+def _guardar_advertencias(importacion: ImportacionAsignaturas, plan, tamano: int) -> None:
+    """Advertencias de prerrequisitos, conocidas solo al terminar de validar el archivo."""
+    advertidas = {v['fila']['fila']: v['fila']['advertencias'] for v in plan.validas.values() if v['fila']['advertencias']}
+    numeros = list(advertidas)
+    for inicio in range(0, len(numeros), tamano):
+        filas = list(FilaImportacion.objects.filter(
+            importacion=importacion, valida=True, fila__in=numeros[inicio:inicio + tamano],
+        ).only('id', 'fila'))
+        for f in filas:
+            f.advertencias = advertidas[f.fila]
+        FilaImportacion.objects.bulk_update(filas, ['advertencias'])
+
+
+def procesar_importacion(importacion_id, tamano: int = TAMANO_BLOQUE) -> ImportacionAsignaturas:
+    """
+    Procesa una importación pendiente. Si falla queda 'fallida' con el error; las asignaturas
+    de los bloques ya confirmados se conservan (sus filas quedan marcadas como creadas).
+    """
+    # Solo un worker toma la importación aunque la tarea se entregue dos veces
+    tomada = ImportacionAsignaturas.objects.filter(pk=importacion_id, estado='pendiente').update(
+        estado='procesando', fecha_inicio=timezone.now(),
+    )
+    importacion = ImportacionAsignaturas.objects.select_related('periodo').get(pk=importacion_id)
+    if not tomada:
+        return importacion
+
+    try:
+        with importacion.archivo.open('rb') as archivo, leer_archivo(importacion.nombre_archivo, archivo) as tabla:
+            columnas_mapa = mapear_columnas(tabla.columnas)
+            # Un recorrido previo (sin guardar filas) da el total para el progreso
+            ImportacionAsignaturas.objects.filter(pk=importacion.pk).update(total_filas=sum(1 for _ in tabla))
+            plan = validar_asignaturas(
+                tabla, columnas_mapa, tamano=tamano, al_validar=_GuardarFilas(importacion, columnas_mapa['codigo']),
+            )
+        _guardar_advertencias(importacion, plan, tamano)
+
+        creadas = 0
+        if not importacion.dry_run:
+            for inicio in range(0, len(plan.orden), tamano):
+                codigos = plan.orden[inicio:inicio + tamano]
+                creadas += len(crear_asignaturas(plan, importacion.periodo, codigos))
+                FilaImportacion.objects.filter(importacion=importacion, valida=True, codigo__in=codigos).update(creada=True)
+                ImportacionAsignaturas.objects.filter(pk=importacion.pk).update(creadas=creadas)
+        estado, error = 'completada', ''
+    except ArchivoInvalido as e:
+        estado, error = 'fallida', str(e)
+    except Exception as e:
+        logger.exception('Importación de asignaturas %s fallida', importacion_id)
+        estado, error = 'fallida', f'{type(e).__name__}: {e}'
+
+    ImportacionAsignaturas.objects.filter(pk=importacion.pk).update(estado=estado, error=error, fecha_fin=timezone.now())
+    importacion.refresh_from_db()
+    return importacion
@@ -1,17 +1,51 @@
 
 from __future__ import annotations
 
-from django.db import transaction
-from django.db.models.signals import pre_save, post_save, post_delete
-from django.dispatch import receiver
+from contextlib import contextmanager
+from contextvars import ContextVar
 
-from applications.academico.models import ProfesorAsignatura
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, pre_save, post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from applications.academico.models import (
+    Asignatura,
+    Carrera,
+    Facultad,
+    PeriodoAcademico,
+    PlanCarreraAsignatura,
+    ProfesorAsignatura,
+)
+from applications.academico.services.catalogo import invalidar_catalogo
+from applications.academico.services.facultades import sincronizar_facultades_asignaturas
+from applications.academico.services.periodos import invalidar_periodos
+from applications.academico.services.prerrequisitos import invalidar_grafo
 from applications.usuarios.tasks import (
     send_asignatura_assignment_email,
     send_asignatura_unassignment_email,
 )
 
 
+# Operaciones masivas (bulk_create/update) que no disparan post_save; kwargs: asignatura_ids
+asignaturas_modificadas = Signal()
+
+_notificar_por_fila = ContextVar("notificar_profesor_asignatura_por_fila", default=True)
+
+
+@contextmanager
+def sin_notificaciones_por_fila():
+    """
+    Desactiva los correos por fila de ProfesorAsignatura (post_delete) dentro del bloque,
+    para operaciones que notifican en lote con `notificar_cambios_profesores`.
+    """
+    token = _notificar_por_fila.set(False)
+    try:
+        yield
+    finally:
+        _notificar_por_fila.reset(token)
+
+
 def _display_name(user) -> str:
     name = (getattr(user, "get_full_name", lambda: "")() or "").strip()
     return name or getattr(user, "username", "") or "Docente"
@@ -57,6 +91,26 @@ def _enqueue_unassignment(profesor, asignatura) -> None:
     )
 
 
+def notificar_cambios_profesores(asignatura_id, agregados, quitados) -> None:
+    """
+    Encola un correo por cada asignación realmente agregada o quitada en una sincronización
+    masiva (que no dispara las señales por fila). Carga docentes y asignatura con dos consultas.
+    """
+    if not agregados and not quitados:
+        return
+    asignatura = Asignatura.objects.select_related("periodo_academico").filter(pk=asignatura_id).first()
+    if asignatura is None:
+        return
+    User = get_user_model()
+    profesores = User.objects.in_bulk(set(agregados) | set(quitados))
+    for profesor_id in sorted(quitados):
+        if profesor_id in profesores:
+            _enqueue_unassignment(profesores[profesor_id], asignatura)
+    for profesor_id in sorted(agregados):
+        if profesor_id in profesores:
+            _enqueue_assignment(ProfesorAsignatura(profesor=profesores[profesor_id], asignatura=asignatura))
+
+
 @receiver(pre_save, sender=ProfesorAsignatura)
 def profesor_asignatura_pre_save(sender, instance: ProfesorAsignatura, **kwargs):
     if not instance.pk:
@@ -101,6 +155,86 @@ def profesor_asignatura_post_save(sender, instance: ProfesorAsignatura, created:
 
 @receiver(post_delete, sender=ProfesorAsignatura)
 def profesor_asignatura_post_delete(sender, instance: ProfesorAsignatura, **kwargs):
+    if not _notificar_por_fila.get():
+        return
     profesor = instance.profesor
     asignatura = instance.asignatura
     transaction.on_commit(lambda: _enqueue_unassignment(profesor, asignatura))
+
+
+# --- Alcance por facultad (AsignaturaFacultad) ---
+
+@receiver(pre_save, sender=PlanCarreraAsignatura)
+def plan_carrera_pre_save(sender, instance: PlanCarreraAsignatura, **kwargs):
+    instance._old_asignatura_id = (
+        sender.objects.filter(pk=instance.pk).values_list("asignatura_id", flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=PlanCarreraAsignatura)
+def plan_carrera_post_save(sender, instance: PlanCarreraAsignatura, raw=False, **kwargs):
+    if raw:
+        return
+    ids = {instance.asignatura_id}
+    old_asignatura_id = getattr(instance, "_old_asignatura_id", None)
+    if old_asignatura_id:
+        ids.add(old_asignatura_id)
+    sincronizar_facultades_asignaturas(ids)
+
+
+@receiver(post_delete, sender=PlanCarreraAsignatura)
+def plan_carrera_post_delete(sender, instance: PlanCarreraAsignatura, **kwargs):
+    sincronizar_facultades_asignaturas([instance.asignatura_id])
+
+
+@receiver(post_save, sender=Carrera)
+def carrera_post_save(sender, instance: Carrera, created: bool, raw=False, update_fields=None, **kwargs):
+    # Solo importa si la carrera cambió de facultad (una carrera nueva aún no tiene plan)
+    if raw or created or (update_fields is not None and "facultad" not in update_fields):
+        return
+    sincronizar_facultades_asignaturas(instance.planes_asignaturas.values_list("asignatura_id", flat=True))
+
+
+# --- Grafo de prerrequisitos en caché ---
+
+def _invalidar_grafo(**kwargs):
+    transaction.on_commit(invalidar_grafo)
+
+
+post_save.connect(_invalidar_grafo, sender=Asignatura, dispatch_uid="grafo_prerrequisitos_save")
+post_delete.connect(_invalidar_grafo, sender=Asignatura, dispatch_uid="grafo_prerrequisitos_delete")
+asignaturas_modificadas.connect(_invalidar_grafo, dispatch_uid="grafo_prerrequisitos_masivo")
+
+
+@receiver(m2m_changed, sender=Asignatura.prerrequisitos.through)
+def invalidar_grafo_por_prerrequisitos(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        _invalidar_grafo()
+
+
+# --- Catálogo de periodos en caché ---
+
+@receiver(post_save, sender=PeriodoAcademico)
+@receiver(post_delete, sender=PeriodoAcademico)
+def invalidar_cache_periodos(sender, **kwargs):
+    # De inmediato (la misma transacción ve el nuevo periodo activo) y otra vez al confirmar,
+    # por si otro worker recargó la caché con el estado anterior mientras tanto
+    invalidar_periodos()
+    transaction.on_commit(invalidar_periodos)
+
+
+# --- Catálogo de facultades, carreras y planes en caché ---
+
+def _invalidar_catalogo(**kwargs):
+    # Como los periodos: ya para este proceso y de nuevo al confirmar (aviso a los demás workers)
+    invalidar_catalogo()
+    transaction.on_commit(invalidar_catalogo)
+
+
+for _modelo in (Facultad, Carrera, PlanCarreraAsignatura):
+    post_save.connect(_invalidar_catalogo, sender=_modelo, dispatch_uid=f"catalogo_academico_save_{_modelo.__name__}")
+    post_delete.connect(_invalidar_catalogo, sender=_modelo, dispatch_uid=f"catalogo_academico_delete_{_modelo.__name__}")
+
+# Importaciones y clonaciones crean planes con bulk_create
+asignaturas_modificadas.connect(_invalidar_catalogo, dispatch_uid="catalogo_academico_masivo")
@@ -0,0 +1,22 @@
+"""
+Tareas Celery académicas
+"""
+import logging
+
+from celery import shared_task
+
+from applications.academico.services.trabajos_importacion import procesar_importacion
+
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def procesar_importacion_asignaturas(importacion_id):
+    """Valida y (si no es dry_run) crea las asignaturas de una ImportacionAsignaturas."""
+    importacion = procesar_importacion(importacion_id)
+    logger.info(
+        'Importación %s: %s (%s filas, %s creadas)',
+        importacion.pk, importacion.estado, importacion.total_filas, importacion.creadas,
+    )
+    return {'estado': importacion.estado, 'creadas': importacion.creadas}
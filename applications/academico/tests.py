@@ -0,0 +1,744 @@
+import shutil
+import tempfile
+from datetime import date, datetime, timezone
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+import pandas as pd
+from openpyxl import Workbook
+from rest_framework.test import APITestCase, APIClient
+
+from applications.academico.models import (
+    Asignatura,
+    AsignaturaFacultad,
+    Carrera,
+    Facultad,
+    ImportacionAsignaturas,
+    PeriodoAcademico,
+    PlanCarreraAsignatura,
+    ProfesorAsignatura,
+)
+from applications.reportes.services.ingesta import ArchivoIlegible, abrir_tabla
+
+
+class ListadoAsignaturasConsultasTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+
+        self.periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        facultad = Facultad.objects.create(nombre="Ingeniería", codigo="ING")
+        self.carreras = [
+            Carrera.objects.create(
+                nombre=f"Carrera {i}", codigo=f"CAR{i}", facultad=facultad, nivel="pregrado", modalidad="presencial"
+            )
+            for i in range(2)
+        ]
+        self.profesores = [
+            User.objects.create_user(username=f"prof{i}", password="pass1234", rol="profesor")
+            for i in range(2)
+        ]
+        self.admin = User.objects.create_superuser(username="admin", password="pass1234", email="a@a.com")
+        self.client.force_authenticate(self.admin)
+
+    def _crear_asignaturas(self, n):
+        inicio = Asignatura.objects.count()
+        anterior = Asignatura.objects.last()
+        for i in range(inicio, inicio + n):
+            asignatura = Asignatura.objects.create(
+                nombre=f"Asignatura {i}", codigo=f"AS{i:04d}", periodo_academico=self.periodo, creditos=3
+            )
+            for semestre, carrera in enumerate(self.carreras, start=1):
+                PlanCarreraAsignatura.objects.create(carrera=carrera, asignatura=asignatura, semestre=semestre)
+            for profesor in self.profesores:
+                ProfesorAsignatura.objects.create(profesor=profesor, asignatura=asignatura)
+            if anterior:
+                asignatura.prerrequisitos.add(anterior)
+            anterior = asignatura
+
+    def _consultas_listado(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/asignaturas/")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"], len(ctx)
+
+    def test_listado_con_consultas_constantes(self):
+        self._crear_asignaturas(3)
+        pocas, consultas_pocas = self._consultas_listado()
+        self._crear_asignaturas(30)
+        muchas, consultas_muchas = self._consultas_listado()
+
+        self.assertEqual(len(pocas), 3)
+        self.assertEqual(len(muchas), 33)
+        self.assertEqual(consultas_pocas, consultas_muchas)
+        # roles + count + página + carreras + planes + profesores + prerrequisitos
+        self.assertEqual(consultas_muchas, 7)
+
+    def test_datos_desde_prefetch(self):
+        self._crear_asignaturas(2)
+        asignaturas, _ = self._consultas_listado()
+        segunda = next(a for a in asignaturas if a["codigo"] == "AS0001")
+
+        self.assertEqual(segunda["carrera_nombre"], "Carrera 0")
+        self.assertEqual(segunda["carrera_facultad"], "Ingeniería")
+        self.assertEqual(segunda["carrera_id"], self.carreras[0].id)
+        self.assertEqual(segunda["semestre"], 1)
+        self.assertEqual(sorted(segunda["carreras"]), sorted(c.id for c in self.carreras))
+        self.assertEqual(segunda["prerrequisitos_nombres"], [{"codigo": "AS0000", "nombre": "Asignatura 0"}])
+        self.assertEqual(sorted(p["username"] for p in segunda["profesores_info"]), ["prof0", "prof1"])
+
+
+class SincronizacionProfesoresTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+
+        self.periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        self.profesores = [
+            User.objects.create_user(
+                username=f"prof{i}", password="pass1234", rol="profesor", email=f"prof{i}@example.com"
+            )
+            for i in range(3)
+        ]
+        self.admin = User.objects.create_superuser(username="admin", password="pass1234", email="a@a.com")
+        self.client.force_authenticate(self.admin)
+
+    def _guardar(self, metodo, url, profesores):
+        datos = {
+            "nombre": "Algoritmos", "codigo": "ALG-01", "creditos": 3,
+            "periodo_academico": self.periodo.id, "profesores": [p.id for p in profesores],
+        }
+        with mock.patch("applications.academico.signals.send_asignatura_assignment_email.delay") as asignar, \
+                mock.patch("applications.academico.signals.send_asignatura_unassignment_email.delay") as quitar, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = getattr(self.client, metodo)(url, datos, format="json")
+        self.assertIn(response.status_code, (200, 201), response.content)
+        return (
+            response.json()["id"],
+            sorted(c.kwargs["docente_email"] for c in asignar.call_args_list),
+            sorted(c.kwargs["docente_email"] for c in quitar.call_args_list),
+        )
+
+    def test_solo_se_notifican_los_cambios(self):
+        p0, p1, p2 = self.profesores
+        asignatura_id, asignados, quitados = self._guardar("post", "/api/asignaturas/", [p0, p1])
+        self.assertEqual((asignados, quitados), (["prof0@example.com", "prof1@example.com"], []))
+
+        url = f"/api/asignaturas/{asignatura_id}/"
+        _, asignados, quitados = self._guardar("put", url, [p1, p0])
+        self.assertEqual((asignados, quitados), ([], []))
+
+        _, asignados, quitados = self._guardar("put", url, [p1, p2])
+        self.assertEqual((asignados, quitados), (["prof2@example.com"], ["prof0@example.com"]))
+        self.assertEqual(
+            sorted(ProfesorAsignatura.objects.filter(asignatura_id=asignatura_id).values_list("profesor__username", flat=True)),
+            ["prof1", "prof2"],
+        )
+
+        # Fuera de la sincronización el borrado de una asignación sigue notificando por fila
+        with mock.patch("applications.academico.signals.send_asignatura_unassignment_email.delay") as quitar, \
+                self.captureOnCommitCallbacks(execute=True):
+            ProfesorAsignatura.objects.get(asignatura_id=asignatura_id, profesor=p1).delete()
+        self.assertEqual([c.kwargs["docente_email"] for c in quitar.call_args_list], ["prof1@example.com"])
+
+
+class GrafoPrerrequisitosTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+
+        self.periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        facultad = Facultad.objects.create(nombre="Ingeniería", codigo="ING")
+        self.carrera = Carrera.objects.create(
+            nombre="Sistemas", codigo="SIS", facultad=facultad, nivel="pregrado", modalidad="presencial"
+        )
+        self.a, self.b, self.c = [
+            Asignatura.objects.create(nombre=codigo, codigo=codigo, periodo_academico=self.periodo, creditos=3)
+            for codigo in ("A", "B", "C")
+        ]
+        for semestre, asignatura in enumerate((self.a, self.b, self.c), start=1):
+            PlanCarreraAsignatura.objects.create(carrera=self.carrera, asignatura=asignatura, semestre=semestre)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.b.prerrequisitos.add(self.a)
+            self.c.prerrequisitos.add(self.b)
+
+        self.admin = User.objects.create_superuser(username="admin", password="pass1234", email="a@a.com")
+        self.client.force_authenticate(self.admin)
+
+    def test_grafo_transitivo_y_orden_curricular(self):
+        response = self.client.get(
+            "/api/asignaturas/grafo/", {"carrera_id": self.carrera.id, "asignatura_id": self.b.id}
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["ciclos"], [])
+        self.assertEqual(data["asignatura"]["prerrequisitos_transitivos"], ["A"])
+        self.assertEqual(data["asignatura"]["dependientes_transitivos"], ["C"])
+        self.assertEqual([(a["codigo"], a["nivel"]) for a in data["orden_curricular"]], [("A", 1), ("B", 2), ("C", 3)])
+
+    def test_rechaza_prerrequisito_que_cierra_un_ciclo(self):
+        response = self.client.patch(
+            f"/api/asignaturas/{self.a.id}/", {"prerrequisitos": [self.c.id]}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ciclo", response.json()["prerrequisitos"][0])
+        self.assertFalse(self.a.prerrequisitos.exists())
+
+    def test_cache_se_invalida_al_cambiar_prerrequisitos(self):
+        url = "/api/asignaturas/grafo/"
+        self.assertEqual(len(self.client.get(url).json()["aristas"]), 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.c.prerrequisitos.add(self.a)
+        self.assertEqual(len(self.client.get(url).json()["aristas"]), 3)
+
+
+class ClonacionPeriodoTests(APITestCase):
+    def setUp(self):
+        from applications.evaluaciones.models import Tarea
+
+        User = get_user_model()
+        self.origen = PeriodoAcademico.objects.create(
+            nombre="2025-II", fecha_inicio=date(2025, 8, 1), fecha_fin=date(2025, 12, 15)
+        )
+        self.destino = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 2, 1), fecha_fin=date(2026, 6, 30)
+        )
+        facultad = Facultad.objects.create(nombre="Ingeniería", codigo="ING")
+        self.carrera = Carrera.objects.create(
+            nombre="Sistemas", codigo="SIS", facultad=facultad, nivel="pregrado", modalidad="presencial"
+        )
+        profesor = User.objects.create_user(username="prof", password="pass1234", rol="profesor")
+        self.a, self.b = [
+            Asignatura.objects.create(nombre=codigo, codigo=codigo, periodo_academico=self.origen, creditos=3)
+            for codigo in ("MAT1", "MAT2")
+        ]
+        for semestre, asignatura in enumerate((self.a, self.b), start=1):
+            PlanCarreraAsignatura.objects.create(carrera=self.carrera, asignatura=asignatura, semestre=semestre)
+        self.b.prerrequisitos.add(self.a)
+        ProfesorAsignatura.objects.create(profesor=profesor, asignatura=self.a)
+        Tarea.objects.create(
+            asignatura=self.a, titulo="Taller 1", descripcion="...", peso_porcentual=10,
+            fecha_publicacion=datetime(2025, 8, 10, tzinfo=timezone.utc),
+            fecha_vencimiento=datetime(2025, 8, 20, tzinfo=timezone.utc), estado="publicada",
+        )
+
+    def _clonar(self, *opciones):
+        salida = StringIO()
+        with mock.patch("applications.academico.signals.send_asignatura_assignment_email.delay") as correo, \
+                self.captureOnCommitCallbacks(execute=True):
+            call_command("clonar_asignaturas_periodo", "2025-II", "2026-I", *opciones, stdout=salida)
+        self.assertFalse(correo.called)
+        return salida.getvalue()
+
+    def test_dry_run_no_escribe(self):
+        salida = self._clonar("--dry-run", "--profesores", "--tareas")
+        self.assertIn("Dry run", salida)
+        self.assertFalse(Asignatura.objects.filter(periodo_academico=self.destino).exists())
+
+    def test_clona_y_remapea_prerrequisitos(self):
+        from applications.evaluaciones.models import Tarea
+
+        self._clonar("--profesores", "--tareas")
+        copias = {a.codigo: a for a in Asignatura.objects.filter(periodo_academico=self.destino)}
+        self.assertEqual(sorted(copias), ["MAT1-2026-I", "MAT2-2026-I"])
+        a, b = copias["MAT1-2026-I"], copias["MAT2-2026-I"]
+        self.assertEqual(list(b.prerrequisitos.all()), [a])
+        self.assertEqual(
+            sorted(PlanCarreraAsignatura.objects.filter(asignatura__in=[a, b]).values_list("asignatura__codigo", "semestre")),
+            [("MAT1-2026-I", 1), ("MAT2-2026-I", 2)],
+        )
+        self.assertTrue(ProfesorAsignatura.objects.filter(asignatura=a, profesor__username="prof").exists())
+        tarea = Tarea.objects.get(asignatura=a)
+        self.assertEqual(tarea.estado, "borrador")
+        self.assertEqual(tarea.fecha_publicacion, datetime(2026, 2, 10, tzinfo=timezone.utc))
+
+        # Una segunda ejecución reutiliza lo ya clonado
+        self._clonar("--profesores", "--tareas")
+        self.assertEqual(Asignatura.objects.filter(periodo_academico=self.destino).count(), 2)
+        self.assertEqual(Tarea.objects.filter(asignatura=a).count(), 1)
+        self.assertEqual(b.prerrequisitos.count(), 1)
+
+
+class MovimientoPeriodoTests(APITestCase):
+    def setUp(self):
+        from applications.evaluaciones.models import Tarea
+        from applications.matriculas.models import Matricula
+
+        User = get_user_model()
+        self.origen = PeriodoAcademico.objects.create(
+            nombre="2025-II", fecha_inicio=date(2025, 8, 1), fecha_fin=date(2025, 12, 15)
+        )
+        self.destino = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2025, 8, 8), fecha_fin=date(2026, 6, 30)
+        )
+        facultad = Facultad.objects.create(nombre="Ingeniería", codigo="ING")
+        carreras = [
+            Carrera.objects.create(
+                nombre=codigo, codigo=codigo, facultad=facultad, nivel="pregrado", modalidad="presencial"
+            )
+            for codigo in ("SIS", "IND")
+        ]
+        self.a, self.b, self.inactiva = [
+            Asignatura.objects.create(
+                nombre=codigo, codigo=codigo, periodo_academico=self.origen, creditos=3, estado=codigo != "INA"
+            )
+            for codigo in ("SIS1", "IND1", "INA")
+        ]
+        for asignatura, carrera in ((self.a, carreras[0]), (self.b, carreras[1]), (self.inactiva, carreras[0])):
+            PlanCarreraAsignatura.objects.create(carrera=carrera, asignatura=asignatura, semestre=1)
+
+        estudiantes = [
+            User.objects.create_user(username=f"est{i}", password="pass1234", rol="estudiante") for i in range(2)
+        ]
+        for estudiante in estudiantes:
+            Matricula.objects.create(estudiante=estudiante, asignatura=self.a, periodo=self.origen)
+        # Ya matriculado en el destino: su matrícula de origen no puede moverse
+        Matricula.objects.create(estudiante=estudiantes[1], asignatura=self.a, periodo=self.destino)
+        self.tarea = Tarea.objects.create(
+            asignatura=self.a, titulo="Taller 1", descripcion="...", peso_porcentual=10,
+            fecha_publicacion=datetime(2025, 9, 1, tzinfo=timezone.utc),
+            fecha_vencimiento=datetime(2025, 9, 20, tzinfo=timezone.utc), estado="publicada",
+        )
+
+    def test_mueve_por_carrera_con_dependientes(self):
+        from applications.matriculas.models import Matricula
+
+        salida = StringIO()
+        call_command(
+            "mover_asignaturas_periodo", "2025-II", "2026-I", "--carrera", "SIS", "--desplazar-fechas", "--lote", "1",
+            stdout=salida,
+        )
+        for asignatura in (self.a, self.b, self.inactiva):
+            asignatura.refresh_from_db()
+        self.assertEqual(self.a.periodo_academico, self.destino)
+        self.assertEqual(self.b.periodo_academico, self.origen)
+        self.assertEqual(self.inactiva.periodo_academico, self.origen)
+
+        self.assertEqual(
+            sorted(Matricula.objects.filter(asignatura=self.a).values_list("estudiante__username", "periodo__nombre")),
+            [("est0", "2026-I"), ("est1", "2025-II"), ("est1", "2026-I")],
+        )
+        self.assertIn("1 matrículas quedan en 2025-II", salida.getvalue())
+
+        self.tarea.refresh_from_db()
+        self.assertEqual(self.tarea.fecha_vencimiento, datetime(2025, 9, 27, tzinfo=timezone.utc))
+        self.assertEqual(
+            sorted(self.tarea.recordatorios_vencimiento.values_list("scheduled_for", flat=True)),
+            [datetime(2025, 9, 24, tzinfo=timezone.utc), datetime(2025, 9, 26, tzinfo=timezone.utc),
+             datetime(2025, 9, 26, tzinfo=timezone.utc)],
+        )
+
+
+class PeriodoActivoCacheTests(APITestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        User = get_user_model()
+        self.client = APIClient()
+        self.p1 = PeriodoAcademico.objects.create(
+            nombre="2025-II", fecha_inicio=date(2025, 8, 1), fecha_fin=date(2025, 12, 15), activo=True
+        )
+        self.p2 = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 2, 1), fecha_fin=date(2026, 6, 30)
+        )
+        self.admin = User.objects.create_superuser(username="admin", password="pass1234", email="a@a.com")
+        self.client.force_authenticate(self.admin)
+
+    def test_activar_deja_un_solo_periodo_activo_y_renueva_la_cache(self):
+        from dataclasses import FrozenInstanceError
+        from applications.academico.services.periodos import periodo_activo
+
+        self.assertEqual(periodo_activo().id, self.p1.id)
+        with self.assertNumQueries(0):
+            activo = periodo_activo()
+        self.assertEqual((activo.id, activo.nombre, activo.activo), (self.p1.id, "2025-II", True))
+        with self.assertRaises(FrozenInstanceError):
+            activo.activo = False
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"/api/periodos-academicos/{self.p2.id}/activar/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(PeriodoAcademico.objects.filter(activo=True)), [self.p2])
+        self.assertEqual(periodo_activo().id, self.p2.id)
+
+        # Guardar otro periodo como activo también desactiva el anterior
+        self.p1.activo = True
+        self.p1.save()
+        self.assertEqual(list(PeriodoAcademico.objects.filter(activo=True)), [self.p1])
+        self.assertEqual(periodo_activo().id, self.p1.id)
+
+        # El listado sin filtros sale del catálogo
+        response = self.client.get("/api/periodos-academicos/")
+        resultados = response.data["results"] if isinstance(response.data, dict) else response.data
+        self.assertEqual([(p["nombre"], p["activo"]) for p in resultados], [("2026-I", False), ("2025-II", True)])
+
+
+class CatalogoAcademicoTests(APITestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        facultad = Facultad.objects.create(nombre="Ingeniería", codigo="ING")
+        self.carrera = Carrera.objects.create(
+            nombre="Sistemas", codigo="SIS", facultad=facultad, nivel="pregrado", modalidad="presencial"
+        )
+        periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30)
+        )
+        self.asignatura = Asignatura.objects.create(nombre="A", codigo="A", periodo_academico=periodo, creditos=3)
+        PlanCarreraAsignatura.objects.create(carrera=self.carrera, asignatura=self.asignatura, semestre=2)
+
+    def test_lecturas_sin_consultas_tras_calentar_e_invalidacion_al_escribir(self):
+        from applications.academico.services import catalogo
+
+        call_command("calentar_catalogo", stdout=StringIO())
+        catalogo.reiniciar_estadisticas()
+        with self.assertNumQueries(0):
+            self.assertEqual(catalogo.carrera(self.carrera.id).nombre, "Sistemas")
+            self.assertEqual(catalogo.facultad(self.carrera.facultad_id).codigo, "ING")
+            self.assertEqual(catalogo.carreras_por_nombre()["sistemas"].id, self.carrera.id)
+            self.assertEqual(
+                [(p.asignatura_id, p.semestre) for p in catalogo.plan_carrera(self.carrera.id)],
+                [(self.asignatura.id, 2)],
+            )
+        self.assertEqual(catalogo.estadisticas()["tasa_aciertos"], 1.0)
+
+        self.carrera.nombre = "Ingeniería de Sistemas"
+        self.carrera.save()
+        self.assertEqual(catalogo.carrera(self.carrera.id).nombre, "Ingeniería de Sistemas")
+        self.assertEqual(catalogo.estadisticas()["fallos"], 1)
+
+    def test_invalidacion_de_otro_proceso_y_caducidad_del_lru(self):
+        from django.core.cache import cache
+        from applications.academico.services import catalogo
+
+        ahora = [1000.0]
+        with mock.patch.object(catalogo.time, "monotonic", lambda: ahora[0]):
+            self.assertEqual(set(catalogo.carreras_por_nombre()), {"sistemas"})
+
+            # Otro worker crea una carrera: solo incrementa la versión en la caché compartida
+            Carrera.objects.bulk_create([Carrera(
+                nombre="Civil", codigo="CIV", facultad_id=self.carrera.facultad_id, nivel="pregrado", modalidad="presencial"
+            )])
+            cache.incr(catalogo.CLAVE_VERSION)
+            self.assertEqual(set(catalogo.carreras_por_nombre()), {"sistemas"})
+            ahora[0] += catalogo.VERSION_LOCAL_TTL
+            self.assertEqual(set(catalogo.carreras_por_nombre()), {"sistemas", "civil"})
+
+            # Sin cambio de versión, el LRU se rellena desde la caché compartida al caducar
+            catalogo.reiniciar_estadisticas()
+            ahora[0] += catalogo.LRU_TTL
+            with self.assertNumQueries(0):
+                catalogo.carreras_por_nombre()
+            self.assertEqual(catalogo.estadisticas()["aciertos_compartida"], 1)
+
+
+class AsignaturaFacultadTests(APITestCase):
+    def test_alcance_sigue_a_los_planes_y_a_la_facultad_de_la_carrera(self):
+        ing = Facultad.objects.create(nombre="Ingeniería", codigo="ING")
+        cie = Facultad.objects.create(nombre="Ciencias", codigo="CIE")
+        sistemas = Carrera.objects.create(
+            nombre="Sistemas", codigo="SIS", facultad=ing, nivel="pregrado", modalidad="presencial"
+        )
+        fisica = Carrera.objects.create(
+            nombre="Física", codigo="FIS", facultad=cie, nivel="pregrado", modalidad="presencial"
+        )
+        periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30)
+        )
+        asignatura = Asignatura.objects.create(nombre="Cálculo", codigo="CAL", periodo_academico=periodo)
+
+        def facultades():
+            return set(AsignaturaFacultad.objects.filter(asignatura=asignatura).values_list("facultad_id", flat=True))
+
+        PlanCarreraAsignatura.objects.create(carrera=sistemas, asignatura=asignatura)
+        plan_fisica = PlanCarreraAsignatura.objects.create(carrera=fisica, asignatura=asignatura)
+        self.assertEqual(facultades(), {ing.id, cie.id})
+
+        plan_fisica.delete()
+        self.assertEqual(facultades(), {ing.id})
+
+        sistemas.facultad = cie
+        sistemas.save()
+        self.assertEqual(facultades(), {cie.id})
+
+        PlanCarreraAsignatura.objects.filter(carrera=sistemas).delete()
+        self.assertEqual(facultades(), set())
+
+
+class LecturaTablasTests(SimpleTestCase):
+    def leer(self, nombre, contenido):
+        with abrir_tabla(nombre, BytesIO(contenido)) as tabla:
+            return tabla.columnas, list(tabla)
+
+    def test_csv_solo_encabezados(self):
+        self.assertEqual(self.leer("a.csv", b"Codigo,Materia\r\n"), (["Codigo", "Materia"], []))
+
+    def test_csv_con_bom_y_punto_y_coma(self):
+        contenido = "Código;Materia;Créditos\nMAT1; Álgebra ;4\n;;\nMAT2;Cálculo\n".encode("utf-8-sig")
+        columnas, filas = self.leer("a.csv", contenido)
+        self.assertEqual(columnas, ["Código", "Materia", "Créditos"])
+        self.assertEqual(filas, [
+            (2, {"Código": "MAT1", "Materia": "Álgebra", "Créditos": "4"}),
+            (4, {"Código": "MAT2", "Materia": "Cálculo", "Créditos": None}),
+        ])
+
+    def test_xlsx_con_filas_vacias_al_final(self):
+        libro = Workbook()
+        hoja = libro.active
+        hoja.append(["Código", "Materia", "Créditos"])
+        hoja.append(["MAT1", "Álgebra", 4.0])
+        hoja.append(["MAT2", "Cálculo", None])
+        # Celdas con formato o solo espacios: openpyxl read_only las devuelve como filas
+        for fila in range(4, 30):
+            hoja.cell(row=fila, column=1, value="  ")
+            hoja.cell(row=fila, column=3).number_format = "0.00"
+        contenido = BytesIO()
+        libro.save(contenido)
+        columnas, filas = self.leer("a.xlsx", contenido.getvalue())
+        self.assertEqual(columnas, ["Código", "Materia", "Créditos"])
+        self.assertEqual(filas, [
+            (2, {"Código": "MAT1", "Materia": "Álgebra", "Créditos": 4}),
+            (3, {"Código": "MAT2", "Materia": "Cálculo", "Créditos": None}),
+        ])
+
+    def test_xls_se_lee_con_pandas(self):
+        hoja = pd.DataFrame([["Código", "Materia"], ["MAT1", float("nan")], [float("nan"), float("nan")]])
+        with mock.patch("pandas.read_excel", return_value=hoja):
+            self.assertEqual(self.leer("a.xls", b"..."), (["Código", "Materia"], [(2, {"Código": "MAT1", "Materia": None})]))
+        with mock.patch("pandas.read_excel", side_effect=ImportError("xlrd")):
+            with self.assertRaisesMessage(ArchivoIlegible, "guarde el archivo como XLSX o CSV"):
+                self.leer("a.xls", b"...")
+        with self.assertRaisesMessage(ArchivoIlegible, "Formato de archivo no soportado (ods)"):
+            self.leer("a.ods", b"...")
+
+
+class ImportacionAsignaturasTests(APITestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        self.facultad = Facultad.objects.create(nombre="Ingeniería", codigo="ING")
+        self.carrera = Carrera.objects.create(
+            nombre="Sistemas", codigo="SIS", facultad=self.facultad, nivel="pregrado", modalidad="presencial"
+        )
+        self.base = Asignatura.objects.create(nombre="Álgebra", codigo="MAT0", periodo_academico=self.periodo)
+        admin = User.objects.create_superuser(username="admin", password="pass1234", email="a@x.com", rol="super_admin")
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def importar(self, dry_run):
+        # PRG2 depende de PRG1, que aparece después y en un semestre posterior: se crea primero igual
+        contenido = (
+            "Carrera,Semestre,Materia,Créditos,Código,Prerrequisitos\n"
+            "Sistemas,1,Programación II,4,PRG2,\"PRG1, MAT0\"\n"
+            "Sistemas,2,Programación I,4,PRG1,XYZ9\n"
+            "Sistemas,3,Repetida,3,PRG1,\n"
+            "Medicina,1,Anatomía,5,MED1,\n"
+        ).encode("utf-8")
+        archivo = SimpleUploadedFile("asignaturas.csv", contenido, content_type="text/csv")
+        with mock.patch("applications.academico.signals.send_asignatura_assignment_email.delay"), \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/asignaturas/importar/",
+                {"archivo": archivo, "dry_run": "true" if dry_run else "false"},
+                format="multipart",
+            )
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_dry_run_valida_sin_escribir(self):
+        datos = self.importar(dry_run=True)
+        self.assertEqual((datos["total"], datos["validas"], datos["invalidas"], datos["creadas"]), (4, 2, 2, 0))
+        self.assertEqual(datos["periodo"], {"id": self.periodo.id, "nombre": "2026-I"})
+        errores = {f["fila"]: f["errores"] for f in datos["filas"]}
+        self.assertIn('Código "PRG1" repetido en el archivo (fila 3)', errores[4])
+        self.assertIn('Carrera "Medicina" no existe', errores[5])
+        advertencias = {f["fila"]: f["advertencias"] for f in datos["filas"]}
+        self.assertEqual(advertencias[3], ["Prerrequisitos no encontrados (se omitirán): XYZ9"])
+        self.assertEqual(Asignatura.objects.count(), 1)
+
+    def test_crea_en_bloque_con_prerrequisitos_y_alcance(self):
+        datos = self.importar(dry_run=False)
+        self.assertEqual(datos["creadas"], 2)
+        prg1, prg2 = Asignatura.objects.get(codigo="PRG1"), Asignatura.objects.get(codigo="PRG2")
+        self.assertEqual(prg2.periodo_academico_id, self.periodo.id)
+        self.assertEqual(set(prg2.prerrequisitos.values_list("codigo", flat=True)), {"PRG1", "MAT0"})
+        self.assertFalse(prg1.prerrequisitos.exists())
+        self.assertEqual(
+            dict(PlanCarreraAsignatura.objects.filter(carrera=self.carrera).values_list("asignatura__codigo", "semestre")),
+            {"PRG1": 2, "PRG2": 1},
+        )
+        self.assertEqual(
+            set(AsignaturaFacultad.objects.filter(facultad=self.facultad).values_list("asignatura_id", flat=True)),
+            {prg1.id, prg2.id},
+        )
+        self.assertTrue(all(f["creada"] for f in datos["filas"] if not f["errores"]))
+
+
+class ImportacionAsincronaTests(APITestCase):
+    CSV = (
+        "Carrera,Semestre,Materia,Créditos,Código,Prerrequisitos\n"
+        "Sistemas,1,Programación I,4,PRG1,\n"
+        "Sistemas,2,Programación II,4,PRG2,PRG1\n"
+        "Sistemas,3,Programación III,4,PRG3,\"PRG2, XYZ9\"\n"
+        "Medicina,1,Anatomía,5,MED1,\n"
+        "Sistemas,0,Semestre cero,4,SEM0,\n"
+    )
+
+    def setUp(self):
+        from applications.academico.tasks import procesar_importacion_asignaturas
+
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        ajustes = override_settings(MEDIA_ROOT=media)
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+        conf = procesar_importacion_asignaturas.app.conf
+        self.addCleanup(setattr, conf, "task_always_eager", conf.task_always_eager)
+        conf.task_always_eager = True
+
+        User = get_user_model()
+        self.periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        facultad = Facultad.objects.create(nombre="Ingeniería", codigo="ING")
+        Carrera.objects.create(nombre="Sistemas", codigo="SIS", facultad=facultad, nivel="pregrado", modalidad="presencial")
+        self.admin = User.objects.create_superuser(username="admin", password="pass1234", email="a@x.com", rol="super_admin")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def importar(self, contenido=None, dry_run=False):
+        archivo = SimpleUploadedFile("asignaturas.csv", (contenido or self.CSV).encode("utf-8"), content_type="text/csv")
+        with mock.patch("applications.academico.signals.send_asignatura_assignment_email.delay"), \
+                self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                "/api/asignaturas/importar/",
+                {"archivo": archivo, "asincrono": "true", "dry_run": "true" if dry_run else "false"},
+                format="multipart",
+            )
+
+    def test_estados_y_progreso_por_bloques(self):
+        from applications.academico.services import trabajos_importacion
+
+        archivo = SimpleUploadedFile("asignaturas.csv", self.CSV.encode("utf-8"))
+        with mock.patch("applications.academico.tasks.procesar_importacion_asignaturas.delay"):
+            importacion, creada = trabajos_importacion.crear_importacion(
+                archivo=archivo, periodo=self.periodo, usuario=self.admin, dry_run=False
+            )
+        self.assertTrue(creada)
+        self.assertEqual(importacion.estado, "pendiente")
+
+        avance = []
+        crear = trabajos_importacion.crear_asignaturas
+
+        def crear_y_anotar(plan, periodo, codigos):
+            avance.append(ImportacionAsignaturas.objects.values_list("estado", "filas_procesadas", "creadas").get())
+            return crear(plan, periodo, codigos)
+
+        with mock.patch.object(trabajos_importacion, "crear_asignaturas", crear_y_anotar):
+            importacion = trabajos_importacion.procesar_importacion(importacion.pk, tamano=2)
+
+        # Las filas se guardan antes de crear; luego un bloque de 2 y otro de 1 en orden topológico
+        self.assertEqual(avance, [("procesando", 5, 0), ("procesando", 5, 2)])
+        self.assertEqual(importacion.estado, "completada")
+        self.assertEqual(
+            (importacion.total_filas, importacion.filas_procesadas, importacion.validas, importacion.invalidas, importacion.creadas),
+            (5, 5, 3, 2, 3),
+        )
+        self.assertIsNotNone(importacion.fecha_inicio)
+        self.assertIsNotNone(importacion.fecha_fin)
+        self.assertEqual(
+            set(importacion.filas.filter(creada=True).values_list("codigo", flat=True)), {"PRG1", "PRG2", "PRG3"}
+        )
+        self.assertEqual(list(Asignatura.objects.get(codigo="PRG3").prerrequisitos.values_list("codigo", flat=True)), ["PRG2"])
+        # La advertencia de PRG3 se conoce al final del archivo, después de guardar su bloque
+        self.assertEqual(importacion.filas.get(codigo="PRG3").advertencias, ["Prerrequisitos no encontrados (se omitirán): XYZ9"])
+
+        # Una segunda entrega de la tarea no la vuelve a procesar
+        self.assertEqual(trabajos_importacion.procesar_importacion(importacion.pk).creadas, 3)
+        self.assertEqual(Asignatura.objects.count(), 3)
+
+    def test_validacion_por_bloques_no_acumula_filas(self):
+        from applications.academico.services.importacion import leer_archivo, mapear_columnas, validar_asignaturas
+
+        bloques = []
+        archivo = SimpleUploadedFile("asignaturas.csv", self.CSV.encode("utf-8"))
+        with leer_archivo(archivo.name, archivo) as tabla, CaptureQueriesContext(connection) as consultas:
+            plan = validar_asignaturas(
+                tabla, mapear_columnas(tabla.columnas), tamano=2,
+                al_validar=lambda filas: bloques.append([f["fila"] for f in filas]),
+            )
+        self.assertEqual(bloques, [[2, 3], [4, 5], [6]])
+        self.assertEqual((plan.filas, plan.total, plan.invalidas), ([], 5, 2))
+        self.assertEqual(plan.orden, ["PRG1", "PRG2", "PRG3"])
+        # Las filas válidas ya entregadas no conservan los datos del archivo
+        self.assertTrue(all("datos" not in v["fila"] for v in plan.validas.values()))
+        self.assertEqual(plan.validas["PRG3"]["fila"]["advertencias"], ["Prerrequisitos no encontrados (se omitirán): XYZ9"])
+        # Una consulta de códigos existentes por bloque
+        self.assertEqual(sum('FROM "academico_asignatura"' in q["sql"] for q in consultas.captured_queries), 3)
+
+    def test_mismo_archivo_devuelve_la_importacion_existente_salvo_si_fallo(self):
+        response = self.importar()
+        self.assertEqual(response.status_code, 202, response.data)
+        self.assertFalse(response.data["duplicada"])
+        importacion = ImportacionAsignaturas.objects.get(pk=response.data["id"])
+        self.assertEqual((importacion.estado, importacion.creadas), ("completada", 3))
+
+        response = self.importar()
+        self.assertEqual((response.status_code, response.data["id"], response.data["duplicada"]), (200, str(importacion.pk), True))
+        # Otro modo es otra importación
+        self.assertEqual(self.importar(dry_run=True).status_code, 202)
+
+        ImportacionAsignaturas.objects.filter(pk=importacion.pk).update(estado="fallida")
+        response = self.importar()
+        self.assertEqual(response.status_code, 202)
+        self.assertNotEqual(response.data["id"], str(importacion.pk))
+        self.assertEqual(ImportacionAsignaturas.objects.count(), 3)
+
+    def test_archivo_invalido_queda_fallida(self):
+        response = self.importar("Nombre,Creditos\nX,3\n")
+        self.assertEqual(response.status_code, 202)
+        detalle = self.client.get(f"/api/importaciones-asignaturas/{response.data['id']}/")
+        self.assertEqual(detalle.data["estado"], "fallida")
+        self.assertIn("Columnas faltantes", detalle.data["error"])
+        self.assertNotIn("Retry-After", detalle)
+
+    def test_filas_paginadas_y_errores_en_ndjson(self):
+        import json
+
+        importacion_id = self.importar(dry_run=True).data["id"]
+        url = f"/api/importaciones-asignaturas/{importacion_id}"
+
+        pagina = self.client.get(f"{url}/filas/?page_size=2")
+        self.assertEqual((pagina.data["count"], len(pagina.data["results"])), (5, 2))
+        self.assertIsNotNone(pagina.data["next"])
+        con_errores = self.client.get(f"{url}/filas/?con_errores=true").data["results"]
+        self.assertEqual({f["codigo"] for f in con_errores}, {"MED1", "SEM0"})
+
+        response = self.client.get(f"{url}/errores/")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lineas = [json.loads(linea) for linea in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual({f["codigo"] for f in lineas}, {"MED1", "SEM0", "PRG3"})
+        self.assertEqual(next(f for f in lineas if f["codigo"] == "PRG3")["advertencias"],
+                         ["Prerrequisitos no encontrados (se omitirán): XYZ9"])
+        self.assertFalse(Asignatura.objects.exists())
+
+        # Otro usuario (no super_admin) no ve la importación
+        otro = get_user_model().objects.create_user(username="coord", password="pass1234", rol="coordinador")
+        self.client.force_authenticate(otro)
+        self.assertEqual(self.client.get(f"{url}/").status_code, 404)
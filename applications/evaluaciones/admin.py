@@ -2,7 +2,7 @@
 Configuración del admin para evaluaciones
 """
 from django.contrib import admin
-from applications.evaluaciones.models import Tarea, EntregaTarea
+from applications.evaluaciones.models import Tarea, EntregaTarea, SubidaEntrega, ContenidoArchivo
 
 
 @admin.register(Tarea)
@@ -53,3 +53,19 @@ class EntregaTareaAdmin(admin.ModelAdmin):
             'fields': ('calificacion', 'comentarios_docente', 'fecha_calificacion')
         }),
     )
+
+
+@admin.register(SubidaEntrega)
+class SubidaEntregaAdmin(admin.ModelAdmin):
+    list_display = ['id', 'estudiante', 'tarea', 'nombre_archivo', 'tamano_recibido', 'tamano_total', 'estado', 'fecha_actualizacion']
+    list_filter = ['estado']
+    search_fields = ['estudiante__username', 'tarea__titulo', 'nombre_archivo']
+    readonly_fields = ['fecha_creacion', 'fecha_actualizacion']
+
+
+@admin.register(ContenidoArchivo)
+class ContenidoArchivoAdmin(admin.ModelAdmin):
+    list_display = ['sha256', 'ruta', 'tamano', 'referencias', 'fecha_ultima_referencia']
+    list_filter = ['referencias']
+    search_fields = ['sha256', 'ruta']
+    readonly_fields = ['ruta', 'sha256', 'tamano', 'referencias', 'fecha_creacion', 'fecha_ultima_referencia']
@@ -0,0 +1,171 @@
+"""
+Paginación por cursor para listados grandes (entregas y tareas).
+
+El CursorPagination de DRF filtra solo por el primer campo del orden y resuelve los empates
+con un OFFSET: con una fecha como primer campo, las filas con la misma fecha se recorren
+(o se saltan/repiten si cambian entre páginas). Aquí el cursor guarda la clave completa
+(fecha, id) de la última fila y la página siguiente es un rango sobre esa clave:
+
+    fecha <= f AND (fecha < f OR (fecha = f AND id < i))
+
+La primera condición acota el recorrido del índice compuesto (-fecha, -id) del modelo y
+la segunda resuelve los empates sin OFFSET. En modo cursor se ignora `?ordering=`. Los
+clientes que no lo piden siguen recibiendo la paginación global por número de página,
+con el orden de la vista.
+"""
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.settings import api_settings
+
+
+def _invertir(ordering):
+    return tuple(campo[1:] if campo.startswith('-') else f'-{campo}' for campo in ordering)
+
+
+class CursorClavePagination(CursorPagination):
+    """
+    Cursor sobre una clave compuesta única (`ordering`, terminada en la clave primaria).
+    Como la posición nunca se repite entre filas, el offset de DRF siempre es 0.
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = ('-id',)
+
+    def get_ordering(self, request, queryset, view):
+        # No se toma el orden de OrderingFilter: el cursor necesita la clave de sus índices
+        return self.ordering
+
+    def _campos(self, queryset):
+        return [queryset.model._meta.get_field(campo.lstrip('-')) for campo in self.ordering]
+
+    def _get_position_from_instance(self, instance, ordering):
+        valores = []
+        for campo in ordering:
+            nombre = campo.lstrip('-')
+            valor = instance[nombre] if isinstance(instance, dict) else getattr(instance, nombre)
+            valores.append(valor.isoformat() if hasattr(valor, 'isoformat') else valor)
+        return json.dumps(valores)
+
+    def _filtro_posicion(self, queryset, posicion, reverse):
+        try:
+            crudos = json.loads(posicion)
+            campos = self._campos(queryset)
+            if not isinstance(crudos, list) or len(crudos) != len(campos):
+                raise ValueError
+            valores = [campo.to_python(valor) for campo, valor in zip(campos, crudos)]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        filtro, iguales = Q(), Q()
+        for campo, valor in zip(self.ordering, valores):
+            nombre = campo.lstrip('-')
+            menor = campo.startswith('-') != reverse
+            filtro |= iguales & Q(**{f'{nombre}__{"lt" if menor else "gt"}': valor})
+            iguales &= Q(**{nombre: valor})
+        # Cota no estricta sobre el primer campo: delimita el rango del índice
+        primero = self.ordering[0].lstrip('-')
+        menor = self.ordering[0].startswith('-') != reverse
+        return Q(**{f'{primero}__{"lte" if menor else "gte"}': valores[0]}) & filtro
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        posicion = self.cursor.position if self.cursor else None
+
+        queryset = queryset.order_by(*(_invertir(self.ordering) if reverse else self.ordering))
+        if posicion is not None:
+            queryset = queryset.filter(self._filtro_posicion(queryset, posicion, reverse))
+
+        resultados = list(queryset[:self.page_size + 1])
+        self.page = resultados[:self.page_size]
+        siguiente = (
+            self._get_position_from_instance(resultados[-1], self.ordering)
+            if len(resultados) > len(self.page) else None
+        )
+
+        # Mismo significado de next/previous que CursorPagination (con offset 0)
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = posicion is not None, siguiente is not None
+            self.next_position, self.previous_position = posicion, siguiente
+        else:
+            self.has_next, self.has_previous = siguiente is not None, posicion is not None
+            self.next_position, self.previous_position = siguiente, posicion
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+
+class CursorOpcionalPagination(BasePagination):
+    """
+    Usa `cursor_class` cuando el cliente envía `cursor`, `page_size` o `paginacion=cursor`;
+    si no (o si envía `page`), delega en DEFAULT_PAGINATION_CLASS por compatibilidad.
+    """
+    cursor_class = CursorClavePagination
+    parametros_cursor = ('cursor', 'page_size')
+
+    def __init__(self):
+        self._paginador = None
+
+    def _usa_cursor(self, request):
+        params = request.query_params
+        if 'page' in params:
+            return False
+        return params.get('paginacion') == 'cursor' or any(p in params for p in self.parametros_cursor)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self._usa_cursor(request):
+            self._paginador = self.cursor_class()
+        else:
+            self._paginador = api_settings.DEFAULT_PAGINATION_CLASS()
+        return self._paginador.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self._paginador.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.cursor_class().get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        return self.cursor_class().get_schema_operation_parameters(view)
+
+    def get_results(self, data):
+        return self._paginador.get_results(data)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self._paginador, 'display_page_controls', False)
+
+    def to_html(self):
+        return self._paginador.to_html()
+
+
+class EntregaCursorPagination(CursorClavePagination):
+    ordering = ('-fecha_entrega', '-id')
+    max_page_size = 200
+
+
+class TareaCursorPagination(CursorClavePagination):
+    ordering = ('-fecha_publicacion', '-id')
+    max_page_size = 100
+
+
+class EntregaPagination(CursorOpcionalPagination):
+    cursor_class = EntregaCursorPagination
+
+
+class TareaPagination(CursorOpcionalPagination):
+    cursor_class = TareaCursorPagination
@@ -7,18 +7,22 @@ from django.urls import path
 from applications.evaluaciones.api.views import (
 	TareaViewSet,
 	EntregaTareaViewSet,
+	SubidaEntregaViewSet,
 	MisTareasEstudianteView,
 	MisCalificacionesEstudianteView,
+	MisCalificacionesProyeccionView,
 	StaffCalificacionesPorAsignaturaView,
 )
 
 router = DefaultRouter()
 router.register(r'tareas', TareaViewSet, basename='tarea')
 router.register(r'entregas', EntregaTareaViewSet, basename='entrega')
+router.register(r'subidas-entrega', SubidaEntregaViewSet, basename='subida-entrega')
 
 # Exportar rutas personalizadas
 mis_tareas_urlpatterns = [
 	path('mis-tareas/', MisTareasEstudianteView.as_view(), name='mis-tareas-estudiante'),
 	path('mis-calificaciones/', MisCalificacionesEstudianteView.as_view(), name='mis-calificaciones-estudiante'),
+	path('mis-calificaciones/proyeccion/', MisCalificacionesProyeccionView.as_view(), name='mis-calificaciones-proyeccion'),
 	path('staff-calificaciones/', StaffCalificacionesPorAsignaturaView.as_view(), name='staff-calificaciones-por-asignatura'),
 ]
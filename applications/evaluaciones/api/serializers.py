@@ -5,8 +5,9 @@ from rest_framework import serializers
 from django.db.models import Sum
 from django.utils import timezone
 from decimal import Decimal
-from applications.evaluaciones.models import Tarea, EntregaTarea
+from applications.evaluaciones.models import Tarea, EntregaTarea, SubidaEntrega
 from applications.academico.models import Asignatura
+from applications.evaluaciones.services.proyeccion import OBJETIVO_APROBACION
 
 
 class TareaSerializer(serializers.ModelSerializer):
@@ -101,6 +102,55 @@ class TareaSerializer(serializers.ModelSerializer):
         return value
 
 
+EXTENSIONES_PERMITIDAS_ENTREGA = ['.pdf', '.doc', '.docx', '.zip', '.rar', '.txt']
+TAMANO_MAXIMO_ENTREGA = 10 * 1024 * 1024  # 10MB
+
+
+def validar_archivo_entrega(nombre, tamano):
+    """Valida tamaño y extensión; se usa antes de recibir el archivo en subidas por partes."""
+    # Validar tamaño (máximo 10MB)
+    if tamano is not None and tamano > TAMANO_MAXIMO_ENTREGA:
+        raise serializers.ValidationError('El archivo no puede superar 10MB.')
+    
+    # Validar extensión
+    nombre = (nombre or '').lower()
+    if not any(nombre.endswith(ext) for ext in EXTENSIONES_PERMITIDAS_ENTREGA):
+        raise serializers.ValidationError(
+            f'Solo se permiten archivos: {", ".join(EXTENSIONES_PERMITIDAS_ENTREGA)}'
+        )
+
+
+def validar_tarea_para_entrega(tarea, estudiante=None):
+    """
+    Reglas para aceptar una nueva entrega sobre `tarea`.
+    Retorna 'tardia' si la entrega se acepta fuera de plazo, o None.
+    """
+    # Validar que la tarea esté publicada
+    if tarea.estado != 'publicada':
+        raise serializers.ValidationError({
+            'tarea': 'No se puede entregar una tarea que no está publicada.'
+        })
+    
+    # Validar fecha de vencimiento
+    estado_entrega = None
+    ahora = timezone.now()
+    if ahora > tarea.fecha_vencimiento:
+        if not tarea.permite_entrega_tardia:
+            raise serializers.ValidationError({
+                'tarea': 'La fecha de vencimiento ya pasó y esta tarea no permite entregas tardías.'
+            })
+        # Marcar como tardía
+        estado_entrega = 'tardia'
+    
+    # Validar que no exista entrega previa
+    if estudiante and EntregaTarea.objects.filter(tarea=tarea, estudiante=estudiante).exists():
+        raise serializers.ValidationError({
+            'tarea': 'Ya has entregado esta tarea anteriormente.'
+        })
+    
+    return estado_entrega
+
+
 class EntregaTareaSerializer(serializers.ModelSerializer):
     """
     Serializer para EntregaTarea con validaciones de fecha y estado
@@ -129,7 +179,7 @@ class EntregaTareaSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'tarea', 'tarea_titulo', 'tarea_vencimiento',
             'asignatura_nombre', 'estudiante', 'estudiante_nombre',
-            'estudiante_username', 'archivo_entrega',
+            'estudiante_username', 'archivo_entrega', 'nombre_archivo',
             'comentarios_estudiante', 'fecha_entrega', 'estado_entrega',
             'calificacion', 'comentarios_docente', 'fecha_calificacion',
             'fue_tardia'
@@ -137,7 +187,7 @@ class EntregaTareaSerializer(serializers.ModelSerializer):
         read_only_fields = [
             'id', 'fecha_entrega', 'estado_entrega', 
             'calificacion', 'comentarios_docente', 'fecha_calificacion',
-            'estudiante'
+            'estudiante', 'nombre_archivo'
         ]
     
     def validate(self, data):
@@ -146,36 +196,10 @@ class EntregaTareaSerializer(serializers.ModelSerializer):
         estudiante = data.get('estudiante')
         
         # Solo validar en creación (no en actualización)
-        if not self.instance:
-            # Validar que la tarea esté publicada
-            if tarea and tarea.estado != 'publicada':
-                raise serializers.ValidationError({
-                    'tarea': 'No se puede entregar una tarea que no está publicada.'
-                })
-            
-            # Validar fecha de vencimiento
-            if tarea:
-                ahora = timezone.now()
-                if ahora > tarea.fecha_vencimiento:
-                    if not tarea.permite_entrega_tardia:
-                        raise serializers.ValidationError({
-                            'tarea': 'La fecha de vencimiento ya pasó y esta tarea no permite entregas tardías.'
-                        })
-                    else:
-                        # Marcar como tardía
-                        data['estado_entrega'] = 'tardia'
-            
-            # Validar que no exista entrega previa
-            if tarea and estudiante:
-                existe = EntregaTarea.objects.filter(
-                    tarea=tarea,
-                    estudiante=estudiante
-                ).exists()
-                
-                if existe:
-                    raise serializers.ValidationError({
-                        'tarea': 'Ya has entregado esta tarea anteriormente.'
-                    })
+        if not self.instance and tarea:
+            estado_entrega = validar_tarea_para_entrega(tarea, estudiante)
+            if estado_entrega:
+                data['estado_entrega'] = estado_entrega
         
         return data
     
@@ -195,16 +219,72 @@ class EntregaTareaSerializer(serializers.ModelSerializer):
     
     def validate_archivo_entrega(self, value):
         """Validar tamaño y tipo de archivo"""
-        # Validar tamaño (máximo 10MB)
-        if value.size > 10 * 1024 * 1024:
-            raise serializers.ValidationError('El archivo no puede superar 10MB.')
-        
-        # Validar extensión
-        extensiones_permitidas = ['.pdf', '.doc', '.docx', '.zip', '.rar', '.txt']
-        nombre = value.name.lower()
-        if not any(nombre.endswith(ext) for ext in extensiones_permitidas):
-            raise serializers.ValidationError(
-                f'Solo se permiten archivos: {", ".join(extensiones_permitidas)}'
-            )
-        
+        validar_archivo_entrega(value.name, value.size)
+        return value
+
+
+class SubidaEntregaSerializer(serializers.ModelSerializer):
+    """
+    Inicio/estado de una subida por partes. El tamaño y la extensión se validan
+    aquí, antes de recibir el primer byte del archivo.
+    """
+    offset = serializers.IntegerField(source='tamano_recibido', read_only=True)
+    chunk_max_bytes = serializers.SerializerMethodField(read_only=True)
+
+    class Meta:
+        model = SubidaEntrega
+        fields = [
+            'id', 'tarea', 'nombre_archivo', 'tamano_total', 'offset', 'chunk_max_bytes',
+            'sha256', 'comentarios_estudiante', 'estado', 'entrega',
+            'fecha_creacion', 'fecha_actualizacion',
+        ]
+        read_only_fields = ['id', 'estado', 'entrega', 'fecha_creacion', 'fecha_actualizacion']
+
+    def get_chunk_max_bytes(self, obj):
+        from django.conf import settings
+        return settings.SUBIDAS_CHUNK_MAX_BYTES
+
+    def validate_sha256(self, value):
+        value = (value or '').strip().lower()
+        if value and (len(value) != 64 or any(c not in '0123456789abcdef' for c in value)):
+            raise serializers.ValidationError('Debe ser un SHA-256 en hexadecimal (64 caracteres).')
         return value
+
+    def validate_tamano_total(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('El tamaño debe ser mayor a 0.')
+        return value
+
+    def validate(self, data):
+        request = self.context.get('request')
+        estudiante = getattr(request, 'user', None)
+        if getattr(estudiante, 'rol', None) != 'estudiante':
+            raise serializers.ValidationError({'estudiante': 'Solo los estudiantes pueden entregar tareas.'})
+
+        try:
+            validar_archivo_entrega(data.get('nombre_archivo'), data.get('tamano_total'))
+        except serializers.ValidationError as e:
+            raise serializers.ValidationError({'nombre_archivo': e.detail})
+
+        validar_tarea_para_entrega(data['tarea'], estudiante)
+        return data
+
+
+class ProyeccionCalificacionesSerializer(serializers.Serializer):
+    """
+    Entrada de POST /api/mis-calificaciones/proyeccion/
+    { "objetivo": 70, "notas_hipoteticas": {"<tarea_id>": 85, ...}, "periodo_id": 1, "asignatura_id": 2 }
+    """
+    objetivo = serializers.FloatField(min_value=0, max_value=100, default=OBJETIVO_APROBACION)
+    notas_hipoteticas = serializers.DictField(
+        child=serializers.FloatField(min_value=0, max_value=100),
+        default=dict,
+    )
+    periodo_id = serializers.IntegerField(required=False, allow_null=True)
+    asignatura_id = serializers.IntegerField(required=False, allow_null=True)
+
+    def validate_notas_hipoteticas(self, value):
+        try:
+            return {int(tarea_id): nota for tarea_id, nota in value.items()}
+        except (TypeError, ValueError):
+            raise serializers.ValidationError('Las claves deben ser IDs de tarea.')
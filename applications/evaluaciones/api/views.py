@@ -1,9 +1,14 @@
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
+from applications.reportes.api.renderers import EXPORT_RENDERER_CLASSES, formato_exportacion
+from applications.academico.services.facultades import asignaturas_de_facultad
 class MisTareasEstudianteView(APIView):
     """
     Endpoint profesional para que el estudiante vea solo tareas de materias con horario asignado.
     GET /api/mis-tareas/
+
+    Soporta GET condicional: con `If-None-Match` igual al ETag vigente responde 304
+    sin consultar ni serializar las tareas.
     """
     permission_classes = [IsAuthenticated]
 
@@ -18,6 +23,14 @@ class MisTareasEstudianteView(APIView):
         if 'estudiante' not in user_roles:
             return Response({'detail': 'Solo estudiantes pueden acceder a este endpoint.'}, status=403)
 
+        from applications.evaluaciones.services.version_estudiante import (
+            con_version, respuesta_no_modificada, version_estudiante,
+        )
+        etag, ultima_modificacion = version_estudiante(user)
+        no_modificada = respuesta_no_modificada(request, etag)
+        if no_modificada is not None:
+            return no_modificada
+
         from applications.matriculas.models import Matricula
         from applications.evaluaciones.models import Tarea
         from applications.evaluaciones.api.serializers import TareaSerializer
@@ -33,7 +46,7 @@ class MisTareasEstudianteView(APIView):
         ).distinct()
 
         serializer = TareaSerializer(tareas, many=True)
-        return Response(serializer.data)
+        return con_version(Response(serializer.data), etag, ultima_modificacion)
 
 
 class MisCalificacionesEstudianteView(APIView):
@@ -45,6 +58,8 @@ class MisCalificacionesEstudianteView(APIView):
     - asignatura + docentes + horario
     - tareas (peso) + calificación del estudiante (si existe)
     - total ponderado y métricas para visualización
+
+    Soporta GET condicional (ETag / If-None-Match -> 304), igual que /api/mis-tareas/.
     """
     permission_classes = [IsAuthenticated]
 
@@ -64,13 +79,22 @@ class MisCalificacionesEstudianteView(APIView):
         from applications.matriculas.models import Matricula
         from applications.evaluaciones.models import Tarea, EntregaTarea
         from applications.academico.models import ProfesorAsignatura
+        from applications.evaluaciones.services.version_estudiante import (
+            con_version, respuesta_no_modificada, version_estudiante,
+        )
 
-        objetivo_aprobacion = 60.0
+        from applications.evaluaciones.services.proyeccion import OBJETIVO_APROBACION
+        objetivo_aprobacion = OBJETIVO_APROBACION
 
         # Filtros opcionales (HU-10): por periodo y/o asignatura
         periodo_id = request.query_params.get('periodo_id')
         asignatura_id = request.query_params.get('asignatura_id')
 
+        etag, ultima_modificacion = version_estudiante(user, periodo_id=periodo_id, asignatura_id=asignatura_id)
+        no_modificada = respuesta_no_modificada(request, etag)
+        if no_modificada is not None:
+            return no_modificada
+
         matriculas = (
             Matricula.objects
             .select_related('asignatura', 'periodo')
@@ -85,10 +109,10 @@ class MisCalificacionesEstudianteView(APIView):
 
         asignaturas_ids = list(matriculas.values_list('asignatura_id', flat=True))
         if not asignaturas_ids:
-            return Response({
+            return con_version(Response({
                 'objetivo_aprobacion': objetivo_aprobacion,
                 'asignaturas': [],
-            })
+            }), etag, ultima_modificacion)
 
         tareas = (
             Tarea.objects
@@ -211,10 +235,38 @@ class MisCalificacionesEstudianteView(APIView):
                 },
             })
 
-        return Response({
+        return con_version(Response({
             'objetivo_aprobacion': objetivo_aprobacion,
             'asignaturas': asignaturas_payload,
-        })
+        }), etag, ultima_modificacion)
+
+
+class MisCalificacionesProyeccionView(APIView):
+    """
+    Proyección de la nota ponderada con notas hipotéticas y/o un objetivo distinto.
+    POST /api/mis-calificaciones/proyeccion/
+    Body: { "objetivo": 70, "notas_hipoteticas": {"<tarea_id>": 85}, "periodo_id": opcional, "asignatura_id": opcional }
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        user = request.user
+
+        # Solo estudiantes
+        user_roles = []
+        if hasattr(user, 'roles') and user.roles.exists():
+            user_roles = [r.tipo for r in user.roles.all()]
+        elif hasattr(user, 'rol'):
+            user_roles = [user.rol]
+        if 'estudiante' not in user_roles:
+            return Response({'detail': 'Solo estudiantes pueden acceder a este endpoint.'}, status=403)
+
+        from applications.evaluaciones.api.serializers import ProyeccionCalificacionesSerializer
+        from applications.evaluaciones.services.proyeccion import proyectar_calificaciones
+
+        serializer = ProyeccionCalificacionesSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(proyectar_calificaciones(user, **serializer.validated_data))
 
 
 class StaffCalificacionesPorAsignaturaView(APIView):
@@ -224,6 +276,7 @@ class StaffCalificacionesPorAsignaturaView(APIView):
     y su estado de calificaciones (ponderado + por tarea).
 
     GET /api/staff-calificaciones/?periodo_id=<opcional>
+    GET /api/staff-calificaciones/?format=csv|xlsx  (exportación; el CSV se envía en streaming)
 
     Reglas clave:
     - La lista de asignaturas se deriva de ProfesorAsignatura ("se crea" al asignar docente).
@@ -232,6 +285,7 @@ class StaffCalificacionesPorAsignaturaView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    renderer_classes = EXPORT_RENDERER_CLASSES
 
     def get(self, request):
         user = request.user
@@ -249,15 +303,12 @@ class StaffCalificacionesPorAsignaturaView(APIView):
         if not (set(user_roles) & allowed_roles):
             return Response({'detail': 'No tienes permisos para ver calificaciones del staff.'}, status=403)
 
-        from applications.academico.models import PeriodoAcademico, ProfesorAsignatura, Asignatura
+        from applications.academico.models import ProfesorAsignatura, Asignatura
+        from applications.academico.services.periodos import obtener_periodo
         from applications.matriculas.models import Matricula
         from applications.evaluaciones.models import Tarea, EntregaTarea
 
-        periodo_id = request.query_params.get('periodo_id')
-        if periodo_id:
-            periodo = PeriodoAcademico.objects.filter(id=periodo_id).first()
-        else:
-            periodo = PeriodoAcademico.objects.filter(activo=True).first()
+        periodo = obtener_periodo(request.query_params.get('periodo_id'))
 
         if not periodo:
             return Response({'detail': 'No hay periodo académico válido (activo o periodo_id).'}, status=400)
@@ -265,7 +316,7 @@ class StaffCalificacionesPorAsignaturaView(APIView):
         pa_qs = (
             ProfesorAsignatura.objects
             .select_related('asignatura', 'profesor')
-            .filter(asignatura__periodo_academico=periodo)
+            .filter(asignatura__periodo_academico_id=periodo.id)
         )
 
         # Alcance por rol (mismo criterio que otras vistas del proyecto)
@@ -276,11 +327,17 @@ class StaffCalificacionesPorAsignaturaView(APIView):
             if not facultad:
                 pa_qs = pa_qs.none()
             else:
-                pa_qs = pa_qs.filter(asignatura__carreras__facultad=facultad).distinct()
+                pa_qs = pa_qs.filter(asignatura_id__in=asignaturas_de_facultad(facultad))
         elif any(r in user_roles for r in ['profesor', 'docente']):
             pa_qs = pa_qs.filter(profesor=user)
 
         asignaturas_ids = list(pa_qs.values_list('asignatura_id', flat=True).distinct())
+
+        formato = formato_exportacion(request)
+        if formato:
+            from applications.evaluaciones.services.libro_calificaciones import exportar_libro_calificaciones
+            return exportar_libro_calificaciones(periodo, asignaturas_ids, formato)
+
         if not asignaturas_ids:
             return Response({
                 'periodo': {'id': periodo.id, 'nombre': str(periodo)},
@@ -312,7 +369,7 @@ class StaffCalificacionesPorAsignaturaView(APIView):
         matriculas = (
             Matricula.objects
             .select_related('estudiante', 'estudiante__carrera', 'asignatura', 'periodo')
-            .filter(periodo=periodo, asignatura_id__in=asignaturas_ids)
+            .filter(periodo_id=periodo.id, asignatura_id__in=asignaturas_ids)
             .distinct()
         )
 
@@ -425,7 +482,7 @@ class StaffCalificacionesPorAsignaturaView(APIView):
 """
 ViewSets para evaluaciones
 """
-from rest_framework import viewsets, filters, status
+from rest_framework import viewsets, filters, status, mixins
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
@@ -434,9 +491,11 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q, Sum
 from django.utils import timezone
 from decimal import Decimal
-from applications.evaluaciones.models import Tarea, EntregaTarea
-from applications.evaluaciones.api.serializers import TareaSerializer, EntregaTareaSerializer
+from applications.evaluaciones.models import Tarea, EntregaTarea, SubidaEntrega
+from applications.evaluaciones.api.serializers import TareaSerializer, EntregaTareaSerializer, SubidaEntregaSerializer
 from applications.evaluaciones.api.permissions import TareaPermission
+from applications.evaluaciones.api.pagination import EntregaPagination, TareaPagination
+from applications.reportes.api.renderers import ZIP_RENDERER_CLASSES
 from applications.evaluaciones.tasks import (
     enviar_notificacion_tarea,
     notificar_docente_nueva_entrega,
@@ -447,13 +506,15 @@ from applications.evaluaciones.tasks import (
 class TareaViewSet(viewsets.ModelViewSet):
     """
     ViewSet para gestionar Tareas y Exámenes
+    Listado paginado por cursor con ?paginacion=cursor / ?cursor= / ?page_size= (máx. 100)
     """
     serializer_class = TareaSerializer
     permission_classes = [TareaPermission]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['asignatura', 'tipo_tarea', 'estado']
     search_fields = ['titulo', 'descripcion', 'asignatura__nombre', 'asignatura__codigo']
-    ordering = ['-fecha_publicacion']
+    ordering = ['-fecha_publicacion', '-id']
+    pagination_class = TareaPagination
 
     def _assert_pesos_total_100_para_publicar(self, *, asignatura, exclude_tarea_id=None, peso_nuevo=None):
         """Exige que el total de pesos de la asignatura sea exactamente 100% al publicar."""
@@ -540,15 +601,15 @@ class TareaViewSet(viewsets.ModelViewSet):
         if 'coordinador' in user_roles:
             if user.facultad:
                 return Tarea.objects.select_related('asignatura').filter(
-                    asignatura__carreras__facultad=user.facultad
-                ).distinct()
+                    asignatura_id__in=asignaturas_de_facultad(user.facultad)
+                )
 
         # Admins ven tareas de su facultad asignada (si tiene)
         if 'admin' in user_roles:
             if user.facultad:
                 return Tarea.objects.select_related('asignatura').filter(
-                    asignatura__carreras__facultad=user.facultad
-                ).distinct()
+                    asignatura_id__in=asignaturas_de_facultad(user.facultad)
+                )
             return Tarea.objects.select_related('asignatura').none()
 
         # Docentes ven solo tareas de SUS asignaturas (vía ProfesorAsignatura)
@@ -702,6 +763,63 @@ class TareaViewSet(viewsets.ModelViewSet):
             'tarea': TareaSerializer(tarea).data
         })
 
+    @action(detail=True, methods=['get'])
+    def estadisticas(self, request, pk=None):
+        """
+        Distribución de calificaciones de la tarea (promedio, mediana, percentiles, histograma...)
+        GET /api/tareas/{id}/estadisticas/
+        """
+        from applications.evaluaciones.services.estadisticas import estadisticas_tarea
+
+        tarea = self.get_object()
+        return Response(estadisticas_tarea(tarea.id))
+
+    @action(detail=False, methods=['get'], url_path='estadisticas')
+    def estadisticas_por_asignatura(self, request):
+        """
+        Estadísticas de todas las tareas de una asignatura en una sola llamada
+        GET /api/tareas/estadisticas/?asignatura_id=<id>
+        """
+        from applications.evaluaciones.services.estadisticas import estadisticas_asignatura
+
+        asignatura_id = request.query_params.get('asignatura_id')
+        if not asignatura_id:
+            return Response(
+                {'error': 'Se requiere el parámetro asignatura_id'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Mismo alcance por rol que el listado de tareas
+        tareas = self.get_queryset().filter(asignatura_id=asignatura_id)
+        return Response({
+            'asignatura_id': asignatura_id,
+            'tareas': estadisticas_asignatura(tareas),
+        })
+
+    @action(detail=True, methods=['get'], url_path=r'entregas\.zip', url_name='entregas-zip',
+            renderer_classes=ZIP_RENDERER_CLASSES)
+    def entregas_zip(self, request, pk=None):
+        """
+        Descarga en un ZIP (generado en streaming) los archivos de todas las entregas
+        GET /api/tareas/{id}/entregas.zip?horario=...&estado_entrega=...
+        """
+        from applications.evaluaciones.services.descargas import exportar_entregas_zip
+
+        tarea = self.get_object()
+        estado_entrega = request.query_params.get('estado_entrega') or None
+        estados_validos = dict(EntregaTarea.ESTADO_CHOICES)
+        if estado_entrega and estado_entrega not in estados_validos:
+            return Response(
+                {'error': f'estado_entrega inválido. Opciones: {", ".join(sorted(estados_validos))}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        return exportar_entregas_zip(
+            tarea,
+            horario=request.query_params.get('horario') or None,
+            estado_entrega=estado_entrega,
+        )
+
 
 class EntregaTareaViewSet(viewsets.ModelViewSet):
     """
@@ -709,13 +827,15 @@ class EntregaTareaViewSet(viewsets.ModelViewSet):
     - Estudiantes: solo pueden crear/ver sus propias entregas
     - Docentes: pueden ver entregas de sus asignaturas y calificar
     - Coordinadores/Admins: pueden ver entregas de su facultad
+    Listado paginado por cursor con ?paginacion=cursor / ?cursor= / ?page_size= (máx. 200)
     """
     serializer_class = EntregaTareaSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['tarea', 'estudiante', 'estado_entrega']
     search_fields = ['estudiante__username', 'estudiante__first_name', 'estudiante__last_name', 'tarea__titulo']
-    ordering = ['-fecha_entrega']
+    ordering = ['-fecha_entrega', '-id']
+    pagination_class = EntregaPagination
     
     def get_queryset(self):
         """
@@ -746,8 +866,8 @@ class EntregaTareaViewSet(viewsets.ModelViewSet):
                 return EntregaTarea.objects.select_related(
                     'tarea', 'tarea__asignatura', 'estudiante'
                 ).filter(
-                    tarea__asignatura__carreras__facultad=user.facultad
-                ).distinct()
+                    tarea__asignatura_id__in=asignaturas_de_facultad(user.facultad)
+                )
         
         # Admin ve entregas de su facultad
         if 'admin' in user_roles:
@@ -755,8 +875,8 @@ class EntregaTareaViewSet(viewsets.ModelViewSet):
                 return EntregaTarea.objects.select_related(
                     'tarea', 'tarea__asignatura', 'estudiante'
                 ).filter(
-                    tarea__asignatura__carreras__facultad=user.facultad
-                ).distinct()
+                    tarea__asignatura_id__in=asignaturas_de_facultad(user.facultad)
+                )
             # Si no tiene facultad, ve todas
             return EntregaTarea.objects.select_related(
                 'tarea', 'tarea__asignatura', 'estudiante'
@@ -865,3 +985,84 @@ class EntregaTareaViewSet(viewsets.ModelViewSet):
             'message': 'Entrega calificada exitosamente',
             'entrega': EntregaTareaSerializer(entrega).data
         })
+
+
+class SubidaEntregaViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.ListModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """
+    Subida reanudable por partes del archivo de una entrega (alternativa a POST /api/entregas/ multipart).
+
+    - POST   /api/subidas-entrega/                 {tarea, nombre_archivo, tamano_total, sha256?, comentarios_estudiante?}
+    - PUT    /api/subidas-entrega/{id}/parte/      cuerpo binario; headers Upload-Offset y X-Chunk-SHA256
+    - GET    /api/subidas-entrega/{id}/            estado y `offset` desde el cual reanudar
+    - POST   /api/subidas-entrega/{id}/completar/  crea la EntregaTarea con el archivo ensamblado
+    - DELETE /api/subidas-entrega/{id}/            cancela la subida
+    """
+    serializer_class = SubidaEntregaSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # Cada estudiante solo ve sus propias subidas
+        return SubidaEntrega.objects.select_related('tarea').filter(estudiante=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(estudiante=self.request.user)
+
+    def perform_destroy(self, instance):
+        from applications.evaluaciones.services.subidas import cancelar_subida
+        cancelar_subida(instance)
+
+    @action(detail=True, methods=['put', 'patch'])
+    def parte(self, request, pk=None):
+        """
+        Agrega una parte en la posición `Upload-Offset` (o ?offset=).
+        Si el offset no coincide responde 409 con el offset correcto para reanudar.
+        """
+        from applications.evaluaciones.services.subidas import agregar_parte
+
+        subida = self.get_object()
+        offset = request.headers.get('Upload-Offset', request.query_params.get('offset'))
+        try:
+            offset = int(offset)
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'Debe indicar el offset de la parte (header Upload-Offset)'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            longitud = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            longitud = 0
+
+        subida = agregar_parte(
+            subida,
+            offset=offset,
+            stream=request.stream,
+            longitud=longitud,
+            checksum=request.headers.get('X-Chunk-SHA256'),
+        )
+        response = Response({
+            'id': subida.id,
+            'offset': subida.tamano_recibido,
+            'tamano_total': subida.tamano_total,
+            'completa': subida.esta_completa,
+        })
+        response['Upload-Offset'] = str(subida.tamano_recibido)
+        return response
+
+    @action(detail=True, methods=['post'])
+    def completar(self, request, pk=None):
+        """Finaliza la subida y adjunta el archivo a una nueva entrega (atómico)."""
+        from applications.evaluaciones.services.subidas import completar_subida
+
+        entrega = completar_subida(self.get_object())
+        return Response(
+            EntregaTareaSerializer(entrega, context=self.get_serializer_context()).data,
+            status=status.HTTP_201_CREATED
+        )
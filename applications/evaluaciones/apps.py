@@ -5,3 +5,6 @@ class EvaluacionesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'applications.evaluaciones'
     verbose_name = 'Evaluaciones'
+
+    def ready(self):
+        from . import signals  # noqa: F401
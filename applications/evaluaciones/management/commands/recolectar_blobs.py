@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+
+from applications.evaluaciones.services.deduplicacion import (
+    LOTE_RECOLECCION,
+    recolectar_blobs,
+    recontar_referencias,
+    reporte_ahorro,
+)
+
+
+def _mb(n):
+    return f'{(n or 0) / (1024 * 1024):.2f} MB'
+
+
+class Command(BaseCommand):
+    help = 'Elimina los archivos deduplicados sin referencias y muestra el ahorro de disco.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=LOTE_RECOLECCION, help='Blobs por lote')
+        parser.add_argument('--recontar', action='store_true', help='Recalcula las referencias desde la base de datos antes de recolectar')
+        parser.add_argument('--dry-run', action='store_true', help='Solo informa lo que se eliminaría')
+        parser.add_argument('--solo-reporte', action='store_true', help='Muestra el reporte de ahorro sin recolectar')
+
+    def handle(self, *args, **options):
+        if not options['solo_reporte']:
+            if options['recontar']:
+                cambios = recontar_referencias(options['batch_size'])
+                self.stdout.write(f'Referencias corregidas: {cambios}')
+
+            res = recolectar_blobs(options['batch_size'], dry_run=options['dry_run'])
+            prefijo = '[dry-run] ' if options['dry_run'] else ''
+            self.stdout.write(self.style.SUCCESS(
+                f"{prefijo}Blobs eliminados: {res['eliminados']} ({_mb(res['bytes_liberados'])}), "
+                f"cuentas corregidas: {res['corregidos']}, archivos sin registro: {res['sin_registro']}"
+            ))
+
+        r = reporte_ahorro()
+        self.stdout.write(
+            f"Blobs: {r['blobs']} | Referencias: {r['referencias']}\n"
+            f"Sin deduplicar: {_mb(r['bytes_logicos'])} | En disco: {_mb(r['bytes_fisicos'])}\n"
+            f"Ahorro: {_mb(r['bytes_ahorrados'])} ({r['porcentaje_ahorro']}%)\n"
+            f"Pendiente de recolectar: {r['blobs_sin_referencias']} blobs ({_mb(r['bytes_recolectables'])})"
+        )
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:05
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluaciones', '0002_entregatarea'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubidaEntrega',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('nombre_archivo', models.CharField(max_length=255)),
+                ('tamano_total', models.PositiveBigIntegerField(help_text='Tamaño total declarado en bytes')),
+                ('tamano_recibido', models.PositiveBigIntegerField(default=0, help_text='Bytes recibidos (offset actual)')),
+                ('sha256', models.CharField(blank=True, default='', help_text='SHA-256 del archivo completo (opcional, se verifica al completar)', max_length=64)),
+                ('comentarios_estudiante', models.TextField(blank=True, null=True)),
+                ('estado', models.CharField(choices=[('iniciada', 'Iniciada'), ('completada', 'Completada'), ('cancelada', 'Cancelada')], default='iniciada', max_length=20)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_actualizacion', models.DateTimeField(auto_now=True)),
+                ('entrega', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='subida', to='evaluaciones.entregatarea')),
+                ('estudiante', models.ForeignKey(help_text='Estudiante que sube el archivo', on_delete=django.db.models.deletion.CASCADE, related_name='subidas_entrega', to=settings.AUTH_USER_MODEL)),
+                ('tarea', models.ForeignKey(help_text='Tarea a la que corresponde la entrega', on_delete=django.db.models.deletion.CASCADE, related_name='subidas', to='evaluaciones.tarea')),
+            ],
+            options={
+                'verbose_name': 'Subida de Entrega',
+                'verbose_name_plural': 'Subidas de Entregas',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['estado', 'fecha_actualizacion'], name='evaluacione_estado_61e883_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:07
+
+import applications.evaluaciones.storage
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluaciones', '0003_subidaentrega'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='entregatarea',
+            name='archivo_entrega',
+            field=models.FileField(help_text='Archivo entregado por el estudiante', storage=applications.evaluaciones.storage.almacenamiento_deduplicado, upload_to='tareas/entregas/%Y/%m/'),
+        ),
+        migrations.AlterField(
+            model_name='tarea',
+            name='archivo_adjunto',
+            field=models.FileField(blank=True, help_text='Archivo adjunto con instrucciones (PDF, DOCX, etc.)', null=True, storage=applications.evaluaciones.storage.almacenamiento_deduplicado, upload_to='tareas/adjuntos/%Y/%m/'),
+        ),
+        migrations.CreateModel(
+            name='ContenidoArchivo',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ruta', models.CharField(help_text='Nombre del archivo en el storage', max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('tamano', models.PositiveBigIntegerField(help_text='Tamaño en bytes')),
+                ('referencias', models.PositiveIntegerField(default=0)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_ultima_referencia', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Contenido de Archivo',
+                'verbose_name_plural': 'Contenidos de Archivos',
+                'ordering': ['-fecha_creacion'],
+                'indexes': [models.Index(fields=['referencias', 'fecha_ultima_referencia'], name='evaluacione_referen_f66cf0_idx')],
+            },
+        ),
+    ]
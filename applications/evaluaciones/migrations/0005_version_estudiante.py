@@ -0,0 +1,28 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluaciones', '0004_contenidoarchivo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entregatarea',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='entregatarea',
+            index=models.Index(fields=['estudiante', 'fecha_actualizacion'], name='evaluacione_estudia_819ead_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['asignatura', 'fecha_actualizacion'], name='evaluacione_asignat_f36c3a_idx'),
+        ),
+    ]
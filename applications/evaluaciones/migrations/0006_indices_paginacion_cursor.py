@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluaciones', '0005_version_estudiante'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='entregatarea',
+            index=models.Index(fields=['-fecha_entrega', '-id'], name='evaluacione_fecha_e_60ca30_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entregatarea',
+            index=models.Index(fields=['tarea', '-fecha_entrega', '-id'], name='evaluacione_tarea_i_e9fff2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['-fecha_publicacion', '-id'], name='evaluacione_fecha_p_c98f50_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(fields=['asignatura', '-fecha_publicacion', '-id'], name='evaluacione_asignat_8d18d0_idx'),
+        ),
+    ]
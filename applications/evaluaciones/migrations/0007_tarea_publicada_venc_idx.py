@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluaciones', '0006_indices_paginacion_cursor'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tarea',
+            index=models.Index(condition=models.Q(('estado', 'publicada')), fields=['estado', 'fecha_vencimiento'], name='tarea_publicada_venc_idx'),
+        ),
+    ]
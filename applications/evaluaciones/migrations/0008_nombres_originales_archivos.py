@@ -0,0 +1,23 @@
+# Generated by Django 5.2.9 on 2026-10-19 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluaciones', '0007_tarea_publicada_venc_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contenidoarchivo',
+            name='nombre_original',
+            field=models.CharField(blank=True, default='', help_text='Nombre con el que se subió por primera vez', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='entregatarea',
+            name='nombre_archivo',
+            field=models.CharField(blank=True, default='', help_text='Nombre original del archivo (en el storage deduplicado se guarda por su digest)', max_length=255),
+        ),
+    ]
@@ -1,10 +1,15 @@
 """
 Modelos de evaluaciones - Tareas y Exámenes
 """
+import os
+import uuid
+
+from django.conf import settings
 from django.db import models
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from applications.academico.models import Asignatura
+from applications.evaluaciones.storage import almacenamiento_deduplicado
 
 
 class Tarea(models.Model):
@@ -69,6 +74,7 @@ class Tarea(models.Model):
     )
     archivo_adjunto = models.FileField(
         upload_to='tareas/adjuntos/%Y/%m/',
+        storage=almacenamiento_deduplicado,
         blank=True,
         null=True,
         help_text='Archivo adjunto con instrucciones (PDF, DOCX, etc.)'
@@ -80,6 +86,18 @@ class Tarea(models.Model):
         verbose_name = 'Tarea'
         verbose_name_plural = 'Tareas'
         ordering = ['-fecha_publicacion']
+        indexes = [
+            models.Index(fields=['asignatura', 'fecha_actualizacion']),
+            # Listados ordenados por (fecha, id): cursor (api/pagination.py) y número de página
+            models.Index(fields=['-fecha_publicacion', '-id']),
+            models.Index(fields=['asignatura', '-fecha_publicacion', '-id']),
+            # Cierre automático de tareas vencidas (tasks.cerrar_tareas_vencidas)
+            models.Index(
+                fields=['estado', 'fecha_vencimiento'],
+                condition=models.Q(estado='publicada'),
+                name='tarea_publicada_venc_idx',
+            ),
+        ]
         constraints = [
             models.CheckConstraint(
                 check=models.Q(peso_porcentual__gte=0) & models.Q(peso_porcentual__lte=100),
@@ -153,8 +171,15 @@ class EntregaTarea(models.Model):
     )
     archivo_entrega = models.FileField(
         upload_to='tareas/entregas/%Y/%m/',
+        storage=almacenamiento_deduplicado,
         help_text='Archivo entregado por el estudiante'
     )
+    nombre_archivo = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        help_text='Nombre original del archivo (en el storage deduplicado se guarda por su digest)'
+    )
     comentarios_estudiante = models.TextField(
         blank=True,
         null=True,
@@ -187,12 +212,20 @@ class EntregaTarea(models.Model):
         null=True,
         help_text='Fecha en que el docente calificó'
     )
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
     
     class Meta:
         verbose_name = 'Entrega de Tarea'
         verbose_name_plural = 'Entregas de Tareas'
         ordering = ['-fecha_entrega']
         unique_together = ('tarea', 'estudiante')  # Un estudiante solo puede entregar una vez
+        indexes = [
+            # Sello de versión de /api/mis-tareas/ y /api/mis-calificaciones/
+            models.Index(fields=['estudiante', 'fecha_actualizacion']),
+            # Listados ordenados por (fecha, id): cursor (api/pagination.py) y número de página
+            models.Index(fields=['-fecha_entrega', '-id']),
+            models.Index(fields=['tarea', '-fecha_entrega', '-id']),
+        ]
         constraints = [
             models.CheckConstraint(
                 check=models.Q(calificacion__isnull=True) | 
@@ -238,3 +271,98 @@ class EntregaTarea(models.Model):
     def fue_tardia(self):
         """Retorna True si la entrega fue realizada después del vencimiento"""
         return self.fecha_entrega > self.tarea.fecha_vencimiento
+
+
+class SubidaEntrega(models.Model):
+    """
+    Sesión de subida por partes (reanudable) de un archivo de entrega.
+    Las partes se agregan a un archivo temporal y al completar se adjunta
+    el archivo ensamblado a una nueva EntregaTarea.
+    """
+    ESTADO_CHOICES = (
+        ('iniciada', 'Iniciada'),
+        ('completada', 'Completada'),
+        ('cancelada', 'Cancelada'),
+    )
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    tarea = models.ForeignKey(
+        Tarea,
+        on_delete=models.CASCADE,
+        related_name='subidas',
+        help_text='Tarea a la que corresponde la entrega'
+    )
+    estudiante = models.ForeignKey(
+        'usuarios.Usuario',
+        on_delete=models.CASCADE,
+        related_name='subidas_entrega',
+        help_text='Estudiante que sube el archivo'
+    )
+    nombre_archivo = models.CharField(max_length=255)
+    tamano_total = models.PositiveBigIntegerField(help_text='Tamaño total declarado en bytes')
+    tamano_recibido = models.PositiveBigIntegerField(default=0, help_text='Bytes recibidos (offset actual)')
+    sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        help_text='SHA-256 del archivo completo (opcional, se verifica al completar)'
+    )
+    comentarios_estudiante = models.TextField(blank=True, null=True)
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='iniciada')
+    entrega = models.OneToOneField(
+        EntregaTarea,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='subida',
+    )
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Subida de Entrega'
+        verbose_name_plural = 'Subidas de Entregas'
+        ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['estado', 'fecha_actualizacion']),
+        ]
+
+    def __str__(self):
+        return f"{self.estudiante_id} - {self.nombre_archivo} ({self.tamano_recibido}/{self.tamano_total})"
+
+    @property
+    def ruta_parcial(self):
+        """Archivo temporal donde se agregan las partes (fuera de MEDIA_ROOT)."""
+        return os.path.join(settings.SUBIDAS_PARCIALES_ROOT, f'{self.id}.part')
+
+    @property
+    def esta_completa(self):
+        return self.tamano_recibido == self.tamano_total
+
+
+class ContenidoArchivo(models.Model):
+    """
+    Blob único (por SHA-256) del almacenamiento deduplicado.
+    `referencias` cuenta los adjuntos/entregas que apuntan a `ruta`; con 0 el blob
+    puede eliminarse en la recolección.
+    """
+    ruta = models.CharField(max_length=255, unique=True, help_text='Nombre del archivo en el storage')
+    nombre_original = models.CharField(
+        max_length=255, blank=True, default='', help_text='Nombre con el que se subió por primera vez'
+    )
+    sha256 = models.CharField(max_length=64, db_index=True)
+    tamano = models.PositiveBigIntegerField(help_text='Tamaño en bytes')
+    referencias = models.PositiveIntegerField(default=0)
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_ultima_referencia = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = 'Contenido de Archivo'
+        verbose_name_plural = 'Contenidos de Archivos'
+        ordering = ['-fecha_creacion']
+        indexes = [
+            models.Index(fields=['referencias', 'fecha_ultima_referencia']),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.referencias} ref.)"
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import os
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from applications.evaluaciones.models import ContenidoArchivo, EntregaTarea, Tarea
+from applications.evaluaciones.storage import PREFIJO_BLOBS, almacenamiento_deduplicado
+
+
+LOTE_RECOLECCION = 500
+
+# Un blob recién subido puede no tener aún su fila confirmada; no se recolecta antes de este margen
+GRACIA_RECOLECCION = timedelta(hours=1)
+
+
+def _referencias_en_bd(rutas=None) -> dict[str, int]:
+    """Cuenta, por ruta de blob, cuántas tareas y entregas lo usan (una consulta agregada por modelo)."""
+    conteo: dict[str, int] = {}
+    for modelo, campo in ((Tarea, 'archivo_adjunto'), (EntregaTarea, 'archivo_entrega')):
+        qs = modelo.objects.filter(**{f'{campo}__startswith': f'{PREFIJO_BLOBS}/'})
+        if rutas is not None:
+            qs = qs.filter(**{f'{campo}__in': rutas})
+        for ruta, n in qs.values_list(campo).annotate(n=Count('pk')).order_by():
+            conteo[ruta] = conteo.get(ruta, 0) + n
+    return conteo
+
+
+def recontar_referencias(batch_size: int = LOTE_RECOLECCION) -> int:
+    """
+    Recalcula `referencias` desde las tablas (repara cuentas desfasadas por altas fallidas
+    o por copias de registros que no pasaron por el storage). Devuelve cuántos blobs cambiaron.
+    """
+    conteo = _referencias_en_bd()
+    cambios = []
+    for contenido in ContenidoArchivo.objects.only('id', 'ruta', 'referencias').iterator(chunk_size=batch_size):
+        real = conteo.get(contenido.ruta, 0)
+        if contenido.referencias != real:
+            contenido.referencias = real
+            cambios.append(contenido)
+    ContenidoArchivo.objects.bulk_update(cambios, ['referencias'], batch_size=batch_size)
+    return len(cambios)
+
+
+def _archivos_blob(storage, limite):
+    """Archivos bajo blobs/ (ruta en el storage, ruta absoluta, tamaño) modificados antes de `limite`."""
+    raiz = storage.path(PREFIJO_BLOBS)
+    limite = limite.timestamp()
+    for directorio, _, archivos in os.walk(raiz):
+        for nombre in archivos:
+            ruta_abs = os.path.join(directorio, nombre)
+            try:
+                info = os.stat(ruta_abs)
+            except OSError:
+                continue
+            if info.st_mtime < limite:
+                ruta = os.path.relpath(ruta_abs, storage.path('')).replace(os.sep, '/')
+                yield ruta, ruta_abs, info.st_size
+
+
+def _barrer_sin_registro(storage, limite, batch_size: int, dry_run: bool, resultado: dict) -> None:
+    """
+    Borra los archivos de blobs/ sin fila en ContenidoArchivo: los de subidas cuya transacción
+    se revirtió después de mover el archivo, y temporales (`blobs/.tmp`) de procesos caídos.
+    """
+    lote = []
+
+    def procesar():
+        con_fila = set(ContenidoArchivo.objects.filter(ruta__in=[r for r, _, _ in lote]).values_list('ruta', flat=True))
+        for ruta, ruta_abs, tamano in lote:
+            if ruta in con_fila:
+                continue
+            if ruta.startswith(f'{PREFIJO_BLOBS}/.tmp/'):
+                if not dry_run:
+                    try:
+                        os.remove(ruta_abs)
+                    except OSError:
+                        continue
+            elif not dry_run and not storage.descartar_sin_registro(ruta):
+                continue
+            resultado['sin_registro'] += 1
+            resultado['bytes_liberados'] += tamano
+        lote.clear()
+
+    for archivo in _archivos_blob(storage, limite):
+        lote.append(archivo)
+        if len(lote) >= batch_size:
+            procesar()
+    if lote:
+        procesar()
+
+
+def recolectar_blobs(batch_size: int = LOTE_RECOLECCION, dry_run: bool = False) -> dict:
+    """
+    Elimina por lotes los blobs sin referencias. Antes de borrar cada lote se verifica contra
+    las tablas que nadie los usa; si alguno sigue en uso se corrige su cuenta en vez de borrarlo.
+    Después barre los archivos de blobs/ que no tienen fila (`sin_registro`).
+    """
+    storage = almacenamiento_deduplicado()
+    limite = timezone.now() - GRACIA_RECOLECCION
+    resultado = {'eliminados': 0, 'bytes_liberados': 0, 'corregidos': 0, 'sin_registro': 0}
+    ultimo_id = 0
+
+    while True:
+        lote = list(
+            ContenidoArchivo.objects
+            .filter(referencias=0, fecha_ultima_referencia__lt=limite, id__gt=ultimo_id)
+            .order_by('id')[:batch_size]
+        )
+        if not lote:
+            break
+        ultimo_id = lote[-1].id
+
+        en_uso = _referencias_en_bd([c.ruta for c in lote])
+        huerfanos = [c for c in lote if c.ruta not in en_uso]
+        for c in lote:
+            if c.ruta in en_uso and not dry_run:
+                ContenidoArchivo.objects.filter(pk=c.pk).update(referencias=en_uso[c.ruta])
+                resultado['corregidos'] += 1
+
+        if not dry_run:
+            eliminados = []
+            for c in huerfanos:
+                # Con la fila bloqueada (como en la subida) y solo si sigue en 0: una subida
+                # concurrente pudo volver a referenciarlo
+                with transaction.atomic():
+                    bloqueado = (
+                        ContenidoArchivo.objects.select_for_update()
+                        .filter(pk=c.pk, referencias=0).values_list('pk', flat=True).first()
+                    )
+                    if bloqueado is None:
+                        continue
+                    ContenidoArchivo.objects.filter(pk=c.pk).delete()
+                    storage.eliminar_blob(c.ruta)
+                eliminados.append(c)
+            huerfanos = eliminados
+
+        resultado['eliminados'] += len(huerfanos)
+        resultado['bytes_liberados'] += sum(c.tamano for c in huerfanos)
+
+    _barrer_sin_registro(storage, limite, batch_size, dry_run, resultado)
+    return resultado
+
+
+def reporte_ahorro() -> dict:
+    """
+    Bytes que ocuparían los archivos sin deduplicar (`bytes_logicos`) frente a los que
+    ocupan en disco (`bytes_fisicos`).
+    """
+    agregados = ContenidoArchivo.objects.aggregate(
+        total_blobs=Count('id'),
+        total_referencias=Sum('referencias'),
+        bytes_fisicos=Sum('tamano'),
+        bytes_logicos=Sum(F('tamano') * F('referencias')),
+    )
+    sin_referencias = ContenidoArchivo.objects.filter(referencias=0).aggregate(
+        blobs=Count('id'), bytes=Sum('tamano')
+    )
+    bytes_fisicos = agregados['bytes_fisicos'] or 0
+    bytes_logicos = agregados['bytes_logicos'] or 0
+    # Los blobs sin referencias aún ocupan disco pero no cuentan como archivos en uso
+    bytes_en_uso = bytes_fisicos - (sin_referencias['bytes'] or 0)
+    ahorro = max(0, bytes_logicos - bytes_en_uso)
+    return {
+        'blobs': agregados['total_blobs'],
+        'referencias': agregados['total_referencias'] or 0,
+        'bytes_logicos': bytes_logicos,
+        'bytes_fisicos': bytes_fisicos,
+        'bytes_ahorrados': ahorro,
+        'porcentaje_ahorro': round(ahorro * 100.0 / bytes_logicos, 2) if bytes_logicos else 0.0,
+        'blobs_sin_referencias': sin_referencias['blobs'],
+        'bytes_recolectables': sin_referencias['bytes'] or 0,
+    }
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import os
+import re
+
+from applications.evaluaciones.models import EntregaTarea
+from applications.evaluaciones.services.libro_calificaciones import ITERATOR_CHUNK_SIZE
+from applications.evaluaciones.storage import AlmacenamientoDeduplicado
+from applications.matriculas.models import Matricula
+from applications.reportes.services.streaming import streaming_zip_response
+
+
+_NO_PERMITIDOS = re.compile(r'[^\w.\-]+')
+
+
+def _limpiar(nombre: str) -> str:
+    return _NO_PERMITIDOS.sub('_', nombre).strip('._') or 'archivo'
+
+
+def _nombre_archivo(entrega: EntregaTarea) -> str:
+    if entrega.nombre_archivo:
+        return entrega.nombre_archivo
+    nombre = entrega.archivo_entrega.name
+    if AlmacenamientoDeduplicado.es_blob(nombre):
+        # Blob subido antes de guardar el nombre original: se usa el id de la entrega
+        return f'entrega_{entrega.id}{os.path.splitext(nombre)[1]}'
+    return os.path.basename(nombre)
+
+
+def entregas_para_zip(tarea, *, horario: str | None = None, estado_entrega: str | None = None):
+    qs = (
+        EntregaTarea.objects
+        .filter(tarea=tarea)
+        .exclude(archivo_entrega='')
+        .select_related('estudiante')
+        .only('id', 'archivo_entrega', 'nombre_archivo', 'fecha_entrega', 'estudiante__username')
+        .order_by('estudiante__username', 'fecha_entrega', 'id')
+    )
+    if estado_entrega:
+        qs = qs.filter(estado_entrega=estado_entrega)
+    if horario:
+        qs = qs.filter(
+            estudiante_id__in=Matricula.objects.filter(
+                asignatura_id=tarea.asignatura_id, horario=horario
+            ).values('estudiante_id')
+        )
+    return qs
+
+
+def exportar_entregas_zip(tarea, *, horario: str | None = None, estado_entrega: str | None = None):
+    """ZIP en streaming con los archivos de las entregas, nombrados `<username>_<archivo>`."""
+    entregas = entregas_para_zip(tarea, horario=horario, estado_entrega=estado_entrega)
+
+    def _entradas():
+        usados: set[str] = set()
+        for e in entregas.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+            nombre = _limpiar(f'{e.estudiante.username}_{_nombre_archivo(e)}')
+            base, ext = os.path.splitext(nombre)
+            n = 2
+            while nombre.lower() in usados:
+                nombre = f'{base}_{n}{ext}'
+                n += 1
+            usados.add(nombre.lower())
+
+            archivo = e.archivo_entrega
+            try:
+                tamano = archivo.storage.size(archivo.name)
+            except OSError:
+                tamano = None
+            yield nombre, tamano, e.fecha_entrega, (lambda a=archivo: a.storage.open(a.name, 'rb'))
+
+    sufijo = f'_{_limpiar(horario)}' if horario else ''
+    return streaming_zip_response(f'entregas_{tarea.asignatura.codigo}_tarea{tarea.id}{sufijo}.zip', _entradas())
@@ -0,0 +1,140 @@
+"""
+Estadísticas de calificaciones por tarea (distribución, percentiles, histograma).
+
+Las calificaciones se traen con `values_list(flat=True)` directo a un arreglo de NumPy y
+el resultado se guarda en caché por tarea. Las señales de EntregaTarea/Tarea borran la
+entrada al confirmarse la transacción que califica, entrega o cambia la tarea; como la
+caché es la compartida de settings.CACHES (Redis), el borrado vale para todos los workers.
+`CACHE_TTL` solo acota escrituras que no pasan por señales (`QuerySet.update`, SQL directo).
+"""
+from __future__ import annotations
+
+import numpy as np
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+
+from applications.evaluaciones.models import EntregaTarea
+
+
+CACHE_TTL = 60 * 10
+PERCENTILES = (10, 25, 50, 75, 90)
+BINS_HISTOGRAMA = 10
+
+
+def _clave(tarea_id) -> str:
+    return f'evaluaciones:estadisticas_tarea:{tarea_id}'
+
+
+def invalidar_estadisticas(tarea_id) -> None:
+    cache.delete(_clave(tarea_id))
+
+
+def _redondear(valor):
+    return None if valor is None else round(float(valor), 2)
+
+
+def _resumen(tarea_id, notas: np.ndarray, conteos: dict) -> dict:
+    total = conteos.get('total', 0)
+    datos = {
+        'tarea_id': tarea_id,
+        'entregas': total,
+        'calificadas': int(notas.size),
+        'pendientes_por_calificar': conteos.get('pendientes', 0),
+        'proporcion_tardias': round(conteos.get('tardias', 0) / total, 4) if total else 0.0,
+        'promedio': None,
+        'mediana': None,
+        'desviacion_estandar': None,
+        'minimo': None,
+        'maximo': None,
+        'percentiles': {f'p{p}': None for p in PERCENTILES},
+        'histograma': [],
+    }
+
+    cantidades, bordes = np.histogram(notas, bins=BINS_HISTOGRAMA, range=(0, 100))
+    datos['histograma'] = [
+        {'desde': float(bordes[i]), 'hasta': float(bordes[i + 1]), 'cantidad': int(cantidades[i])}
+        for i in range(len(cantidades))
+    ]
+    if not notas.size:
+        return datos
+
+    valores_percentiles = np.percentile(notas, PERCENTILES)
+    datos.update({
+        'promedio': _redondear(notas.mean()),
+        'mediana': _redondear(np.median(notas)),
+        # Desviación muestral (n-1); con una sola nota es 0
+        'desviacion_estandar': _redondear(notas.std(ddof=1) if notas.size > 1 else 0.0),
+        'minimo': _redondear(notas.min()),
+        'maximo': _redondear(notas.max()),
+        'percentiles': {f'p{p}': _redondear(v) for p, v in zip(PERCENTILES, valores_percentiles)},
+    })
+    return datos
+
+
+def _conteos(tareas_ids) -> dict:
+    filas = (
+        EntregaTarea.objects
+        .filter(tarea_id__in=tareas_ids)
+        .values('tarea_id')
+        .annotate(
+            total=Count('id'),
+            pendientes=Count('id', filter=Q(calificacion__isnull=True)),
+            tardias=Count('id', filter=Q(fecha_entrega__gt=F('tarea__fecha_vencimiento'))),
+        )
+        .order_by()
+    )
+    return {f.pop('tarea_id'): f for f in filas}
+
+
+def estadisticas_tarea(tarea_id) -> dict:
+    datos = cache.get(_clave(tarea_id))
+    if datos is not None:
+        return datos
+
+    notas = np.fromiter(
+        EntregaTarea.objects
+        .filter(tarea_id=tarea_id, calificacion__isnull=False)
+        .values_list('calificacion', flat=True),
+        dtype=float,
+    )
+    datos = _resumen(tarea_id, notas, _conteos([tarea_id]).get(tarea_id, {}))
+    cache.set(_clave(tarea_id), datos, CACHE_TTL)
+    return datos
+
+
+def estadisticas_por_tareas(tareas_ids) -> list[dict]:
+    """
+    Variante masiva: lo que no está en caché se calcula con una consulta de notas y una de
+    conteos para todas las tareas, agrupando con NumPy.
+    """
+    tareas_ids = list(tareas_ids)
+    en_cache = cache.get_many([_clave(t) for t in tareas_ids])
+    faltantes = [t for t in tareas_ids if _clave(t) not in en_cache]
+
+    if faltantes:
+        filas = np.array(
+            list(
+                EntregaTarea.objects
+                .filter(tarea_id__in=faltantes, calificacion__isnull=False)
+                .values_list('tarea_id', 'calificacion')
+            ),
+            dtype=float,
+        ).reshape(-1, 2)
+        conteos = _conteos(faltantes)
+        nuevos = {}
+        for tarea_id in faltantes:
+            notas = filas[filas[:, 0] == tarea_id, 1]
+            nuevos[_clave(tarea_id)] = _resumen(tarea_id, notas, conteos.get(tarea_id, {}))
+        cache.set_many(nuevos, CACHE_TTL)
+        en_cache.update(nuevos)
+
+    return [en_cache[_clave(t)] for t in tareas_ids]
+
+
+def estadisticas_asignatura(tareas_qs) -> list[dict]:
+    tareas = list(tareas_qs.order_by('fecha_publicacion', 'id').values('id', 'titulo', 'peso_porcentual'))
+    resultados = estadisticas_por_tareas([t['id'] for t in tareas])
+    return [
+        {'titulo': t['titulo'], 'peso_porcentual': float(t['peso_porcentual'] or 0), **datos}
+        for t, datos in zip(tareas, resultados)
+    ]
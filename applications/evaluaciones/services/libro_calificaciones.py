@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+from typing import Iterator
+
+from applications.academico.models import Asignatura
+from applications.evaluaciones.models import EntregaTarea, Tarea
+from applications.matriculas.models import Matricula
+from applications.reportes.services.streaming import streaming_csv_response, streaming_xlsx_response
+
+
+# Tamaño de lote para `.iterator()` (cursor de servidor en PostgreSQL)
+ITERATOR_CHUNK_SIZE = 2000
+
+ENCABEZADO_ESTUDIANTE = ['username', 'nombre', 'email', 'carrera']
+ENCABEZADO_RESUMEN = ['nota_actual_ponderada', 'peso_calificado', 'peso_restante']
+
+
+def _nombre(usuario) -> str:
+    return (usuario.get_full_name() or usuario.username).strip()
+
+
+def resumen_ponderado(tareas, notas: dict) -> tuple[float, float, float]:
+    """(nota_acumulada, peso_calificado, peso_restante) con el mismo criterio que /api/staff-calificaciones/."""
+    nota_acumulada = 0.0
+    peso_calificado = 0.0
+    for t in tareas:
+        cal = notas.get(t.id)
+        if cal is None:
+            continue
+        peso = float(t.peso_porcentual or 0)
+        peso_calificado += peso
+        nota_acumulada += float(cal) * (peso / 100.0)
+    return nota_acumulada, peso_calificado, max(0.0, 100.0 - peso_calificado)
+
+
+def iter_estudiantes_con_notas(periodo, asignatura_id) -> Iterator[tuple[Matricula, dict]]:
+    """
+    Recorre las matrículas de la asignatura junto con las calificaciones de cada estudiante.
+
+    Matrículas y entregas se leen con `.iterator()` ordenadas por estudiante y se cruzan
+    como un merge-join, así que solo se mantiene en memoria un estudiante a la vez.
+    """
+    matriculas = (
+        Matricula.objects
+        .select_related('estudiante', 'estudiante__carrera')
+        .filter(periodo_id=periodo.id, asignatura_id=asignatura_id)
+        .order_by('estudiante_id')
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+    entregas = (
+        EntregaTarea.objects
+        .filter(tarea__asignatura_id=asignatura_id)
+        .order_by('estudiante_id')
+        .values_list('estudiante_id', 'tarea_id', 'calificacion')
+        .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+    )
+
+    pendiente = next(entregas, None)
+    for m in matriculas:
+        notas = {}
+        while pendiente is not None and pendiente[0] < m.estudiante_id:
+            pendiente = next(entregas, None)
+        while pendiente is not None and pendiente[0] == m.estudiante_id:
+            notas[pendiente[1]] = pendiente[2]
+            pendiente = next(entregas, None)
+        yield m, notas
+
+
+def _tareas_asignatura(asignatura_id) -> list[Tarea]:
+    return list(
+        Tarea.objects
+        .filter(asignatura_id=asignatura_id)
+        .only('id', 'titulo', 'peso_porcentual', 'asignatura_id')
+        .order_by('fecha_publicacion', 'id')
+    )
+
+
+def _datos_estudiante(m: Matricula) -> list:
+    est = m.estudiante
+    carrera = getattr(est, 'carrera', None)
+    return [est.username, _nombre(est), est.email, str(carrera) if carrera else '']
+
+
+def _hojas_xlsx(periodo, asignaturas):
+    """Una hoja por asignatura: estudiantes en filas, tareas en columnas."""
+    for asig in asignaturas:
+        tareas = _tareas_asignatura(asig.id)
+        header = (
+            ENCABEZADO_ESTUDIANTE
+            + [f'{t.titulo} ({float(t.peso_porcentual or 0):g}%)' for t in tareas]
+            + ENCABEZADO_RESUMEN
+        )
+
+        def _filas(asig=asig, tareas=tareas):
+            for m, notas in iter_estudiantes_con_notas(periodo, asig.id):
+                nota, peso_cal, peso_rest = resumen_ponderado(tareas, notas)
+                yield (
+                    _datos_estudiante(m)
+                    + [notas.get(t.id) for t in tareas]
+                    + [round(nota, 2), round(peso_cal, 2), round(peso_rest, 2)]
+                )
+
+        yield asig.codigo, header, _filas()
+
+
+def _filas_csv(periodo, asignaturas):
+    """Formato largo: una fila por (asignatura, estudiante, tarea), apto para tablas dinámicas."""
+    for asig in asignaturas:
+        tareas = _tareas_asignatura(asig.id)
+        for m, notas in iter_estudiantes_con_notas(periodo, asig.id):
+            nota, _, _ = resumen_ponderado(tareas, notas)
+            base = [periodo.nombre, asig.codigo, asig.nombre] + _datos_estudiante(m)
+            for t in tareas:
+                yield base + [t.id, t.titulo, float(t.peso_porcentual or 0), notas.get(t.id), round(nota, 2)]
+
+
+def exportar_libro_calificaciones(periodo, asignaturas_ids, formato: str):
+    """Respuesta en streaming (csv/xlsx) del libro de calificaciones del staff."""
+    asignaturas = (
+        Asignatura.objects
+        .filter(id__in=list(asignaturas_ids))
+        .only('id', 'codigo', 'nombre')
+        .order_by('codigo', 'nombre')
+    )
+    nombre_archivo = f'calificaciones_{periodo.nombre}'
+
+    if formato == 'xlsx':
+        return streaming_xlsx_response(f'{nombre_archivo}.xlsx', _hojas_xlsx(periodo, asignaturas.iterator()))
+
+    header = (
+        ['periodo', 'asignatura_codigo', 'asignatura_nombre']
+        + ENCABEZADO_ESTUDIANTE
+        + ['tarea_id', 'tarea_titulo', 'peso_porcentual', 'calificacion', 'nota_actual_ponderada']
+    )
+    return streaming_csv_response(f'{nombre_archivo}.csv', header, _filas_csv(periodo, asignaturas.iterator()))
+
+
+def exportar_entregas_por_grupo(asignatura, matriculas, formato: str):
+    """
+    Exporta estudiantes del grupo y sus entregas (una fila por entrega; estudiantes sin
+    entregas aparecen con las columnas de entrega vacías).
+    """
+    header = ENCABEZADO_ESTUDIANTE[:3] + [
+        'horario', 'tarea_id', 'tarea_titulo', 'estado', 'calificacion',
+        'fecha_entrega', 'archivo', 'comentarios_estudiante', 'comentarios_docente',
+    ]
+
+    def _filas():
+        mats = (
+            matriculas
+            .select_related('estudiante')
+            .order_by('estudiante_id')
+            .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+        )
+        entregas = (
+            EntregaTarea.objects
+            .filter(tarea__asignatura=asignatura, estudiante_id__in=matriculas.values('estudiante_id'))
+            .select_related('tarea')
+            .order_by('estudiante_id', 'tarea__fecha_publicacion', 'tarea_id')
+            .iterator(chunk_size=ITERATOR_CHUNK_SIZE)
+        )
+        pendiente = next(entregas, None)
+        ultimo_id, filas_estudiante = None, []
+        for m in mats:
+            est = m.estudiante
+            if m.estudiante_id != ultimo_id:
+                # Un estudiante puede tener matrículas en varios periodos: se reutilizan sus entregas
+                ultimo_id, filas_estudiante = m.estudiante_id, []
+                while pendiente is not None and pendiente.estudiante_id < m.estudiante_id:
+                    pendiente = next(entregas, None)
+                while pendiente is not None and pendiente.estudiante_id == m.estudiante_id:
+                    e = pendiente
+                    filas_estudiante.append([
+                        e.tarea_id, e.tarea.titulo, e.estado_entrega, e.calificacion, e.fecha_entrega,
+                        e.archivo_entrega.url if e.archivo_entrega else None,
+                        e.comentarios_estudiante, e.comentarios_docente,
+                    ])
+                    pendiente = next(entregas, None)
+
+            base = [est.username, _nombre(est), est.email, m.horario]
+            if not filas_estudiante:
+                yield base + [None] * 8
+            for fila in filas_estudiante:
+                yield base + fila
+
+    nombre_archivo = f'entregas_{asignatura.codigo}'
+    if formato == 'xlsx':
+        return streaming_xlsx_response(f'{nombre_archivo}.xlsx', [(asignatura.codigo, header, _filas())])
+    return streaming_csv_response(f'{nombre_archivo}.csv', header, _filas())
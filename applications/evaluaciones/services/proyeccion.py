@@ -0,0 +1,112 @@
+"""
+Proyección "qué pasaría si" de la nota ponderada del estudiante.
+
+Se hace una sola lectura de matrículas y otra de tareas (peso + calificación del estudiante
+vía subconsulta); el cálculo por asignatura se vectoriza con NumPy (bincount por asignatura),
+así la UI puede recalcular con cada movimiento de un slider sin pedir todo /api/mis-calificaciones/.
+"""
+from __future__ import annotations
+
+import numpy as np
+from django.db.models import OuterRef, Subquery
+
+from applications.evaluaciones.models import EntregaTarea, Tarea
+from applications.matriculas.models import Matricula
+
+
+OBJETIVO_APROBACION = 60.0
+
+
+def _r(valor):
+    return None if valor is None or np.isnan(valor) else round(float(valor), 2)
+
+
+def proyectar_calificaciones(user, *, objetivo=OBJETIVO_APROBACION, notas_hipoteticas=None,
+                             periodo_id=None, asignatura_id=None) -> dict:
+    """
+    `notas_hipoteticas` ({tarea_id: nota}) solo se aplica a tareas aún sin calificar; las que
+    ya tienen nota o no son visibles para el estudiante se informan en `tareas_ignoradas`.
+    """
+    notas_hipoteticas = notas_hipoteticas or {}
+
+    matriculas = (
+        Matricula.objects
+        .filter(estudiante=user, horario__isnull=False)
+        .exclude(horario='')
+    )
+    if periodo_id:
+        matriculas = matriculas.filter(periodo_id=periodo_id)
+    if asignatura_id:
+        matriculas = matriculas.filter(asignatura_id=asignatura_id)
+
+    asignaturas = {}
+    for a_id, codigo, nombre in matriculas.values_list('asignatura_id', 'asignatura__codigo', 'asignatura__nombre'):
+        asignaturas.setdefault(a_id, (codigo, nombre))
+    asignaturas_ids = list(asignaturas)
+
+    calificacion = EntregaTarea.objects.filter(
+        tarea_id=OuterRef('pk'), estudiante=user
+    ).values('calificacion')[:1]
+    filas = list(
+        Tarea.objects
+        .filter(asignatura_id__in=asignaturas_ids)
+        .annotate(nota=Subquery(calificacion))
+        .values_list('id', 'asignatura_id', 'peso_porcentual', 'nota')
+    )
+
+    posicion = {a_id: i for i, a_id in enumerate(asignaturas_ids)}
+    tareas_ids = np.array([f[0] for f in filas], dtype=np.int64)
+    indice = np.array([posicion[f[1]] for f in filas], dtype=np.int64)
+    peso = np.array([float(f[2] or 0) for f in filas], dtype=float)
+    nota = np.array([np.nan if f[3] is None else float(f[3]) for f in filas], dtype=float)
+    hipotetica = np.array([notas_hipoteticas.get(int(t), np.nan) for t in tareas_ids], dtype=float)
+
+    calificada = ~np.isnan(nota)
+    # Las notas hipotéticas no reemplazan calificaciones reales
+    hipotetica[calificada] = np.nan
+    con_hipotesis = ~np.isnan(hipotetica)
+
+    n = len(asignaturas_ids)
+    peso_calificado = np.bincount(indice, weights=peso * calificada, minlength=n)
+    nota_actual = np.bincount(indice, weights=np.nan_to_num(nota) * peso / 100.0, minlength=n)
+    peso_hipotetico = np.bincount(indice, weights=peso * con_hipotesis, minlength=n)
+    aporte_hipotetico = np.bincount(indice, weights=np.nan_to_num(hipotetica) * peso / 100.0, minlength=n)
+    peso_total = np.bincount(indice, weights=peso, minlength=n)
+
+    nota_proyectada = nota_actual + aporte_hipotetico
+    peso_restante = np.maximum(0.0, 100.0 - peso_calificado - peso_hipotetico)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        requerido = np.where(
+            peso_restante > 0,
+            np.maximum(0.0, (objetivo - nota_proyectada) / (peso_restante / 100.0)),
+            np.nan,
+        )
+    maximo_alcanzable = nota_proyectada + peso_restante
+
+    visibles = set(tareas_ids.tolist())
+    aplicadas = set(tareas_ids[con_hipotesis].tolist())
+    ignoradas = sorted(t for t in notas_hipoteticas if t not in aplicadas)
+
+    return {
+        'objetivo': objetivo,
+        'tareas_ignoradas': [
+            {'tarea_id': t, 'motivo': 'ya calificada' if t in visibles else 'no pertenece a tus asignaturas'}
+            for t in ignoradas
+        ],
+        'asignaturas': [
+            {
+                'asignatura': {'id': a_id, 'codigo': asignaturas[a_id][0], 'nombre': asignaturas[a_id][1]},
+                'nota_actual_ponderada': _r(nota_actual[i]),
+                'nota_proyectada': _r(nota_proyectada[i]),
+                'peso_calificado': _r(peso_calificado[i]),
+                'peso_hipotetico': _r(peso_hipotetico[i]),
+                'peso_restante': _r(peso_restante[i]),
+                'peso_total_tareas_asignatura': _r(peso_total[i]),
+                'requerido_promedio_en_restante_para_objetivo': _r(requerido[i]),
+                'maximo_alcanzable': _r(maximo_alcanzable[i]),
+                'alcanza_objetivo': bool(nota_proyectada[i] >= objetivo),
+                'objetivo_alcanzable': bool(maximo_alcanzable[i] >= objetivo),
+            }
+            for i, a_id in enumerate(asignaturas_ids)
+        ],
+    }
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files import File
+from django.db import transaction
+from rest_framework import serializers, status
+from rest_framework.exceptions import APIException
+
+from applications.evaluaciones.api.serializers import validar_archivo_entrega, validar_tarea_para_entrega
+from applications.evaluaciones.models import EntregaTarea, SubidaEntrega
+from applications.evaluaciones.tasks import notificar_docente_nueva_entrega
+
+
+BLOQUE_LECTURA = 64 * 1024
+
+
+class OffsetDesfasado(APIException):
+    """El cliente envió una parte que no continúa donde quedó la subida (debe reanudar desde `offset`)."""
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'El offset no coincide con los bytes ya recibidos.'
+    default_code = 'offset_desfasado'
+
+
+class ParteDemasiadoGrande(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'La parte supera el tamaño máximo permitido.'
+    default_code = 'parte_demasiado_grande'
+
+
+def _tamano_en_disco(ruta: str) -> int:
+    try:
+        return os.path.getsize(ruta)
+    except OSError:
+        return 0
+
+
+def _eliminar_parcial(ruta: str) -> None:
+    try:
+        os.remove(ruta)
+    except OSError:
+        pass
+
+
+def _sha256_archivo(ruta: str) -> str:
+    h = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(BLOQUE_LECTURA), b''):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+def _bloquear(subida_id) -> SubidaEntrega:
+    return SubidaEntrega.objects.select_for_update().get(pk=subida_id)
+
+
+def agregar_parte(subida: SubidaEntrega, *, offset: int, stream, longitud: int, checksum: str | None = None) -> SubidaEntrega:
+    """
+    Agrega `longitud` bytes leídos de `stream` en la posición `offset`.
+
+    El tamaño y el offset se validan antes de leer el cuerpo, y la parte se copia a disco
+    por bloques mientras se calcula su SHA-256: si el checksum no coincide se descarta
+    (truncando el archivo) y el cliente puede reintentar solo esa parte.
+    """
+    if longitud <= 0:
+        raise serializers.ValidationError({'detail': 'La parte está vacía (falta Content-Length).'})
+    if longitud > settings.SUBIDAS_CHUNK_MAX_BYTES:
+        raise ParteDemasiadoGrande(
+            f'Cada parte puede tener como máximo {settings.SUBIDAS_CHUNK_MAX_BYTES} bytes.'
+        )
+
+    with transaction.atomic():
+        subida = _bloquear(subida.pk)
+
+        if subida.estado != 'iniciada':
+            raise serializers.ValidationError({'detail': f'La subida está {subida.estado}.'})
+
+        ruta = subida.ruta_parcial
+        # Si el archivo temporal perdió bytes (p. ej. reinicio del servidor) se reanuda desde lo que hay en disco
+        en_disco = _tamano_en_disco(ruta)
+        if en_disco < subida.tamano_recibido:
+            subida.tamano_recibido = en_disco
+            subida.save(update_fields=['tamano_recibido', 'fecha_actualizacion'])
+
+        if offset != subida.tamano_recibido:
+            raise OffsetDesfasado({'detail': OffsetDesfasado.default_detail, 'offset': subida.tamano_recibido})
+        if offset + longitud > subida.tamano_total:
+            raise serializers.ValidationError({'detail': 'La parte excede el tamaño total declarado.'})
+
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        h = hashlib.sha256()
+        escritos = 0
+        with open(ruta, 'r+b' if os.path.exists(ruta) else 'wb') as f:
+            # Descarta restos de una parte que se escribió pero nunca se confirmó
+            f.truncate(offset)
+            f.seek(offset)
+            while escritos < longitud:
+                bloque = stream.read(min(BLOQUE_LECTURA, longitud - escritos))
+                if not bloque:
+                    break
+                h.update(bloque)
+                f.write(bloque)
+                escritos += len(bloque)
+
+            if escritos != longitud:
+                f.truncate(offset)
+                raise serializers.ValidationError({'detail': 'La parte llegó incompleta; reintente.', 'offset': offset})
+            if checksum and checksum.strip().lower() != h.hexdigest():
+                f.truncate(offset)
+                raise serializers.ValidationError({'detail': 'El checksum SHA-256 de la parte no coincide; reintente.', 'offset': offset})
+
+        subida.tamano_recibido = offset + escritos
+        subida.save(update_fields=['tamano_recibido', 'fecha_actualizacion'])
+
+    return subida
+
+
+def completar_subida(subida: SubidaEntrega) -> EntregaTarea:
+    """
+    Adjunta el archivo ensamblado a una nueva EntregaTarea de forma atómica.
+    Es idempotente: si la subida ya se completó devuelve la entrega existente.
+    Si la transacción se revierte después de guardar el archivo, el blob que quedó sin
+    registro se descarta al salir de ella.
+    """
+    entrega = None
+    try:
+        with transaction.atomic():
+            subida = _bloquear(subida.pk)
+
+            if subida.estado == 'completada' and subida.entrega_id:
+                return subida.entrega
+            if subida.estado != 'iniciada':
+                raise serializers.ValidationError({'detail': f'La subida está {subida.estado}.'})
+
+            ruta = subida.ruta_parcial
+            if not subida.esta_completa or _tamano_en_disco(ruta) != subida.tamano_total:
+                raise serializers.ValidationError({
+                    'detail': 'La subida aún no está completa.',
+                    'offset': min(subida.tamano_recibido, _tamano_en_disco(ruta)),
+                })
+
+            if subida.sha256 and _sha256_archivo(ruta) != subida.sha256.lower():
+                raise serializers.ValidationError({'sha256': 'El SHA-256 del archivo ensamblado no coincide.'})
+
+            validar_archivo_entrega(subida.nombre_archivo, subida.tamano_total)
+            estado_entrega = validar_tarea_para_entrega(subida.tarea, subida.estudiante)
+
+            entrega = EntregaTarea(
+                tarea=subida.tarea,
+                estudiante=subida.estudiante,
+                comentarios_estudiante=subida.comentarios_estudiante,
+                estado_entrega=estado_entrega or 'pendiente',
+                nombre_archivo=subida.nombre_archivo,
+            )
+            with open(ruta, 'rb') as f:
+                entrega.archivo_entrega.save(subida.nombre_archivo, File(f), save=False)
+            try:
+                entrega.save()
+            except DjangoValidationError as e:
+                raise serializers.ValidationError(getattr(e, 'message_dict', {'detail': e.messages}))
+
+            subida.estado = 'completada'
+            subida.entrega = entrega
+            subida.save(update_fields=['estado', 'entrega', 'fecha_actualizacion'])
+
+            transaction.on_commit(lambda: _eliminar_parcial(ruta))
+            transaction.on_commit(lambda: notificar_docente_nueva_entrega.delay(entrega.id))
+    except Exception:
+        # Fuera de la transacción: la referencia ya se revirtió y el archivo solo se borra si nadie más lo usa
+        if entrega is not None and entrega.archivo_entrega.name:
+            entrega.archivo_entrega.storage.descartar_sin_registro(entrega.archivo_entrega.name)
+        raise
+
+    return entrega
+
+
+def cancelar_subida(subida: SubidaEntrega) -> None:
+    with transaction.atomic():
+        subida = _bloquear(subida.pk)
+        if subida.estado == 'completada':
+            raise serializers.ValidationError({'detail': 'La subida ya fue completada.'})
+        subida.estado = 'cancelada'
+        subida.save(update_fields=['estado', 'fecha_actualizacion'])
+        ruta = subida.ruta_parcial
+        transaction.on_commit(lambda: _eliminar_parcial(ruta))
@@ -0,0 +1,98 @@
+"""
+Sello de versión por estudiante para GET condicionales (ETag) de /api/mis-tareas/ y
+/api/mis-calificaciones/.
+
+El sello se calcula con una sola consulta (subconsultas escalares sobre índices
+(estudiante|asignatura, fecha_actualizacion)): máximos de fecha_actualizacion y conteos
+de matrículas, tareas, entregas y docentes asignados. Los conteos detectan borrados, y el
+número de tareas ya publicadas/vencidas cambia el sello cuando `esta_publicada` /
+`esta_vencida` cambian con el paso del tiempo.
+"""
+from __future__ import annotations
+
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Max, Q, Subquery, Value
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from applications.academico.models import ProfesorAsignatura
+from applications.evaluaciones.models import EntregaTarea, Tarea
+from applications.matriculas.models import Matricula
+
+
+def _escalar(qs, agregado):
+    """Subconsulta con un agregado sobre todo `qs` (sin GROUP BY)."""
+    return Subquery(
+        qs.order_by().annotate(_todo=Value(1)).values('_todo').annotate(v=agregado).values('v')[:1]
+    )
+
+
+def version_estudiante(user, *, periodo_id=None, asignatura_id=None) -> tuple[str, object]:
+    """
+    Devuelve (etag, ultima_modificacion) de los datos visibles para el estudiante.
+    Los filtros deben coincidir con los de la vista para que el sello cubra la respuesta.
+    """
+    ahora = timezone.now()
+
+    matriculas = Matricula.objects.filter(estudiante_id=user.pk)
+    if periodo_id:
+        matriculas = matriculas.filter(periodo_id=periodo_id)
+    if asignatura_id:
+        matriculas = matriculas.filter(asignatura_id=asignatura_id)
+    # Todas las matrículas (también sin horario): asignar horario cambia fecha_actualizacion
+    asignaturas = matriculas.filter(horario__isnull=False).exclude(horario='').values('asignatura_id')
+
+    tareas = Tarea.objects.filter(asignatura_id__in=asignaturas)
+    entregas = EntregaTarea.objects.filter(estudiante_id=user.pk, tarea__asignatura_id__in=asignaturas)
+    docentes = ProfesorAsignatura.objects.filter(asignatura_id__in=asignaturas)
+
+    sello = (
+        get_user_model().objects
+        .filter(pk=user.pk)
+        .annotate(
+            m_n=_escalar(matriculas, Count('id')),
+            m_max=_escalar(matriculas, Max('fecha_actualizacion')),
+            t_n=_escalar(tareas, Count('id')),
+            t_max=_escalar(tareas, Max('fecha_actualizacion')),
+            t_publicadas=_escalar(tareas, Count('id', filter=Q(fecha_publicacion__lte=ahora))),
+            t_vencidas=_escalar(tareas, Count('id', filter=Q(fecha_vencimiento__lt=ahora))),
+            e_n=_escalar(entregas, Count('id')),
+            e_max=_escalar(entregas, Max('fecha_actualizacion')),
+            d_n=_escalar(docentes, Count('id')),
+            d_max=_escalar(docentes, Max('id')),
+        )
+        .values_list(
+            'm_n', 'm_max', 't_n', 't_max', 't_publicadas', 't_vencidas', 'e_n', 'e_max', 'd_n', 'd_max'
+        )
+        .first()
+    )
+
+    clave = repr((user.pk, periodo_id, asignatura_id, sello)).encode()
+    etag = '"%s"' % hashlib.sha1(clave).hexdigest()
+    fechas = [f for f in (sello[1], sello[3], sello[7]) if f is not None] if sello else []
+    return etag, max(fechas) if fechas else None
+
+
+def con_version(response, etag: str, ultima_modificacion=None):
+    """Agrega ETag/Last-Modified; `no-cache` obliga a revalidar en cada sondeo."""
+    response['ETag'] = etag
+    if ultima_modificacion is not None:
+        response['Last-Modified'] = http_date(ultima_modificacion.timestamp())
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def respuesta_no_modificada(request, etag: str):
+    """
+    304 si el `If-None-Match` del cliente coincide con el sello actual, o None.
+    Solo se evalúa el ETag: Last-Modified no refleja borrados.
+    """
+    if not request.META.get('HTTP_IF_NONE_MATCH'):
+        return None
+    cabeceras = con_version(HttpResponse(), etag)
+    respuesta = get_conditional_response(request, etag=etag, response=cabeceras)
+    return None if respuesta is cabeceras else respuesta
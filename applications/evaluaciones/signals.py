@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from applications.evaluaciones.models import Tarea, EntregaTarea
+
+
+# Campos de archivo que usan el almacenamiento deduplicado
+CAMPOS_ARCHIVO = {
+    Tarea: 'archivo_adjunto',
+    EntregaTarea: 'archivo_entrega',
+}
+
+
+def _liberar(field_file, nombre: str | None) -> None:
+    if nombre:
+        storage = field_file.storage
+        transaction.on_commit(lambda: storage.liberar(nombre))
+
+
+@receiver(pre_save, sender=Tarea)
+@receiver(pre_save, sender=EntregaTarea)
+def recordar_archivo_anterior(sender, instance, **kwargs):
+    campo = CAMPOS_ARCHIVO[sender]
+    instance._archivo_anterior = None
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and campo not in update_fields:
+        return
+    if instance.pk:
+        instance._archivo_anterior = (
+            sender.objects.filter(pk=instance.pk).values_list(campo, flat=True).first()
+        )
+
+
+@receiver(pre_save, sender=EntregaTarea)
+def recordar_nombre_archivo(sender, instance, **kwargs):
+    # El storage deduplicado nombra el archivo por su digest: se conserva el nombre subido
+    archivo = instance.archivo_entrega
+    if archivo and not archivo._committed:
+        instance.nombre_archivo = os.path.basename(archivo.name)[:255]
+
+
+@receiver(post_save, sender=Tarea)
+@receiver(post_save, sender=EntregaTarea)
+def liberar_archivo_reemplazado(sender, instance, created, **kwargs):
+    anterior = getattr(instance, '_archivo_anterior', None)
+    field_file = getattr(instance, CAMPOS_ARCHIVO[sender])
+    if anterior and anterior != field_file.name:
+        _liberar(field_file, anterior)
+
+
+@receiver(post_delete, sender=Tarea)
+@receiver(post_delete, sender=EntregaTarea)
+def liberar_archivo_eliminado(sender, instance, **kwargs):
+    field_file = getattr(instance, CAMPOS_ARCHIVO[sender])
+    _liberar(field_file, field_file.name)
+
+
+@receiver(post_save, sender=EntregaTarea)
+@receiver(post_delete, sender=EntregaTarea)
+def invalidar_estadisticas_entrega(sender, instance, **kwargs):
+    from applications.evaluaciones.services.estadisticas import invalidar_estadisticas
+    tarea_id = instance.tarea_id
+    transaction.on_commit(lambda: invalidar_estadisticas(tarea_id))
+
+
+@receiver(post_save, sender=Tarea)
+def invalidar_estadisticas_tarea(sender, instance, created, **kwargs):
+    # El vencimiento define qué entregas cuentan como tardías
+    if not created:
+        from applications.evaluaciones.services.estadisticas import invalidar_estadisticas
+        tarea_id = instance.pk
+        transaction.on_commit(lambda: invalidar_estadisticas(tarea_id))
@@ -0,0 +1,159 @@
+"""
+Almacenamiento direccionado por contenido para adjuntos de tareas y entregas.
+
+Cada archivo se guarda una sola vez bajo su SHA-256 (`blobs/ab/cd/<sha256><ext>`) y
+ContenidoArchivo lleva la cuenta de cuántos registros lo usan, junto con el nombre con el
+que se subió por primera vez (cada entrega guarda además el suyo en `nombre_archivo`).
+Subir un archivo idéntico solo incrementa la referencia; borrar la decrementa y el archivo
+físico lo elimina después la recolección por lotes (services/deduplicacion.py). La subida
+y la recolección bloquean la fila del blob (`select_for_update`) para comprobar el archivo
+en disco y cambiar la cuenta, así que la recolección no puede borrar un blob que se acaba
+de volver a referenciar.
+
+La fila y la cuenta forman parte de la transacción del que guarda o borra; el archivo no.
+Si esa transacción se revierte, el archivo recién movido queda en disco sin fila: quien
+conoce el fallo lo descarta con `descartar_sin_registro` (ver `completar_subida`) y, si no,
+lo barre la recolección. Por lo mismo `delete` resta la referencia al confirmar, como las
+señales de evaluaciones.
+
+Los archivos anteriores (`tareas/adjuntos/...`, `tareas/entregas/...`) se siguen leyendo
+y borrando igual que con FileSystemStorage.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+
+PREFIJO_BLOBS = 'blobs'
+
+
+@deconstructible
+class AlmacenamientoDeduplicado(FileSystemStorage):
+
+    def _contenidos(self):
+        return apps.get_model('evaluaciones', 'ContenidoArchivo').objects
+
+    @staticmethod
+    def es_blob(name: str | None) -> bool:
+        return bool(name) and name.replace('\\', '/').startswith(f'{PREFIJO_BLOBS}/')
+
+    @staticmethod
+    def ruta_blob(digest: str, nombre_original: str) -> str:
+        ext = os.path.splitext(nombre_original)[1].lower()[:16]
+        return f'{PREFIJO_BLOBS}/{digest[:2]}/{digest[2:4]}/{digest}{ext}'
+
+    def get_available_name(self, name, max_length=None):
+        # El nombre definitivo depende del contenido; se decide en _save
+        return name
+
+    def _save(self, name, content):
+        """
+        Copia el contenido a un temporal por bloques calculando el SHA-256 al vuelo. Luego,
+        con la fila del blob bloqueada, suma la referencia y mueve el temporal a su ruta
+        definitiva si ese contenido no está en disco.
+        """
+        tmp_dir = self.path(os.path.join(PREFIJO_BLOBS, '.tmp'))
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        h = hashlib.sha256()
+        tamano = 0
+        if hasattr(content, 'seek') and hasattr(content, 'seekable') and content.seekable():
+            content.seek(0)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in content.chunks():
+                    h.update(chunk)
+                    tmp.write(chunk)
+                    tamano += len(chunk)
+
+            ruta = self.ruta_blob(h.hexdigest(), name)
+            with transaction.atomic():
+                self._referenciar(ruta, h.hexdigest(), tamano, os.path.basename(name))
+                destino = self.path(ruta)
+                if not os.path.exists(destino):
+                    os.makedirs(os.path.dirname(destino), exist_ok=True)
+                    if self.file_permissions_mode is not None:
+                        os.chmod(tmp_path, self.file_permissions_mode)
+                    # Atómico: dos subidas simultáneas del mismo contenido escriben bytes idénticos
+                    os.replace(tmp_path, destino)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return ruta
+
+    def _referenciar(self, ruta: str, digest: str, tamano: int, nombre_original: str) -> None:
+        """Suma una referencia al blob dejando su fila bloqueada hasta el final de la transacción."""
+        ahora = timezone.now()
+        contenidos = self._contenidos()
+        while True:
+            if contenidos.select_for_update().filter(ruta=ruta).values_list('pk', flat=True).first():
+                contenidos.filter(ruta=ruta).update(
+                    referencias=F('referencias') + 1, fecha_ultima_referencia=ahora
+                )
+                return
+            try:
+                with transaction.atomic():
+                    contenidos.create(
+                        ruta=ruta, sha256=digest, tamano=tamano, referencias=1,
+                        nombre_original=nombre_original[:255],
+                    )
+                return
+            except IntegrityError:
+                # Otra subida del mismo contenido creó el registro primero: se bloquea el suyo
+                continue
+
+    def liberar(self, name: str | None) -> None:
+        """Quita una referencia a un blob; los archivos heredados no se tocan."""
+        if not self.es_blob(name):
+            return
+        self._contenidos().filter(ruta=name, referencias__gt=0).update(
+            referencias=F('referencias') - 1, fecha_ultima_referencia=timezone.now()
+        )
+
+    def delete(self, name):
+        if self.es_blob(name):
+            # El archivo puede estar compartido: se elimina en la recolección de blobs sin referencias
+            transaction.on_commit(lambda: self.liberar(name))
+            return
+        super().delete(name)
+
+    def descartar_sin_registro(self, name: str) -> bool:
+        """
+        Borra el archivo de un blob que no tiene fila en ContenidoArchivo (p. ej. porque la
+        transacción que lo subió se revirtió). Se inserta una fila provisional para tomar el
+        mismo candado que `_referenciar`: si otra subida del mismo contenido ya la tiene, el
+        archivo es suyo y no se toca. Devuelve si se borró.
+        """
+        if not self.es_blob(name):
+            return False
+        try:
+            with transaction.atomic():
+                provisional = self._contenidos().create(
+                    ruta=name, sha256=os.path.basename(name)[:64], tamano=0, referencias=0
+                )
+                super().delete(name)
+                provisional.delete()
+        except IntegrityError:
+            return False
+        return True
+
+    def eliminar_blob(self, name: str) -> None:
+        """Borra físicamente un blob (solo desde la recolección)."""
+        super().delete(name)
+
+
+_almacenamiento = AlmacenamientoDeduplicado()
+
+
+def almacenamiento_deduplicado():
+    return _almacenamiento
@@ -1,10 +1,18 @@
 """
 Tareas Celery para notificaciones de evaluaciones
 """
+import logging
+import os
+from datetime import timedelta
+
 from celery import shared_task
 from django.core.mail import send_mail
 from django.conf import settings
-from applications.evaluaciones.models import Tarea, EntregaTarea
+from django.utils import timezone
+from applications.evaluaciones.models import Tarea, EntregaTarea, SubidaEntrega
+
+
+logger = logging.getLogger(__name__)
 
 
 @shared_task
@@ -218,3 +226,83 @@ Sistema de Gestión Académica
         return f"Notificación enviada al estudiante {estudiante_email}"
     except Exception as e:
         return f"Error al enviar email: {str(e)}"
+
+
+@shared_task
+def limpiar_subidas_abandonadas(batch_size=500):
+    """
+    Cancela subidas por partes sin actividad y borra sus archivos temporales.
+    (Programada con Celery Beat)
+    """
+    limite = timezone.now() - timedelta(hours=settings.SUBIDAS_EXPIRACION_HORAS)
+    abandonadas = list(
+        SubidaEntrega.objects
+        .filter(estado='iniciada', fecha_actualizacion__lt=limite)
+        .order_by('fecha_actualizacion')[:batch_size]
+    )
+    if not abandonadas:
+        return "Sin subidas abandonadas"
+
+    for subida in abandonadas:
+        try:
+            os.remove(subida.ruta_parcial)
+        except OSError:
+            pass
+
+    canceladas = SubidaEntrega.objects.filter(
+        id__in=[s.id for s in abandonadas],
+        estado='iniciada',
+    ).update(estado='cancelada', fecha_actualizacion=timezone.now())
+    return f"Canceladas {canceladas} subidas abandonadas"
+
+
+@shared_task
+def recolectar_blobs_sin_referencias(batch_size=500):
+    """
+    Elimina por lotes los archivos deduplicados que ya no usa ninguna tarea ni entrega.
+    (Programada con Celery Beat)
+    """
+    from applications.evaluaciones.services.deduplicacion import recolectar_blobs
+
+    res = recolectar_blobs(batch_size)
+    return f"Eliminados {res['eliminados']} blobs ({res['bytes_liberados']} bytes)"
+
+
+@shared_task
+def cerrar_tareas_vencidas(batch_size=1000):
+    """
+    Cierra las tareas publicadas cuyo vencimiento ya pasó y que no aceptan entregas tardías.
+    Cada lote es un único UPDATE ... WHERE id IN (SELECT ... LIMIT batch_size), apoyado en el
+    índice parcial (estado='publicada', fecha_vencimiento). (Programada con Celery Beat)
+    """
+    ahora = timezone.now()
+    vencidas = Tarea.objects.filter(
+        estado='publicada',
+        permite_entrega_tardia=False,
+        fecha_vencimiento__lt=ahora,
+    )
+
+    cerradas = 0
+    lotes = 0
+    while True:
+        lote = vencidas.order_by('fecha_vencimiento').values('pk')[:batch_size]
+        # update() no dispara auto_now: se actualiza la fecha para invalidar los ETag de estudiantes
+        actualizadas = Tarea.objects.filter(pk__in=lote, estado='publicada').update(
+            estado='cerrada', fecha_actualizacion=ahora
+        )
+        if not actualizadas:
+            break
+        cerradas += actualizadas
+        lotes += 1
+        if actualizadas < batch_size:
+            break
+
+    resultado = {
+        'cerradas': cerradas,
+        'lotes': lotes,
+        'vencidas_con_entrega_tardia': Tarea.objects.filter(
+            estado='publicada', fecha_vencimiento__lt=ahora
+        ).count(),
+    }
+    logger.info('cerrar_tareas_vencidas: %s', resultado)
+    return resultado
@@ -0,0 +1,677 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import zipfile
+from datetime import date, timedelta
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase, APIClient
+
+from applications.academico.models import Asignatura, PeriodoAcademico, ProfesorAsignatura
+from applications.evaluaciones.models import ContenidoArchivo, Tarea, EntregaTarea
+from applications.matriculas.models import Matricula
+from applications.reportes.services.streaming import XLSX_CONTENT_TYPE
+
+
+class GetCondicionalEstudianteTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+
+        self.periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        self.asignatura = Asignatura.objects.create(
+            nombre="Algoritmos", codigo="ALG-01", periodo_academico=self.periodo, creditos=3
+        )
+        self.estudiante = User.objects.create_user(username="est1", password="pass1234", rol="estudiante")
+        Matricula.objects.create(
+            estudiante=self.estudiante, asignatura=self.asignatura, periodo=self.periodo, horario="Lunes 8-10"
+        )
+        self.client.force_authenticate(self.estudiante)
+
+    def _crear_tareas(self, n):
+        ahora = timezone.now()
+        inicio = Tarea.objects.count()
+        return [
+            Tarea.objects.create(
+                asignatura=self.asignatura,
+                titulo=f"Tarea {inicio + i}",
+                peso_porcentual=1,
+                fecha_publicacion=ahora - timedelta(days=1),
+                fecha_vencimiento=ahora + timedelta(days=7),
+                estado="publicada",
+            )
+            for i in range(n)
+        ]
+
+    def _consultas_sondeo(self, url):
+        etag = self.client.get(url)["ETag"]
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        return len(ctx)
+
+    def test_sondeo_304_con_consultas_constantes(self):
+        for url in ("/api/mis-tareas/", "/api/mis-calificaciones/"):
+            self._crear_tareas(2)
+            pocas = self._consultas_sondeo(url)
+            self._crear_tareas(30)
+            muchas = self._consultas_sondeo(url)
+            self.assertEqual(pocas, muchas, url)
+
+    def test_etag_cambia_con_tareas_y_calificaciones(self):
+        tarea = self._crear_tareas(1)[0]
+        url = "/api/mis-calificaciones/"
+        etag = self.client.get(url)["ETag"]
+
+        entrega = EntregaTarea.objects.create(tarea=tarea, estudiante=self.estudiante, archivo_entrega="x.pdf")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+
+        entrega.calificacion = 90
+        entrega.estado_entrega = "calificada"
+        entrega.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["asignaturas"][0]["tareas"][0]["nota"], 90.0)
+
+        Tarea.objects.filter(pk=tarea.pk).delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["asignaturas"][0]["tareas"], [])
+
+
+
+
+class CierreTareasVencidasTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        self.asignatura = Asignatura.objects.create(
+            nombre="Algoritmos", codigo="ALG-01", periodo_academico=periodo, creditos=3
+        )
+        self.estudiante = get_user_model().objects.create_user(username="est1", password="pass1234", rol="estudiante")
+        Matricula.objects.create(estudiante=self.estudiante, asignatura=self.asignatura, periodo=periodo, horario="Lunes 8-10")
+        self.client.force_authenticate(self.estudiante)
+
+    def crear(self, titulo, vence_en, tardia=False, estado="publicada"):
+        ahora = timezone.now()
+        return Tarea.objects.create(
+            asignatura=self.asignatura, titulo=titulo, peso_porcentual=1, estado=estado,
+            fecha_publicacion=ahora - timedelta(days=10), fecha_vencimiento=ahora + vence_en,
+            permite_entrega_tardia=tardia,
+        )
+
+    def test_cierra_por_lotes_solo_las_vencidas_sin_entrega_tardia(self):
+        from applications.evaluaciones.tasks import cerrar_tareas_vencidas
+
+        vencidas = [self.crear(f"Vencida {i}", -timedelta(days=i + 1)) for i in range(5)]
+        tardia = self.crear("Tardía", -timedelta(days=1), tardia=True)
+        futura = self.crear("Futura", timedelta(days=3))
+        borrador = self.crear("Borrador", -timedelta(days=1), estado="borrador")
+        Tarea.objects.update(fecha_actualizacion=timezone.now() - timedelta(hours=1))
+        antes = {t.pk: t.fecha_actualizacion for t in Tarea.objects.all()}
+        etag = self.client.get("/api/mis-tareas/")["ETag"]
+
+        resultado = cerrar_tareas_vencidas(batch_size=2)
+
+        self.assertEqual(resultado, {"cerradas": 5, "lotes": 3, "vencidas_con_entrega_tardia": 1})
+        estados = dict(Tarea.objects.values_list("pk", "estado"))
+        self.assertEqual({estados[t.pk] for t in vencidas}, {"cerrada"})
+        self.assertEqual((estados[tardia.pk], estados[futura.pk], estados[borrador.pk]), ("publicada", "publicada", "borrador"))
+        for tarea in Tarea.objects.all():
+            if tarea.estado == "cerrada":
+                self.assertGreater(tarea.fecha_actualizacion, antes[tarea.pk])
+            else:
+                self.assertEqual(tarea.fecha_actualizacion, antes[tarea.pk])
+        self.assertEqual(self.client.get("/api/mis-tareas/", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        # Sin vencidas pendientes no hay lotes
+        self.assertEqual(cerrar_tareas_vencidas(batch_size=2)["lotes"], 0)
+
+
+class EstadisticasTareaTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        User = get_user_model()
+        periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        asignatura = Asignatura.objects.create(nombre="Algoritmos", codigo="ALG-01", periodo_academico=periodo, creditos=3)
+        ahora = timezone.now()
+        self.tareas = [
+            Tarea.objects.create(
+                asignatura=asignatura, titulo=f"Tarea {i}", peso_porcentual=10, estado="publicada",
+                fecha_publicacion=ahora - timedelta(days=5), fecha_vencimiento=ahora + timedelta(days=5),
+            )
+            for i in range(3)
+        ]
+        self.estudiantes = [
+            User.objects.create_user(username=f"est{i}", password="pass1234", rol="estudiante") for i in range(6)
+        ]
+        self.entregas = [
+            EntregaTarea.objects.create(tarea=self.tareas[0], estudiante=e, archivo_entrega="x.pdf", calificacion=nota)
+            for e, nota in zip(self.estudiantes, (50, 60, 70, 80, 90, None))
+        ]
+        EntregaTarea.objects.create(tarea=self.tareas[1], estudiante=self.estudiantes[0], archivo_entrega="x.pdf", calificacion=75)
+        # Una entrega tardía
+        EntregaTarea.objects.filter(pk=self.entregas[5].pk).update(fecha_entrega=ahora + timedelta(days=6))
+
+    def test_distribucion_de_un_conjunto_conocido(self):
+        from applications.evaluaciones.services.estadisticas import estadisticas_tarea
+
+        datos = estadisticas_tarea(self.tareas[0].id)
+        self.assertEqual(
+            {k: datos[k] for k in ("entregas", "calificadas", "pendientes_por_calificar", "promedio", "mediana",
+                                   "desviacion_estandar", "minimo", "maximo")},
+            {"entregas": 6, "calificadas": 5, "pendientes_por_calificar": 1, "promedio": 70.0, "mediana": 70.0,
+             "desviacion_estandar": 15.81, "minimo": 50.0, "maximo": 90.0},
+        )
+        self.assertEqual(datos["proporcion_tardias"], round(1 / 6, 4))
+        self.assertEqual(datos["percentiles"], {"p10": 54.0, "p25": 60.0, "p50": 70.0, "p75": 80.0, "p90": 86.0})
+        self.assertEqual(len(datos["histograma"]), 10)
+        self.assertEqual([b["cantidad"] for b in datos["histograma"]], [0, 0, 0, 0, 0, 1, 1, 1, 1, 1])
+        self.assertEqual((datos["histograma"][9]["desde"], datos["histograma"][9]["hasta"]), (90.0, 100.0))
+
+    def test_sin_notas_y_con_una_sola(self):
+        from applications.evaluaciones.services.estadisticas import estadisticas_por_tareas, estadisticas_tarea
+
+        vacia, una = estadisticas_tarea(self.tareas[2].id), estadisticas_tarea(self.tareas[1].id)
+        self.assertEqual((vacia["entregas"], vacia["calificadas"], vacia["proporcion_tardias"]), (0, 0, 0.0))
+        self.assertIsNone(vacia["promedio"])
+        self.assertEqual(set(vacia["percentiles"].values()), {None})
+        self.assertEqual(sum(b["cantidad"] for b in vacia["histograma"]), 0)
+        self.assertEqual((una["promedio"], una["mediana"], una["desviacion_estandar"]), (75.0, 75.0, 0.0))
+        self.assertEqual(set(una["percentiles"].values()), {75.0})
+
+        # La variante masiva da lo mismo que la individual
+        cache.clear()
+        masivas = estadisticas_por_tareas([t.id for t in self.tareas])
+        self.assertEqual(masivas, [estadisticas_tarea(t.id) for t in self.tareas])
+
+    def test_cache_se_invalida_al_calificar(self):
+        from applications.evaluaciones.services.estadisticas import estadisticas_tarea
+
+        tarea_id = self.tareas[0].id
+        self.assertEqual(estadisticas_tarea(tarea_id)["promedio"], 70.0)
+        with self.assertNumQueries(0):
+            estadisticas_tarea(tarea_id)
+
+        entrega = self.entregas[5]
+        entrega.calificacion = 100
+        with self.captureOnCommitCallbacks(execute=True):
+            entrega.save()
+        datos = estadisticas_tarea(tarea_id)
+        self.assertEqual((datos["calificadas"], datos["promedio"], datos["maximo"]), (6, 75.0, 100.0))
+
+        admin = get_user_model().objects.create_superuser(
+            username="admin", password="pass1234", email="a@a.com", rol="super_admin"
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.get(f"/api/tareas/{tarea_id}/estadisticas/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["promedio"], 75.0)
+
+
+class ProyeccionCalificacionesTests(APITestCase):
+    URL = "/api/mis-calificaciones/proyeccion/"
+
+    def setUp(self):
+        User = get_user_model()
+        periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        self.asignatura = Asignatura.objects.create(nombre="Redes", codigo="RED-01", periodo_academico=periodo, creditos=3)
+        ajena = Asignatura.objects.create(nombre="Química", codigo="QUI-01", periodo_academico=periodo, creditos=3)
+        self.estudiante = User.objects.create_user(username="est", password="pass1234", rol="estudiante")
+        self.companero = User.objects.create_user(username="comp", password="pass1234", rol="estudiante")
+        ahora = timezone.now()
+
+        def tarea(asignatura, titulo, peso):
+            return Tarea.objects.create(
+                asignatura=asignatura, titulo=titulo, peso_porcentual=peso, estado="publicada",
+                fecha_publicacion=ahora - timedelta(days=5), fecha_vencimiento=ahora + timedelta(days=5),
+            )
+
+        self.calificada = tarea(self.asignatura, "Parcial", 30)
+        self.pendiente = tarea(self.asignatura, "Proyecto", 30)
+        self.final = tarea(self.asignatura, "Final", 40)
+        self.ajena = tarea(ajena, "Laboratorio", 50)
+        for estudiante in (self.estudiante, self.companero):
+            Matricula.objects.create(estudiante=estudiante, asignatura=self.asignatura, periodo=periodo, horario="Grupo A")
+        EntregaTarea.objects.create(tarea=self.calificada, estudiante=self.estudiante, archivo_entrega="x.pdf", calificacion=80)
+        EntregaTarea.objects.create(tarea=self.calificada, estudiante=self.companero, archivo_entrega="x.pdf", calificacion=20)
+        EntregaTarea.objects.create(tarea=self.pendiente, estudiante=self.companero, archivo_entrega="x.pdf", calificacion=100)
+        self.client.force_authenticate(self.estudiante)
+
+    def test_proyeccion_ponderada_con_notas_hipoteticas(self):
+        response = self.client.post(self.URL, {
+            "objetivo": 60,
+            "notas_hipoteticas": {
+                str(self.pendiente.id): 90, str(self.calificada.id): 10, str(self.ajena.id): 50,
+            },
+        }, format="json")
+        self.assertEqual(response.status_code, 200)
+        [fila] = response.data["asignaturas"]
+        self.assertEqual(fila["asignatura"]["id"], self.asignatura.id)
+        self.assertEqual(
+            {k: fila[k] for k in ("nota_actual_ponderada", "nota_proyectada", "peso_calificado", "peso_hipotetico",
+                                  "peso_restante", "requerido_promedio_en_restante_para_objetivo", "maximo_alcanzable")},
+            {"nota_actual_ponderada": 24.0, "nota_proyectada": 51.0, "peso_calificado": 30.0, "peso_hipotetico": 30.0,
+             "peso_restante": 40.0, "requerido_promedio_en_restante_para_objetivo": 22.5, "maximo_alcanzable": 91.0},
+        )
+        self.assertFalse(fila["alcanza_objetivo"])
+        self.assertTrue(fila["objetivo_alcanzable"])
+        # La nota real no se reemplaza y la tarea de otra asignatura no se aplica
+        self.assertEqual(response.data["tareas_ignoradas"], [
+            {"tarea_id": self.calificada.id, "motivo": "ya calificada"},
+            {"tarea_id": self.ajena.id, "motivo": "no pertenece a tus asignaturas"},
+        ])
+
+    def test_entrada_invalida(self):
+        for cuerpo in (
+            {"notas_hipoteticas": {str(self.pendiente.id): 101}},
+            {"notas_hipoteticas": {str(self.pendiente.id): -1}},
+            {"notas_hipoteticas": {"abc": 50}},
+            {"objetivo": 150},
+        ):
+            with self.subTest(cuerpo=cuerpo):
+                self.assertEqual(self.client.post(self.URL, cuerpo, format="json").status_code, 400)
+
+    def test_solo_proyecta_las_notas_propias(self):
+        # Sin hipótesis: la nota del compañero en "Proyecto" no cuenta para este estudiante
+        [fila] = self.client.post(self.URL, {}, format="json").data["asignaturas"]
+        self.assertEqual((fila["nota_actual_ponderada"], fila["peso_calificado"]), (24.0, 30.0))
+
+        self.client.force_authenticate(self.companero)
+        [fila] = self.client.post(self.URL, {}, format="json").data["asignaturas"]
+        self.assertEqual((fila["nota_actual_ponderada"], fila["peso_calificado"]), (36.0, 60.0))
+
+        profesor = get_user_model().objects.create_user(username="prof", password="pass1234", rol="profesor")
+        self.client.force_authenticate(profesor)
+        self.assertEqual(self.client.post(self.URL, {}, format="json").status_code, 403)
+
+class ExportacionHojasCalculoTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+        periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        self.asignatura = Asignatura.objects.create(
+            nombre="Algoritmos", codigo="ALG-01", periodo_academico=periodo, creditos=3
+        )
+        self.profesor = User.objects.create_user(username="prof", password="pass1234", rol="profesor")
+        with mock.patch("applications.academico.signals.send_asignatura_assignment_email.delay"):
+            ProfesorAsignatura.objects.create(profesor=self.profesor, asignatura=self.asignatura)
+        ahora = timezone.now()
+        self.tareas = [
+            Tarea.objects.create(
+                asignatura=self.asignatura, titulo=titulo, peso_porcentual=peso,
+                fecha_publicacion=ahora - timedelta(days=2 - i), fecha_vencimiento=ahora + timedelta(days=7),
+                estado="publicada",
+            )
+            for i, (titulo, peso) in enumerate((("Taller", 40), ("Examen", 60)))
+        ]
+        self.estudiantes = []
+        for i in range(2):
+            estudiante = User.objects.create_user(
+                username=f"est{i}", password="pass1234", rol="estudiante", first_name="Ana", last_name=f"Ruiz {i}"
+            )
+            Matricula.objects.create(estudiante=estudiante, asignatura=self.asignatura, periodo=periodo, horario="Grupo A")
+            self.estudiantes.append(estudiante)
+        EntregaTarea.objects.create(
+            tarea=self.tareas[0], estudiante=self.estudiantes[0], archivo_entrega="x.pdf", calificacion=80,
+            estado_entrega="calificada",
+        )
+
+    def descargar(self, url):
+        response = self.client.get(url)
+        contenido = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, contenido
+
+    def test_libro_de_calificaciones_csv_y_xlsx(self):
+        import csv
+        from openpyxl import load_workbook
+
+        self.client.force_authenticate(self.profesor)
+        response, contenido = self.descargar("/api/staff-calificaciones/?format=csv")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="calificaciones_2026-I.csv"')
+        filas = list(csv.reader(contenido.decode("utf-8-sig").splitlines()))
+        self.assertEqual(filas[0][:4], ["periodo", "asignatura_codigo", "asignatura_nombre", "username"])
+        self.assertEqual(len(filas), 1 + 2 * 2)  # una fila por estudiante y tarea
+        fila = next(f for f in filas[1:] if f[3] == "est0" and f[8] == "Taller")
+        self.assertEqual((fila[4], fila[10], fila[11]), ("Ana Ruiz 0", "80.00", "32.0"))
+
+        response, contenido = self.descargar("/api/staff-calificaciones/?format=xlsx")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], XLSX_CONTENT_TYPE)
+        hoja = load_workbook(BytesIO(contenido), read_only=True)["ALG-01"]
+        filas = list(hoja.iter_rows(values_only=True))
+        self.assertEqual(
+            filas[0],
+            ("username", "nombre", "email", "carrera", "Taller (40%)", "Examen (60%)",
+             "nota_actual_ponderada", "peso_calificado", "peso_restante"),
+        )
+        self.assertEqual([f[0] for f in filas[1:]], ["est0", "est1"])
+        self.assertEqual(filas[1][4:], (80, None, 32, 40, 60))
+
+    def test_entregas_por_grupo_csv(self):
+        import csv
+
+        self.client.force_authenticate(self.profesor)
+        url = f"/api/gestion-entregas/entregas-por-grupo/?asignatura_id={self.asignatura.id}&format=csv"
+        response, contenido = self.descargar(url)
+        self.assertEqual(response.status_code, 200)
+        filas = list(csv.reader(contenido.decode("utf-8-sig").splitlines()))
+        self.assertEqual(filas[0][:5], ["username", "nombre", "email", "horario", "tarea_id"])
+        self.assertEqual([(f[0], f[3], f[5]) for f in filas[1:]], [("est0", "Grupo A", "Taller"), ("est1", "Grupo A", "")])
+
+    def test_permisos_y_errores_en_json(self):
+        self.client.force_authenticate(self.estudiantes[0])
+        for url in (
+            "/api/staff-calificaciones/?format=xlsx",
+            f"/api/gestion-entregas/entregas-por-grupo/?asignatura_id={self.asignatura.id}&format=csv",
+        ):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 403)
+                self.assertEqual(response["Content-Type"], "application/json")
+                self.assertIn("detail", response.json())
+
+        # Un profesor solo exporta sus asignaturas
+        otro = get_user_model().objects.create_user(username="prof2", password="pass1234", rol="profesor")
+        self.client.force_authenticate(otro)
+        response, contenido = self.descargar("/api/staff-calificaciones/?format=csv")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(contenido.decode("utf-8-sig").splitlines()), 1)
+
+        self.client.force_authenticate(self.profesor)
+        response = self.client.get("/api/gestion-entregas/entregas-por-grupo/?asignatura_id=0&format=xlsx")
+        self.assertEqual((response.status_code, response["Content-Type"]), (400, "application/json"))
+
+class EntregasConArchivoTests(APITestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media, ignore_errors=True)
+        ajustes = override_settings(MEDIA_ROOT=self.media, SUBIDAS_PARCIALES_ROOT=os.path.join(self.media, "parciales"))
+        ajustes.enable()
+        self.addCleanup(ajustes.disable)
+
+        User = get_user_model()
+        periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        self.asignatura = Asignatura.objects.create(
+            nombre="Algoritmos", codigo="ALG-01", periodo_academico=periodo, creditos=3
+        )
+        ahora = timezone.now()
+        self.tarea = Tarea.objects.create(
+            asignatura=self.asignatura, titulo="Informe", peso_porcentual=10,
+            fecha_publicacion=ahora - timedelta(days=1), fecha_vencimiento=ahora + timedelta(days=7),
+            estado="publicada",
+        )
+        self.estudiantes = [
+            User.objects.create_user(username=f"est{i}", password="pass1234", rol="estudiante")
+            for i in range(3)
+        ]
+
+    def entregar(self, estudiante, nombre, contenido):
+        with self.captureOnCommitCallbacks(execute=True):
+            return EntregaTarea.objects.create(
+                tarea=self.tarea, estudiante=estudiante, archivo_entrega=SimpleUploadedFile(nombre, contenido)
+            )
+
+
+class AlmacenamientoDeduplicadoTests(EntregasConArchivoTests):
+    def test_contenido_repetido_se_guarda_una_vez_con_los_nombres_originales(self):
+        a = self.entregar(self.estudiantes[0], "Informe final.PDF", b"mismo contenido")
+        b = self.entregar(self.estudiantes[1], "copia.pdf", b"mismo contenido")
+        c = self.entregar(self.estudiantes[2], "otro.pdf", b"distinto")
+
+        self.assertEqual(a.archivo_entrega.name, b.archivo_entrega.name)
+        self.assertTrue(a.archivo_entrega.name.startswith("blobs/"))
+        self.assertNotEqual(a.archivo_entrega.name, c.archivo_entrega.name)
+        self.assertEqual((a.nombre_archivo, b.nombre_archivo), ("Informe final.PDF", "copia.pdf"))
+
+        contenido = ContenidoArchivo.objects.get(ruta=a.archivo_entrega.name)
+        self.assertEqual((contenido.referencias, contenido.tamano), (2, len(b"mismo contenido")))
+        # El storage recibe el nombre ya saneado por get_valid_name
+        self.assertEqual(contenido.nombre_original, "Informe_final.PDF")
+        self.assertEqual(ContenidoArchivo.objects.count(), 2)
+        with a.archivo_entrega.open("rb") as f:
+            self.assertEqual(f.read(), b"mismo contenido")
+
+    def test_recoleccion_borra_solo_blobs_sin_referencias(self):
+        from applications.evaluaciones.services.deduplicacion import GRACIA_RECOLECCION, recolectar_blobs
+
+        a = self.entregar(self.estudiantes[0], "a.pdf", b"compartido")
+        b = self.entregar(self.estudiantes[1], "b.pdf", b"compartido")
+        c = self.entregar(self.estudiantes[2], "c.pdf", b"solo")
+        compartido, solo = a.archivo_entrega.name, c.archivo_entrega.name
+        ruta_compartido = a.archivo_entrega.path
+
+        with self.captureOnCommitCallbacks(execute=True):
+            a.delete()
+            c.delete()
+        self.assertEqual(ContenidoArchivo.objects.get(ruta=compartido).referencias, 1)
+        self.assertEqual(ContenidoArchivo.objects.get(ruta=solo).referencias, 0)
+
+        # Dentro del margen de gracia no se recolecta nada
+        self.assertEqual(recolectar_blobs()["eliminados"], 0)
+
+        ContenidoArchivo.objects.update(fecha_ultima_referencia=timezone.now() - GRACIA_RECOLECCION * 2)
+        resultado = recolectar_blobs()
+        self.assertEqual((resultado["eliminados"], resultado["bytes_liberados"]), (1, len(b"solo")))
+        self.assertFalse(ContenidoArchivo.objects.filter(ruta=solo).exists())
+        self.assertTrue(os.path.exists(ruta_compartido))
+
+        # Un blob sin referencias que se vuelve a subir antes de la recolección se conserva
+        with self.captureOnCommitCallbacks(execute=True):
+            b.delete()
+        ContenidoArchivo.objects.update(fecha_ultima_referencia=timezone.now() - GRACIA_RECOLECCION * 2)
+        os.remove(ruta_compartido)  # p. ej. una recolección interrumpida tras borrar el archivo
+        d = self.entregar(self.estudiantes[0], "de nuevo.pdf", b"compartido")
+        self.assertEqual(d.archivo_entrega.name, compartido)
+        self.assertEqual(recolectar_blobs()["eliminados"], 0)
+        self.assertEqual(ContenidoArchivo.objects.get(ruta=compartido).referencias, 1)
+        with d.archivo_entrega.open("rb") as f:
+            self.assertEqual(f.read(), b"compartido")
+
+
+    def test_transacciones_revertidas_no_dejan_archivos_ni_pierden_referencias(self):
+        from django.db import transaction
+
+        from applications.evaluaciones.services.deduplicacion import GRACIA_RECOLECCION, recolectar_blobs
+
+        class Revertir(Exception):
+            pass
+
+        # La subida se revierte después de mover el blob a su ruta: queda el archivo sin fila
+        with self.assertRaises(Revertir), transaction.atomic():
+            entrega = self.entregar(self.estudiantes[0], "a.pdf", b"revertido")
+            huerfano = entrega.archivo_entrega.path
+            raise Revertir
+        self.assertTrue(os.path.exists(huerfano))
+        self.assertFalse(ContenidoArchivo.objects.exists())
+
+        # Un borrado revertido no resta la referencia
+        b = self.entregar(self.estudiantes[1], "b.pdf", b"conservado")
+        conservado = b.archivo_entrega.path
+        with self.assertRaises(Revertir), self.captureOnCommitCallbacks(execute=True), transaction.atomic():
+            b.archivo_entrega.delete(save=False)
+            raise Revertir
+        self.assertEqual(ContenidoArchivo.objects.get().referencias, 1)
+
+        self.assertEqual(recolectar_blobs()["sin_registro"], 0)  # dentro del margen de gracia
+        antiguo = (timezone.now() - GRACIA_RECOLECCION * 2).timestamp()
+        for ruta in (huerfano, conservado):
+            os.utime(ruta, (antiguo, antiguo))
+        resultado = recolectar_blobs()
+        self.assertEqual((resultado["sin_registro"], resultado["bytes_liberados"]), (1, len(b"revertido")))
+        self.assertFalse(os.path.exists(huerfano))
+        self.assertTrue(os.path.exists(conservado))
+        self.assertEqual(ContenidoArchivo.objects.count(), 1)
+
+class DescargaEntregasZipTests(EntregasConArchivoTests):
+    def test_zip_usa_el_usuario_y_el_nombre_original_de_cada_entrega(self):
+        from applications.evaluaciones.services.descargas import exportar_entregas_zip
+
+        self.entregar(self.estudiantes[0], "Informe final.pdf", b"mismo contenido")
+        self.entregar(self.estudiantes[1], "informe.pdf", b"mismo contenido")
+        antigua = self.entregar(self.estudiantes[2], "sin nombre.pdf", b"otro")
+        EntregaTarea.objects.filter(pk=antigua.pk).update(nombre_archivo="")
+
+        response = exportar_entregas_zip(self.tarea)
+        with zipfile.ZipFile(BytesIO(b"".join(response.streaming_content))) as zf:
+            self.assertEqual(
+                sorted(zf.namelist()),
+                ["est0_Informe_final.pdf", "est1_informe.pdf", f"est2_entrega_{antigua.id}.pdf"],
+            )
+            self.assertEqual(zf.read("est1_informe.pdf"), b"mismo contenido")
+
+
+class PaginacionCursorTests(EntregasConArchivoTests):
+    def test_cursor_recorre_una_vez_cada_entrega_con_fechas_empatadas(self):
+        User = get_user_model()
+        estudiantes = self.estudiantes + [
+            User.objects.create_user(username=f"otro{i}", password="pass1234", rol="estudiante") for i in range(6)
+        ]
+        for i, estudiante in enumerate(estudiantes):
+            self.entregar(estudiante, f"e{i}.pdf", f"contenido {i}".encode())
+        # Grupos de entregas con la misma fecha, en distinto orden que los ids
+        base = timezone.now() - timedelta(days=1)
+        for i, entrega_id in enumerate(EntregaTarea.objects.order_by("id").values_list("id", flat=True)):
+            EntregaTarea.objects.filter(pk=entrega_id).update(fecha_entrega=base - timedelta(hours=(i * 7) % 3))
+        esperadas = list(EntregaTarea.objects.order_by("-fecha_entrega", "-id").values_list("id", flat=True))
+        self.assertNotEqual(esperadas, sorted(esperadas, reverse=True))
+
+        self.client.force_authenticate(User.objects.create_superuser(username="admin", password="pass1234", email="a@a.com", rol="super_admin"))
+        vistas, anterior = [], None
+        url = "/api/entregas/?page_size=3&ordering=id"
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            vistas += [e["id"] for e in response.data["results"]]
+            url, anterior = response.data["next"], response.data["previous"] or anterior
+            if len(vistas) == 3:
+                # Una entrega nueva entre páginas (más reciente) no desplaza las siguientes
+                self.entregar(User.objects.create_user(username="tarde", password="pass1234", rol="estudiante"), "t.pdf", b"t")
+        self.assertEqual(vistas, esperadas)
+
+        # Hacia atrás desde la última página: la anterior son las tres filas previas
+        response = self.client.get(anterior)
+        self.assertEqual([e["id"] for e in response.data["results"]], esperadas[3 * ((len(esperadas) - 1) // 3) - 3:][:3])
+
+        self.assertEqual(self.client.get("/api/entregas/?cursor=cD1ub3R1bmE%3D").status_code, 404)
+
+    def test_cursor_de_tareas_por_fecha_de_publicacion(self):
+        ahora = timezone.now()
+        for i, dias in enumerate((3, 2, 2)):
+            Tarea.objects.create(
+                asignatura=self.asignatura, titulo=f"Tarea {i}", peso_porcentual=10, estado="publicada",
+                fecha_publicacion=ahora - timedelta(days=dias), fecha_vencimiento=ahora + timedelta(days=7),
+            )
+        esperadas = list(Tarea.objects.order_by("-fecha_publicacion", "-id").values_list("id", flat=True))
+        self.client.force_authenticate(get_user_model().objects.create_superuser(
+            username="admin", password="pass1234", email="a@a.com", rol="super_admin"
+        ))
+        vistas, url = [], "/api/tareas/?page_size=1"
+        while url:
+            response = self.client.get(url)
+            vistas += [t["id"] for t in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(vistas, esperadas)
+
+
+class SubidaPorPartesTests(EntregasConArchivoTests):
+    def enviar_parte(self, subida_id, offset, datos, checksum=None):
+        extra = {"HTTP_UPLOAD_OFFSET": str(offset)}
+        if checksum:
+            extra["HTTP_X_CHUNK_SHA256"] = checksum
+        return self.client.put(
+            f"/api/subidas-entrega/{subida_id}/parte/", data=datos, content_type="application/octet-stream", **extra
+        )
+
+    def test_subida_reanudable_hasta_crear_la_entrega(self):
+        estudiante = self.estudiantes[0]
+        self.client.force_authenticate(estudiante)
+        contenido = b"0123456789" * 30
+        response = self.client.post("/api/subidas-entrega/", {
+            "tarea": self.tarea.id, "nombre_archivo": "Informe.pdf", "tamano_total": len(contenido),
+            "sha256": hashlib.sha256(contenido).hexdigest(),
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        subida_id = response.data["id"]
+
+        response = self.enviar_parte(subida_id, 0, contenido[:100], hashlib.sha256(contenido[:100]).hexdigest())
+        self.assertEqual((response.status_code, response["Upload-Offset"]), (200, "100"))
+
+        # Checksum incorrecto: la parte se descarta y el offset no avanza
+        response = self.enviar_parte(subida_id, 100, contenido[100:200], "0" * 64)
+        self.assertEqual(response.status_code, 400)
+        # Parte repetida o fuera de lugar: 409 con el offset desde el que reanudar
+        response = self.enviar_parte(subida_id, 0, contenido[:100])
+        self.assertEqual((response.status_code, int(response.data["offset"])), (409, 100))
+        self.assertEqual(self.client.get(f"/api/subidas-entrega/{subida_id}/").data["offset"], 100)
+
+        # Completar antes de tiempo no crea nada
+        response = self.client.post(f"/api/subidas-entrega/{subida_id}/completar/")
+        self.assertEqual(response.status_code, 400)
+
+        self.assertEqual(self.enviar_parte(subida_id, 100, contenido[100:250]).status_code, 200)
+        self.assertEqual(self.enviar_parte(subida_id, 250, contenido[250:]).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"/api/subidas-entrega/{subida_id}/completar/")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["nombre_archivo"], "Informe.pdf")
+
+        entrega = EntregaTarea.objects.get(tarea=self.tarea, estudiante=estudiante)
+        with entrega.archivo_entrega.open("rb") as f:
+            self.assertEqual(f.read(), contenido)
+        # Completar de nuevo es idempotente
+        response = self.client.post(f"/api/subidas-entrega/{subida_id}/completar/")
+        self.assertEqual((response.status_code, response.data["id"]), (201, entrega.id))
+        self.assertEqual(EntregaTarea.objects.count(), 1)
+
+    def test_fallo_al_guardar_la_entrega_no_deja_archivo_ni_registro(self):
+        from django.core.exceptions import ValidationError as DjangoValidationError
+
+        estudiante = self.estudiantes[0]
+        self.client.force_authenticate(estudiante)
+        contenido = b"entrega que falla"
+        response = self.client.post("/api/subidas-entrega/", {
+            "tarea": self.tarea.id, "nombre_archivo": "Informe.pdf", "tamano_total": len(contenido),
+        }, format="json")
+        subida_id = response.data["id"]
+        self.assertEqual(self.enviar_parte(subida_id, 0, contenido).status_code, 200)
+
+        with mock.patch.object(EntregaTarea, "save", side_effect=DjangoValidationError({"estudiante": ["Error"]})):
+            response = self.client.post(f"/api/subidas-entrega/{subida_id}/completar/")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(EntregaTarea.objects.exists())
+        self.assertFalse(ContenidoArchivo.objects.exists())
+        blob = os.path.join(self.media, "blobs", hashlib.sha256(contenido).hexdigest()[:2])
+        self.assertFalse(os.path.exists(blob) and any(files for _, _, files in os.walk(blob)))
+
+        # La subida sigue abierta y se puede completar después
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"/api/subidas-entrega/{subida_id}/completar/")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(ContenidoArchivo.objects.get().referencias, 1)
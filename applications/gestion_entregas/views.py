@@ -5,6 +5,7 @@ from applications.matriculas.models import Matricula
 from applications.academico.models import Asignatura, ProfesorAsignatura
 from applications.evaluaciones.models import EntregaTarea
 from django.contrib.auth import get_user_model
+from applications.reportes.api.renderers import EXPORT_RENDERER_CLASSES, formato_exportacion
 
 Usuario = get_user_model()
 
@@ -12,11 +13,26 @@ class EntregasPorGrupoAPIView(APIView):
     """
     Devuelve la estructura: Materia -> Grupo/Horario -> Estudiantes -> Entregas
     Filtros: asignatura_id, horario, periodo, profesor_id
+    Exportación: ?format=csv|xlsx (una fila por entrega; el CSV se envía en streaming)
     Solo accesible para profesor, admin, coordinador, super admin
     """
     permission_classes = [IsAuthenticated]
+    renderer_classes = EXPORT_RENDERER_CLASSES
 
     def get(self, request):
+        user = request.user
+        user_roles = []
+        if hasattr(user, 'roles') and user.roles.exists():
+            user_roles = [r.tipo for r in user.roles.all()]
+        elif hasattr(user, 'rol'):
+            user_roles = [user.rol]
+
+        if getattr(user, 'is_superuser', False) and 'super_admin' not in user_roles:
+            user_roles.append('super_admin')
+
+        if not (set(user_roles) & {'profesor', 'admin', 'coordinador', 'super_admin'}):
+            return Response({'detail': 'No tienes permisos para ver las entregas del grupo.'}, status=403)
+
         asignatura_id = request.query_params.get('asignatura_id')
         horario = request.query_params.get('horario')
         periodo_id = request.query_params.get('periodo_id')
@@ -39,6 +55,11 @@ class EntregasPorGrupoAPIView(APIView):
             if not ProfesorAsignatura.objects.filter(asignatura=asignatura, profesor_id=profesor_id).exists():
                 return Response({'error': 'El profesor no imparte esta asignatura'}, status=400)
 
+        formato = formato_exportacion(request)
+        if formato:
+            from applications.evaluaciones.services.libro_calificaciones import exportar_entregas_por_grupo
+            return exportar_entregas_por_grupo(asignatura, matriculas, formato)
+
         estudiantes = []
         for m in matriculas.select_related('estudiante'):
             entregas = EntregaTarea.objects.filter(estudiante=m.estudiante, tarea__asignatura=asignatura)
@@ -1,8 +1,20 @@
 from django.contrib import admin
-from .models import Matricula
+from .models import Matricula, SesionHorario, SolicitudMatricula
+
+
+class SesionHorarioInline(admin.TabularInline):
+    model = SesionHorario
+    extra = 0
+    readonly_fields = ('dia_semana', 'inicio', 'fin')
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
 
 @admin.register(Matricula)
 class MatriculaAdmin(admin.ModelAdmin):
+    inlines = [SesionHorarioInline]
     list_display = ('id', 'estudiante', 'asignatura', 'periodo', 'fecha', 'estado')
     search_fields = ('estudiante__username', 'asignatura__nombre', 'periodo__nombre')
     list_filter = ('periodo', 'estado')
@@ -28,3 +40,11 @@ class MatriculaAdmin(admin.ModelAdmin):
                 # Si no hay estudiante seleccionado, no mostrar ninguna asignatura
                 kwargs["queryset"] = Asignatura.objects.none()
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+@admin.register(SolicitudMatricula)
+class SolicitudMatriculaAdmin(admin.ModelAdmin):
+    list_display = ('id', 'estudiante', 'asignatura', 'periodo', 'estado', 'motivo', 'fecha_creacion', 'fecha_procesada')
+    search_fields = ('estudiante__username', 'asignatura__nombre')
+    list_filter = ('estado', 'motivo', 'periodo')
+    raw_id_fields = ('estudiante', 'asignatura', 'periodo', 'matricula')
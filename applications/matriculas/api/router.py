@@ -1,8 +1,9 @@
 # router.py para Matriculas
 from rest_framework.routers import DefaultRouter
-from applications.matriculas.views import MatriculaViewSet
+from applications.matriculas.views import MatriculaViewSet, SolicitudMatriculaViewSet
 
 router = DefaultRouter()
 router.register(r'matriculas', MatriculaViewSet, basename='matricula')
+router.register(r'solicitudes-matricula', SolicitudMatriculaViewSet, basename='solicitud-matricula')
 
 urlpatterns = router.urls
\ No newline at end of file
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+
+from applications.matriculas.models import Matricula
+from applications.matriculas.services.horario import LOTE_SESIONES, reporte_conflictos_periodo, sincronizar_sesiones
+
+
+class Command(BaseCommand):
+    help = 'Genera las sesiones estructuradas (día, inicio, fin) a partir del texto de Matricula.horario.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--periodo', type=int, help='ID del periodo (por defecto todos)')
+        parser.add_argument('--batch-size', type=int, default=LOTE_SESIONES, help='Matrículas por lote')
+        parser.add_argument('--todas', action='store_true', help='Regenera también las matrículas que ya tienen sesiones')
+        parser.add_argument('--conflictos', action='store_true', help='Al terminar, muestra los choques de horario del periodo')
+
+    def handle(self, *args, **options):
+        qs = Matricula.objects.filter(horario__isnull=False).exclude(horario='')
+        if options['periodo']:
+            qs = qs.filter(periodo_id=options['periodo'])
+        if not options['todas']:
+            qs = qs.filter(sesiones__isnull=True)
+
+        batch_size = options['batch_size']
+        total = {'matriculas': 0, 'sesiones': 0, 'invalidas': 0}
+        ultimo_id = 0
+        while True:
+            lote = list(qs.filter(id__gt=ultimo_id).order_by('id').only('id', 'horario')[:batch_size])
+            if not lote:
+                break
+            ultimo_id = lote[-1].id
+            res = sincronizar_sesiones(lote)
+            total['matriculas'] += res['matriculas']
+            total['sesiones'] += res['sesiones']
+            total['invalidas'] += len(res['invalidas'])
+            for inv in res['invalidas']:
+                self.stdout.write(self.style.WARNING(f"Matrícula {inv['matricula']}: {inv['error']}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Matrículas procesadas: {total['matriculas']} | Sesiones: {total['sesiones']} | "
+            f"Horarios no reconocidos: {total['invalidas']}"
+        ))
+
+        if options['conflictos']:
+            if not options['periodo']:
+                self.stdout.write(self.style.ERROR('--conflictos requiere --periodo'))
+                return
+            conflictos = reporte_conflictos_periodo(options['periodo'])
+            for c in conflictos:
+                self.stdout.write(
+                    f"{c['username']} {c['dia']}: {c['asignatura_a']} {c['sesion_a']} <> "
+                    f"{c['asignatura_b']} {c['sesion_b']}"
+                )
+            self.stdout.write(f'Choques de horario: {len(conflictos)}')
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from applications.academico.services.facultades import sincronizar_facultades_asignaturas
+from applications.matriculas.services.facultades import sincronizar_facultad_matriculas
+
+
+class Command(BaseCommand):
+    help = (
+        'Reconstruye la facultad desnormalizada de asignaturas (AsignaturaFacultad) y matrículas '
+        '(Matricula.facultad) usada por los filtros de alcance. Solo escribe las diferencias.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--periodo', type=int, help='Limita las matrículas a un periodo')
+
+    def handle(self, *args, **options):
+        res = sincronizar_facultades_asignaturas()
+        self.stdout.write(f"Asignatura-facultad: {res['agregadas']} agregadas, {res['eliminadas']} eliminadas")
+
+        filtros = {'periodo_id': options['periodo']} if options['periodo'] else {}
+        cambiadas = sincronizar_facultad_matriculas(**filtros)
+        self.stdout.write(self.style.SUCCESS(f'Matrículas con facultad corregida: {cambiadas}'))
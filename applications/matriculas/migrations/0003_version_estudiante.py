@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matriculas', '0002_alter_matricula_options_matricula_horario_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matricula',
+            name='fecha_actualizacion',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='matricula',
+            index=models.Index(fields=['estudiante', 'fecha_actualizacion'], name='matriculas__estudia_415187_idx'),
+        ),
+    ]
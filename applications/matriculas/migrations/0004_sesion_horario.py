@@ -0,0 +1,30 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matriculas', '0003_version_estudiante'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SesionHorario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dia_semana', models.PositiveSmallIntegerField(choices=[(0, 'Lunes'), (1, 'Martes'), (2, 'Miércoles'), (3, 'Jueves'), (4, 'Viernes'), (5, 'Sábado'), (6, 'Domingo')])),
+                ('inicio', models.PositiveSmallIntegerField(help_text='Minutos desde medianoche')),
+                ('fin', models.PositiveSmallIntegerField(help_text='Minutos desde medianoche (exclusivo)')),
+                ('matricula', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sesiones', to='matriculas.matricula')),
+            ],
+            options={
+                'verbose_name': 'Sesión de horario',
+                'verbose_name_plural': 'Sesiones de horario',
+                'ordering': ['dia_semana', 'inicio'],
+                'constraints': [models.CheckConstraint(condition=models.Q(('inicio__lt', models.F('fin'))), name='sesion_inicio_antes_fin')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('matriculas', '0004_sesion_horario'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolicitudMatricula',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('horario', models.CharField(blank=True, max_length=100, null=True)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('aceptada', 'Aceptada'), ('rechazada', 'Rechazada')], default='pendiente', max_length=20)),
+                ('motivo', models.CharField(blank=True, default='', help_text='Resultado del procesamiento (ver services/lote.py)', max_length=50)),
+                ('fecha_creacion', models.DateTimeField(auto_now_add=True)),
+                ('fecha_procesada', models.DateTimeField(blank=True, null=True)),
+                ('asignatura', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solicitudes_matricula', to='academico.asignatura')),
+                ('estudiante', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solicitudes_matricula', to=settings.AUTH_USER_MODEL)),
+                ('matricula', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='matriculas.matricula')),
+                ('periodo', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='solicitudes_matricula', to='academico.periodoacademico')),
+            ],
+            options={
+                'verbose_name': 'Solicitud de matrícula',
+                'verbose_name_plural': 'Solicitudes de matrícula',
+                'indexes': [models.Index(fields=['estado', 'id'], name='solicitud_mat_estado_idx'), models.Index(fields=['fecha_procesada'], name='solicitud_mat_procesada_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('estado', 'pendiente')), fields=('estudiante', 'asignatura', 'periodo'), name='solicitud_mat_pendiente_unica')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.9 on 2026-10-19 03:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def poblar_facultad(apps, schema_editor):
+    Matricula = apps.get_model('matriculas', 'Matricula')
+    Usuario = apps.get_model('usuarios', 'Usuario')
+    Matricula.objects.update(
+        facultad_id=Subquery(
+            Usuario.objects.filter(pk=OuterRef('estudiante_id')).values('carrera__facultad_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('academico', '0010_asignatura_facultad'),
+        ('matriculas', '0005_solicitud_matricula'),
+        ('usuarios', '0006_permiso_rol_permisos_asignados'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matricula',
+            name='facultad',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='matriculas', to='academico.facultad'),
+        ),
+        migrations.RunPython(poblar_facultad, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,7 @@
 # models.py para Matriculas
 from django.db import models
 from django.conf import settings
-from applications.academico.models import Asignatura, PeriodoAcademico
+from applications.academico.models import Asignatura, Facultad, PeriodoAcademico
 
 from django.db.models import Q
 
@@ -17,11 +17,100 @@ class Matricula(models.Model):
     fecha = models.DateTimeField(auto_now_add=True)
     estado = models.CharField(max_length=20, default='activa')
     horario = models.CharField(max_length=100, blank=True, null=True, help_text='Horario de estudio: Ejemplo Lunes 8-10am o formato JSON')
+    fecha_actualizacion = models.DateTimeField(auto_now=True)
+    # Facultad de la carrera del estudiante (desnormalizada para el alcance de coordinadores/admins)
+    facultad = models.ForeignKey(
+        Facultad,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name='matriculas',
+    )
 
     class Meta:
         verbose_name = 'Matrícula-Asignatura'
         verbose_name_plural = 'Matrículas-Asignaturas'
         unique_together = ('estudiante', 'asignatura', 'periodo')
+        indexes = [
+            models.Index(fields=['estudiante', 'fecha_actualizacion']),
+        ]
+
+    def __str__(self):
+        return f"{self.estudiante} - {self.asignatura} ({self.periodo})"
+
+class SesionHorario(models.Model):
+    """
+    Sesión semanal estructurada de una matrícula (día y rango en minutos desde medianoche,
+    semiabierto [inicio, fin)). Se deriva de `Matricula.horario`; ver services/horario.py.
+    """
+    DIAS_SEMANA = [
+        (0, 'Lunes'),
+        (1, 'Martes'),
+        (2, 'Miércoles'),
+        (3, 'Jueves'),
+        (4, 'Viernes'),
+        (5, 'Sábado'),
+        (6, 'Domingo'),
+    ]
+
+    matricula = models.ForeignKey(Matricula, on_delete=models.CASCADE, related_name='sesiones')
+    dia_semana = models.PositiveSmallIntegerField(choices=DIAS_SEMANA)
+    inicio = models.PositiveSmallIntegerField(help_text='Minutos desde medianoche')
+    fin = models.PositiveSmallIntegerField(help_text='Minutos desde medianoche (exclusivo)')
+
+    class Meta:
+        verbose_name = 'Sesión de horario'
+        verbose_name_plural = 'Sesiones de horario'
+        ordering = ['dia_semana', 'inicio']
+        constraints = [
+            models.CheckConstraint(condition=models.Q(inicio__lt=models.F('fin')), name='sesion_inicio_antes_fin'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_dia_semana_display()} {self.inicio // 60:02d}:{self.inicio % 60:02d}-{self.fin // 60:02d}:{self.fin % 60:02d}"
+
+
+class SolicitudMatricula(models.Model):
+    """
+    Ticket de matrícula en cola (modo alta demanda). POST /api/matriculas/ solo la registra
+    y un worker Celery las procesa por lotes en transacciones (services/cola.py).
+    """
+    ESTADO_CHOICES = (
+        ('pendiente', 'Pendiente'),
+        ('aceptada', 'Aceptada'),
+        ('rechazada', 'Rechazada'),
+    )
+
+    estudiante = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='solicitudes_matricula',
+    )
+    asignatura = models.ForeignKey(Asignatura, on_delete=models.CASCADE, related_name='solicitudes_matricula')
+    periodo = models.ForeignKey(PeriodoAcademico, on_delete=models.CASCADE, related_name='solicitudes_matricula')
+    horario = models.CharField(max_length=100, blank=True, null=True)
+    estado = models.CharField(max_length=20, choices=ESTADO_CHOICES, default='pendiente')
+    motivo = models.CharField(max_length=50, blank=True, default='', help_text='Resultado del procesamiento (ver services/lote.py)')
+    matricula = models.ForeignKey(Matricula, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    fecha_creacion = models.DateTimeField(auto_now_add=True)
+    fecha_procesada = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Solicitud de matrícula'
+        verbose_name_plural = 'Solicitudes de matrícula'
+        indexes = [
+            models.Index(fields=['estado', 'id'], name='solicitud_mat_estado_idx'),
+            models.Index(fields=['fecha_procesada'], name='solicitud_mat_procesada_idx'),
+        ]
+        constraints = [
+            # Reintentos del cliente no duplican tickets pendientes
+            models.UniqueConstraint(
+                fields=['estudiante', 'asignatura', 'periodo'],
+                condition=models.Q(estado='pendiente'),
+                name='solicitud_mat_pendiente_unica',
+            ),
+        ]
 
     def __str__(self):
-        return f"{self.estudiante} - {self.asignatura} ({self.periodo})"
\ No newline at end of file
+        return f"#{self.id} {self.estudiante} - {self.asignatura} ({self.estado})"
@@ -5,7 +5,16 @@ from rest_framework import serializers
 from applications.academico.models import Asignatura, PeriodoAcademico
 from applications.academico.api.serializers import AsignaturaSerializer, PeriodoAcademicoSerializer
 
-from .models import Matricula
+from .models import Matricula, SolicitudMatricula
+
+
+def validar_horario(value):
+    from applications.matriculas.services.horario import HorarioInvalido, sesiones_horario
+
+    try:
+        sesiones_horario(value)
+    except HorarioInvalido as e:
+        raise serializers.ValidationError(str(e))
 
 
 class MatriculaSerializer(serializers.ModelSerializer):
@@ -19,9 +28,89 @@ class MatriculaSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ('fecha', 'estudiante')
 
+    @property
+    def vista_compacta(self):
+        request = self.context.get('request')
+        vista = self.context.get('vista') or (request.query_params.get('vista') if request else None)
+        return vista == 'compacta'
+
+    def validate(self, data):
+        """
+        Si el horario se puede interpretar (ej.: "Lunes 8-10am") no puede chocar con otras
+        matrículas activas del estudiante en el mismo periodo. El texto libre ("Grupo A") se
+        acepta sin revisar choques; solo se rechaza el JSON con sesiones mal formadas.
+        """
+        from applications.matriculas.services.horario import HorarioInvalido, conflictos_estudiante, sesiones_horario
+
+        if 'horario' not in data:
+            return data
+        try:
+            sesiones = sesiones_horario(data['horario'])
+        except HorarioInvalido as e:
+            raise serializers.ValidationError({'horario': str(e)})
+
+        instance = self.instance
+        request = self.context.get('request')
+        estudiante = instance.estudiante if instance else getattr(request, 'user', None)
+        periodo = data.get('periodo') or (instance.periodo if instance else None)
+        if sesiones and estudiante is not None and periodo is not None:
+            conflictos = conflictos_estudiante(
+                estudiante.id, periodo.id, sesiones, excluir_matricula_id=instance.id if instance else None
+            )
+            if conflictos:
+                raise serializers.ValidationError({
+                    'horario': 'El horario se cruza con otra asignatura matriculada.',
+                    'conflictos': conflictos,
+                })
+        return data
+
     def to_representation(self, instance):
-        """Mantiene compatibilidad: devuelve asignatura/periodo como objetos."""
+        """
+        Mantiene compatibilidad: devuelve asignatura/periodo como objetos.
+        Con ?vista=compacta solo se incluyen los campos básicos de asignatura y periodo.
+        """
         rep = super().to_representation(instance)
-        rep['asignatura'] = AsignaturaSerializer(instance.asignatura).data if instance.asignatura_id else None
+        rep['sesiones'] = [
+            {'dia': s.get_dia_semana_display(), 'inicio': s.inicio, 'fin': s.fin}
+            for s in instance.sesiones.all()
+        ] if instance.pk else []
+        if self.vista_compacta:
+            a = instance.asignatura
+            rep['asignatura'] = {
+                'id': a.id, 'codigo': a.codigo, 'nombre': a.nombre, 'creditos': a.creditos,
+            } if instance.asignatura_id else None
+            rep['periodo'] = {
+                'id': instance.periodo.id, 'nombre': instance.periodo.nombre,
+            } if instance.periodo_id else None
+            return rep
+        rep['asignatura'] = AsignaturaSerializer(instance.asignatura, context=self.context).data if instance.asignatura_id else None
         rep['periodo'] = PeriodoAcademicoSerializer(instance.periodo).data if instance.periodo_id else None
-        return rep
\ No newline at end of file
+        return rep
+
+class MatriculaLoteSerializer(serializers.Serializer):
+    """Entrada de POST /api/matriculas/lote/."""
+    estudiantes = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+    asignaturas = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+    periodo = serializers.PrimaryKeyRelatedField(queryset=PeriodoAcademico.objects.all())
+    horario = serializers.CharField(allow_blank=True, allow_null=True, required=False, max_length=100, validators=[validar_horario])
+
+    def validate(self, data):
+        from applications.matriculas.services.lote import MAX_MATRICULAS_LOTE
+
+        total = len(set(data['estudiantes'])) * len(set(data['asignaturas']))
+        if total > MAX_MATRICULAS_LOTE:
+            raise serializers.ValidationError({
+                'detail': f'El lote genera {total} matrículas; el máximo por solicitud es {MAX_MATRICULAS_LOTE}.'
+            })
+        return data
+
+
+class SolicitudMatriculaSerializer(serializers.ModelSerializer):
+    """Ticket de matrícula en cola; la elegibilidad se valida al procesarla."""
+    horario = serializers.CharField(allow_blank=True, allow_null=True, required=False, max_length=100, validators=[validar_horario])
+
+    class Meta:
+        model = SolicitudMatricula
+        fields = ('id', 'asignatura', 'periodo', 'horario', 'estado', 'motivo', 'matricula', 'fecha_creacion', 'fecha_procesada')
+        read_only_fields = ('estado', 'motivo', 'matricula', 'fecha_creacion', 'fecha_procesada')
+
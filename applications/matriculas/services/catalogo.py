@@ -0,0 +1,56 @@
+"""
+Catálogo de asignaturas disponibles por (carrera, periodo).
+
+Todos los estudiantes de una carrera ven el mismo catálogo salvo sus propias matrículas,
+así que la consulta y la serialización (AsignaturaSerializer) se hacen una vez y se
+guardan en la caché compartida de settings.CACHES (Redis, común a todos los workers). La
+clave incluye un número de versión global que las señales incrementan al cambiar
+asignaturas, planes, docentes o prerrequisitos; cada lectura consulta esa versión, así que
+el cambio se ve en todos los workers en la siguiente petición. Las entradas anteriores
+quedan huérfanas y expiran por `CACHE_TTL`, que no interviene en la frescura.
+"""
+from __future__ import annotations
+
+from django.core.cache import cache
+
+from applications.academico.api.serializers import AsignaturaSerializer
+from applications.academico.models import Asignatura
+
+
+CACHE_TTL = 60 * 15
+CLAVE_VERSION = 'matriculas:catalogo:version'
+
+
+def version_catalogo() -> int:
+    version = cache.get(CLAVE_VERSION)
+    if version is None:
+        cache.add(CLAVE_VERSION, 1, None)
+        version = cache.get(CLAVE_VERSION, 1)
+    return version
+
+
+def invalidar_catalogo() -> None:
+    try:
+        cache.incr(CLAVE_VERSION)
+    except ValueError:
+        # La clave no existía (caché recién iniciada): cualquier versión nueva sirve
+        cache.add(CLAVE_VERSION, 1, None)
+
+
+def _clave(carrera_id, periodo_id, version) -> str:
+    return f'matriculas:catalogo:v{version}:{carrera_id}:{periodo_id}'
+
+
+def catalogo_disponibles(carrera_id, periodo_id) -> list[dict]:
+    """Asignaturas activas de la carrera en el periodo, ya serializadas."""
+    clave = _clave(carrera_id, periodo_id, version_catalogo())
+    data = cache.get(clave)
+    if data is None:
+        asignaturas = AsignaturaSerializer.preparar_queryset(
+            Asignatura.objects.filter(carreras=carrera_id, estado=True, periodo_academico=periodo_id).distinct()
+        )
+        data = AsignaturaSerializer(asignaturas, many=True).data
+        # Lista de dicts simples para que la caché no guarde objetos de DRF
+        data = [dict(a) for a in data]
+        cache.set(clave, data, CACHE_TTL)
+    return data
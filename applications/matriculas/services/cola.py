@@ -0,0 +1,191 @@
+"""
+Matrícula en cola para días de alta demanda.
+
+Con `MATRICULAS_MODO_COLA` activo, POST /api/matriculas/ de un estudiante solo inserta una
+SolicitudMatricula (una fila, sin validar elegibilidad) y responde 202 con el ticket. El
+worker toma lotes de `MATRICULAS_COLA_LOTE` solicitudes en orden de llegada
+(`select_for_update(skip_locked=True)`, así varios workers no se pisan), decide todas en
+memoria con `Elegibilidad` (las mismas reglas que el POST síncrono, ver
+`lote.evaluar_matricula`) y las inserta con un `bulk_create` por lote: la base recibe
+pocas transacciones grandes en vez de una por estudiante.
+
+El candado de despacho (`CLAVE_PROGRAMADA`) y las métricas de la última ejecución
+(`CLAVE_METRICAS`) van en la caché compartida de settings.CACHES: el `cache.add` es atómico
+en Redis para todos los procesos web, y las métricas que escribe el worker Celery se leen
+desde la web.
+"""
+from __future__ import annotations
+
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, DurationField, ExpressionWrapper, F
+from django.utils import timezone
+
+from applications.matriculas.models import Matricula, SolicitudMatricula
+from applications.matriculas.services.horario import HorarioInvalido, sesiones_horario, sincronizar_sesiones
+from applications.matriculas.services.lote import BULK_BATCH_SIZE, CREADA, Elegibilidad
+
+
+CLAVE_PROGRAMADA = 'matriculas:cola:programada'
+CLAVE_METRICAS = 'matriculas:cola:metricas'
+HORARIO_INVALIDO = 'horario_invalido'
+VENTANA_METRICAS = timedelta(minutes=5)
+
+
+def modo_cola_activo() -> bool:
+    return getattr(settings, 'MATRICULAS_MODO_COLA', False)
+
+
+def encolar_solicitud(*, estudiante, asignatura, periodo, horario=None) -> SolicitudMatricula:
+    """Registra la solicitud; si ya hay una pendiente para la misma asignatura devuelve esa."""
+    try:
+        with transaction.atomic():
+            solicitud = SolicitudMatricula.objects.create(
+                estudiante=estudiante, asignatura=asignatura, periodo=periodo, horario=horario
+            )
+    except IntegrityError:
+        return SolicitudMatricula.objects.get(
+            estudiante=estudiante, asignatura=asignatura, periodo=periodo, estado='pendiente'
+        )
+    transaction.on_commit(programar_procesamiento)
+    return solicitud
+
+
+def programar_procesamiento() -> None:
+    """
+    Despacha el worker, como máximo una vez por segundo aunque lleguen miles de solicitudes
+    (a través de todos los procesos web: el candado está en la caché compartida).
+    """
+    from applications.matriculas.tasks import procesar_cola_matriculas
+
+    if cache.add(CLAVE_PROGRAMADA, True, timeout=1):
+        procesar_cola_matriculas.delay()
+
+
+def posicion_en_cola(solicitud: SolicitudMatricula) -> int | None:
+    if solicitud.estado != 'pendiente':
+        return None
+    return SolicitudMatricula.objects.filter(estado='pendiente', id__lt=solicitud.id).count() + 1
+
+
+def procesar_lote(tamano: int | None = None) -> dict:
+    """Procesa hasta `tamano` solicitudes pendientes en una transacción."""
+    tamano = tamano or settings.MATRICULAS_COLA_LOTE
+    ahora = timezone.now()
+    with transaction.atomic():
+        solicitudes = list(
+            SolicitudMatricula.objects
+            .select_for_update(skip_locked=True)
+            .filter(estado='pendiente')
+            .order_by('id')[:tamano]
+        )
+        if not solicitudes:
+            return {'procesadas': 0, 'aceptadas': 0, 'rechazadas': 0}
+
+        por_periodo: dict[int, list[SolicitudMatricula]] = {}
+        for s in solicitudes:
+            por_periodo.setdefault(s.periodo_id, []).append(s)
+
+        nuevas = []
+        for periodo_id, grupo in por_periodo.items():
+            sesiones_por_solicitud = {}
+            for s in grupo:
+                try:
+                    sesiones_por_solicitud[s.id] = sesiones_horario(s.horario)
+                except HorarioInvalido:
+                    sesiones_por_solicitud[s.id] = None
+
+            elegibilidad = Elegibilidad(
+                grupo[0].periodo,
+                {s.estudiante_id for s in grupo},
+                {s.asignatura_id for s in grupo},
+                con_horario=any(sesiones_por_solicitud.values()),
+                exigir_periodo_activo=True,
+            )
+            for s in grupo:
+                sesiones = sesiones_por_solicitud[s.id]
+                if sesiones is None:
+                    s.motivo = HORARIO_INVALIDO
+                else:
+                    s.motivo = elegibilidad.evaluar(s.estudiante_id, s.asignatura_id, sesiones)
+                s.estado = 'aceptada' if s.motivo == CREADA else 'rechazada'
+                s.fecha_procesada = ahora
+                if s.estado == 'aceptada':
+                    nuevas.append(Matricula(
+                        estudiante_id=s.estudiante_id, asignatura_id=s.asignatura_id,
+                        periodo_id=periodo_id, horario=s.horario,
+                        facultad_id=elegibilidad.estudiantes[s.estudiante_id][1],
+                    ))
+
+        # ignore_conflicts: una matrícula creada por otra vía entre la lectura y el insert no aborta el lote
+        Matricula.objects.bulk_create(nuevas, batch_size=BULK_BATCH_SIZE, ignore_conflicts=True)
+        creadas = {
+            (m.estudiante_id, m.asignatura_id, m.periodo_id): m
+            for m in Matricula.objects.filter(
+                estudiante_id__in={m.estudiante_id for m in nuevas},
+                asignatura_id__in={m.asignatura_id for m in nuevas},
+                periodo_id__in=por_periodo.keys(),
+            ).only('id', 'estudiante_id', 'asignatura_id', 'periodo_id', 'horario')
+        } if nuevas else {}
+        for s in solicitudes:
+            if s.estado == 'aceptada':
+                s.matricula = creadas.get((s.estudiante_id, s.asignatura_id, s.periodo_id))
+        sincronizar_sesiones(
+            creadas[k] for k in
+            {(s.estudiante_id, s.asignatura_id, s.periodo_id) for s in solicitudes if s.estado == 'aceptada' and s.horario}
+            if k in creadas
+        )
+
+        SolicitudMatricula.objects.bulk_update(
+            solicitudes, ['estado', 'motivo', 'matricula', 'fecha_procesada'], batch_size=BULK_BATCH_SIZE
+        )
+
+    aceptadas = sum(1 for s in solicitudes if s.estado == 'aceptada')
+    return {'procesadas': len(solicitudes), 'aceptadas': aceptadas, 'rechazadas': len(solicitudes) - aceptadas}
+
+
+def procesar_cola(max_lotes: int | None = None, tamano: int | None = None) -> dict:
+    """
+    Vacía la cola hasta `max_lotes` lotes y registra el throughput de la ejecución
+    (lo expone GET /api/solicitudes-matricula/metricas/).
+    """
+    max_lotes = max_lotes or settings.MATRICULAS_COLA_MAX_LOTES
+    inicio = time.monotonic()
+    total = {'procesadas': 0, 'aceptadas': 0, 'rechazadas': 0, 'lotes': 0, 'pendientes': False}
+    for _ in range(max_lotes):
+        res = procesar_lote(tamano)
+        if not res['procesadas']:
+            break
+        total['lotes'] += 1
+        for k in ('procesadas', 'aceptadas', 'rechazadas'):
+            total[k] += res[k]
+    else:
+        # Se agotó el límite de lotes con la cola aún llena
+        total['pendientes'] = SolicitudMatricula.objects.filter(estado='pendiente').exists()
+
+    segundos = time.monotonic() - inicio
+    total['segundos'] = round(segundos, 3)
+    total['por_segundo'] = round(total['procesadas'] / segundos, 1) if segundos > 0 else 0.0
+    if total['procesadas']:
+        cache.set(CLAVE_METRICAS, {**total, 'fecha': timezone.now().isoformat()}, timeout=None)
+    return total
+
+
+def metricas_cola() -> dict:
+    """Pendientes, throughput de la última ejecución y latencia media de los últimos minutos."""
+    desde = timezone.now() - VENTANA_METRICAS
+    recientes = SolicitudMatricula.objects.filter(fecha_procesada__gte=desde)
+    latencia = recientes.aggregate(
+        media=Avg(ExpressionWrapper(F('fecha_procesada') - F('fecha_creacion'), output_field=DurationField()))
+    )['media']
+    return {
+        'modo_cola': modo_cola_activo(),
+        'pendientes': SolicitudMatricula.objects.filter(estado='pendiente').count(),
+        'procesadas_ultimos_5_min': recientes.count(),
+        'latencia_media_segundos': round(latencia.total_seconds(), 3) if latencia else None,
+        'ultima_ejecucion': cache.get(CLAVE_METRICAS),
+    }
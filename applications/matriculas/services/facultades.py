@@ -0,0 +1,36 @@
+"""Facultad desnormalizada en Matricula (la de la carrera del estudiante)."""
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.db.models import F, OuterRef, Q, Subquery
+
+from applications.matriculas.models import Matricula
+
+
+def facultad_de_estudiante(estudiante_id):
+    User = get_user_model()
+    return User.objects.filter(pk=estudiante_id).values_list('carrera__facultad_id', flat=True).first()
+
+
+def sincronizar_facultad_matriculas(**filtros) -> int:
+    """
+    Corrige con un solo UPDATE las matrículas (opcionalmente filtradas) cuya facultad no
+    coincide con la de la carrera actual del estudiante, incluida la que debe quedar en NULL
+    porque el estudiante ya no tiene carrera. Devuelve cuántas cambiaron.
+    """
+    User = get_user_model()
+    facultad_actual = Subquery(
+        User.objects.filter(pk=OuterRef('estudiante_id')).values('carrera__facultad_id')[:1]
+    )
+    desfasadas = (
+        Matricula.objects.filter(**filtros)
+        .annotate(facultad_actual=facultad_actual)
+        # En SQL `facultad_id <> NULL` no es verdadero: los NULL se comparan aparte
+        .filter(
+            Q(facultad__isnull=True, facultad_actual__isnull=False)
+            | Q(facultad__isnull=False, facultad_actual__isnull=True)
+            | (Q(facultad__isnull=False, facultad_actual__isnull=False) & ~Q(facultad_id=F('facultad_actual')))
+        )
+        .values('pk')
+    )
+    return Matricula.objects.filter(pk__in=desfasadas).update(facultad_id=facultad_actual)
@@ -0,0 +1,364 @@
+"""
+Horario estructurado de las matrículas.
+
+`Matricula.horario` sigue siendo texto ("Lunes 8-10am", "Lun y Mié 14:00-16:00",
+"Lunes a Viernes 7-9" o JSON) y
+de él se derivan filas SesionHorario (día, inicio, fin en minutos). El texto libre que no es
+un horario ("Grupo A", "Mañana") sigue siendo válido: se guarda tal cual, sin sesiones y sin
+revisión de choques (ver `sesiones_horario`). Con las sesiones:
+
+- `conflictos_estudiante`: al matricular, consulta un árbol de intervalos por día con las
+  sesiones que el estudiante ya tiene en el periodo.
+- `reporte_conflictos_periodo`: recorre todas las sesiones del periodo ordenadas por
+  (estudiante, día, inicio) con un barrido, O(n log n) en vez de comparar por pares.
+"""
+from __future__ import annotations
+
+import heapq
+import json
+import re
+import unicodedata
+from typing import Iterable, NamedTuple
+
+from django.db import transaction
+
+from applications.matriculas.models import Matricula, SesionHorario
+
+
+LOTE_SESIONES = 2000
+
+DIAS = {
+    'lunes': 0, 'lun': 0, 'lu': 0,
+    'martes': 1, 'mar': 1, 'ma': 1,
+    'miercoles': 2, 'mie': 2, 'mi': 2,
+    'jueves': 3, 'jue': 3, 'ju': 3,
+    'viernes': 4, 'vie': 4, 'vi': 4,
+    'sabado': 5, 'sab': 5, 'sa': 5,
+    'domingo': 6, 'dom': 6, 'do': 6,
+}
+NOMBRES_DIAS = dict(SesionHorario.DIAS_SEMANA)
+
+_RE_DIA = re.compile(r'\b(' + '|'.join(sorted(DIAS, key=len, reverse=True)) + r')\b\.?')
+# Entre dos días: "Lunes a Viernes", "lun-vie", "Lunes hasta Jueves"
+_RE_HASTA_DIA = re.compile(r'\s*(?:al?|-|hasta)\s*')
+_RE_RANGO = re.compile(
+    r'(\d{1,2})(?:[:h.](\d{2}))?\s*(am|pm)?\s*(?:-|a|hasta)\s*(\d{1,2})(?:[:h.](\d{2}))?\s*(am|pm)?'
+)
+
+
+class HorarioInvalido(ValueError):
+    pass
+
+
+class Sesion(NamedTuple):
+    dia: int
+    inicio: int
+    fin: int
+
+    def __str__(self):
+        return f'{NOMBRES_DIAS[self.dia]} {_hhmm(self.inicio)}-{_hhmm(self.fin)}'
+
+
+def _hhmm(minutos: int) -> str:
+    return f'{minutos // 60:02d}:{minutos % 60:02d}'
+
+
+def _normalizar(texto: str) -> str:
+    texto = unicodedata.normalize('NFKD', texto.lower())
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    return texto.replace('a.m.', 'am').replace('p.m.', 'pm').replace('–', '-')
+
+
+def _a_minutos(hora: int, minutos: int, sufijo: str | None) -> int:
+    if sufijo == 'am' and hora == 12:
+        hora = 0
+    elif sufijo == 'pm' and hora < 12:
+        hora += 12
+    return hora * 60 + minutos
+
+
+def _rango(m: re.Match) -> tuple[int, int]:
+    h1, m1, suf1, h2, m2, suf2 = m.groups()
+    fin = _a_minutos(int(h2), int(m2 or 0), suf2)
+    if suf1 or not suf2:
+        inicio = _a_minutos(int(h1), int(m1 or 0), suf1)
+    else:
+        # "2-4pm" -> 14:00-16:00, pero "10-12pm" / "11-1pm" empiezan en la mañana
+        inicio = _a_minutos(int(h1), int(m1 or 0), suf2)
+        if inicio >= fin:
+            inicio = _a_minutos(int(h1), int(m1 or 0), 'am')
+    return inicio, fin
+
+
+def _validar(sesion: Sesion) -> Sesion:
+    if not (0 <= sesion.inicio < sesion.fin <= 24 * 60):
+        raise HorarioInvalido(f'Rango de horas inválido: {_hhmm(sesion.inicio)}-{_hhmm(sesion.fin)}.')
+    return sesion
+
+
+def _hora_json(valor) -> int:
+    if isinstance(valor, int):
+        return valor
+    m = re.fullmatch(r'\s*(\d{1,2})(?::(\d{2}))?\s*(am|pm)?\s*', _normalizar(str(valor)))
+    if not m:
+        raise HorarioInvalido(f'Hora inválida: {valor!r}.')
+    return _a_minutos(int(m.group(1)), int(m.group(2) or 0), m.group(3))
+
+
+def _dia_json(valor) -> int:
+    if isinstance(valor, int) and 0 <= valor <= 6:
+        return valor
+    dia = DIAS.get(_normalizar(str(valor)).strip().rstrip('.'))
+    if dia is None:
+        raise HorarioInvalido(f'Día inválido: {valor!r}.')
+    return dia
+
+
+def _parsear_json(texto: str) -> list[Sesion]:
+    try:
+        datos = json.loads(texto)
+    except ValueError as e:
+        raise HorarioInvalido('JSON de horario inválido.') from e
+    if isinstance(datos, dict):
+        datos = datos.get('sesiones', [datos])
+    if not isinstance(datos, list):
+        raise HorarioInvalido('El JSON de horario debe ser un objeto o una lista de sesiones.')
+    sesiones = []
+    for item in datos:
+        if not isinstance(item, dict) or not {'dia', 'inicio', 'fin'} <= item.keys():
+            raise HorarioInvalido('Cada sesión necesita "dia", "inicio" y "fin".')
+        sesiones.append(_validar(Sesion(_dia_json(item['dia']), _hora_json(item['inicio']), _hora_json(item['fin']))))
+    return sesiones
+
+
+def parsear_horario(texto: str | None) -> list[Sesion]:
+    """
+    Convierte el texto de `Matricula.horario` en sesiones. Cada rango de horas aplica a los
+    días que lo preceden: "Lunes y Miércoles 8-10am, Viernes 14:00-16:00". Dos días unidos
+    por "a", "al", "-" o "hasta" son un rango: "Lunes a Viernes 7-9" (de lunes a viernes).
+    Sin sufijo am/pm las horas se interpretan en formato 24 h. Texto vacío -> [].
+    """
+    if texto is None or not texto.strip():
+        return []
+    texto = texto.strip()
+    if texto[0] in '[{':
+        return sorted(set(_parsear_json(texto)))
+
+    normal = _normalizar(texto)
+    eventos = [(m.start(), 'rango', _rango(m)) for m in _RE_RANGO.finditer(normal)]
+    coincidencias = list(_RE_DIA.finditer(normal))
+    i = 0
+    while i < len(coincidencias):
+        m = coincidencias[i]
+        siguiente = coincidencias[i + 1] if i + 1 < len(coincidencias) else None
+        if siguiente and _RE_HASTA_DIA.fullmatch(normal, m.end(), siguiente.start()):
+            desde, hasta = DIAS[m.group(1)], DIAS[siguiente.group(1)]
+            if desde >= hasta:
+                raise HorarioInvalido(f'Rango de días inválido en "{texto}" (ej.: "Lunes a Viernes").')
+            eventos.append((m.start(), 'dia', tuple(range(desde, hasta + 1))))
+            i += 2
+        else:
+            eventos.append((m.start(), 'dia', (DIAS[m.group(1)],)))
+            i += 1
+    eventos.sort()
+
+    sesiones, dias = set(), []
+    for pos, tipo, valor in eventos:
+        if tipo == 'dia':
+            dias.extend(valor)
+            continue
+        if not dias:
+            raise HorarioInvalido(f'El rango de horas en "{texto}" no indica el día.')
+        for dia in dias:
+            sesiones.add(_validar(Sesion(dia, *valor)))
+        dias = []
+
+    if dias or not sesiones:
+        raise HorarioInvalido(f'No se reconoce el horario "{texto}" (ej.: "Lunes 8-10am").')
+    return sorted(sesiones)
+
+
+def _es_json(texto: str) -> bool:
+    try:
+        json.loads(texto)
+    except ValueError:
+        return False
+    return True
+
+
+def sesiones_horario(texto: str | None) -> list[Sesion]:
+    """
+    Sesiones de `texto` para revisar choques, sin exigir que sea un horario: el texto libre
+    que no se puede interpretar ("Grupo A", "G1") no tiene sesiones. Solo el horario en JSON
+    con sesiones mal formadas (sin "dia", "inicio" o "fin", horas inválidas) es HorarioInvalido.
+    """
+    try:
+        return parsear_horario(texto)
+    except HorarioInvalido:
+        if texto.strip()[:1] in ('[', '{') and _es_json(texto):
+            raise
+        return []
+
+
+class ArbolIntervalos:
+    """
+    Árbol de intervalos estático sobre un arreglo ordenado por inicio: cada nodo (el punto
+    medio de su rango) guarda el mayor `fin` de su subárbol para podar la búsqueda.
+    Construcción O(n log n), consulta O(log n + k). Intervalos semiabiertos [inicio, fin).
+    """
+
+    def __init__(self, intervalos: Iterable[tuple[int, int, object]]):
+        self._items = sorted(intervalos, key=lambda x: (x[0], x[1]))
+        self._max_fin = [0] * len(self._items)
+        self._construir(0, len(self._items) - 1)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _construir(self, lo: int, hi: int) -> int:
+        if lo > hi:
+            return -1
+        medio = (lo + hi) // 2
+        self._max_fin[medio] = max(
+            self._items[medio][1], self._construir(lo, medio - 1), self._construir(medio + 1, hi)
+        )
+        return self._max_fin[medio]
+
+    def solapados(self, inicio: int, fin: int) -> list[tuple[int, int, object]]:
+        encontrados = []
+        pila = [(0, len(self._items) - 1)]
+        while pila:
+            lo, hi = pila.pop()
+            if lo > hi:
+                continue
+            medio = (lo + hi) // 2
+            if self._max_fin[medio] <= inicio:
+                continue
+            pila.append((lo, medio - 1))
+            item = self._items[medio]
+            if item[0] < fin:
+                if item[1] > inicio:
+                    encontrados.append(item)
+                pila.append((medio + 1, hi))
+        return sorted(encontrados, key=lambda x: (x[0], x[1]))
+
+
+class AgendaEstudiante:
+    """Sesiones de un estudiante en un periodo, con un árbol de intervalos por día."""
+
+    def __init__(self, sesiones: Iterable[tuple[Sesion, object]] = ()):
+        self._por_dia: dict[int, list] = {}
+        self._arboles: dict[int, ArbolIntervalos] = {}
+        for sesion, dato in sesiones:
+            self.agregar(sesion, dato)
+
+    def agregar(self, sesion: Sesion, dato) -> None:
+        self._por_dia.setdefault(sesion.dia, []).append((sesion.inicio, sesion.fin, dato))
+        self._arboles.pop(sesion.dia, None)
+
+    def conflictos(self, sesiones: Iterable[Sesion]) -> list[dict]:
+        resultado = []
+        for s in sesiones:
+            if s.dia not in self._por_dia:
+                continue
+            if s.dia not in self._arboles:
+                self._arboles[s.dia] = ArbolIntervalos(self._por_dia[s.dia])
+            for inicio, fin, dato in self._arboles[s.dia].solapados(s.inicio, s.fin):
+                resultado.append({
+                    'sesion': str(s),
+                    'choca_con': str(Sesion(s.dia, inicio, fin)),
+                    'asignatura': dato,
+                })
+        return resultado
+
+
+def agendas_periodo(periodo_id, estudiantes_ids=None, excluir_matriculas=()) -> dict[int, AgendaEstudiante]:
+    """Agenda por estudiante con sus matrículas activas del periodo (una consulta)."""
+    qs = SesionHorario.objects.filter(matricula__periodo_id=periodo_id, matricula__estado='activa')
+    if estudiantes_ids is not None:
+        qs = qs.filter(matricula__estudiante_id__in=list(estudiantes_ids))
+    if excluir_matriculas:
+        qs = qs.exclude(matricula_id__in=list(excluir_matriculas))
+    agendas: dict[int, AgendaEstudiante] = {}
+    for est_id, asig_id, dia, inicio, fin in qs.values_list(
+        'matricula__estudiante_id', 'matricula__asignatura_id', 'dia_semana', 'inicio', 'fin'
+    ):
+        agendas.setdefault(est_id, AgendaEstudiante()).agregar(Sesion(dia, inicio, fin), asig_id)
+    return agendas
+
+
+def conflictos_estudiante(estudiante_id, periodo_id, sesiones: list[Sesion], excluir_matricula_id=None) -> list[dict]:
+    """Choques de `sesiones` con lo que el estudiante ya tiene matriculado en el periodo."""
+    if not sesiones:
+        return []
+    agendas = agendas_periodo(
+        periodo_id, [estudiante_id], excluir_matriculas=[excluir_matricula_id] if excluir_matricula_id else ()
+    )
+    agenda = agendas.get(estudiante_id)
+    return agenda.conflictos(sesiones) if agenda else []
+
+
+def sincronizar_sesiones(matriculas: Iterable[Matricula]) -> dict:
+    """
+    Reemplaza las sesiones de las matrículas dadas por las derivadas de su `horario`.
+    Los horarios que no se pueden interpretar quedan sin sesiones y se informan.
+    """
+    matriculas = list(matriculas)
+    nuevas, invalidas = [], []
+    for m in matriculas:
+        try:
+            sesiones = parsear_horario(m.horario)
+        except HorarioInvalido as e:
+            invalidas.append({'matricula': m.id, 'horario': m.horario, 'error': str(e)})
+            continue
+        nuevas.extend(
+            SesionHorario(matricula_id=m.id, dia_semana=s.dia, inicio=s.inicio, fin=s.fin) for s in sesiones
+        )
+    with transaction.atomic():
+        SesionHorario.objects.filter(matricula_id__in=[m.id for m in matriculas]).delete()
+        SesionHorario.objects.bulk_create(nuevas, batch_size=LOTE_SESIONES)
+    return {'matriculas': len(matriculas), 'sesiones': len(nuevas), 'invalidas': invalidas}
+
+
+def reporte_conflictos_periodo(periodo_id, facultad_id=None) -> list[dict]:
+    """
+    Todos los pares de matrículas activas del periodo cuyas sesiones se solapan.
+
+    Las sesiones llegan ordenadas por (estudiante, día, inicio) y se barren manteniendo en un
+    heap las que siguen abiertas (por `fin`): O(n log n + k) con k pares en conflicto.
+    """
+    qs = SesionHorario.objects.filter(matricula__periodo_id=periodo_id, matricula__estado='activa')
+    if facultad_id is not None:
+        qs = qs.filter(matricula__facultad_id=facultad_id)
+    filas = (
+        qs.order_by('matricula__estudiante_id', 'dia_semana', 'inicio', 'fin')
+        .values_list(
+            'matricula__estudiante_id', 'matricula__estudiante__username',
+            'matricula_id', 'matricula__asignatura__codigo', 'dia_semana', 'inicio', 'fin',
+        )
+        .iterator(chunk_size=LOTE_SESIONES)
+    )
+
+    conflictos = []
+    grupo, abiertas = None, []
+    for est_id, username, mat_id, codigo, dia, inicio, fin in filas:
+        if grupo != (est_id, dia):
+            grupo, abiertas = (est_id, dia), []
+        while abiertas and abiertas[0][0] <= inicio:
+            heapq.heappop(abiertas)
+        for fin_a, mat_a, codigo_a, inicio_a in abiertas:
+            if mat_a == mat_id:
+                continue
+            conflictos.append({
+                'estudiante': est_id,
+                'username': username,
+                'dia': NOMBRES_DIAS[dia],
+                'matricula_a': mat_a,
+                'asignatura_a': codigo_a,
+                'sesion_a': f'{_hhmm(inicio_a)}-{_hhmm(fin_a)}',
+                'matricula_b': mat_id,
+                'asignatura_b': codigo,
+                'sesion_b': f'{_hhmm(inicio)}-{_hhmm(fin)}',
+            })
+        heapq.heappush(abiertas, (fin, mat_id, codigo, inicio))
+    return conflictos
@@ -0,0 +1,212 @@
+"""
+Matrícula masiva (estudiantes × asignaturas × periodo).
+
+Toda la elegibilidad se resuelve contra conjuntos precargados (una consulta por tabla) y
+las filas nuevas se insertan con un `bulk_create`, apoyado en el unique_together
+(estudiante, asignatura, periodo): si otra petición matriculó algún par entre la lectura y
+el insert, ese par se informa como existente y el resto se reintenta. Si se indica horario, los choques se
+detectan con la agenda (árbol de intervalos) de cada estudiante, incluyendo lo que el
+mismo lote le va matriculando.
+"""
+from __future__ import annotations
+
+from functools import cached_property
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from applications.academico.models import Asignatura, PlanCarreraAsignatura
+from applications.matriculas.models import Matricula
+from applications.matriculas.services.horario import AgendaEstudiante, agendas_periodo, sesiones_horario, sincronizar_sesiones
+
+
+MAX_MATRICULAS_LOTE = 50_000
+BULK_BATCH_SIZE = 2000
+
+# Resultados por fila
+CREADA = 'creada'
+EXISTENTE = 'existente'
+ESTUDIANTE_INVALIDO = 'estudiante_invalido'
+FUERA_DE_ALCANCE = 'fuera_de_alcance'
+ASIGNATURA_INVALIDA = 'asignatura_invalida'
+CARRERA_NO_ELEGIBLE = 'carrera_no_elegible'
+CONFLICTO_HORARIO = 'conflicto_horario'
+PERIODO_INACTIVO = 'periodo_inactivo'
+
+# Mensajes para la matrícula individual de un estudiante (POST /api/matriculas/)
+MENSAJES = {
+    ESTUDIANTE_INVALIDO: 'El usuario no tiene carrera asignada o no es un estudiante activo.',
+    PERIODO_INACTIVO: 'El periodo académico no está activo.',
+    ASIGNATURA_INVALIDA: 'La asignatura no es válida para tu carrera o periodo.',
+    CARRERA_NO_ELEGIBLE: 'La asignatura no es válida para tu carrera o periodo.',
+    EXISTENTE: 'Ya tienes esta asignatura matriculada en este periodo.',
+    CONFLICTO_HORARIO: 'El horario se cruza con otra asignatura matriculada.',
+}
+
+
+class Elegibilidad:
+    """
+    Datos precargados de un periodo para decidir en memoria si un estudiante puede
+    matricularse en una asignatura (una consulta por tabla, sin consultas por fila).
+    Las matrículas aceptadas se registran para que el resto del lote las tenga en cuenta.
+    Con `exigir_periodo_activo` (matrícula del propio estudiante) solo se acepta el periodo activo.
+    """
+
+    def __init__(self, periodo, estudiantes_ids, asignaturas_ids, con_horario=False, exigir_periodo_activo=False):
+        self.periodo_cerrado = exigir_periodo_activo and not periodo.activo
+        self.estudiantes_ids = list(estudiantes_ids)
+
+        # Estudiantes activos -> (carrera_id, facultad_id)
+        User = get_user_model()
+        self.estudiantes = {
+            e_id: (carrera_id, facultad_id)
+            for e_id, carrera_id, facultad_id in (
+                User.objects
+                .filter(id__in=estudiantes_ids, estado='activo')
+                .filter(Q(rol='estudiante') | Q(roles__tipo='estudiante'))
+                .values_list('id', 'carrera_id', 'carrera__facultad_id')
+                .distinct()
+            )
+        }
+
+        # Asignaturas activas del periodo -> carreras en cuyo plan están
+        self.asignaturas_validas = set(
+            Asignatura.objects
+            .filter(id__in=asignaturas_ids, estado=True, periodo_academico=periodo)
+            .values_list('id', flat=True)
+        )
+        self.carreras_por_asignatura: dict[int, set[int]] = {}
+        for a_id, c_id in PlanCarreraAsignatura.objects.filter(
+            asignatura_id__in=self.asignaturas_validas
+        ).values_list('asignatura_id', 'carrera_id'):
+            self.carreras_por_asignatura.setdefault(a_id, set()).add(c_id)
+
+        self.existentes = set(
+            Matricula.objects
+            .filter(periodo=periodo, estudiante_id__in=estudiantes_ids, asignatura_id__in=asignaturas_ids)
+            .values_list('estudiante_id', 'asignatura_id')
+        )
+        self.agendas = agendas_periodo(periodo.id, self.estudiantes.keys()) if con_horario else {}
+
+    @cached_property
+    def facultades_usuarios(self) -> dict[int, int | None]:
+        """Facultad (por su carrera) de cada usuario pedido, exista o no como estudiante activo."""
+        return dict(
+            get_user_model().objects.filter(id__in=self.estudiantes_ids).values_list('id', 'carrera__facultad_id')
+        )
+
+    def evaluar(self, e_id, a_id, sesiones=(), facultad_alcance=None) -> str:
+        # El alcance va primero: fuera de él no se distingue un id inexistente de uno de otra facultad
+        if facultad_alcance is not None and self.facultades_usuarios.get(e_id) != facultad_alcance:
+            return FUERA_DE_ALCANCE
+        datos = self.estudiantes.get(e_id)
+        if datos is None or datos[0] is None:
+            return ESTUDIANTE_INVALIDO
+        if self.periodo_cerrado:
+            return PERIODO_INACTIVO
+        if a_id not in self.asignaturas_validas:
+            return ASIGNATURA_INVALIDA
+        if datos[0] not in self.carreras_por_asignatura.get(a_id, ()):
+            return CARRERA_NO_ELEGIBLE
+        if (e_id, a_id) in self.existentes:
+            return EXISTENTE
+        if sesiones and e_id in self.agendas and self.agendas[e_id].conflictos(sesiones):
+            return CONFLICTO_HORARIO
+
+        self.existentes.add((e_id, a_id))
+        if sesiones:
+            agenda = self.agendas.setdefault(e_id, AgendaEstudiante())
+            for s in sesiones:
+                agenda.agregar(s, a_id)
+        return CREADA
+
+
+def evaluar_matricula(estudiante_id, asignatura_id, periodo, sesiones=()) -> str:
+    """
+    Elegibilidad de la matrícula de un estudiante en una asignatura: las mismas reglas que
+    la cola de matrícula, para el POST síncrono.
+    """
+    elegibilidad = Elegibilidad(
+        periodo, [estudiante_id], [asignatura_id], con_horario=bool(sesiones), exigir_periodo_activo=True
+    )
+    return elegibilidad.evaluar(estudiante_id, asignatura_id, sesiones)
+
+
+def insertar_matriculas(nuevas: list[Matricula]) -> set[tuple[int, int]]:
+    """
+    Inserta `nuevas` (todas del mismo periodo) en bloque dentro de un savepoint. Si otra
+    petición matriculó alguno de los pares (estudiante, asignatura) entre la lectura y el
+    insert, se reintenta sin ellos; devuelve esos pares.
+    """
+    perdidas: set[tuple[int, int]] = set()
+    while nuevas:
+        try:
+            with transaction.atomic():
+                Matricula.objects.bulk_create(nuevas, batch_size=BULK_BATCH_SIZE)
+            break
+        except IntegrityError:
+            pares = {(m.estudiante_id, m.asignatura_id) for m in nuevas}
+            chocan = pares & set(
+                Matricula.objects
+                .filter(
+                    periodo_id=nuevas[0].periodo_id,
+                    estudiante_id__in={e for e, _ in pares},
+                    asignatura_id__in={a for _, a in pares},
+                )
+                .values_list('estudiante_id', 'asignatura_id')
+            )
+            if not chocan:
+                raise
+            perdidas |= chocan
+            nuevas = [m for m in nuevas if (m.estudiante_id, m.asignatura_id) not in chocan]
+            for m in nuevas:
+                m.pk = None  # ids de lotes que el savepoint revirtió
+    return perdidas
+
+
+def resumir(resultados) -> dict:
+    resumen = {}
+    for r in resultados:
+        resumen[r['resultado']] = resumen.get(r['resultado'], 0) + 1
+    return resumen
+
+
+def matricular_lote(*, estudiantes_ids, asignaturas_ids, periodo, horario=None, facultad_alcance=None) -> dict:
+    """
+    Matricula cada estudiante en cada asignatura del periodo.
+    `facultad_alcance` limita los estudiantes a una facultad (coordinadores/admins).
+    """
+    estudiantes_ids = list(dict.fromkeys(estudiantes_ids))
+    asignaturas_ids = list(dict.fromkeys(asignaturas_ids))
+
+    sesiones = sesiones_horario(horario)
+    elegibilidad = Elegibilidad(periodo, estudiantes_ids, asignaturas_ids, con_horario=bool(sesiones))
+
+    resultados = []
+    nuevas = []
+    for e_id in estudiantes_ids:
+        for a_id in asignaturas_ids:
+            resultado = elegibilidad.evaluar(e_id, a_id, sesiones, facultad_alcance)
+            if resultado == CREADA:
+                nuevas.append(Matricula(
+                    estudiante_id=e_id, asignatura_id=a_id, periodo=periodo, horario=horario,
+                    facultad_id=elegibilidad.estudiantes[e_id][1],
+                ))
+            resultados.append({'estudiante': e_id, 'asignatura': a_id, 'resultado': resultado})
+
+    with transaction.atomic():
+        perdidas = insertar_matriculas(nuevas)
+        if sesiones:
+            # bulk_create no dispara post_save
+            sincronizar_sesiones(m for m in nuevas if (m.estudiante_id, m.asignatura_id) not in perdidas)
+    for r in resultados:
+        if (r['estudiante'], r['asignatura']) in perdidas:
+            r['resultado'] = EXISTENTE
+
+    return {
+        'periodo': periodo.id,
+        'total': len(resultados),
+        'resumen': resumir(resultados),
+        'resultados': resultados,
+    }
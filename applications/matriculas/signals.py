@@ -0,0 +1,68 @@
+from django.db import transaction
+from django.contrib.auth import get_user_model
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+
+from applications.academico.models import (
+    Asignatura,
+    Carrera,
+    Facultad,
+    PlanCarreraAsignatura,
+    ProfesorAsignatura,
+)
+from applications.academico.signals import asignaturas_modificadas
+from applications.matriculas.models import Matricula
+from applications.matriculas.services.catalogo import invalidar_catalogo
+from applications.matriculas.services.facultades import facultad_de_estudiante, sincronizar_facultad_matriculas
+from applications.matriculas.services.horario import sincronizar_sesiones
+
+
+def _invalidar(**kwargs):
+    transaction.on_commit(invalidar_catalogo)
+
+
+# El catálogo de disponibles serializa asignaturas con su plan, carrera, docentes y prerrequisitos
+for _modelo in (Asignatura, PlanCarreraAsignatura, ProfesorAsignatura, Carrera, Facultad):
+    post_save.connect(_invalidar, sender=_modelo, dispatch_uid=f'catalogo_save_{_modelo.__name__}')
+    post_delete.connect(_invalidar, sender=_modelo, dispatch_uid=f'catalogo_delete_{_modelo.__name__}')
+
+
+asignaturas_modificadas.connect(_invalidar, dispatch_uid='catalogo_asignaturas_modificadas')
+
+
+@receiver(m2m_changed, sender=Asignatura.prerrequisitos.through)
+def invalidar_por_prerrequisitos(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _invalidar()
+
+
+@receiver(post_save, sender=Matricula)
+def sincronizar_sesiones_matricula(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    """Mantiene las sesiones estructuradas al día con `Matricula.horario`."""
+    if raw or (update_fields is not None and 'horario' not in update_fields):
+        return
+    sincronizar_sesiones([instance])
+
+
+# --- Facultad desnormalizada en Matricula ---
+
+@receiver(pre_save, sender=Matricula)
+def asignar_facultad_matricula(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and 'estudiante' not in update_fields):
+        return
+    instance.facultad_id = facultad_de_estudiante(instance.estudiante_id)
+
+
+@receiver(post_save, sender=get_user_model())
+def facultad_por_cambio_de_carrera(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    # Un alta no tiene matrículas; los guardados parciales sin carrera (p. ej. last_login) no la cambian
+    if raw or created or (update_fields is not None and 'carrera' not in update_fields):
+        return
+    sincronizar_facultad_matriculas(estudiante=instance)
+
+
+@receiver(post_save, sender=Carrera)
+def facultad_por_cambio_de_facultad(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or created or (update_fields is not None and 'facultad' not in update_fields):
+        return
+    sincronizar_facultad_matriculas(estudiante__carrera=instance)
@@ -0,0 +1,29 @@
+"""
+Tareas Celery para matrículas
+"""
+import logging
+
+from celery import shared_task
+
+from django.core.cache import cache
+
+from applications.matriculas.services.cola import CLAVE_PROGRAMADA, procesar_cola
+
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def procesar_cola_matriculas(max_lotes=None, tamano=None):
+    """
+    Procesa las solicitudes de matrícula en cola (modo alta demanda) por lotes transaccionales.
+    Se despacha al encolar y además cada minuto con Celery Beat por si algún despacho se pierde.
+    """
+    # Lo que se encole mientras este worker corre vuelve a despachar otro
+    cache.delete(CLAVE_PROGRAMADA)
+    resultado = procesar_cola(max_lotes=max_lotes, tamano=tamano)
+    if resultado['procesadas']:
+        logger.info('procesar_cola_matriculas: %s', resultado)
+    if resultado['pendientes']:
+        procesar_cola_matriculas.delay(max_lotes, tamano)
+    return resultado
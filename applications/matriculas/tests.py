@@ -0,0 +1,498 @@
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase, APIClient
+
+from applications.academico.models import (
+    Asignatura,
+    Carrera,
+    Facultad,
+    PeriodoAcademico,
+    PlanCarreraAsignatura,
+)
+from applications.matriculas.models import Matricula, SolicitudMatricula
+from applications.matriculas.services.cola import procesar_cola, programar_procesamiento
+from applications.matriculas.services.facultades import sincronizar_facultad_matriculas
+from applications.matriculas.services.horario import (
+    AgendaEstudiante,
+    ArbolIntervalos,
+    HorarioInvalido,
+    Sesion,
+    parsear_horario,
+    reporte_conflictos_periodo,
+    sesiones_horario,
+)
+
+
+class MatriculaBaseTests(APITestCase):
+    def setUp(self):
+        self.client = APIClient()
+        User = get_user_model()
+
+        self.periodo = PeriodoAcademico.objects.create(
+            nombre="2026-I", fecha_inicio=date(2026, 1, 1), fecha_fin=date(2026, 6, 30), activo=True
+        )
+        self.periodo_cerrado = PeriodoAcademico.objects.create(
+            nombre="2025-II", fecha_inicio=date(2025, 7, 1), fecha_fin=date(2025, 12, 31)
+        )
+        self.facultad = Facultad.objects.create(nombre="Ingeniería", codigo="ING")
+        self.carrera = Carrera.objects.create(
+            nombre="Sistemas", codigo="SIS", facultad=self.facultad, nivel="pregrado", modalidad="presencial"
+        )
+        self.otra_carrera = Carrera.objects.create(
+            nombre="Civil", codigo="CIV", facultad=self.facultad, nivel="pregrado", modalidad="presencial"
+        )
+        self.asignatura = Asignatura.objects.create(nombre="Algoritmos", codigo="ALG", periodo_academico=self.periodo)
+        self.ajena = Asignatura.objects.create(nombre="Estructuras", codigo="EST", periodo_academico=self.periodo)
+        self.inactiva = Asignatura.objects.create(
+            nombre="Historia", codigo="HIS", periodo_academico=self.periodo, estado=False
+        )
+        self.anterior = Asignatura.objects.create(
+            nombre="Cálculo", codigo="CAL", periodo_academico=self.periodo_cerrado
+        )
+        for asignatura in (self.asignatura, self.inactiva, self.anterior):
+            PlanCarreraAsignatura.objects.create(carrera=self.carrera, asignatura=asignatura, semestre=1)
+        PlanCarreraAsignatura.objects.create(carrera=self.otra_carrera, asignatura=self.ajena, semestre=1)
+
+        self.estudiante = User.objects.create_user(
+            username="est", password="pass1234", rol="estudiante", carrera=self.carrera
+        )
+
+
+class MatriculaSincronaTests(MatriculaBaseTests):
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.estudiante)
+
+    def matricular(self, asignatura, periodo=None):
+        return self.client.post(
+            "/api/matriculas/",
+            {"asignatura": asignatura.id, "periodo": (periodo or self.periodo).id},
+            format="json",
+        )
+
+    def test_matricula_valida(self):
+        response = self.matricular(self.asignatura)
+
+        self.assertEqual(response.status_code, 201, response.data)
+        matricula = Matricula.objects.get()
+        self.assertEqual(matricula.estudiante, self.estudiante)
+        self.assertEqual(matricula.facultad, self.facultad)
+
+    def test_matriculas_invalidas_responden_400(self):
+        self.matricular(self.asignatura)
+        casos = [
+            (self.asignatura, None, "existente"),
+            (self.ajena, None, "carrera_no_elegible"),
+            (self.inactiva, None, "asignatura_invalida"),
+            (self.asignatura, self.periodo_cerrado, "periodo_inactivo"),
+            (self.anterior, self.periodo_cerrado, "periodo_inactivo"),
+        ]
+        for asignatura, periodo, motivo in casos:
+            with self.subTest(asignatura=asignatura.codigo, motivo=motivo):
+                response = self.matricular(asignatura, periodo)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data["motivo"], motivo)
+        self.assertEqual(Matricula.objects.count(), 1)
+
+    def test_estudiante_inactivo_o_sin_carrera(self):
+        for cambios in ({"estado": "inactivo"}, {"carrera": None}):
+            with self.subTest(cambios=cambios):
+                get_user_model().objects.filter(pk=self.estudiante.pk).update(
+                    **{"estado": "activo", "carrera": self.carrera, **cambios}
+                )
+                response = self.matricular(self.asignatura)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data["motivo"], "estudiante_invalido")
+        self.assertFalse(Matricula.objects.exists())
+
+
+@override_settings(MATRICULAS_MODO_COLA=True)
+class MatriculaColaTests(MatriculaBaseTests):
+    def test_cola_aplica_las_mismas_reglas_que_el_post_sincrono(self):
+        self.client.force_authenticate(self.estudiante)
+        tickets = {}
+        for clave, asignatura, periodo, horario in (
+            ("valida", self.asignatura, self.periodo, "Lunes 8-10"),
+            ("ajena", self.ajena, self.periodo, None),
+            ("cerrado", self.anterior, self.periodo_cerrado, None),
+        ):
+            response = self.client.post(
+                "/api/matriculas/",
+                {"asignatura": asignatura.id, "periodo": periodo.id, "horario": horario},
+                format="json",
+            )
+            self.assertEqual(response.status_code, 202, response.data)
+            tickets[clave] = response.data["id"]
+        self.assertFalse(Matricula.objects.exists())
+
+        resultado = procesar_cola(tamano=2)
+
+        self.assertEqual(resultado["procesadas"], 3)
+        self.assertEqual(resultado["lotes"], 2)
+        estados = {
+            clave: SolicitudMatricula.objects.values_list("estado", "motivo").get(pk=pk)
+            for clave, pk in tickets.items()
+        }
+        self.assertEqual(estados, {
+            "valida": ("aceptada", "creada"),
+            "ajena": ("rechazada", "carrera_no_elegible"),
+            "cerrado": ("rechazada", "periodo_inactivo"),
+        })
+        matricula = Matricula.objects.get()
+        self.assertEqual(SolicitudMatricula.objects.get(pk=tickets["valida"]).matricula, matricula)
+        self.assertEqual(matricula.sesiones.count(), 1)
+        self.assertEqual(matricula.facultad, self.facultad)
+
+        # Un ticket repetido tras procesar se rechaza como existente
+        self.client.post("/api/matriculas/", {"asignatura": self.asignatura.id, "periodo": self.periodo.id}, format="json")
+        procesar_cola()
+        self.assertEqual(SolicitudMatricula.objects.order_by("-id").values_list("motivo", flat=True)[0], "existente")
+
+    def test_despacho_deduplicado_y_metricas_de_la_ultima_ejecucion(self):
+        cache.clear()
+        with mock.patch("applications.matriculas.tasks.procesar_cola_matriculas.delay") as delay:
+            for _ in range(3):
+                programar_procesamiento()
+        delay.assert_called_once_with()
+
+        self.client.force_authenticate(self.estudiante)
+        self.client.post("/api/matriculas/", {"asignatura": self.asignatura.id, "periodo": self.periodo.id}, format="json")
+        procesar_cola()
+
+        admin = get_user_model().objects.create_superuser(username="admin", password="pass1234", email="a@a.com")
+        self.client.force_authenticate(admin)
+        response = self.client.get("/api/solicitudes-matricula/metricas/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["pendientes"], 0)
+        self.assertEqual(response.data["ultima_ejecucion"]["aceptadas"], 1)
+
+    def test_solo_los_estudiantes_van_a_la_cola(self):
+        coordinador = get_user_model().objects.create_user(
+            username="coord", password="pass1234", rol="coordinador", facultad=self.facultad, carrera=self.carrera
+        )
+        self.client.force_authenticate(coordinador)
+        response = self.client.post(
+            "/api/matriculas/", {"asignatura": self.asignatura.id, "periodo": self.periodo.id}, format="json"
+        )
+        # Se procesa en la petición: el coordinador no es un estudiante elegible y no queda ticket a su nombre
+        self.assertEqual((response.status_code, response.data.get("motivo")), (400, "estudiante_invalido"))
+        self.assertFalse(SolicitudMatricula.objects.exists())
+
+
+class MatriculaLoteTests(MatriculaBaseTests):
+    def test_lote_decide_cada_combinacion_dentro_del_alcance(self):
+        User = get_user_model()
+        ciencias = Facultad.objects.create(nombre="Ciencias", codigo="CIE")
+        fisica = Carrera.objects.create(
+            nombre="Física", codigo="FIS", facultad=ciencias, nivel="pregrado", modalidad="presencial"
+        )
+        civil = User.objects.create_user(username="civil", password="pass1234", rol="estudiante", carrera=self.otra_carrera)
+        fisico = User.objects.create_user(username="fisico", password="pass1234", rol="estudiante", carrera=fisica)
+        profesor = User.objects.create_user(username="prof", password="pass1234", rol="profesor", carrera=self.carrera)
+        coordinador = User.objects.create_user(
+            username="coord", password="pass1234", rol="coordinador", facultad=self.facultad
+        )
+        # El estudiante ya tiene otra asignatura los lunes de 9 a 11
+        redes = Asignatura.objects.create(nombre="Redes", codigo="RED", periodo_academico=self.periodo)
+        PlanCarreraAsignatura.objects.create(carrera=self.carrera, asignatura=redes, semestre=1)
+        Matricula.objects.create(estudiante=self.estudiante, asignatura=redes, periodo=self.periodo, horario="Lunes 9-11")
+
+        self.client.force_authenticate(self.estudiante)
+        cuerpo = {
+            "estudiantes": [self.estudiante.id, civil.id, fisico.id, profesor.id, 99999],
+            "asignaturas": [self.asignatura.id, self.ajena.id, self.inactiva.id],
+            "periodo": self.periodo.id,
+            "horario": "Lunes 8-10",
+        }
+        self.assertEqual(self.client.post("/api/matriculas/lote/", cuerpo, format="json").status_code, 403)
+
+        self.client.force_authenticate(coordinador)
+        response = self.client.post("/api/matriculas/lote/", cuerpo, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        resultados = {(r["estudiante"], r["asignatura"]): r["resultado"] for r in response.data["resultados"]}
+        self.assertEqual(resultados[(self.estudiante.id, self.asignatura.id)], "conflicto_horario")
+        self.assertEqual(resultados[(self.estudiante.id, self.ajena.id)], "carrera_no_elegible")
+        self.assertEqual(resultados[(self.estudiante.id, self.inactiva.id)], "asignatura_invalida")
+        self.assertEqual(resultados[(civil.id, self.ajena.id)], "creada")
+        self.assertEqual(resultados[(civil.id, self.asignatura.id)], "carrera_no_elegible")
+        self.assertEqual({resultados[(fisico.id, a)] for a in cuerpo["asignaturas"]}, {"fuera_de_alcance"})
+        self.assertEqual({resultados[(profesor.id, a)] for a in cuerpo["asignaturas"]}, {"estudiante_invalido"})
+        # Para un coordinador un id inexistente es indistinguible de uno de otra facultad
+        self.assertEqual({resultados[(99999, a)] for a in cuerpo["asignaturas"]}, {"fuera_de_alcance"})
+        self.assertEqual(response.data["total"], 15)
+        self.assertEqual(response.data["resumen"]["creada"], 1)
+
+        creada = Matricula.objects.get(estudiante=civil)
+        self.assertEqual((creada.asignatura, creada.facultad, creada.horario), (self.ajena, self.facultad, "Lunes 8-10"))
+        self.assertEqual([(s.dia_semana, s.inicio, s.fin) for s in creada.sesiones.all()], [(0, 480, 600)])
+
+        # Repetir el lote no duplica
+        response = self.client.post("/api/matriculas/lote/", cuerpo, format="json")
+        self.assertEqual(response.data["resumen"].get("creada", 0), 0)
+        self.assertEqual(response.data["resumen"]["existente"], 1)
+        self.assertEqual(Matricula.objects.count(), 2)
+
+        cuerpo["estudiantes"] = list(range(1, 10_002))
+        cuerpo["asignaturas"] = list(range(1, 6))
+        self.assertEqual(self.client.post("/api/matriculas/lote/", cuerpo, format="json").status_code, 400)
+
+    def test_par_matriculado_por_otra_peticion_durante_el_lote_se_informa_existente(self):
+        from applications.matriculas.services import lote
+
+        otro = get_user_model().objects.create_user(
+            username="otro", password="pass1234", rol="estudiante", carrera=self.carrera
+        )
+        original = lote.Elegibilidad.__init__
+
+        def matricular_tras_la_lectura(elegibilidad, *args, **kwargs):
+            original(elegibilidad, *args, **kwargs)
+            # Otra petición matricula al estudiante justo después de la lectura
+            Matricula.objects.create(estudiante=self.estudiante, asignatura=self.asignatura, periodo=self.periodo)
+
+        with mock.patch.object(lote.Elegibilidad, "__init__", matricular_tras_la_lectura):
+            resultado = lote.matricular_lote(
+                estudiantes_ids=[self.estudiante.id, otro.id], asignaturas_ids=[self.asignatura.id],
+                periodo=self.periodo, horario="Martes 8-10",
+            )
+        self.assertEqual(
+            {r["estudiante"]: r["resultado"] for r in resultado["resultados"]},
+            {self.estudiante.id: "existente", otro.id: "creada"},
+        )
+        self.assertEqual(Matricula.objects.count(), 2)
+        self.assertFalse(Matricula.objects.get(estudiante=self.estudiante).sesiones.exists())
+        self.assertEqual(Matricula.objects.get(estudiante=otro).sesiones.count(), 1)
+
+
+class HorarioMatriculaTests(MatriculaBaseTests):
+    def setUp(self):
+        super().setUp()
+        self.redes = Asignatura.objects.create(nombre="Redes", codigo="RED", periodo_academico=self.periodo)
+        PlanCarreraAsignatura.objects.create(carrera=self.carrera, asignatura=self.redes, semestre=1)
+        self.client.force_authenticate(self.estudiante)
+
+    def matricular(self, asignatura, horario):
+        return self.client.post(
+            "/api/matriculas/",
+            {"asignatura": asignatura.id, "periodo": self.periodo.id, "horario": horario},
+            format="json",
+        )
+
+    def test_choque_de_horario_responde_400(self):
+        self.assertEqual(self.matricular(self.asignatura, "Lunes 8-10").status_code, 201)
+
+        response = self.matricular(self.redes, "Lunes y Miércoles 9-11")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(str(response.data["conflictos"][0]["asignatura"]), str(self.asignatura.id))
+        self.assertEqual(str(response.data["conflictos"][0]["choca_con"]), "Lunes 08:00-10:00")
+
+        # Intervalos semiabiertos: terminar a las 10 y empezar a las 10 no es choque
+        response = self.matricular(self.redes, "Lunes 10-12")
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Matricula.objects.get(asignatura=self.redes).sesiones.count(), 1)
+
+    def test_texto_libre_se_guarda_sin_sesiones(self):
+        self.matricular(self.asignatura, "Lunes 8-10")
+        response = self.matricular(self.redes, "Grupo A")
+        self.assertEqual(response.status_code, 201, response.data)
+        matricula = Matricula.objects.get(asignatura=self.redes)
+        self.assertFalse(matricula.sesiones.exists())
+
+        for horario in ("G1", "Mañana", "Lunes 8-10"):
+            with self.subTest(horario=horario):
+                response = self.client.patch(f"/api/matriculas/{matricula.id}/", {"horario": horario}, format="json")
+                if horario == "Lunes 8-10":
+                    self.assertEqual(response.status_code, 400)
+                else:
+                    self.assertEqual(response.status_code, 200, response.data)
+                    matricula.refresh_from_db()
+                    self.assertEqual(matricula.horario, horario)
+
+        response = self.client.patch(f"/api/matriculas/{matricula.id}/", {"horario": '{"dia": "Lunes"}'}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("horario", response.data)
+
+    def test_reporte_de_conflictos_del_periodo(self):
+        otro = get_user_model().objects.create_user(
+            username="otro", password="pass1234", rol="estudiante", carrera=self.carrera
+        )
+        a = Matricula.objects.create(estudiante=self.estudiante, asignatura=self.asignatura, periodo=self.periodo, horario="Lunes 8-10")
+        b = Matricula.objects.create(estudiante=self.estudiante, asignatura=self.redes, periodo=self.periodo, horario="Lunes a Miércoles 9-11")
+        # Mismo horario pero otro estudiante, y sesiones que solo se tocan: no cuentan
+        Matricula.objects.create(estudiante=otro, asignatura=self.asignatura, periodo=self.periodo, horario="Lunes 8-10")
+        Matricula.objects.create(estudiante=otro, asignatura=self.redes, periodo=self.periodo, horario="Lunes 10-12")
+
+        conflictos = reporte_conflictos_periodo(self.periodo.id)
+        self.assertEqual(len(conflictos), 1)
+        self.assertEqual(
+            {k: conflictos[0][k] for k in ("estudiante", "dia", "matricula_a", "matricula_b", "sesion_a", "sesion_b")},
+            {
+                "estudiante": self.estudiante.id, "dia": "Lunes", "matricula_a": a.id, "matricula_b": b.id,
+                "sesion_a": "08:00-10:00", "sesion_b": "09:00-11:00",
+            },
+        )
+        self.assertEqual(reporte_conflictos_periodo(self.periodo.id, facultad_id=self.facultad.id + 1), [])
+
+        self.assertEqual(self.client.get("/api/matriculas/conflictos-horario/").status_code, 403)
+        admin = get_user_model().objects.create_superuser(
+            username="admin", password="pass1234", email="a@a.com", rol="super_admin"
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.get("/api/matriculas/conflictos-horario/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["total"], response.data["estudiantes_afectados"]), (1, 1))
+
+
+class ListadoMatriculasTests(MatriculaBaseTests):
+    def crear_matriculas(self, n):
+        inicio = Asignatura.objects.count()
+        for i in range(inicio, inicio + n):
+            asignatura = Asignatura.objects.create(
+                nombre=f"Asignatura {i}", codigo=f"A{i:03d}", periodo_academico=self.periodo, creditos=3
+            )
+            PlanCarreraAsignatura.objects.create(carrera=self.carrera, asignatura=asignatura, semestre=2)
+            Matricula.objects.create(
+                estudiante=self.estudiante, asignatura=asignatura, periodo=self.periodo, horario=f"Martes {7 + i}-{8 + i}"
+            )
+
+    def listar(self, vista=None):
+        url = "/api/matriculas/" + (f"?vista={vista}" if vista else "")
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        datos = response.data["results"] if isinstance(response.data, dict) else response.data
+        return datos, len(ctx)
+
+    def test_vista_compacta_y_completa_con_consultas_constantes(self):
+        self.client.force_authenticate(self.estudiante)
+        self.crear_matriculas(2)
+        compacta, consultas_compacta = self.listar("compacta")
+        completa, consultas_completa = self.listar()
+
+        fila = compacta[0]
+        self.assertEqual(set(fila["asignatura"]), {"id", "codigo", "nombre", "creditos"})
+        self.assertEqual(set(fila["periodo"]), {"id", "nombre"})
+        self.assertEqual(len(fila["sesiones"]), 1)
+        self.assertEqual(completa[0]["asignatura"]["carrera_nombre"], "Sistemas")
+        self.assertEqual(completa[0]["asignatura"]["semestre"], 2)
+        self.assertIn("fecha_inicio", completa[0]["periodo"])
+
+        self.crear_matriculas(8)
+        self.assertEqual(len(self.listar("compacta")[0]), 10)
+        self.assertEqual(self.listar("compacta")[1], consultas_compacta)
+        self.assertEqual(self.listar()[1], consultas_completa)
+        self.assertLess(consultas_compacta, consultas_completa)
+
+
+class FacultadMatriculaTests(MatriculaBaseTests):
+    def test_facultad_sigue_a_la_carrera_del_estudiante(self):
+        matricula = Matricula.objects.create(estudiante=self.estudiante, asignatura=self.asignatura, periodo=self.periodo)
+        self.assertEqual(matricula.facultad, self.facultad)
+
+        otra = Facultad.objects.create(nombre="Ciencias", codigo="CIE")
+        self.otra_carrera.facultad = otra
+        self.otra_carrera.save()
+        self.estudiante.carrera = self.otra_carrera
+        self.estudiante.save()
+        matricula.refresh_from_db()
+        self.assertEqual(matricula.facultad, otra)
+
+        # Sin carrera la facultad queda vacía (antes el NULL hacía que no se actualizara)
+        self.estudiante.carrera = None
+        self.estudiante.save()
+        matricula.refresh_from_db()
+        self.assertIsNone(matricula.facultad)
+
+        self.estudiante.carrera = self.carrera
+        self.estudiante.save()
+        matricula.refresh_from_db()
+        self.assertEqual(matricula.facultad, self.facultad)
+        self.assertEqual(sincronizar_facultad_matriculas(), 0)
+
+
+class IntervalosTests(SimpleTestCase):
+    def test_arbol_de_intervalos_semiabiertos(self):
+        arbol = ArbolIntervalos([(480, 600, "a"), (600, 720, "b"), (540, 560, "c"), (900, 1000, "d")])
+        self.assertEqual(len(arbol), 4)
+        self.assertEqual([i[2] for i in arbol.solapados(550, 650)], ["a", "c", "b"])
+        self.assertEqual([i[2] for i in arbol.solapados(599, 601)], ["a", "b"])
+        # Intervalos que solo se tocan no se solapan
+        self.assertEqual(arbol.solapados(720, 900), [])
+        self.assertEqual([i[2] for i in arbol.solapados(400, 480 + 1)], ["a"])
+        self.assertEqual(arbol.solapados(0, 480), [])
+        self.assertEqual(ArbolIntervalos([]).solapados(0, 1440), [])
+
+    def test_agenda_por_dia(self):
+        agenda = AgendaEstudiante([(Sesion(0, 480, 600), 1), (Sesion(2, 480, 600), 2)])
+        self.assertEqual(agenda.conflictos([Sesion(1, 480, 600), Sesion(0, 600, 700)]), [])
+        conflictos = agenda.conflictos([Sesion(0, 540, 660), Sesion(2, 420, 500)])
+        self.assertEqual(
+            [(c["sesion"], c["choca_con"], c["asignatura"]) for c in conflictos],
+            [("Lunes 09:00-11:00", "Lunes 08:00-10:00", 1), ("Miércoles 07:00-08:20", "Miércoles 08:00-10:00", 2)],
+        )
+        # Agregar después de consultar reconstruye el árbol del día
+        agenda.agregar(Sesion(1, 480, 600), 3)
+        self.assertEqual(len(agenda.conflictos([Sesion(1, 500, 510)])), 1)
+
+
+class ParsearHorarioTests(SimpleTestCase):
+    def dias(self, texto):
+        return [s.dia for s in parsear_horario(texto)]
+
+    def test_rangos_de_dias(self):
+        self.assertEqual(
+            parsear_horario("Lunes a Viernes 8-10"),
+            [Sesion(d, 8 * 60, 10 * 60) for d in range(5)],
+        )
+        for texto, dias in (
+            ("lun-vie 8-10", [0, 1, 2, 3, 4]),
+            ("Lunes al Miércoles 8-10", [0, 1, 2]),
+            ("Martes hasta Jueves 14:00-16:00", [1, 2, 3]),
+        ):
+            with self.subTest(texto=texto):
+                self.assertEqual(self.dias(texto), dias)
+        self.assertEqual(
+            parsear_horario("Lunes a Miércoles 8-10am, Sábado 2-4pm"),
+            [Sesion(0, 480, 600), Sesion(1, 480, 600), Sesion(2, 480, 600), Sesion(5, 840, 960)],
+        )
+
+    def test_listas_de_dias(self):
+        self.assertEqual(self.dias("Lunes, Miércoles y Viernes 8-10"), [0, 2, 4])
+        self.assertEqual(self.dias("Lun y Mié 14:00-16:00"), [0, 2])
+        self.assertEqual(
+            parsear_horario("Lunes 8-10am, Jueves 10-12pm"),
+            [Sesion(0, 480, 600), Sesion(3, 600, 720)],
+        )
+        self.assertEqual(parsear_horario(""), [])
+        self.assertEqual(parsear_horario(None), [])
+
+    def test_textos_mal_formados(self):
+        for texto in (
+            "8-10",                      # sin día
+            "Lunes",                     # sin horas
+            "Lunes 8-10, Martes",        # día final sin horas
+            "Viernes a Lunes 8-10",      # rango de días invertido
+            "Lunes 10-8",                # rango de horas invertido
+            "Lunes 8-25",                # hora fuera del día
+            "por definir",
+            '{"dia": "Lunes"}',
+            "[1, 2",
+        ):
+            with self.subTest(texto=texto):
+                with self.assertRaises(HorarioInvalido):
+                    parsear_horario(texto)
+
+    def test_texto_libre_no_tiene_sesiones(self):
+        for texto in ("Grupo A", "G1", "Mañana", "por definir", "[1, 2", None, ""):
+            with self.subTest(texto=texto):
+                self.assertEqual(sesiones_horario(texto), [])
+        self.assertEqual(sesiones_horario("Lunes 8-10"), [Sesion(0, 480, 600)])
+        for texto in ('{"dia": "Lunes"}', '[{"dia": "Lunes", "inicio": "10:00", "fin": "8:00"}]', "[1, 2]"):
+            with self.subTest(texto=texto):
+                with self.assertRaises(HorarioInvalido):
+                    sesiones_horario(texto)
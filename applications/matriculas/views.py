@@ -1,11 +1,11 @@
 """ViewSets para Matrículas."""
 
-from rest_framework import viewsets, permissions, status, serializers
+from rest_framework import mixins, viewsets, permissions, status, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from .models import Matricula
-from .serializers import MatriculaSerializer
-from applications.academico.models import Asignatura, PeriodoAcademico
+from .models import Matricula, SolicitudMatricula
+from .serializers import MatriculaSerializer, MatriculaLoteSerializer, SolicitudMatriculaSerializer
+from applications.academico.services.periodos import obtener_periodo, periodo_activo
 from applications.academico.api.serializers import AsignaturaSerializer
 
 class MatriculaViewSet(viewsets.ModelViewSet):
@@ -25,36 +25,149 @@ class MatriculaViewSet(viewsets.ModelViewSet):
 
         # Super admin ve todo
         if 'super_admin' in user_roles:
-            return Matricula.objects.all()
+            return self._con_plan_de_consultas(Matricula.objects.all())
 
         # Admin/Coordinador: alcance por facultad
         if 'admin' in user_roles or 'coordinador' in user_roles:
             facultad = getattr(user, 'facultad', None)
             if not facultad:
                 return Matricula.objects.none()
-            return Matricula.objects.filter(estudiante__carrera__facultad=facultad).distinct()
+            return self._con_plan_de_consultas(
+                Matricula.objects.filter(facultad=facultad)
+            )
 
         # Estudiante: solo sus matrículas
-        return Matricula.objects.filter(estudiante=user)
+        return self._con_plan_de_consultas(Matricula.objects.filter(estudiante=user))
+
+    def create(self, request, *args, **kwargs):
+        """
+        En modo cola (MATRICULAS_MODO_COLA, días de alta demanda) la matrícula de un estudiante
+        no se procesa en la petición: se registra una solicitud y se responde 202 con el ticket,
+        que se consulta en /api/solicitudes-matricula/{id}/. Admins y coordinadores matriculan
+        siempre de forma síncrona.
+        """
+        from applications.matriculas.services.cola import encolar_solicitud, modo_cola_activo, posicion_en_cola
+
+        user = request.user
+        user_roles = []
+        if hasattr(user, 'roles') and user.roles.exists():
+            user_roles = [r.tipo for r in user.roles.all()]
+        elif hasattr(user, 'rol'):
+            user_roles = [user.rol]
+
+        es_personal = getattr(user, 'is_superuser', False) or {'super_admin', 'admin', 'coordinador'} & set(user_roles)
+        if not modo_cola_activo() or 'estudiante' not in user_roles or es_personal:
+            return super().create(request, *args, **kwargs)
+
+        serializer = SolicitudMatriculaSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        solicitud = encolar_solicitud(estudiante=request.user, **serializer.validated_data)
+        data = SolicitudMatriculaSerializer(solicitud).data
+        data['posicion'] = posicion_en_cola(solicitud)
+        data['ticket_url'] = f'/api/solicitudes-matricula/{solicitud.id}/'
+        return Response(data, status=status.HTTP_202_ACCEPTED, headers={'Location': data['ticket_url']})
 
     def perform_create(self, serializer):
-        # Validar que asignatura y periodo existan y sean válidos
-        asignatura = serializer.validated_data.get('asignatura')
-        periodo = serializer.validated_data.get('periodo')
+        from applications.matriculas.services.lote import CREADA, MENSAJES, evaluar_matricula
+
+        # El cruce de horario ya lo valida MatriculaSerializer.validate
         user = self.request.user
-        if not asignatura or not periodo:
-            raise serializers.ValidationError({'detail': 'Asignatura y periodo son obligatorios.'})
-        # Validar que la asignatura esté activa y corresponda a la carrera y periodo
-        carrera = getattr(user, 'carrera', None)
-        if not carrera:
-            raise serializers.ValidationError({'detail': 'El usuario no tiene carrera asignada.'})
-        if not asignatura.estado or asignatura.periodo_academico != periodo or not asignatura.carreras.filter(id=carrera.id).exists():
-            raise serializers.ValidationError({'detail': 'La asignatura no es válida para tu carrera o periodo.'})
-        # Validar que no exista matrícula previa
-        if Matricula.objects.filter(estudiante=user, asignatura=asignatura, periodo=periodo).exists():
-            raise serializers.ValidationError({'detail': 'Ya tienes esta asignatura matriculada en este periodo.'})
+        resultado = evaluar_matricula(
+            user.id, serializer.validated_data['asignatura'].id, serializer.validated_data['periodo']
+        )
+        if resultado != CREADA:
+            raise serializers.ValidationError({'detail': MENSAJES[resultado], 'motivo': resultado})
         serializer.save(estudiante=user)
 
+    def _con_plan_de_consultas(self, queryset):
+        """
+        Precarga lo que lee MatriculaSerializer para que el listado use un número fijo
+        de consultas (sin consultas por fila). La vista compacta no necesita los prefetch.
+        """
+        queryset = queryset.select_related('asignatura', 'periodo').prefetch_related('sesiones')
+        if self.request.query_params.get('vista') == 'compacta':
+            return queryset
+        return AsignaturaSerializer.preparar_queryset(queryset, prefijo='asignatura__')
+
+    @action(detail=False, methods=['post'], url_path='lote')
+    def lote(self, request):
+        """
+        Matrícula masiva de estudiantes × asignaturas en un periodo (coordinadores/admins).
+        Body: { "estudiantes": [ids], "asignaturas": [ids], "periodo": id, "horario": opcional }
+        Devuelve el resultado de cada combinación y un resumen por resultado.
+        """
+        user = request.user
+        user_roles = []
+        if hasattr(user, 'roles') and user.roles.exists():
+            user_roles = [r.tipo for r in user.roles.all()]
+        elif hasattr(user, 'rol'):
+            user_roles = [user.rol]
+
+        if getattr(user, 'is_superuser', False) and 'super_admin' not in user_roles:
+            user_roles.append('super_admin')
+
+        facultad_alcance = None
+        if 'super_admin' not in user_roles:
+            if not ('admin' in user_roles or 'coordinador' in user_roles):
+                return Response({'detail': 'No tienes permisos para matricular en lote.'}, status=status.HTTP_403_FORBIDDEN)
+            # Admin/Coordinador: solo estudiantes de su facultad
+            facultad_alcance = getattr(user, 'facultad_id', None)
+            if not facultad_alcance:
+                return Response({'detail': 'El usuario no tiene facultad asignada.'}, status=status.HTTP_403_FORBIDDEN)
+
+        from applications.matriculas.services.lote import matricular_lote
+
+        serializer = MatriculaLoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        resultado = matricular_lote(
+            estudiantes_ids=data['estudiantes'],
+            asignaturas_ids=data['asignaturas'],
+            periodo=data['periodo'],
+            horario=data.get('horario'),
+            facultad_alcance=facultad_alcance,
+        )
+        return Response(resultado, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['get'], url_path='conflictos-horario')
+    def conflictos_horario(self, request):
+        """
+        Reporte de choques de horario de todo un periodo (coordinadores/admins).
+        Query: ?periodo_id= (por defecto el periodo activo)
+        """
+        user = request.user
+        user_roles = []
+        if hasattr(user, 'roles') and user.roles.exists():
+            user_roles = [r.tipo for r in user.roles.all()]
+        elif hasattr(user, 'rol'):
+            user_roles = [user.rol]
+
+        if getattr(user, 'is_superuser', False) and 'super_admin' not in user_roles:
+            user_roles.append('super_admin')
+
+        facultad_id = None
+        if 'super_admin' not in user_roles:
+            if not ('admin' in user_roles or 'coordinador' in user_roles):
+                return Response({'detail': 'No tienes permisos para ver este reporte.'}, status=status.HTTP_403_FORBIDDEN)
+            facultad_id = getattr(user, 'facultad_id', None)
+            if not facultad_id:
+                return Response({'detail': 'El usuario no tiene facultad asignada.'}, status=status.HTTP_403_FORBIDDEN)
+
+        periodo_id = request.query_params.get('periodo_id')
+        periodo = obtener_periodo(periodo_id)
+        if not periodo:
+            return Response({'detail': 'Periodo no encontrado.'}, status=status.HTTP_404_NOT_FOUND)
+
+        from applications.matriculas.services.horario import reporte_conflictos_periodo
+
+        conflictos = reporte_conflictos_periodo(periodo.id, facultad_id=facultad_id)
+        return Response({
+            'periodo': periodo.id,
+            'total': len(conflictos),
+            'estudiantes_afectados': len({c['estudiante'] for c in conflictos}),
+            'conflictos': conflictos,
+        })
+
     @action(detail=False, methods=['get'], url_path='disponibles')
     def disponibles(self, request):
         """
@@ -65,14 +178,58 @@ class MatriculaViewSet(viewsets.ModelViewSet):
         if not carrera:
             return Response({'detail': 'El usuario no tiene carrera asignada.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        periodo = PeriodoAcademico.objects.filter(activo=True).first()
+        periodo = periodo_activo()
         if not periodo:
             return Response({'detail': 'No hay periodo académico activo.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # IDs de asignaturas ya matriculadas por el usuario en el periodo activo
-        ya_matriculadas = Matricula.objects.filter(estudiante=user, periodo=periodo).values_list('asignatura_id', flat=True)
+        # Catálogo compartido por carrera/periodo (en caché) menos lo ya matriculado por el estudiante
+        from applications.matriculas.services.catalogo import catalogo_disponibles
+
+        ya_matriculadas = set(
+            Matricula.objects.filter(estudiante=user, periodo_id=periodo.id).values_list('asignatura_id', flat=True)
+        )
+        data = [a for a in catalogo_disponibles(carrera.id, periodo.id) if a['id'] not in ya_matriculadas]
+        return Response(data)
+
+
+class SolicitudMatriculaViewSet(mixins.RetrieveModelMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    Tickets de matrícula en cola (modo alta demanda).
+
+    - GET /api/solicitudes-matricula/        solicitudes del estudiante
+    - GET /api/solicitudes-matricula/{id}/   estado, motivo y posición en la cola (para sondeo)
+    - GET /api/solicitudes-matricula/metricas/  pendientes, throughput y latencia (super admin)
+    """
+    serializer_class = SolicitudMatriculaSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return SolicitudMatricula.objects.filter(estudiante=self.request.user).order_by('-id')
+
+    def retrieve(self, request, *args, **kwargs):
+        from applications.matriculas.services.cola import posicion_en_cola
+
+        solicitud = self.get_object()
+        data = self.get_serializer(solicitud).data
+        data['posicion'] = posicion_en_cola(solicitud)
+        headers = {'Retry-After': '2'} if solicitud.estado == 'pendiente' else {}
+        return Response(data, headers=headers)
+
+    @action(detail=False, methods=['get'])
+    def metricas(self, request):
+        user = request.user
+        user_roles = []
+        if hasattr(user, 'roles') and user.roles.exists():
+            user_roles = [r.tipo for r in user.roles.all()]
+        elif hasattr(user, 'rol'):
+            user_roles = [user.rol]
+
+        if getattr(user, 'is_superuser', False) and 'super_admin' not in user_roles:
+            user_roles.append('super_admin')
+
+        if 'super_admin' not in user_roles:
+            return Response({'detail': 'No tienes permisos para ver las métricas de la cola.'}, status=status.HTTP_403_FORBIDDEN)
+
+        from applications.matriculas.services.cola import metricas_cola
 
-        # Asignaturas activas de la carrera, excluyendo las ya matriculadas
-        disponibles = Asignatura.objects.filter(carreras=carrera, estado=True, periodo_academico=periodo).exclude(id__in=ya_matriculadas).distinct()
-        data = AsignaturaSerializer(disponibles, many=True).data
-        return Response(data)
\ No newline at end of file
+        return Response(metricas_cola())
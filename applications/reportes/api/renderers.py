@@ -0,0 +1,58 @@
+"""
+Renderers para exportar a hojas de cálculo.
+
+DRF usa `?format=` para la negociación de contenido, así que `?format=csv|xlsx` solo
+funciona si existe un renderer con ese formato. La vista detecta el formato aceptado y
+devuelve directamente un StreamingHttpResponse; estos renderers solo se usan para
+respuestas normales (errores 4xx), que se siguen serializando como JSON y se envían
+como application/json.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from applications.reportes.services.streaming import XLSX_CONTENT_TYPE
+
+
+class _JSONComoArchivoRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = 'application/json'
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class CSVExportRenderer(_JSONComoArchivoRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class XLSXExportRenderer(_JSONComoArchivoRenderer):
+    media_type = XLSX_CONTENT_TYPE
+    format = 'xlsx'
+
+
+class ZIPRenderer(_JSONComoArchivoRenderer):
+    """Permite `Accept: application/zip` en descargas que devuelven un ZIP en streaming."""
+    media_type = 'application/zip'
+    format = 'zip'
+
+
+EXPORT_FORMATS = {CSVExportRenderer.format, XLSXExportRenderer.format}
+
+EXPORT_RENDERER_CLASSES = [
+    *api_settings.DEFAULT_RENDERER_CLASSES,
+    CSVExportRenderer,
+    XLSXExportRenderer,
+]
+
+ZIP_RENDERER_CLASSES = [
+    *api_settings.DEFAULT_RENDERER_CLASSES,
+    ZIPRenderer,
+]
+
+
+def formato_exportacion(request):
+    """Devuelve 'csv' / 'xlsx' si el cliente pidió exportar, o None para la respuesta JSON normal."""
+    formato = getattr(getattr(request, 'accepted_renderer', None), 'format', None)
+    return formato if formato in EXPORT_FORMATS else None
@@ -0,0 +1,200 @@
+"""
+Lectura en streaming de archivos tabulares subidos (CSV/XLSX/XLS), contraparte de `streaming`.
+
+El archivo se copia por bloques a un SpooledTemporaryFile (en memoria hasta `MEMORIA_MAX`
+bytes, después en disco) y se recorre fila a fila: XLSX con openpyxl en modo read_only y
+CSV con el módulo csv. Cada fila se entrega como (numero_de_fila, {encabezado: valor}) con
+los valores normalizados, sin construir un DataFrame ni tener el archivo completo en memoria
+más de una vez.
+
+Los XLS (formato binario anterior a 2007) no se pueden leer por filas: se cargan con
+pandas/xlrd como antes, lo que está acotado por el propio formato (65.536 filas por hoja).
+
+    with abrir_tabla(archivo.name, archivo) as tabla:
+        tabla.columnas            # encabezados de la primera fila no vacía
+        for numero, fila in tabla:
+            ...
+"""
+from __future__ import annotations
+
+import codecs
+import csv
+import math
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import IO, Iterator, Sequence
+
+from openpyxl import load_workbook
+
+
+CHUNK_SIZE = 64 * 1024
+MEMORIA_MAX = 5 * 1024 * 1024
+EXTENSIONES = ('csv', 'xlsx', 'xls')
+DELIMITADORES_CSV = ',;\t'
+
+
+class ArchivoIlegible(ValueError):
+    """El archivo no tiene un formato soportado o no se puede leer (mensaje para el usuario)."""
+
+
+def extension_de(nombre: str) -> str:
+    return str(nombre).rsplit('.', 1)[-1].lower()
+
+
+def normalizar_valor(valor):
+    """Textos sin espacios (vacío -> None) y números enteros guardados como float -> int."""
+    if isinstance(valor, str):
+        return valor.strip() or None
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    return valor
+
+
+def _encabezados(celdas: Sequence) -> list[str]:
+    # Mismos nombres que asignaría pandas a encabezados vacíos o repetidos
+    columnas, usados = [], {}
+    for i, celda in enumerate(celdas):
+        valor = normalizar_valor(celda)
+        nombre = str(valor) if valor is not None else f'Unnamed: {i}'
+        if nombre in usados:
+            usados[nombre] += 1
+            nombre = f'{nombre}.{usados[nombre]}'
+        usados.setdefault(nombre, 0)
+        columnas.append(nombre)
+    return columnas
+
+
+def _filas_xls(datos: IO[bytes]) -> list[tuple]:
+    """Filas de la primera hoja de un XLS; pandas delega en xlrd, que es opcional."""
+    import pandas as pd
+
+    try:
+        hoja = pd.read_excel(datos, header=None, dtype=object)
+    except ImportError:
+        raise ArchivoIlegible('El servidor no puede leer archivos XLS; guarde el archivo como XLSX o CSV')
+    return [
+        tuple(None if isinstance(v, float) and math.isnan(v) else v for v in fila)
+        for fila in hoja.itertuples(index=False, name=None)
+    ]
+
+
+class Tabla:
+    """Filas de un CSV o de la primera hoja de un XLSX/XLS; se puede recorrer más de una vez."""
+
+    def __init__(self, extension: str, datos: IO[bytes]):
+        self._datos = datos
+        self._libro = None
+        self._dialecto = None
+        self._xls = None
+        if extension == 'xls':
+            self._xls = _filas_xls(datos)
+        elif extension == 'xlsx':
+            self._libro = load_workbook(datos, read_only=True, data_only=True)
+            self._hoja = self._libro.worksheets[0]
+            # Algunos generadores escriben dimensiones erróneas que truncarían la lectura
+            self._hoja.reset_dimensions()
+        else:
+            self._dialecto = self._detectar_dialecto()
+
+        self.columnas: list[str] = []
+        self._fila_encabezado = 0
+        for numero, celdas in self._filas_crudas():
+            if any(normalizar_valor(c) is not None for c in celdas):
+                self.columnas, self._fila_encabezado = _encabezados(celdas), numero
+                break
+
+    def _detectar_dialecto(self):
+        muestra = self._datos.read(CHUNK_SIZE).decode('utf-8-sig', errors='ignore')
+        self._datos.seek(0)
+        try:
+            return csv.Sniffer().sniff(muestra, delimiters=DELIMITADORES_CSV)
+        except csv.Error:
+            pass
+        # Con filas de distinta longitud el Sniffer falla: se usa el separador más
+        # frecuente en la primera línea no vacía (los encabezados)
+        encabezado = next((linea for linea in muestra.splitlines() if linea.strip()), '')
+        delimitador = max(DELIMITADORES_CSV, key=encabezado.count)
+        if not encabezado.count(delimitador):
+            return csv.excel
+
+        class Dialecto(csv.excel):
+            delimiter = delimitador
+
+        return Dialecto
+
+    def _filas_crudas(self) -> Iterator[tuple[int, Sequence]]:
+        if self._xls is not None:
+            filas = self._xls
+        elif self._libro is not None:
+            filas = self._hoja.iter_rows(values_only=True)
+        else:
+            self._datos.seek(0)
+            filas = csv.reader(codecs.iterdecode(self._datos, 'utf-8-sig'), self._dialecto)
+        yield from enumerate(filas, start=1)
+
+    def __iter__(self) -> Iterator[tuple[int, dict]]:
+        columnas = self.columnas
+        n = len(columnas)
+        try:
+            for numero, celdas in self._filas_crudas():
+                if numero <= self._fila_encabezado:
+                    continue
+                valores = [normalizar_valor(c) for c in celdas[:n]]
+                if not any(v is not None for v in valores):
+                    continue
+                valores.extend([None] * (n - len(valores)))
+                yield numero, dict(zip(columnas, valores))
+        except UnicodeDecodeError:
+            raise ArchivoIlegible('El archivo CSV debe estar codificado en UTF-8')
+        except ArchivoIlegible:
+            raise
+        except Exception as e:
+            raise ArchivoIlegible(str(e)) from e
+
+    def cerrar(self) -> None:
+        if self._libro is not None:
+            self._libro.close()
+
+
+@contextmanager
+def _archivo_local(archivo, memoria_max: int) -> Iterator[IO[bytes]]:
+    """Archivo binario con seek: el temporal de la subida si existe, si no una copia en spool."""
+    if hasattr(archivo, 'temporary_file_path'):
+        with open(archivo.temporary_file_path(), 'rb') as f:
+            yield f
+        return
+    with tempfile.SpooledTemporaryFile(max_size=memoria_max) as spool:
+        if hasattr(archivo, 'chunks'):
+            for bloque in archivo.chunks(CHUNK_SIZE):
+                spool.write(bloque)
+        else:
+            shutil.copyfileobj(archivo, spool, CHUNK_SIZE)
+        spool.seek(0)
+        yield spool
+
+
+@contextmanager
+def abrir_tabla(nombre: str, archivo, *, memoria_max: int = MEMORIA_MAX) -> Iterator[Tabla]:
+    """
+    Abre `archivo` (UploadedFile, FieldFile o cualquier objeto binario legible) según la
+    extensión de `nombre`. Los errores de formato o lectura, al abrir o al recorrer las
+    filas, se informan como ArchivoIlegible.
+    """
+    extension = extension_de(nombre)
+    if extension not in EXTENSIONES:
+        raise ArchivoIlegible(f'Formato de archivo no soportado ({extension}). Use {" o ".join(e.upper() for e in EXTENSIONES)}')
+
+    with _archivo_local(archivo, memoria_max) as datos:
+        try:
+            tabla = Tabla(extension, datos)
+        except UnicodeDecodeError:
+            raise ArchivoIlegible('El archivo CSV debe estar codificado en UTF-8')
+        except ArchivoIlegible:
+            raise
+        except Exception as e:
+            raise ArchivoIlegible(str(e)) from e
+        try:
+            yield tabla
+        finally:
+            tabla.cerrar()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import csv
+import os
+import re
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import IO, Callable, Iterable, Iterator, Sequence
+
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from openpyxl import Workbook
+
+
+CHUNK_SIZE = 64 * 1024
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+_SHEET_TITLE_INVALIDOS = re.compile(r'[\[\]\:\*\?\/\\]')
+
+
+class _Echo:
+    """Pseudo-buffer: csv.writer escribe aquí y devolvemos la línea para el generador."""
+
+    def write(self, value):
+        return value
+
+
+def _valor_csv(value):
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    return value
+
+
+def _valor_xlsx(value):
+    # Excel no soporta datetimes con zona horaria
+    if isinstance(value, datetime) and timezone.is_aware(value):
+        return timezone.localtime(value).replace(tzinfo=None)
+    return value
+
+
+def _sheet_title(title: str, usados: set[str]) -> str:
+    base = _SHEET_TITLE_INVALIDOS.sub('-', str(title or 'Hoja')).strip() or 'Hoja'
+    base = base[:31]
+    candidato = base
+    n = 2
+    while candidato.lower() in usados:
+        sufijo = f' ({n})'
+        candidato = f'{base[:31 - len(sufijo)]}{sufijo}'
+        n += 1
+    usados.add(candidato.lower())
+    return candidato
+
+
+def _attachment(response, filename: str):
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def streaming_csv_response(filename: str, header: Sequence, rows: Iterable[Sequence]) -> StreamingHttpResponse:
+    """
+    CSV que se escribe fila a fila mientras se envía al cliente.
+    `rows` debe ser perezoso (p. ej. alimentado por `.iterator()`) para que la memoria sea constante.
+    """
+    writer = csv.writer(_Echo())
+
+    def _generar() -> Iterator[str]:
+        # BOM para que Excel detecte UTF-8 (tildes en nombres)
+        yield '\ufeff'
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow([_valor_csv(v) for v in row])
+
+    response = StreamingHttpResponse(_generar(), content_type='text/csv; charset=utf-8')
+    return _attachment(response, filename)
+
+
+def streaming_xlsx_response(filename: str, sheets: Iterable[tuple[str, Sequence, Iterable[Sequence]]]) -> StreamingHttpResponse:
+    """
+    XLSX con openpyxl en modo `write_only`: cada fila se vuelca a disco al agregarla,
+    así que la memoria no crece con el número de filas.
+
+    A diferencia del CSV, el XLSX no se envía mientras se genera: openpyxl arma el ZIP
+    recién en `save`, así que el libro completo se escribe primero en un archivo temporal
+    (no en un BytesIO) y después se envía por bloques. El primer byte llega cuando se
+    consumió la última fila de `sheets` (iterable perezoso de (titulo, encabezado, filas));
+    para exportaciones muy grandes conviene el CSV.
+    """
+
+    def _generar() -> Iterator[bytes]:
+        wb = Workbook(write_only=True)
+        usados: set[str] = set()
+        for titulo, header, rows in sheets:
+            ws = wb.create_sheet(title=_sheet_title(titulo, usados))
+            ws.append(list(header))
+            for row in rows:
+                ws.append([_valor_xlsx(v) for v in row])
+
+        if not usados:
+            # Un libro sin hojas no es un XLSX válido
+            wb.create_sheet(title='Datos')
+
+        with tempfile.TemporaryFile() as tmp:
+            wb.save(tmp)
+            tmp.seek(0)
+            while True:
+                chunk = tmp.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+    response = StreamingHttpResponse(_generar(), content_type=XLSX_CONTENT_TYPE)
+    return _attachment(response, filename)
+
+
+# Formatos ya comprimidos: se guardan sin volver a comprimir (ahorra CPU sin perder tamaño)
+_EXTENSIONES_COMPRIMIDAS = {
+    '.zip', '.rar', '.7z', '.gz', '.docx', '.xlsx', '.pptx', '.jpg', '.jpeg', '.png', '.mp4',
+}
+
+
+class _ZipBuffer:
+    """
+    Destino no buscable para zipfile: acumula lo escrito hasta que el generador lo entrega.
+    zipfile detecta que no hay `seek` y usa descriptores de datos, así cada entrada se
+    escribe una sola vez y en orden.
+    """
+
+    def __init__(self):
+        self._partes: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._partes.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def vaciar(self) -> Iterator[bytes]:
+        if self._partes:
+            data = b''.join(self._partes)
+            self._partes = []
+            yield data
+
+
+def streaming_zip_response(
+    filename: str,
+    entries: Iterable[tuple[str, int | None, datetime | None, Callable[[], IO[bytes]]]],
+) -> StreamingHttpResponse:
+    """
+    ZIP generado al vuelo mientras se envía: cada archivo se lee por bloques y los bytes
+    comprimidos se entregan al cliente de inmediato, sin armar el ZIP en memoria ni en disco.
+
+    `entries` es un iterable perezoso de (nombre_en_zip, tamano, fecha, abrir) donde
+    `abrir()` devuelve un archivo binario; si falla con OSError la entrada se omite y se
+    lista en `_FALTANTES.txt` al final del ZIP.
+    """
+
+    def _generar() -> Iterator[bytes]:
+        buffer = _ZipBuffer()
+        faltantes = []
+        with zipfile.ZipFile(buffer, mode='w', allowZip64=True) as zf:
+            for nombre, tamano, fecha, abrir in entries:
+                try:
+                    src = abrir()
+                except OSError:
+                    faltantes.append(nombre)
+                    continue
+
+                fecha = _valor_xlsx(fecha) or datetime.now()
+                info = zipfile.ZipInfo(nombre, date_time=fecha.timetuple()[:6])
+                info.file_size = tamano or 0
+                if os.path.splitext(nombre)[1].lower() in _EXTENSIONES_COMPRIMIDAS:
+                    info.compress_type = zipfile.ZIP_STORED
+                else:
+                    info.compress_type = zipfile.ZIP_DEFLATED
+
+                with src, zf.open(info, mode='w') as dst:
+                    while True:
+                        chunk = src.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        dst.write(chunk)
+                        yield from buffer.vaciar()
+                yield from buffer.vaciar()
+
+            if faltantes:
+                zf.writestr('_FALTANTES.txt', '\n'.join(faltantes) + '\n')
+        yield from buffer.vaciar()
+
+    response = StreamingHttpResponse(_generar(), content_type='application/zip')
+    return _attachment(response, filename)
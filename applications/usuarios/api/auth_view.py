@@ -358,12 +358,10 @@ class AuthViewSet(viewsets.GenericViewSet):
         
         # Asignar facultad si se proporciona
         if facultad_id:
-            from applications.academico.models import Facultad
-            try:
-                facultad = Facultad.objects.get(id=facultad_id)
-                usuario.facultad = facultad
-            except Facultad.DoesNotExist:
-                pass
+            from applications.academico.services.catalogo import facultad as facultad_catalogo
+            facultad = facultad_catalogo(facultad_id)
+            if facultad is not None:
+                usuario.facultad_id = facultad.id
         
         # Activar usuario
         usuario.is_active = True
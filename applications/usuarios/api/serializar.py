@@ -150,8 +150,8 @@ class UsuarioSerializer(serializers.ModelSerializer):
     Serializer para lectura de usuarios (sin contraseña)
     """
     rol_display = serializers.CharField(source='get_rol_display', read_only=True)
-    facultad_nombre = serializers.CharField(source='facultad.nombre', read_only=True)
-    carrera_nombre = serializers.CharField(source='carrera.nombre', read_only=True)
+    facultad_nombre = serializers.SerializerMethodField()
+    carrera_nombre = serializers.SerializerMethodField()
     asignaturas_ids = serializers.SerializerMethodField()
     # `roles` se acepta en escritura como lista de strings (tipos).
     # En lectura lo inyectamos manualmente en `to_representation` para evitar
@@ -262,17 +262,29 @@ class UsuarioSerializer(serializers.ModelSerializer):
             return list(obj.asignaturas_asignadas.values_list('asignatura_id', flat=True))
         return []
 
+    def get_facultad_nombre(self, obj):
+        """Nombre de la facultad desde el catálogo en caché (sin consulta por usuario)"""
+        from applications.academico.services.catalogo import facultad
+        datos = facultad(obj.facultad_id) if obj.facultad_id else None
+        return datos.nombre if datos else None
+
+    def get_carrera_nombre(self, obj):
+        """Nombre de la carrera desde el catálogo en caché (sin consulta por usuario)"""
+        from applications.academico.services.catalogo import carrera
+        datos = carrera(obj.carrera_id) if obj.carrera_id else None
+        return datos.nombre if datos else None
+
     def get_asignaturas_matriculadas(self, obj):
         """Obtener asignaturas matriculadas activas del estudiante (solo periodo activo). Nunca falla si falta info."""
         try:
             if getattr(obj, 'rol', None) != 'estudiante':
                 return []
             from applications.matriculas.models import Matricula
-            from applications.academico.models import PeriodoAcademico
-            periodo_activo = PeriodoAcademico.objects.filter(estado='activo').order_by('-fecha_inicio').first()
+            from applications.academico.services.periodos import periodo_activo as obtener_periodo_activo
+            periodo_activo = obtener_periodo_activo()
             if not periodo_activo:
                 return []
-            matriculas = Matricula.objects.filter(estudiante=obj, periodo=periodo_activo, estado='activa').select_related('asignatura')
+            matriculas = Matricula.objects.filter(estudiante=obj, periodo_id=periodo_activo.id, estado='activa').select_related('asignatura')
             result = []
             for m in matriculas:
                 asignatura = getattr(m, 'asignatura', None)
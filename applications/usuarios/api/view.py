@@ -73,16 +73,15 @@ class UsuarioViewSet(viewsets.ModelViewSet):
             
             # Si viene carrera_id, retornar profesores de esa facultad
             if carrera_id_param and rol_param == 'docente':
-                from applications.academico.models import Carrera
-                try:
-                    carrera = Carrera.objects.get(id=carrera_id_param)
-                    queryset = Usuario.objects.filter(
-                        rol='profesor',
-                        facultad_id=carrera.facultad_id
-                    ).distinct()
-                    return queryset
-                except Carrera.DoesNotExist:
+                from applications.academico.services.catalogo import carrera as carrera_catalogo
+                carrera = carrera_catalogo(carrera_id_param)
+                if carrera is None:
                     return Usuario.objects.none()
+                queryset = Usuario.objects.filter(
+                    rol='profesor',
+                    facultad_id=carrera.facultad_id
+                ).distinct()
+                return queryset
             
             # Filtro base según rol del usuario actual (para otros casos)
             if actor_principal == 'super_admin':
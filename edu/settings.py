@@ -136,6 +136,17 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Subidas de entregas por partes (reanudables): archivos temporales fuera de MEDIA_ROOT
+SUBIDAS_PARCIALES_ROOT = os.path.join(BASE_DIR, 'tmp', 'subidas_entregas')
+SUBIDAS_CHUNK_MAX_BYTES = 2 * 1024 * 1024  # 2MB por parte
+SUBIDAS_EXPIRACION_HORAS = 24
+
+# Matrícula en cola para días de alta demanda: POST /api/matriculas/ de estudiantes responde
+# 202 con un ticket y un worker Celery procesa las solicitudes por lotes
+MATRICULAS_MODO_COLA = False
+MATRICULAS_COLA_LOTE = 500  # solicitudes por transacción
+MATRICULAS_COLA_MAX_LOTES = 20  # lotes por ejecución del worker (limita el throughput por tarea)
+
 # Default primary key field type
 
 # Configurar modelo Usuario personalizado
@@ -202,6 +213,19 @@ SPECTACULAR_SETTINGS = {
     'SECURITY': [{'jwtAuth': []}],
 }
 
+# Caché compartida por todos los procesos (web y workers Celery): los catálogos en caché
+# (periodos, facultades/carreras, asignaturas disponibles, estadísticas de tareas) se
+# invalidan incrementando una versión aquí, y las métricas de la cola de matrícula que
+# escribe el worker se leen desde la web. Con la LocMemCache por defecto cada proceso
+# tendría su propia copia y no vería esas escrituras.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': 'redis://localhost:6379/1',
+        'KEY_PREFIX': 'edu',
+    }
+}
+
 # Configuración Celery
 CELERY_BROKER_URL = 'redis://localhost:6379/0'
 CELERY_RESULT_BACKEND = 'redis://localhost:6379/0'
@@ -219,6 +243,22 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': crontab(minute='*/10'),
         'args': (200,),
     },
+    'cerrar_tareas_vencidas_cada_5_min': {
+        'task': 'applications.evaluaciones.tasks.cerrar_tareas_vencidas',
+        'schedule': crontab(minute='*/5'),
+    },
+    'procesar_cola_matriculas_cada_minuto': {
+        'task': 'applications.matriculas.tasks.procesar_cola_matriculas',
+        'schedule': crontab(minute='*'),
+    },
+    'limpiar_subidas_entregas_abandonadas_cada_hora': {
+        'task': 'applications.evaluaciones.tasks.limpiar_subidas_abandonadas',
+        'schedule': crontab(minute=15),
+    },
+    'recolectar_blobs_sin_referencias_diario': {
+        'task': 'applications.evaluaciones.tasks.recolectar_blobs_sin_referencias',
+        'schedule': crontab(minute=30, hour=3),
+    },
     'reporte_mensual_primer_dia': {
         'task': 'applications.reportes.tasks.generar_y_enviar_reporte_mensual',
         'schedule': crontab(minute=0, hour=8, day_of_month='1'),
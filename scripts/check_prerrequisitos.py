@@ -12,6 +12,7 @@ django.setup()
 
 from applications.academico.models import Asignatura
 from applications.academico.api.serializers import AsignaturaSerializer
+from applications.academico.services.prerrequisitos import grafo_periodo
 import json
 
 print("=" * 60)
@@ -28,13 +29,22 @@ print("TODAS LAS ASIGNATURAS Y PRERREQUISITOS")
 print("=" * 60)
 
 for a in Asignatura.objects.all()[:10]:
-    prereqs = list(a.prerrequisitos.values_list('codigo', flat=True))
+    # Grafo del periodo en caché: sin una consulta por prerrequisito
+    grafo = grafo_periodo(a.periodo_academico_id)
+    prereqs = [grafo.nodos[p][0] for p in grafo.prerrequisitos.get(a.id, [])]
     if prereqs:
+        transitivos = sorted(grafo.nodos[p][0] for p in grafo.prerrequisitos_transitivos(a.id))
         print(f"\n✓ {a.codigo} - {a.nombre}")
         print(f"  Prerrequisitos: {prereqs}")
+        print(f"  Prerrequisitos transitivos: {transitivos}")
     else:
         print(f"\n- {a.codigo} - {a.nombre} (sin prerrequisitos)")
 
+for periodo_id in Asignatura.objects.values_list('periodo_academico_id', flat=True).distinct():
+    grafo = grafo_periodo(periodo_id)
+    for ciclo in grafo.ciclos():
+        print(f"\n⚠ Ciclo de prerrequisitos (periodo {periodo_id}): {[grafo.nodos[i][0] for i in ciclo]}")
+
 # Serializar y mostrar
 print("\n" + "=" * 60)
 print("DATOS SERIALIZADOS (primeras 3 asignaturas)")